@@ -5,14 +5,27 @@ UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
 import csv
+import hashlib
+import heapq
+import json
 import re
+import threading
 from pathlib import Path
 from math import log
 from collections import defaultdict
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
+INDEX_DIR = DATA_DIR / ".index"
+INDEX_VERSION = 1
 MAX_RESULTS = 3
+BM25_BACKEND = "numpy"  # Backend for batch scoring; falls back to "python" without NumPy
 
 CSV_CONFIG = {
     "style": {
@@ -98,17 +111,25 @@ AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
 # ============ BM25 IMPLEMENTATION ============
 class BM25:
-    """BM25 ranking algorithm for text search"""
+    """BM25 ranking algorithm for text search
+
+    backend: "python" (postings walk, default) or "numpy" (sparse term-document
+    matrix, used by score_batch() to rank many queries in one vectorized pass).
+    "numpy" silently falls back to "python" when NumPy is not installed.
+    """
 
-    def __init__(self, k1=1.5, b=0.75):
+    def __init__(self, k1=1.5, b=0.75, backend="python"):
         self.k1 = k1
         self.b = b
+        self.backend = backend
         self.corpus = []
         self.doc_lengths = []
         self.avgdl = 0
         self.idf = {}
         self.doc_freqs = defaultdict(int)
+        self.postings = {}
         self.N = 0
+        self._matrix = None
 
     def tokenize(self, text):
         """Lowercase, split, remove punctuation, filter short words"""
@@ -134,56 +155,270 @@ class BM25:
         for word, freq in self.doc_freqs.items():
             self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
 
-    def score(self, query):
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
-
+        postings = defaultdict(list)
         for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
             term_freqs = defaultdict(int)
             for word in doc:
                 term_freqs[word] += 1
-
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
-
-            scores.append((idx, score))
-
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+            for word, tf in term_freqs.items():
+                postings[word].append([idx, tf])
+        self.postings = dict(postings)
+
+    def to_dict(self):
+        """Serialize the fitted index (tokens, doc lengths, idf, postings)"""
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "corpus": self.corpus,
+            "doc_lengths": self.doc_lengths,
+            "avgdl": self.avgdl,
+            "idf": self.idf,
+            "doc_freqs": dict(self.doc_freqs),
+            "postings": self.postings,
+        }
+
+    @classmethod
+    def from_dict(cls, data, backend="python"):
+        """Restore a fitted index produced by to_dict() without refitting"""
+        bm25 = cls(data["k1"], data["b"], backend)
+        bm25.corpus = data["corpus"]
+        bm25.N = len(bm25.corpus)
+        bm25.doc_lengths = data["doc_lengths"]
+        bm25.avgdl = data["avgdl"]
+        bm25.idf = data["idf"]
+        bm25.doc_freqs = defaultdict(int, data["doc_freqs"])
+        bm25.postings = data["postings"]
+        return bm25
+
+    def score(self, query, top_k=None):
+        """Score documents sharing at least one token with the query.
+
+        Walks only the postings of the query tokens, so cost scales with the
+        matching postings instead of the corpus size. Documents without a
+        matching token score 0 and are not returned. With top_k, the best
+        k are selected with a heap instead of sorting every score.
+
+        Returns (idx, score) pairs, best first; ties keep corpus order.
+        """
+        query_tokens = self.tokenize(query)
+        scores = {}
+
+        for token in query_tokens:
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = self.idf[token]
+            numerator_factor = self.k1 + 1
+            for idx, tf in postings:
+                denominator = tf + self.k1 * (1 - self.b + self.b * self.doc_lengths[idx] / self.avgdl)
+                scores[idx] = scores.get(idx, 0) + idf * (tf * numerator_factor) / denominator
+
+        ranked = scores.items()
+        if top_k is not None:
+            return heapq.nlargest(top_k, ranked, key=lambda x: (x[1], -x[0]))
+        return sorted(ranked, key=lambda x: (-x[1], x[0]))
+
+    def _term_matrix(self):
+        """Sparse (CSR by term) matrix of per-(term, doc) BM25 weights, built once.
+
+        Weights are computed with the same float expression as score(), so a
+        batch pass yields bit-identical scores and therefore identical rankings.
+        """
+        if self._matrix is None:
+            vocab = {}
+            indptr = [0]
+            doc_ids = []
+            weights = []
+            numerator_factor = self.k1 + 1
+            for word, postings in self.postings.items():
+                vocab[word] = len(vocab)
+                idf = self.idf[word]
+                for idx, tf in postings:
+                    denominator = tf + self.k1 * (1 - self.b + self.b * self.doc_lengths[idx] / self.avgdl)
+                    doc_ids.append(idx)
+                    weights.append(idf * (tf * numerator_factor) / denominator)
+                indptr.append(len(doc_ids))
+            self._matrix = (vocab, np.array(indptr, dtype=np.int64),
+                            np.array(doc_ids, dtype=np.int64), np.array(weights, dtype=np.float64))
+        return self._matrix
+
+    def score_batch(self, queries, top_k=None):
+        """Score many queries at once; returns one score()-style ranking per query"""
+        if self.backend != "numpy" or not NUMPY_AVAILABLE or self.N == 0:
+            return [self.score(query, top_k) for query in queries]
+
+        vocab, indptr, doc_ids, weights = self._term_matrix()
+
+        # Gather the postings slices of every (query, token) pair, in token order,
+        # then sum them per (query, doc) cell with a single bincount.
+        slices = []
+        rows = []
+        for row, query in enumerate(queries):
+            for token in self.tokenize(query):
+                term = vocab.get(token)
+                if term is not None:
+                    slices.append(np.arange(indptr[term], indptr[term + 1]))
+                    rows.append(np.full(indptr[term + 1] - indptr[term], row, dtype=np.int64))
+
+        n_queries = len(queries)
+        if not slices:
+            return [[] for _ in range(n_queries)]
+
+        entries = np.concatenate(slices)
+        cells = np.concatenate(rows) * self.N + doc_ids[entries]
+        size = n_queries * self.N
+        scores = np.bincount(cells, weights=weights[entries], minlength=size).reshape(n_queries, self.N)
+        matched = np.bincount(cells, minlength=size).reshape(n_queries, self.N) > 0
+
+        ranked = []
+        for row in range(n_queries):
+            candidates = np.flatnonzero(matched[row])
+            order = candidates[np.argsort(-scores[row, candidates], kind="stable")]
+            if top_k is not None:
+                order = order[:top_k]
+            ranked.append([(int(idx), float(scores[row, idx])) for idx in order])
+        return ranked
+
+
+# ============ PRECOMPILED INDEX ============
+# Loaded indexes, keyed by CSV path. Each CSV is parsed and fitted at most once per process.
+_INDEXES = {}
+_INDEXES_LOCK = threading.Lock()
 
 
-# ============ SEARCH FUNCTIONS ============
 def _load_csv(filepath):
     """Load CSV and return list of dicts"""
     with open(filepath, 'r', encoding='utf-8') as f:
         return list(csv.DictReader(f))
 
 
+def _file_sha256(filepath):
+    """Content hash of a CSV, used when its mtime changed"""
+    return hashlib.sha256(filepath.read_bytes()).hexdigest()
+
+
+def _index_path(filepath):
+    """On-disk index location for a CSV (stacks/react.csv -> .index/stacks__react.json)"""
+    relative = filepath.relative_to(DATA_DIR) if filepath.is_relative_to(DATA_DIR) else Path(filepath.name)
+    return INDEX_DIR / ("__".join(relative.with_suffix("").parts) + ".json")
+
+
+def _build_index(filepath, search_cols):
+    """Parse a CSV and fit a BM25 index over its search columns"""
+    data = _load_csv(filepath)
+    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
+    bm25 = BM25(backend=BM25_BACKEND)
+    bm25.fit(documents)
+    return data, bm25
+
+
+def _read_index(filepath, search_cols):
+    """Return (data, bm25) from disk if the index is still valid for the CSV, else None"""
+    index_file = _index_path(filepath)
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    source = cached.get("source", {})
+    if cached.get("version") != INDEX_VERSION or cached.get("search_cols") != list(search_cols):
+        return None
+
+    stat = filepath.stat()
+    if source.get("mtime_ns") != stat.st_mtime_ns or source.get("size") != stat.st_size:
+        # mtime moved (checkout, copy): only rebuild if the content really changed
+        if source.get("sha256") != _file_sha256(filepath):
+            return None
+        source["mtime_ns"] = stat.st_mtime_ns
+        source["size"] = stat.st_size
+        _write_index_file(index_file, cached)
+
+    return cached["data"], BM25.from_dict(cached["bm25"], BM25_BACKEND)
+
+
+def _write_index_file(index_file, payload):
+    """Atomically write an index file; a read-only data dir just disables persistence"""
+    try:
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = index_file.with_suffix(".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        tmp_file.replace(index_file)
+    except OSError:
+        pass
+
+
+def _write_index(filepath, search_cols, data, bm25):
+    """Persist a fitted index next to the data, stamped with the CSV's mtime/size/hash"""
+    stat = filepath.stat()
+    _write_index_file(_index_path(filepath), {
+        "version": INDEX_VERSION,
+        "source": {
+            "file": str(filepath.relative_to(DATA_DIR)) if filepath.is_relative_to(DATA_DIR) else filepath.name,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": _file_sha256(filepath),
+        },
+        "search_cols": list(search_cols),
+        "data": data,
+        "bm25": bm25.to_dict(),
+    })
+
+
+def get_index(filepath, search_cols):
+    """Lazily load (or build and persist) the index for a CSV, once per process"""
+    key = (str(filepath), tuple(search_cols))
+    index = _INDEXES.get(key)
+    if index is None:
+        # Shared by search threads: make sure each CSV is only loaded/fitted once
+        with _INDEXES_LOCK:
+            index = _INDEXES.get(key)
+            if index is None:
+                index = _read_index(filepath, search_cols)
+                if index is None:
+                    index = _build_index(filepath, search_cols)
+                    _write_index(filepath, search_cols, *index)
+                _INDEXES[key] = index
+    return index
+
+
+def build_indexes(force=False):
+    """Compile every CSV_CONFIG and STACK_CONFIG domain into its on-disk index"""
+    targets = [(name, config["file"], config["search_cols"]) for name, config in CSV_CONFIG.items()]
+    targets += [(f"stack:{name}", config["file"], _STACK_COLS["search_cols"]) for name, config in STACK_CONFIG.items()]
+
+    built = {}
+    for name, filename, search_cols in targets:
+        filepath = DATA_DIR / filename
+        if not filepath.exists():
+            continue
+        index = None if force else _read_index(filepath, search_cols)
+        status = "fresh"
+        if index is None:
+            index = _build_index(filepath, search_cols)
+            _write_index(filepath, search_cols, *index)
+            status = "built"
+        _INDEXES[(str(filepath), tuple(search_cols))] = index
+        built[name] = status
+    return built
+
+
+# ============ SEARCH FUNCTIONS ============
 def _search_csv(filepath, search_cols, output_cols, query, max_results):
     """Core search function using BM25"""
     if not filepath.exists():
         return []
 
-    data = _load_csv(filepath)
-
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
+    data, bm25 = get_index(filepath, search_cols)
+    ranked = bm25.score(query, top_k=max_results)
+    return _ranked_rows(data, ranked, output_cols)
 
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
 
-    # Get top results with score > 0
+def _ranked_rows(data, ranked, output_cols):
+    """Get top results with score > 0, projected on the output columns"""
     results = []
-    for idx, score in ranked[:max_results]:
+    for idx, score in ranked:
         if score > 0:
             row = data[idx]
             results.append({col: row.get(col, "") for col in output_cols if col in row})
@@ -256,3 +491,31 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
         "count": len(results),
         "results": results
     }
+
+
+def search_batch(queries, domain, max_results=MAX_RESULTS):
+    """Run many queries against one domain in a single batch scoring pass.
+
+    Returns one search()-shaped result per query, in order. Uses the NumPy
+    backend when available; rankings are identical to calling search() per query.
+    """
+    config = CSV_CONFIG.get(domain, CSV_CONFIG["style"])
+    filepath = DATA_DIR / config["file"]
+
+    if not filepath.exists():
+        return [{"error": f"File not found: {filepath}", "domain": domain} for _ in queries]
+
+    data, bm25 = get_index(filepath, config["search_cols"])
+    rankings = bm25.score_batch(queries, top_k=max_results)
+
+    batch = []
+    for query, ranked in zip(queries, rankings):
+        results = _ranked_rows(data, ranked, config["output_cols"])
+        batch.append({
+            "domain": domain,
+            "query": query,
+            "file": config["file"],
+            "count": len(results),
+            "results": results
+        })
+    return batch
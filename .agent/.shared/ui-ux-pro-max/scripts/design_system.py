@@ -11,18 +11,34 @@ Usage:
     # With persistence (Master + Overrides pattern)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True, page="dashboard")
+
+    # Bulk: one master + every page override from a manifest
+    result = persist_design_system_bulk(load_manifest("design-pages.json"))
 """
 
+import copy
 import csv
+import hashlib
 import json
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from core import search, DATA_DIR
 
 
 # ============ CONFIGURATION ============
 REASONING_FILE = "ui-reasoning.csv"
+SEARCH_CACHE_SIZE = 1024  # Memoized (query, domain, max_results) lookups
+SEARCH_WORKERS = 8
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
 
 SEARCH_CONFIG = {
     "product": {"max_results": 1},
@@ -33,6 +49,23 @@ SEARCH_CONFIG = {
 }
 
 
+# ============ MEMOIZED SEARCH ============
+@lru_cache(maxsize=SEARCH_CACHE_SIZE)
+def _memo_search(query: str, domain: str, max_results: int) -> dict:
+    return search(query, domain, max_results)
+
+
+def cached_search(query: str, domain: str, max_results: int) -> dict:
+    """search() memoized in an LRU; returns a copy so callers can't corrupt the cache."""
+    return copy.deepcopy(_memo_search(query, domain, max_results))
+
+
+def search_cache_info() -> dict:
+    """Hit/miss counters of the memoized search cache."""
+    info = _memo_search.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
+
+
 # ============ DESIGN SYSTEM GENERATOR ============
 class DesignSystemGenerator:
     """Generates design system recommendations from aggregated searches."""
@@ -49,17 +82,20 @@ class DesignSystemGenerator:
             return list(csv.DictReader(f))
 
     def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
-        results = {}
+        """Execute searches across multiple domains concurrently (indexes are shared)."""
+        lookups = {}
         for domain, config in SEARCH_CONFIG.items():
             if domain == "style" and style_priority:
                 # For style, also search with priority keywords
                 priority_query = " ".join(style_priority[:2]) if style_priority else query
                 combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
+                lookups[domain] = (combined_query, domain, config["max_results"])
             else:
-                results[domain] = search(query, domain, config["max_results"])
-        return results
+                lookups[domain] = (query, domain, config["max_results"])
+
+        with ThreadPoolExecutor(max_workers=min(SEARCH_WORKERS, len(lookups))) as pool:
+            futures = {domain: pool.submit(cached_search, *args) for domain, args in lookups.items()}
+            return {domain: future.result() for domain, future in futures.items()}
 
     def _find_reasoning_rule(self, category: str) -> dict:
         """Find matching reasoning rule for a category."""
@@ -163,7 +199,7 @@ class DesignSystemGenerator:
     def generate(self, query: str, project_name: str = None) -> dict:
         """Generate complete design system recommendation."""
         # Step 1: First search product to get category
-        product_result = search(query, "product", 1)
+        product_result = cached_search(query, "product", 1)
         product_results = product_result.get("results", [])
         category = "General"
         if product_results:
@@ -488,19 +524,27 @@ def generate_design_system(query: str, project_name: str = None, output_format:
 
 
 # ============ PERSISTENCE FUNCTIONS ============
-def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None) -> dict:
-    """
-    Persist design system to design-system/<project>/ folder using Master + Overrides pattern.
-    
-    Args:
-        design_system: The generated design system dictionary
-        page: Optional page name for page-specific override file
-        output_dir: Optional output directory (defaults to current working directory)
-        page_query: Optional query string for intelligent page override generation
-    
-    Returns:
-        dict with created file paths and status
-    """
+_GENERATED_LINE = re.compile(r'^(> )?\*\*Generated:\*\* .*$', re.MULTILINE)
+
+
+def _content_hash(content: str) -> str:
+    """Hash of a generated file, ignoring its "Generated:" timestamp line."""
+    return hashlib.sha256(_GENERATED_LINE.sub("", content).encode("utf-8")).hexdigest()
+
+
+def _write_if_changed(path: Path, content: str) -> bool:
+    """Write content unless the file already holds the same content. Returns True if written."""
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            if _content_hash(f.read()) == _content_hash(content):
+                return False
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return True
+
+
+def _persist(design_system: dict, pages: list, output_dir: str = None) -> dict:
+    """Write MASTER.md plus one override per (page, page_query), skipping unchanged files."""
     base_dir = Path(output_dir) if output_dir else Path.cwd()
     
     # Use project name for project-specific folder
@@ -511,34 +555,115 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
     pages_dir = design_system_dir / "pages"
     
     created_files = []
+    unchanged_files = []
     
     # Create directories
     design_system_dir.mkdir(parents=True, exist_ok=True)
     pages_dir.mkdir(parents=True, exist_ok=True)
     
-    master_file = design_system_dir / "MASTER.md"
-    
-    # Generate and write MASTER.md
-    master_content = format_master_md(design_system)
-    with open(master_file, 'w', encoding='utf-8') as f:
-        f.write(master_content)
-    created_files.append(str(master_file))
-    
-    # If page is specified, create page override file with intelligent content
-    if page:
+    # Generate and write MASTER.md, then page override files with intelligent content
+    targets = [(design_system_dir / "MASTER.md", format_master_md(design_system))]
+    for page, page_query in pages:
         page_file = pages_dir / f"{page.lower().replace(' ', '-')}.md"
-        page_content = format_page_override_md(design_system, page, page_query)
-        with open(page_file, 'w', encoding='utf-8') as f:
-            f.write(page_content)
-        created_files.append(str(page_file))
+        targets.append((page_file, format_page_override_md(design_system, page, page_query)))
+    
+    for path, content in targets:
+        if _write_if_changed(path, content):
+            created_files.append(str(path))
+        else:
+            unchanged_files.append(str(path))
     
     return {
         "status": "success",
         "design_system_dir": str(design_system_dir),
-        "created_files": created_files
+        "created_files": created_files,
+        "unchanged_files": unchanged_files
     }
 
 
+def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None) -> dict:
+    """
+    Persist design system to design-system/<project>/ folder using Master + Overrides pattern.
+    
+    Files whose content (ignoring the timestamp) is unchanged are not rewritten.
+    
+    Args:
+        design_system: The generated design system dictionary
+        page: Optional page name for page-specific override file
+        output_dir: Optional output directory (defaults to current working directory)
+        page_query: Optional query string for intelligent page override generation
+    
+    Returns:
+        dict with created (written) and unchanged file paths and status
+    """
+    return _persist(design_system, [(page, page_query)] if page else [], output_dir)
+
+
+def load_manifest(path: str) -> dict:
+    """
+    Load a bulk persistence manifest (JSON, or YAML when PyYAML is installed).
+    
+    Format:
+        {"query": "sailing school", "project_name": "Getxo Bela",
+         "pages": {"dashboard": "student dashboard progress", "booking": "course booking checkout"}}
+    
+    "pages" may also be a list of {"page": ..., "query": ...} entries. A page
+    without its own query falls back to the manifest query.
+    
+    Raises:
+        OSError: the manifest cannot be read
+        ValueError: the manifest is not valid JSON/YAML or does not match the format
+            (a bad page entry is reported with its index)
+    """
+    manifest_path = Path(path)
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        if manifest_path.suffix.lower() in (".yml", ".yaml"):
+            if not YAML_AVAILABLE:
+                raise ValueError("YAML manifests require PyYAML (pip install pyyaml); use JSON instead")
+            try:
+                manifest = yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Manifest {path} is not valid YAML: {e}")
+        else:
+            manifest = json.load(f)
+    
+    if not isinstance(manifest, dict) or not manifest.get("query"):
+        raise ValueError(f"Manifest {path} must be an object with a 'query'")
+    
+    pages = manifest.get("pages", {})
+    if isinstance(pages, dict):
+        pages = [{"page": page, "query": page_query} for page, page_query in pages.items()]
+    elif not isinstance(pages, list):
+        raise ValueError(f"Manifest {path}: 'pages' must be an object or a list")
+    
+    manifest["pages"] = []
+    for i, entry in enumerate(pages):
+        if not isinstance(entry, dict) or not isinstance(entry.get("page"), str) or not entry["page"].strip():
+            raise ValueError(f"Manifest {path}: pages[{i}] must be an object with a non-empty 'page'")
+        if entry.get("query") is not None and not isinstance(entry["query"], str):
+            raise ValueError(f"Manifest {path}: pages[{i}] ('{entry['page']}') has a non-string 'query'")
+        manifest["pages"].append((entry["page"], entry.get("query") or manifest["query"]))
+    return manifest
+
+
+def persist_design_system_bulk(manifest: dict, output_dir: str = None) -> dict:
+    """
+    Persist MASTER.md and every page override of a manifest in one run.
+    
+    The master design system is generated once; page overrides reuse the
+    memoized search results, and unchanged files are left untouched.
+    
+    Args:
+        manifest: Output of load_manifest() (query, optional project_name, pages)
+        output_dir: Optional output directory (defaults to current working directory)
+    
+    Returns:
+        dict with created (written) and unchanged file paths and status
+    """
+    design_system = DesignSystemGenerator().generate(manifest["query"], manifest.get("project_name"))
+    return _persist(design_system, manifest.get("pages", []), output_dir)
+
+
 def format_master_md(design_system: dict) -> str:
     """Format design system as MASTER.md with hierarchical override logic."""
     project = design_system.get("project_name", "PROJECT")
@@ -918,16 +1043,14 @@ def _generate_intelligent_overrides(page_name: str, page_query: str, design_syst
     Uses the existing search infrastructure to find relevant style, UX, and layout
     data instead of hardcoded page types.
     """
-    from core import search
-    
     page_lower = page_name.lower()
     query_lower = (page_query or "").lower()
     combined_context = f"{page_lower} {query_lower}"
     
     # Search across multiple domains for page-specific guidance
-    style_search = search(combined_context, "style", max_results=1)
-    ux_search = search(combined_context, "ux", max_results=3)
-    landing_search = search(combined_context, "landing", max_results=1)
+    style_search = cached_search(combined_context, "style", 1)
+    ux_search = cached_search(combined_context, "ux", 3)
+    landing_search = cached_search(combined_context, "landing", 1)
     
     # Extract results from search response
     style_results = style_search.get("results", [])
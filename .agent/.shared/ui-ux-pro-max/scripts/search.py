@@ -5,6 +5,9 @@ UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
 Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
        python search.py "<query>" --design-system [-p "Project Name"]
        python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
+       python search.py --manifest design-pages.json [-o <dir>]
+       python search.py --build-index [--force]
+       python search.py --serve [--socket /tmp/uipro.sock]
 
 Domains: style, prompt, color, chart, landing, product, ux, typography
 Stacks: html-tailwind, react, nextjs
@@ -12,11 +15,35 @@ Stacks: html-tailwind, react, nextjs
 Persistence (Master + Overrides pattern):
   --persist    Save design system to design-system/MASTER.md
   --page       Also create a page-specific override file in design-system/pages/
+  --manifest   Bulk mode: one MASTER.md + every page override listed in a JSON/YAML
+               manifest ({"query", "project_name", "pages": {page: page_query}});
+               files are only rewritten when their content changed
+
+Index (precompiled BM25, data/.index/):
+  --build-index  Compile every domain and stack CSV into its on-disk index
+                 (otherwise built lazily on first query; rebuilt when a CSV changes)
+
+Daemon (indexes stay warm, one JSON object per line in and out):
+  --serve        Answer JSON-line requests on stdin/stdout, or on --socket PATH
+  Request:  {"id": 1, "query": "...", "domain": "color", "stack": null, "max_results": 3}
+            {"id": 2, "query": "...", "design_system": true, "project_name": "..."}
+            {"id": 3, "batch": [{"query": "...", "domain": "ux"}, {"query": "...", "stack": "nextjs"}]}
+            {"id": 4, "stats": true}   (design-system search cache hit/miss counters)
+  Response: the search() / search_stack() dict (batch: {"results": [...]}), with "id" echoed
+            (plain domain queries of a batch are scored together: core.search_batch)
 """
 
 import argparse
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
-from design_system import generate_design_system, persist_design_system
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+from core import (CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, build_indexes, detect_domain, search, search_batch,
+                  search_stack)
+from design_system import (DesignSystemGenerator, generate_design_system, persist_design_system_bulk,
+                           load_manifest, search_cache_info)
 
 
 def format_output(result):
@@ -45,9 +72,162 @@ def format_output(result):
     return "\n".join(output)
 
 
+# ============ DAEMON MODE ============
+_generator = None
+
+
+def _request_error(request):
+    """Error response for an invalid query request, or None"""
+    if not isinstance(request, dict) or not isinstance(request.get("query"), str) or not request["query"].strip():
+        return {"error": "Request must be an object with a non-empty string 'query'"}
+
+    max_results = request.get("max_results", MAX_RESULTS)
+    if isinstance(max_results, bool) or not isinstance(max_results, int) or max_results < 1:
+        return {"error": f"'max_results' must be a positive integer, got {max_results!r}"}
+    if request.get("project_name") is not None and not isinstance(request["project_name"], str):
+        return {"error": "'project_name' must be a string"}
+    stack = request.get("stack")
+    if stack is not None and stack not in AVAILABLE_STACKS:
+        return {"error": f"Unknown stack: {stack}. Available: {', '.join(AVAILABLE_STACKS)}"}
+    domain = request.get("domain")
+    if domain is not None and domain not in CSV_CONFIG:
+        return {"error": f"Unknown domain: {domain}. Available: {', '.join(CSV_CONFIG)}"}
+    return None
+
+
+def handle_query(request):
+    """Answer a single query request (domain search, stack search or design system)"""
+    error = _request_error(request)
+    if error:
+        return error
+
+    query = request["query"]
+    max_results = request.get("max_results", MAX_RESULTS)
+    stack = request.get("stack")
+    if request.get("design_system"):
+        global _generator
+        if _generator is None:
+            _generator = DesignSystemGenerator()
+        return _generator.generate(query, request.get("project_name"))
+    if stack:
+        return search_stack(query, stack, max_results)
+    return search(query, request.get("domain"), max_results)
+
+
+def handle_batch(items):
+    """Answer a batch; plain domain searches share one BM25 scoring pass per (domain, max_results)"""
+    responses = [None] * len(items)
+    groups = {}
+    for i, item in enumerate(items):
+        if _request_error(item) or item.get("design_system") or item.get("stack"):
+            responses[i] = handle_query(item)
+            continue
+        domain = item.get("domain") or detect_domain(item["query"])
+        groups.setdefault((domain, item.get("max_results", MAX_RESULTS)), []).append(i)
+    for (domain, max_results), indexes in groups.items():
+        results = search_batch([items[i]["query"] for i in indexes], domain, max_results)
+        for i, result in zip(indexes, results):
+            responses[i] = result
+    return responses
+
+
+def handle_request(request):
+    """Answer a single or batch request, echoing its 'id'"""
+    if isinstance(request, dict) and request.get("stats"):
+        response = {"search_cache": search_cache_info()}
+    elif isinstance(request, dict) and "batch" in request:
+        batch = request["batch"]
+        if not isinstance(batch, list):
+            response = {"error": "'batch' must be a list of query requests"}
+        else:
+            response = {"count": len(batch), "results": handle_batch(batch)}
+    else:
+        response = handle_query(request)
+
+    if isinstance(request, dict) and "id" in request:
+        response = {"id": request["id"], **response}
+    return response
+
+
+def handle_line(line):
+    """Decode one JSON line and return the encoded response line (None for blank lines)"""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as e:
+        response = {"error": f"Invalid JSON: {e}"}
+    else:
+        # One bad request must never take the daemon down
+        try:
+            response = handle_request(request)
+        except Exception as e:
+            response = {"error": f"{type(e).__name__}: {e}"}
+            if isinstance(request, dict) and "id" in request:
+                response = {"id": request["id"], **response}
+    return json.dumps(response, ensure_ascii=False) + "\n"
+
+
+class _QueryHandler(socketserver.StreamRequestHandler):
+    """One client connection: JSON line in, JSON line out, until the client closes"""
+
+    def handle(self):
+        for raw in self.rfile:
+            response = handle_line(raw.decode("utf-8"))
+            if response is not None:
+                self.wfile.write(response.encode("utf-8"))
+                self.wfile.flush()
+
+
+def remove_stale_socket(socket_path):
+    """Unlink a socket left behind by a dead daemon; refuse to touch anything else"""
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise SystemExit(f"Error: {socket_path} exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(socket_path)
+        return
+    finally:
+        probe.close()
+    raise SystemExit(f"Error: a daemon is already listening on {socket_path}")
+
+
+def serve(socket_path=None):
+    """Warm every index once, then answer requests until EOF / interrupt"""
+    build_indexes()
+
+    if not socket_path:
+        for line in sys.stdin:
+            response = handle_line(line)
+            if response is not None:
+                sys.stdout.write(response)
+                sys.stdout.flush()
+        return
+
+    remove_stale_socket(socket_path)
+    server = socketserver.ThreadingUnixStreamServer(socket_path, _QueryHandler)
+    server.daemon_threads = True
+    print(f"UI Pro Max search daemon listening on {socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path) and stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+            os.unlink(socket_path)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="UI Pro Max Search")
-    parser.add_argument("query", help="Search query")
+    parser.add_argument("query", nargs="?", help="Search query")
     parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
     parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
     parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
@@ -60,9 +240,41 @@ if __name__ == "__main__":
     parser.add_argument("--persist", action="store_true", help="Save design system to design-system/MASTER.md (creates hierarchical structure)")
     parser.add_argument("--page", type=str, default=None, help="Create page-specific override file in design-system/pages/")
     parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory for persisted files (default: current directory)")
+    parser.add_argument("--manifest", type=str, default=None, help="Persist MASTER.md + all page overrides listed in a JSON/YAML manifest")
+    # Precompiled index
+    parser.add_argument("--build-index", action="store_true", help="Compile all domain/stack CSVs into the on-disk BM25 index")
+    parser.add_argument("--force", action="store_true", help="With --build-index, rebuild even if the index is up to date")
+    # Daemon mode
+    parser.add_argument("--serve", action="store_true", help="Keep indexes warm and answer JSON-line requests (stdin or --socket)")
+    parser.add_argument("--socket", type=str, default=None, help="With --serve, listen on this Unix socket instead of stdin")
 
     args = parser.parse_args()
 
+    if args.serve:
+        serve(args.socket)
+        raise SystemExit(0)
+
+    if args.build_index:
+        for name, status in build_indexes(force=args.force).items():
+            print(f"{name}: {status}")
+        raise SystemExit(0)
+
+    if args.manifest:
+        try:
+            manifest = load_manifest(args.manifest)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        result = persist_design_system_bulk(manifest, args.output_dir)
+        print(f"✅ Design system persisted to {result['design_system_dir']}/")
+        for path in result["created_files"]:
+            print(f"   📄 {path} (written)")
+        for path in result["unchanged_files"]:
+            print(f"   ⏭️  {path} (unchanged)")
+        raise SystemExit(0)
+
+    if not args.query:
+        parser.error("the following arguments are required: query")
+
     # Design system takes priority
     if args.design_system:
         result = generate_design_system(
@@ -92,7 +304,6 @@ if __name__ == "__main__":
     elif args.stack:
         result = search_stack(args.query, args.stack, args.max_results)
         if args.json:
-            import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
             print(format_output(result))
@@ -100,7 +311,6 @@ if __name__ == "__main__":
     else:
         result = search(args.query, args.domain, args.max_results)
         if args.json:
-            import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
             print(format_output(result))
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Parity of the BM25 backends: the NumPy batch scorer must rank exactly like
+the pure-Python postings walk (same documents, same order, same scores within
+float tolerance) on every domain and stack CSV.
+
+Run: python -m pytest .agent/.shared/ui-ux-pro-max/tests -q
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+import core
+from core import BM25, CSV_CONFIG, DATA_DIR, STACK_CONFIG, _STACK_COLS, get_index, search, search_batch
+
+pytestmark = pytest.mark.skipif(not core.NUMPY_AVAILABLE, reason="NumPy not installed")
+
+TOLERANCE = 1e-9
+FIXED_QUERIES = [
+    "glassmorphism dark mode", "minimal clean saas dashboard", "accessibility contrast wcag",
+    "fintech trust blue", "hero section cta conversion", "zzqx no match at all", "",
+]
+
+
+def _datasets():
+    for name, config in CSV_CONFIG.items():
+        yield name, DATA_DIR / config["file"], config["search_cols"]
+    for name, config in STACK_CONFIG.items():
+        yield f"stack:{name}", DATA_DIR / config["file"], _STACK_COLS["search_cols"]
+
+
+DATASETS = [d for d in _datasets() if d[1].exists()]
+
+
+def _queries(data, search_cols):
+    """Fixed queries plus a few built from the rows themselves (so every CSV gets real matches)."""
+    queries = list(FIXED_QUERIES)
+    for row in data[::max(1, len(data) // 8)]:
+        words = " ".join(str(row.get(col, "")) for col in search_cols).split()
+        queries.append(" ".join(words[:4]))
+    return queries
+
+
+def _backends(filepath, search_cols):
+    data, fitted = get_index(filepath, search_cols)
+    state = fitted.to_dict()
+    return data, BM25.from_dict(state, backend="python"), BM25.from_dict(state, backend="numpy")
+
+
+def _assert_same(expected, actual, query):
+    assert [idx for idx, _ in actual] == [idx for idx, _ in expected], query
+    for (_, want), (_, got) in zip(expected, actual):
+        assert got == pytest.approx(want, rel=TOLERANCE, abs=TOLERANCE), query
+
+
+@pytest.mark.parametrize("name,filepath,search_cols", DATASETS, ids=[d[0] for d in DATASETS])
+@pytest.mark.parametrize("top_k", [1, 3, 10, None])
+def test_numpy_batch_matches_python(name, filepath, search_cols, top_k):
+    data, python, numpy = _backends(filepath, search_cols)
+    queries = _queries(data, search_cols)
+    expected = [python.score(query, top_k) for query in queries]
+    actual = numpy.score_batch(queries, top_k)
+    assert len(actual) == len(queries)
+    for query, want, got in zip(queries, expected, actual):
+        _assert_same(want, got, query)
+
+
+@pytest.mark.parametrize("name,filepath,search_cols", DATASETS, ids=[d[0] for d in DATASETS])
+def test_python_backend_batch_is_per_query_score(name, filepath, search_cols):
+    data, python, _ = _backends(filepath, search_cols)
+    queries = _queries(data, search_cols)
+    assert python.score_batch(queries, 3) == [python.score(query, 3) for query in queries]
+
+
+def test_numpy_backend_falls_back_without_numpy(monkeypatch):
+    _, filepath, search_cols = DATASETS[0]
+    data, python, numpy = _backends(filepath, search_cols)
+    queries = _queries(data, search_cols)
+    monkeypatch.setattr(core, "NUMPY_AVAILABLE", False)
+    assert numpy.score_batch(queries, 5) == [python.score(query, 5) for query in queries]
+
+
+def test_refit_matches_loaded_index():
+    _, filepath, search_cols = DATASETS[0]
+    data, loaded, _ = _backends(filepath, search_cols)
+    refit = BM25()
+    refit.fit([" ".join(str(row.get(col, "")) for col in search_cols) for row in data])
+    for query in FIXED_QUERIES:
+        _assert_same(loaded.score(query), refit.score(query), query)
+
+
+@pytest.mark.parametrize("domain", [d for d in CSV_CONFIG if (DATA_DIR / CSV_CONFIG[d]["file"]).exists()])
+def test_search_batch_matches_search(domain):
+    data, _ = get_index(DATA_DIR / CSV_CONFIG[domain]["file"], CSV_CONFIG[domain]["search_cols"])
+    queries = _queries(data, CSV_CONFIG[domain]["search_cols"])
+    assert search_batch(queries, domain, 3) == [search(query, domain, 3) for query in queries]
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Incremental Audit Cache - Antigravity Kit
+=========================================
+
+Persistent per-file result cache shared by the skill auditors, so a run only
+re-audits files whose content changed since the previous run.
+
+- Results live in `<project>/.agent/cache/<checker>.json`.
+- An entry is reused when the file's content hash matches AND the checker
+  version matches. The version is a hash of the checker's source and of the
+  shared modules it imports, so editing a rule invalidates its cache
+  automatically.
+- `--since <ref>` restricts the scan to files touched since a git ref
+  (see ProjectIndex.restrict_to_changes), making pre-commit / CI runs
+  proportional to the diff.
+
+Usage (from a skill script under .agent/skills/<skill>/scripts/):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+    from audit_cache import incremental_flags, open_incremental
+
+    since, use_cache = incremental_flags(sys.argv)
+    index, cache = open_incremental(project_path, "ux_audit", __file__, since, use_cache)
+    for path in index.files({'.tsx'}):
+        content = index.read(path)
+        findings = cache.get(path, content)
+        if findings is None:
+            findings = audit(content)
+            cache.put(path, content, findings)
+    cache.save()
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from file_index import ProjectIndex, get_project_index
+
+CACHE_DIR = Path(".agent") / "cache"
+CACHE_FORMAT = 1
+
+
+# Shared modules (file_index, js_modules, case_fold...) live next to this file
+SHARED_DIR = Path(__file__).resolve().parent
+_IMPORTED = re.compile(r'^[ \t]*(?:from[ \t]+(\w+)[ \t]+import\b|import[ \t]+(\w+(?:[ \t]*,[ \t]*\w+)*))', re.MULTILINE)
+
+
+def _local_imports(source: Path, text: str) -> List[Path]:
+    """Modules `text` imports that are shared modules or siblings of `source` (not the stdlib)."""
+    found = []
+    for match in _IMPORTED.finditer(text):
+        names = match.group(1) or match.group(2)
+        for name in (n.strip() for n in names.split(',')):
+            for directory in (source.parent, SHARED_DIR):
+                module = directory / f"{name}.py"
+                if module.is_file():
+                    found.append(module)
+                    break
+    return found
+
+
+def checker_version(*sources: str) -> str:
+    """
+    Version of a checker: hash of its source file(s) and of every shared or
+    sibling module they import, followed transitively, so editing a rule in
+    js_modules.py or next_routes.py invalidates the caches built with it.
+    """
+    digest = hashlib.sha256(str(CACHE_FORMAT).encode())
+    pending = [Path(source).resolve() for source in sources]
+    seen = set()
+    while pending:
+        source = pending.pop(0)
+        if source in seen:
+            continue
+        seen.add(source)
+        try:
+            data = source.read_bytes()
+        except OSError:
+            digest.update(str(source).encode())
+            continue
+        digest.update(data)
+        pending.extend(_local_imports(source, data.decode('utf-8', errors='replace')))
+    return digest.hexdigest()[:16]
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8', errors='replace')).hexdigest()
+
+
+class AuditCache:
+    """Per-file findings of one checker, keyed by content hash and checker version."""
+
+    def __init__(self, index: ProjectIndex, checker: str, version: str, enabled: bool = True):
+        self.index = index
+        self.checker = checker
+        self.version = version
+        self.enabled = enabled
+        self.path = index.root / CACHE_DIR / f"{checker}.json"
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._entries: Dict[str, dict] = self._load() if enabled else {}
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != self.version:
+            return {}
+        return data.get("files", {})
+
+    def _key(self, path: Path) -> str:
+        return self.index.relpath(path).replace(os.sep, '/')
+
+    def get(self, path: Path, content: str) -> Optional[Any]:
+        """Cached findings for `path`, or None if the file changed (or was never audited)."""
+        if not self.enabled:
+            return None
+        return self.get_hashed(path, content_hash(content))
+
+    def put(self, path: Path, content: str, findings: Any) -> None:
+        if not self.enabled:
+            return
+        self.put_hashed(path, content_hash(content), findings)
+
+    def cached_hash(self, path: Path) -> Optional[str]:
+        """Content hash the cached findings of `path` belong to (for checkers hashing files elsewhere)."""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(self._key(path))
+        return entry["hash"] if entry is not None else None
+
+    def get_hashed(self, path: Path, digest: str) -> Optional[Any]:
+        """get() for a content hash computed by the caller (e.g. in a worker process)."""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(self._key(path))
+        if entry is not None and entry["hash"] == digest:
+            self.hits += 1
+            return entry["findings"]
+        self.misses += 1
+        return None
+
+    def put_hashed(self, path: Path, digest: str, findings: Any) -> None:
+        if not self.enabled:
+            return
+        self._entries[self._key(path)] = {"hash": digest, "findings": findings}
+        self._dirty = True
+
+    def save(self) -> None:
+        """Persist the cache, dropping entries for files no longer in the project."""
+        if not self.enabled:
+            return
+        live = {self._key(p) for p in self.index.paths}
+        stale = [key for key in self._entries if key not in live]
+        for key in stale:
+            del self._entries[key]
+        if not (self._dirty or stale):
+            return
+
+        data = {"checker": self.checker, "version": self.version, "files": self._entries}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Atomic replace: checkers may run concurrently (check_runner.py)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.checker}.", suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"[!] Could not write audit cache {self.path}: {e}", file=sys.stderr)
+        self._dirty = False
+
+    def stats(self) -> dict:
+        return {"checker": self.checker, "enabled": self.enabled, "hits": self.hits, "misses": self.misses}
+
+
+def incremental_flags(argv: List[str]) -> Tuple[Optional[str], bool]:
+    """Parse `--since <ref>` / `--since=<ref>` and `--no-cache` from a raw argv."""
+    since = None
+    for i, arg in enumerate(argv):
+        if arg == "--since" and i + 1 < len(argv):
+            since = argv[i + 1]
+        elif arg.startswith("--since="):
+            since = arg.split("=", 1)[1]
+    return since, "--no-cache" not in argv
+
+
+def open_incremental(project_path, checker: str, source: str, since: Optional[str] = None,
+                     use_cache: bool = True) -> Tuple[ProjectIndex, AuditCache]:
+    """Shared index (a view restricted to changes since `since`, if given) plus the checker's cache."""
+    index = get_project_index(project_path)
+    if since:
+        index = index.restrict_to_changes(since)
+    return index, AuditCache(index, checker, checker_version(source), enabled=use_cache)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Case Folding for Pattern Scans - Antigravity Kit
+================================================
+
+re.IGNORECASE disables sre's literal-prefix scan and costs ~5x per search.
+Auditors that run many case-insensitive patterns over whole files instead
+fold each pattern to lowercase, compile it case-sensitively, and match it
+against a case-folded copy of the file built once. Folding is
+length-preserving, so match offsets (and groups or lines taken from the
+original text) are identical to an IGNORECASE search.
+
+Usage (from a skill script under .agent/skills/<skill>/scripts/):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+    from case_fold import fold_case, fold_pattern
+
+    regex = re.compile(fold_pattern(r'api[_-]?key\\s*='))
+    folded = fold_case(content)
+    for match in regex.finditer(folded):
+        text = content[match.start():match.end()]  # original casing
+"""
+
+# Characters re.IGNORECASE equates with an ASCII letter, beyond A-Z
+_FOLD_SPECIAL = {'\u0130': 'i', '\u0131': 'i', '\u017f': 's', '\u212a': 'k'}
+_FOLD_TABLE = str.maketrans({**{chr(c): chr(c + 32) for c in range(ord('A'), ord('Z') + 1)}, **_FOLD_SPECIAL})
+
+
+def fold_case(text: str) -> str:
+    """Case-fold `text` exactly as re.IGNORECASE sees ASCII letters, keeping its length."""
+    # str.lower() is ~10x faster than translate() and equivalent unless one of
+    # these is present (U+0130 lowers to two chars, U+0131/U+017F do not lower to ASCII)
+    if '\u0130' in text or '\u0131' in text or '\u017f' in text:
+        return text.translate(_FOLD_TABLE)
+    return text.lower()
+
+
+def fold_pattern(pattern: str) -> str:
+    """Lowercase a pattern's literals, leaving escapes (\\S, \\W, \\D...) untouched."""
+    out, i = [], 0
+    while i < len(pattern):
+        if pattern[i] == '\\':
+            out.append(pattern[i:i + 2])
+            i += 2
+        else:
+            out.append(pattern[i].lower())
+            i += 1
+    return ''.join(out)
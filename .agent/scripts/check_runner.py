@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Parallel Check Runner - Antigravity Kit
+=======================================
+
+Scheduler shared by checklist.py and verify_all.py. Runs independent
+validation scripts concurrently in a pool of worker processes instead of one
+`python <script>` subprocess after another.
+
+- Each check is executed in-process inside a worker (runpy, stdout/stderr
+  captured, SystemExit -> return code). Workers are reused, so interpreter
+  startup and the shared file index (file_index.py) are paid once per worker.
+- Priority order (P0 -> P9) only decides submission order; a check waits for
+  another one only if it is declared in CHECK_DEPENDENCIES.
+- A check's timeout runs from the moment a worker starts it (workers report
+  their start), not from submission. A timed-out check keeps its worker busy,
+  so the pool is terminated and replaced and the other in-flight checks are
+  resubmitted.
+- Results are streamed as each check completes, and the final summary reports
+  wall-clock time next to the summed CPU time of all checks.
+- With `jsonl_dir`, auditors stream their findings to <jsonl_dir>/<script>.jsonl
+  (findings_stream.py); each result carries the path and its summary record.
+  Emitters a check left open are closed when it ends, so reused workers never
+  inherit its stream or its stdout redirection.
+
+Usage:
+    from check_runner import run_checks
+    results, timing = run_checks(checks, project_path, url, workers=4, on_result=print_result)
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import queue
+import runpy
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from findings_stream import close_all, read_summary
+
+# Real dependencies between checks (check name -> names that must finish first).
+# Everything else may run concurrently.
+CHECK_DEPENDENCIES = {
+    # Both drive a browser against the same server; running them together skews Lighthouse timings
+    "Playwright E2E": {"Lighthouse Audit"},
+}
+
+# Scripts backed by the incremental audit cache (audit_cache.py): they accept --since <ref>
+INCREMENTAL_SCRIPTS = {
+    "security_scan.py", "type_coverage.py", "ux_audit.py", "accessibility_checker.py",
+    "seo_checker.py", "geo_checker.py", "mobile_audit.py", "i18n_checker.py",
+}
+
+# Scripts that stream findings as JSONL (findings_stream.py): they accept --jsonl=<file>
+STREAMING_SCRIPTS = INCREMENTAL_SCRIPTS | {
+    "react_performance_checker.py", "api_validator.py", "schema_validator.py", "bundle_analyzer.py",
+}
+
+
+# Worker side: queue of (generation, check name, start time) set by _init_worker
+_STARTED = None
+
+# How often the scheduler looks for start reports while no check completes (seconds)
+POLL_INTERVAL = 0.1
+
+
+def _init_worker(started) -> None:
+    global _STARTED
+    _STARTED = started
+
+
+def _execute_check(script_path: str, argv: List[str], name: Optional[str] = None, generation: int = 0) -> dict:
+    """Worker: run one validation script in this process and capture its outcome."""
+    if _STARTED is not None and name is not None:
+        _STARTED.put((generation, name, time.time()))
+    stdout, stderr = io.StringIO(), io.StringIO()
+    saved_argv, saved_cwd = sys.argv, os.getcwd()
+    cpu_start = time.process_time()
+    children_start = os.times()
+    wall_start = time.perf_counter()
+    returncode = 0
+
+    sys.argv = [script_path] + argv
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                runpy.run_path(script_path, run_name="__main__")
+            except SystemExit as e:
+                if e.code is None:
+                    returncode = 0
+                elif isinstance(e.code, int):
+                    returncode = e.code
+                else:
+                    print(e.code, file=sys.stderr)
+                    returncode = 1
+            except BaseException:
+                traceback.print_exc()
+                returncode = 1
+    finally:
+        close_all()  # a check that failed before its summary must not leak its stream into the next one
+        sys.argv = saved_argv
+        os.chdir(saved_cwd)
+
+    children_end = os.times()
+    cpu = (time.process_time() - cpu_start
+           + (children_end.children_user - children_start.children_user)
+           + (children_end.children_system - children_start.children_system))
+
+    return {
+        "returncode": returncode,
+        "output": stdout.getvalue(),
+        "error": stderr.getvalue(),
+        "duration": time.perf_counter() - wall_start,
+        "cpu_time": cpu,
+    }
+
+
+def findings_path(script: Path, jsonl_dir: Optional[str]) -> Optional[Path]:
+    """Where a check streams its findings, or None if it does not stream them."""
+    if not jsonl_dir or script.name not in STREAMING_SCRIPTS:
+        return None
+    return Path(jsonl_dir) / f"{script.stem}.jsonl"
+
+
+def build_argv(script: Path, project_path: str, url: Optional[str] = None,
+               since: Optional[str] = None, jsonl_dir: Optional[str] = None) -> List[str]:
+    """Command-line arguments passed to a check (same convention as the former subprocess calls)."""
+    argv = [project_path]
+    if url and ("lighthouse" in script.name.lower() or "playwright" in script.name.lower()):
+        argv.append(url)
+    if since and script.name in INCREMENTAL_SCRIPTS:
+        argv += ["--since", since]
+    stream = findings_path(script, jsonl_dir)
+    if stream:
+        argv.append(f"--jsonl={stream}")
+    return argv
+
+
+def run_checks(checks: List[dict], project_path: str, url: Optional[str] = None,
+               workers: Optional[int] = None, timeout: int = 600, stop_on_fail: bool = False,
+               since: Optional[str] = None, jsonl_dir: Optional[str] = None,
+               on_start: Optional[Callable[[dict], None]] = None,
+               on_result: Optional[Callable[[dict], None]] = None) -> Tuple[List[dict], dict]:
+    """
+    Run checks concurrently, honoring CHECK_DEPENDENCIES and priority order.
+
+    Args:
+        checks: dicts with name, script (Path), required, and optional category
+            (list order is the priority order)
+        project_path: project root passed to every script
+        url: URL forwarded to Lighthouse/Playwright scripts
+        workers: worker processes (default: CPU count; 1 = serial in priority order)
+        timeout: per-check timeout in seconds, counted from when a worker starts the check
+        stop_on_fail: stop scheduling once a required check fails
+        since: git ref forwarded as --since to INCREMENTAL_SCRIPTS
+        jsonl_dir: directory STREAMING_SCRIPTS write their JSONL findings to
+        on_start / on_result: callbacks used to stream progress (on_start fires when a
+            worker actually starts the check, not when it is queued)
+
+    Returns:
+        (results in priority order, {"wall_time", "cpu_time", "workers", "stopped_by"})
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    order = {check["name"]: i for i, check in enumerate(checks)}
+    names = set(order)
+    results: Dict[str, dict] = {}
+    pending = list(checks)
+    # name -> (check, wall-clock time a worker started it, or None while still queued in the pool)
+    running: Dict[str, Tuple[dict, Optional[float]]] = {}
+    done_queue: "queue.Queue[Tuple[int, str, dict]]" = queue.Queue()
+    stopped: Optional[str] = None
+    generation = 0
+    pool_size = min(workers, max(1, len(checks)))
+    wall_start = time.perf_counter()
+
+    def finish(check: dict, result: dict) -> None:
+        result = {"name": check["name"], **result}
+        if check.get("category"):
+            result["category"] = check["category"]
+        stream = findings_path(Path(check["script"]), jsonl_dir)
+        if stream and not result.get("skipped"):
+            result["findings_file"] = str(stream)
+            result["findings_summary"] = read_summary(stream)
+        results[check["name"]] = result
+        if on_result:
+            on_result(result)
+
+    def ready(check: dict) -> bool:
+        deps = CHECK_DEPENDENCIES.get(check["name"], set()) & names
+        return all(dep in results for dep in deps)
+
+    def new_pool():
+        started = multiprocessing.Queue()
+        return multiprocessing.Pool(processes=pool_size, initializer=_init_worker, initargs=(started,)), started
+
+    def submit(check: dict) -> None:
+        script = Path(check["script"])
+        name, gen = check["name"], generation
+        pool.apply_async(
+            _execute_check,
+            (str(script), build_argv(script, project_path, url, since, jsonl_dir), name, gen),
+            callback=lambda res: done_queue.put((gen, name, res)),
+            error_callback=lambda exc: done_queue.put(
+                (gen, name, {"returncode": 1, "output": "", "error": str(exc), "duration": 0, "cpu_time": 0})),
+        )
+        running[name] = (check, None)
+
+    pool, started_queue = new_pool()
+    try:
+        while pending or running:
+            # Submit every ready check, highest priority first, while workers are free
+            if not stopped:
+                for check in list(pending):
+                    if len(running) >= workers:
+                        break
+                    if not ready(check):
+                        continue
+                    pending.remove(check)
+                    if not Path(check["script"]).exists():
+                        finish(check, {"passed": True, "skipped": True, "duration": 0, "cpu_time": 0})
+                        continue
+                    submit(check)
+
+            if not running:
+                if stopped or not pending:
+                    break
+                continue
+
+            # Checks a worker picked up: their timeout clock starts now
+            while True:
+                try:
+                    gen, name, started_at = started_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if gen == generation and name in running and running[name][1] is None:
+                    running[name] = (running[name][0], started_at)
+                    if on_start:
+                        on_start(running[name][0])
+
+            # Wait for the next completion, the nearest deadline, or the next start report
+            now = time.time()
+            deadlines = [start + timeout for _, start in running.values() if start is not None]
+            wait = min([POLL_INTERVAL] + [deadline - now for deadline in deadlines])
+            try:
+                gen, name, res = done_queue.get(timeout=max(0.01, wait))
+            except queue.Empty:
+                now = time.time()
+                expired = [name for name, (_, start) in running.items()
+                           if start is not None and now - start >= timeout]
+                if expired:
+                    for name in expired:
+                        check, start = running.pop(name)
+                        finish(check, {"passed": False, "skipped": False, "duration": now - start,
+                                       "cpu_time": 0, "error": "Timeout", "timeout": True})
+                    # A hung check still occupies its worker: replace the pool, rerun the others in flight
+                    pool.terminate()
+                    pool.join()
+                    generation += 1
+                    pool, started_queue = new_pool()
+                    for check, _ in list(running.values()):
+                        submit(check)
+                continue
+
+            if gen != generation or name not in running:
+                continue  # from a replaced pool, or already reported as timed out
+            check, started_at = running.pop(name)
+            if started_at is None and on_start:
+                on_start(check)  # finished before its start report was read
+            finish(check, {
+                "passed": res["returncode"] == 0,
+                "skipped": False,
+                "output": res["output"],
+                "error": res["error"],
+                "duration": res["duration"],
+                "cpu_time": res["cpu_time"],
+            })
+
+            if stop_on_fail and check.get("required") and res["returncode"] != 0:
+                stopped = check["name"]
+                pending.clear()
+                break
+    finally:
+        if stopped:
+            pool.terminate()
+        else:
+            pool.close()
+        pool.join()
+
+    timing = {
+        "wall_time": time.perf_counter() - wall_start,
+        "cpu_time": sum(r.get("cpu_time", 0) for r in results.values()),
+        "workers": workers,
+        "stopped_by": stopped,
+    }
+    ordered = sorted(results.values(), key=lambda r: order[r["name"]])
+    return ordered, timing
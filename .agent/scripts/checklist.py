@@ -9,6 +9,12 @@ Use this for incremental validation during development.
 Usage:
     python scripts/checklist.py .                    # Run core checks
     python scripts/checklist.py . --url <URL>        # Include performance checks
+    python scripts/checklist.py . --workers 4        # Run checks in parallel
+    python scripts/checklist.py . --since HEAD       # Only files changed since a ref
+
+Checks run serially by default; --workers N runs independent checks
+concurrently (see check_runner.py). Priority order decides which checks
+start first and the order of the final summary.
 
 Priority Order:
     P0: Security Scan (vulnerabilities, secrets)
@@ -21,10 +27,12 @@ Priority Order:
 """
 
 import sys
-import subprocess
 import argparse
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from check_runner import run_checks
 
 # ANSI colors for terminal output
 class Colors:
@@ -69,65 +77,24 @@ PERFORMANCE_CHECKS = [
     ("Playwright E2E", ".agent/skills/webapp-testing/scripts/playwright_runner.py", False),
 ]
 
-def check_script_exists(script_path: Path) -> bool:
-    """Check if script file exists"""
-    return script_path.exists() and script_path.is_file()
-
-def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None) -> dict:
-    """
-    Run a validation script and capture results
-    
-    Returns:
-        dict with keys: name, passed, output, skipped
-    """
-    if not check_script_exists(script_path):
+def print_result(result: dict):
+    """Stream one completed check (called as soon as it finishes)"""
+    name = result["name"]
+    if result.get("skipped"):
         print_warning(f"{name}: Script not found, skipping")
-        return {"name": name, "passed": True, "output": "", "skipped": True}
-    
-    print_step(f"Running: {name}")
-    
-    # Build command
-    cmd = ["python", str(script_path), project_path]
-    if url and ("lighthouse" in script_path.name.lower() or "playwright" in script_path.name.lower()):
-        cmd.append(url)
-    
-    # Run script
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='replace',
-            timeout=300  # 5 minute timeout
-        )
-        
-        passed = result.returncode == 0
-        
-        if passed:
-            print_success(f"{name}: PASSED")
-        else:
-            print_error(f"{name}: FAILED")
-            if result.stderr:
-                print(f"  Error: {result.stderr[:200]}")
-        
-        return {
-            "name": name,
-            "passed": passed,
-            "output": result.stdout,
-            "error": result.stderr,
-            "skipped": False
-        }
-    
-    except subprocess.TimeoutExpired:
+    elif result.get("timeout"):
         print_error(f"{name}: TIMEOUT (>5 minutes)")
-        return {"name": name, "passed": False, "output": "", "error": "Timeout", "skipped": False}
-    
-    except Exception as e:
-        print_error(f"{name}: ERROR - {str(e)}")
-        return {"name": name, "passed": False, "output": "", "error": str(e), "skipped": False}
-
-def print_summary(results: List[dict]):
+    elif result["passed"]:
+        print_success(f"{name}: PASSED ({result['duration']:.1f}s)")
+    else:
+        print_error(f"{name}: FAILED ({result['duration']:.1f}s)")
+        if result.get("error"):
+            print(f"  Error: {result['error'][:200]}")
+    summary = result.get("findings_summary")
+    if summary:
+        print(f"  {summary['findings']} finding(s) -> {result['findings_file']}")
+
+def print_summary(results: List[dict], timing: Optional[dict] = None):
     """Print final summary report"""
     print_header("📊 CHECKLIST SUMMARY")
     
@@ -139,6 +106,9 @@ def print_summary(results: List[dict]):
     print(f"{Colors.GREEN}✅ Passed: {passed_count}{Colors.ENDC}")
     print(f"{Colors.RED}❌ Failed: {failed_count}{Colors.ENDC}")
     print(f"{Colors.YELLOW}⏭️  Skipped: {skipped_count}{Colors.ENDC}")
+    if timing:
+        print(f"Wall Time: {timing['wall_time']:.1f}s | CPU Time: {timing['cpu_time']:.1f}s "
+              f"({timing['workers']} worker(s))")
     print()
     
     # Detailed results
@@ -169,11 +139,20 @@ def main():
 Examples:
   python scripts/checklist.py .                      # Core checks only
   python scripts/checklist.py . --url http://localhost:3000  # Include performance
+  python scripts/checklist.py . --workers 4          # 4 checks in parallel
+  python scripts/checklist.py . --since origin/main  # Pre-commit/CI: audit only the diff
+  python scripts/checklist.py . --jsonl-dir .agent/reports  # Findings as JSONL, one file per auditor
         """
     )
     parser.add_argument("project", help="Project path to validate")
     parser.add_argument("--url", help="URL for performance checks (lighthouse, playwright)")
     parser.add_argument("--skip-performance", action="store_true", help="Skip performance checks even if URL provided")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Checks run in parallel (default: 1 = serial)")
+    parser.add_argument("--since", metavar="REF",
+                        help="Only audit files changed since a git ref (e.g. origin/main)")
+    parser.add_argument("--jsonl-dir", metavar="DIR",
+                        help="Auditors stream every finding to DIR/<script>.jsonl as they run")
     
     args = parser.parse_args()
     
@@ -187,31 +166,42 @@ Examples:
     print(f"Project: {project_path}")
     print(f"URL: {args.url if args.url else 'Not provided (performance checks skipped)'}")
     
-    results = []
-    
-    # Run core checks
-    print_header("📋 CORE CHECKS")
-    for name, script_path, required in CORE_CHECKS:
-        script = project_path / script_path
-        result = run_script(name, script, str(project_path))
-        results.append(result)
-        
-        # If required check fails, stop
-        if required and not result["passed"] and not result.get("skipped"):
-            print_error(f"CRITICAL: {name} failed. Stopping checklist.")
-            print_summary(results)
-            sys.exit(1)
-    
-    # Run performance checks if URL provided
+    # Core checks: a required failure stops the checklist
+    checks = [
+        {"name": name, "script": project_path / script_path, "required": required}
+        for name, script_path, required in CORE_CHECKS
+    ]
+    # Performance checks only if URL provided (they never stop the run)
     if args.url and not args.skip_performance:
-        print_header("⚡ PERFORMANCE CHECKS")
-        for name, script_path, required in PERFORMANCE_CHECKS:
-            script = project_path / script_path
-            result = run_script(name, script, str(project_path), args.url)
-            results.append(result)
-    
+        checks += [
+            {"name": name, "script": project_path / script_path, "required": False}
+            for name, script_path, required in PERFORMANCE_CHECKS
+        ]
+
+    print_header("📋 CHECKS")
+    print(f"Running {len(checks)} checks on {min(args.workers, len(checks))} worker(s)\n")
+
+    results, timing = run_checks(
+        checks,
+        str(project_path),
+        url=args.url,
+        workers=args.workers,
+        timeout=300,  # 5 minute timeout
+        since=args.since,
+        jsonl_dir=args.jsonl_dir,
+        stop_on_fail=True,
+        on_start=lambda check: print_step(f"Running: {check['name']}"),
+        on_result=print_result
+    )
+
+    # If required check fails, stop
+    if timing["stopped_by"]:
+        print_error(f"CRITICAL: {timing['stopped_by']} failed. Stopping checklist.")
+        print_summary(results, timing)
+        sys.exit(1)
+
     # Print summary
-    all_passed = print_summary(results)
+    all_passed = print_summary(results, timing)
     
     sys.exit(0 if all_passed else 1)
 
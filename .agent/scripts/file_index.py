@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Shared Project File Index - Antigravity Kit
+===========================================
+
+Enumerates a project tree once (respecting .gitignore) and decodes each file
+at most once, so every auditor running in the same process shares a single
+walk and a single content cache instead of re-reading the tree per checker.
+
+Usage (from a skill script under .agent/skills/<skill>/scripts/):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+    from file_index import get_project_index
+
+    index = get_project_index(project_path)
+    for path in index.files({'.tsx', '.jsx'}, skip_dirs={'ios', 'android'}):
+        content = index.read(path)
+
+Enumeration uses `git ls-files --cached --others --exclude-standard` when the
+project is inside a git work tree, and falls back to os.walk with .gitignore
+matching otherwise. Gitignored files are left out; scanners that must still
+see local-only files (.env.local, private keys) ask for them by name with
+ignored_files().
+"""
+
+import copy
+import fnmatch
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+# Never worth walking, whatever .gitignore says
+ALWAYS_SKIP_DIRS = {'.git', 'node_modules'}
+
+
+# ============================================================================
+#  .GITIGNORE MATCHING (fallback when git is unavailable)
+# ============================================================================
+
+def _translate_pattern(pattern: str) -> str:
+    """Translate a gitignore glob into a regex matched against a relative posix path."""
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+            continue
+        if pattern.startswith("/**", i) and i + 3 == len(pattern):
+            regex += "/.*"
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+            continue
+        if c == "*":
+            regex += "[^/]*"
+        elif c == "?":
+            regex += "[^/]"
+        elif c == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                regex += re.escape(c)
+            else:
+                regex += "[" + pattern[i + 1:end].replace("!", "^", 1) + "]"
+                i = end
+        else:
+            regex += re.escape(c)
+        i += 1
+    return regex
+
+
+class GitIgnore:
+    """Ordered .gitignore rules; the last matching rule decides (negations re-include)."""
+
+    def __init__(self):
+        self.rules = []
+
+    def add_file(self, gitignore_path: Path, base: str) -> None:
+        """Load rules from a .gitignore located at `base` (posix path relative to root)."""
+        try:
+            lines = gitignore_path.read_text(encoding='utf-8', errors='replace').splitlines()
+        except OSError:
+            return
+
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            anchored = '/' in line
+            line = line.lstrip('/')
+            if not line:
+                continue
+            body = _translate_pattern(line)
+            prefix = re.escape(base + '/') if base else ""
+            regex = f"^{prefix}{body}$" if anchored else f"^{prefix}(?:.*/)?{body}$"
+            self.rules.append((re.compile(regex), negate, dir_only))
+
+    def ignored(self, rel_path: str, is_dir: bool) -> bool:
+        ignored = False
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                ignored = not negate
+        return ignored
+
+
+# ============================================================================
+#  PROJECT INDEX
+# ============================================================================
+
+class ProjectIndex:
+    """One enumeration of a project tree plus a decoded-content cache."""
+
+    def __init__(self, root: str):
+        self.root = Path(root).resolve()
+        self._prefix = os.path.join(str(self.root), '')
+        self._contents: Dict[Path, str] = {}
+        self._bytes_read = 0
+        self.paths: List[Path] = self._enumerate()
+        # Set on the views returned by restrict_to_changes(): files() then only yields these
+        self.changed: Optional[Set[Path]] = None
+
+    # ---------------------------------------------------------------- walk
+
+    def _enumerate(self) -> List[Path]:
+        if self.root.is_file():
+            return [self.root]
+        rel_paths = self._git_ls_files()
+        if rel_paths is None:
+            rel_paths = self._walk()
+        paths = []
+        for rel in rel_paths:
+            if any(part in ALWAYS_SKIP_DIRS for part in Path(rel).parts[:-1]):
+                continue
+            path = self.root / rel
+            if path.is_file():
+                paths.append(path)
+        return sorted(paths)
+
+    def _git_ls_files(self) -> Optional[List[str]]:
+        try:
+            result = subprocess.run(
+                ["git", "-C", str(self.root), "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+                capture_output=True,
+                timeout=60
+            )
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return None
+        if result.returncode != 0:
+            return None
+        # Deduplicate (files with merge conflicts are listed once per stage)
+        return list(dict.fromkeys(p for p in result.stdout.decode('utf-8', errors='replace').split('\0') if p))
+
+    def _walk(self) -> List[str]:
+        gitignore = GitIgnore()
+        rel_paths = []
+        for root, dirs, files in os.walk(self.root):
+            base = Path(root).relative_to(self.root).as_posix()
+            base = "" if base == "." else base
+            if '.gitignore' in files:
+                gitignore.add_file(Path(root) / '.gitignore', base)
+
+            def rel(name):
+                return f"{base}/{name}" if base else name
+
+            dirs[:] = [d for d in dirs if d not in ALWAYS_SKIP_DIRS and not gitignore.ignored(rel(d), True)]
+            rel_paths.extend(rel(f) for f in files if not gitignore.ignored(rel(f), False))
+        return rel_paths
+
+    def restrict_to_changes(self, ref: str) -> 'ProjectIndex':
+        """
+        View of the index whose files() only yields paths changed since a git
+        ref: committed, staged and unstaged changes plus untracked files. The
+        view shares the enumeration and content cache; this index (the one
+        get_project_index() hands to every checker of the process) is left
+        unrestricted. Falls back to the full tree (with a warning) if the ref
+        cannot be resolved.
+        """
+        view = copy.copy(self)
+        changed = self._git_changed_since(ref)
+        if changed is None:
+            print(f"[!] Cannot diff against '{ref}', scanning the full project", file=sys.stderr)
+            view.changed = None
+        else:
+            view.changed = {self.root / rel for rel in changed}
+        return view
+
+    def _git_changed_since(self, ref: str) -> Optional[List[str]]:
+        commands = [
+            ["git", "-C", str(self.root), "diff", "--name-only", "-z", "--relative", ref, "--"],
+            ["git", "-C", str(self.root), "ls-files", "-z", "--others", "--exclude-standard"],
+        ]
+        rel_paths: List[str] = []
+        for cmd in commands:
+            try:
+                result = subprocess.run(cmd, capture_output=True, timeout=60)
+            except (FileNotFoundError, subprocess.TimeoutExpired):
+                return None
+            if result.returncode != 0:
+                return None
+            rel_paths.extend(p for p in result.stdout.decode('utf-8', errors='replace').split('\0') if p)
+        return rel_paths
+
+    def ignored_files(self, patterns: Iterable[str], under: Optional[str] = None) -> List[Path]:
+        """
+        Files left out of the index (gitignored) whose name matches one of the
+        glob `patterns` ('.env.*', '*.pem'), optionally under a sub-directory.
+        ALWAYS_SKIP_DIRS stay excluded. Empty on views restricted to changes:
+        git cannot tell whether an ignored file changed.
+        """
+        if self.changed is not None or self.root.is_file():
+            return []
+        patterns = list(patterns)
+        rel_paths = self._git_ignored(patterns)
+        if rel_paths is None:
+            rel_paths = [rel for rel in self._walk_all() if self._name_matches(rel, patterns)]
+        listed = set(self.paths)
+        base_prefix = os.path.join(str((self.root / under).resolve()), '') if under else None
+
+        found = []
+        for rel in rel_paths:
+            if any(part in ALWAYS_SKIP_DIRS for part in Path(rel).parts[:-1]):
+                continue
+            if not self._name_matches(rel, patterns):
+                continue
+            path = self.root / rel
+            if path in listed or (base_prefix and not str(path).startswith(base_prefix)):
+                continue
+            if path.is_file():
+                found.append(path)
+        return sorted(found)
+
+    @staticmethod
+    def _name_matches(rel: str, patterns: List[str]) -> bool:
+        name = rel.rsplit('/', 1)[-1]
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+    def _git_ignored(self, patterns: List[str]) -> Optional[List[str]]:
+        pathspecs = [f":(glob)**/{pattern}" for pattern in patterns]
+        try:
+            result = subprocess.run(
+                ["git", "-C", str(self.root), "ls-files", "-z", "--others", "--ignored", "--exclude-standard",
+                 "--"] + pathspecs,
+                capture_output=True,
+                timeout=60
+            )
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return None
+        if result.returncode != 0:
+            return None
+        return [p for p in result.stdout.decode('utf-8', errors='replace').split('\0') if p]
+
+    def _walk_all(self) -> List[str]:
+        rel_paths = []
+        for root, dirs, files in os.walk(self.root):
+            base = Path(root).relative_to(self.root).as_posix()
+            base = "" if base == "." else base
+            dirs[:] = [d for d in dirs if d not in ALWAYS_SKIP_DIRS]
+            rel_paths.extend(f"{base}/{f}" if base else f for f in files)
+        return rel_paths
+
+    # ---------------------------------------------------------------- queries
+
+    def files(self, extensions: Optional[Iterable[str]] = None, skip_dirs: Iterable[str] = (),
+              skip_hidden: bool = False, under: Optional[str] = None,
+              include_unchanged: bool = False) -> List[Path]:
+        """
+        Files of the index, filtered by suffix (case-insensitive), excluded
+        directory names (anywhere in the relative path), hidden directories
+        and an optional sub-directory of the root. Honors restrict_to_changes()
+        unless include_unchanged is set (cross-file checks need the full tree).
+        """
+        exts = {e.lower() for e in extensions} if extensions is not None else None
+        skip = set(skip_dirs)
+        # Sub-directory test on strings: Path.parents builds a Path per ancestor
+        base = str((self.root / under).resolve()) if under else None
+        base_prefix = os.path.join(base, '') if under else None
+
+        selected = []
+        for path in self.paths:
+            if self.changed is not None and not include_unchanged and path not in self.changed:
+                continue
+            if exts is not None and path.suffix.lower() not in exts:
+                continue
+            if base is not None and not str(path).startswith(base_prefix) and str(path) != base:
+                continue
+            dir_parts = path.relative_to(self.root).parts[:-1]
+            if skip and any(part in skip for part in dir_parts):
+                continue
+            if skip_hidden and any(part.startswith('.') for part in dir_parts):
+                continue
+            selected.append(path)
+        return selected
+
+    def read(self, path: Path) -> str:
+        """Decoded file content (UTF-8, undecodable bytes replaced), read once per process."""
+        path = Path(path)
+        if not path.is_absolute():
+            path = self.root / path
+        content = self._contents.get(path)
+        if content is None:
+            data = path.read_bytes()
+            self._bytes_read += len(data)
+            content = data.decode('utf-8', errors='replace')
+            self._contents[path] = content
+        return content
+
+    def relpath(self, path: Path) -> str:
+        """Path relative to the project root (as the auditors report it)."""
+        text = str(path)
+        if text.startswith(self._prefix):
+            return text[len(self._prefix):]
+        try:
+            return str(Path(path).relative_to(self.root))
+        except ValueError:
+            return str(path)
+
+    def stats(self) -> dict:
+        return {
+            "root": str(self.root),
+            "files_indexed": len(self.paths),
+            "files_changed": len(self.changed) if self.changed is not None else None,
+            "files_cached": len(self._contents),
+            "bytes_read": self._bytes_read
+        }
+
+
+# One index per project root and process, shared by every checker
+_INDEXES: Dict[Path, ProjectIndex] = {}
+
+
+def get_project_index(project_path: str) -> ProjectIndex:
+    """Return the shared index for a project, enumerating it on first use."""
+    root = Path(project_path).resolve()
+    if root not in _INDEXES:
+        _INDEXES[root] = ProjectIndex(str(root))
+    return _INDEXES[root]
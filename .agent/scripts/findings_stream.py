@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Streaming Findings Output - Antigravity Kit
+===========================================
+
+Common JSONL output for the auditors. Every finding is written (and flushed)
+as one JSON record the moment it is produced, and a final summary record
+closes the stream, so verify_all.py and CI dashboards can follow a run
+incrementally with bounded memory instead of waiting for an end-of-run
+report truncated to its first 10-20 items.
+
+Records (one JSON object per line):
+    {"record": "finding", "checker": "ux_audit", "severity": "warning", "message": "...", "file": "src/app/page.tsx"}
+    {"record": "summary", "checker": "ux_audit", "findings": 42, "by_severity": {"issue": 3, "warning": 39}, "passed": false}
+
+Severities are each checker's own vocabulary (issue/warning, critical/high/...).
+
+Enabled per run with `--jsonl` (stdout) or `--jsonl=<path>`. When the stream
+goes to stdout, it takes the real stdout and sys.stdout is pointed at stderr
+until the emitter is closed, so the checker's usual human-readable report can
+never corrupt the stream. summary() closes the emitter; close_all() (run at
+exit and after every check_runner check) closes the ones an exception left
+open, without a summary record, so the run reads as unfinished.
+
+While a stream is enabled, the end-of-run report only needs a sample: lists
+from report_list() keep the first REPORT_LIMIT findings in memory and count
+the rest (`.total`), the stream carries all of them.
+
+Usage (from a skill script under .agent/skills/<skill>/scripts/):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+    from findings_stream import findings_flag, open_emitter
+
+    emitter = open_emitter("ux_audit", findings_flag(sys.argv))
+    emitter.finding("warning", "Missing alt text", file="src/app/page.tsx")
+    ...
+    emitter.summary(passed=True, files_checked=120)   # before every sys.exit()
+
+    with open_emitter("api_validator", target) as emitter:   # closed even on errors
+        ...
+
+Consumers read a stream record by record (iter_records / read_summary).
+"""
+
+import atexit
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+STDOUT = "-"
+
+# Findings an end-of-run report keeps in memory per list while a stream carries all of them
+REPORT_LIMIT = 20
+
+# Emitters not closed yet (see close_all)
+_OPEN: List["FindingsEmitter"] = []
+
+
+def findings_flag(argv: List[str]) -> Optional[str]:
+    """Parse `--jsonl` (stdout) / `--jsonl=<path>` from a raw argv; None when absent."""
+    target = None
+    for arg in argv:
+        if arg == "--jsonl":
+            target = STDOUT
+        elif arg.startswith("--jsonl="):
+            target = arg.split("=", 1)[1] or STDOUT
+    return target
+
+
+class ReportList(list):
+    """Findings kept for an end-of-run report: the first `limit` items (all if None); `total` counts every one."""
+
+    def __init__(self, limit: Optional[int] = None):
+        super().__init__()
+        self.limit = limit
+        self.total = 0
+
+    def append(self, item) -> None:
+        self.total += 1
+        if self.limit is None or len(self) < self.limit:
+            super().append(item)
+
+    def extend(self, items: Iterable) -> None:
+        for item in items:
+            self.append(item)
+
+    @property
+    def truncated(self) -> int:
+        """Findings counted but not kept."""
+        return self.total - len(self)
+
+
+def finding_count(items: list) -> int:
+    """Number of findings in a report list (counting the ones a ReportList did not keep)."""
+    return items.total if isinstance(items, ReportList) else len(items)
+
+
+class FindingsEmitter:
+    """Writes one checker's findings as JSONL records. A no-op when `target` is None."""
+
+    def __init__(self, checker: str, target: Optional[str] = None):
+        self.checker = checker
+        self.target = target
+        self.count = 0
+        self.by_severity: Dict[str, int] = {}
+        self._closed = False
+        self._stream = None
+        self._redirect = None
+        if target == STDOUT:
+            # The stream owns stdout; prints of the human report go to stderr until close()
+            self._stream = sys.stdout
+            self._redirect = sys.stdout = sys.stderr
+        elif target:
+            path = Path(target)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._stream = open(path, 'w', encoding='utf-8')
+        if self._stream is not None:
+            _OPEN.append(self)
+
+    def __enter__(self) -> "FindingsEmitter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def enabled(self) -> bool:
+        return self._stream is not None
+
+    @property
+    def owns_stdout(self) -> bool:
+        return self.target == STDOUT
+
+    def _write(self, record: dict) -> None:
+        self._stream.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._stream.flush()
+
+    def finding(self, severity: str, message: Optional[str] = None, **fields) -> None:
+        """Emit one finding; extra keyword fields (file, line, type...) are copied into the record."""
+        self.count += 1
+        self.by_severity[severity] = self.by_severity.get(severity, 0) + 1
+        if not self.enabled:
+            return
+        record = {"record": "finding", "checker": self.checker, "severity": severity}
+        if message is not None:
+            record["message"] = message
+        record.update(fields)
+        self._write(record)
+
+    def findings(self, severity: str, messages: Iterable[str], **fields) -> None:
+        """Emit one finding per message (for checkers that report plain strings)."""
+        for message in messages:
+            self.finding(severity, message, **fields)
+
+    def report_list(self) -> ReportList:
+        """List for the end-of-run report: bounded to REPORT_LIMIT items while the stream is enabled."""
+        return ReportList(REPORT_LIMIT if self.enabled else None)
+
+    def summary(self, **fields) -> None:
+        """Emit the closing summary record (finding counts plus `fields`) and close the stream."""
+        if self._closed:
+            return
+        try:
+            if self.enabled:
+                record = {"record": "summary", "checker": self.checker,
+                          "findings": self.count, "by_severity": self.by_severity}
+                record.update(fields)
+                self._write(record)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Close the stream (no summary record) and give stdout back if the stream took it."""
+        if self._closed:
+            return
+        self._closed = True
+        if self in _OPEN:
+            _OPEN.remove(self)
+        if self.owns_stdout:
+            if sys.stdout is self._redirect:
+                sys.stdout = self._stream
+        elif self._stream is not None:
+            self._stream.close()
+
+
+def open_emitter(checker: str, target: Optional[str]) -> FindingsEmitter:
+    """Emitter for `checker` writing to `target` ("-" = stdout, None = disabled)."""
+    return FindingsEmitter(checker, target)
+
+
+def close_all() -> None:
+    """Close every emitter still open (a checker that raised or exited before its summary)."""
+    for emitter in list(_OPEN):
+        emitter.close()
+
+
+atexit.register(close_all)
+
+
+def iter_records(path) -> Iterator[dict]:
+    """Records of a JSONL findings file, one at a time (a truncated last line is skipped)."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+    except OSError:
+        return
+
+
+def read_summary(path) -> Optional[dict]:
+    """The summary record of a findings file, or None if the run did not finish it."""
+    summary = None
+    for record in iter_records(path):
+        if record.get("record") == "summary":
+            summary = record
+    return summary
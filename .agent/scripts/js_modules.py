@@ -0,0 +1,618 @@
+#!/usr/bin/env python3
+"""
+JS/TS Module Scanner - Antigravity Kit
+======================================
+
+Lightweight tokenizer and import graph for TypeScript/JavaScript sources, so
+auditors can reason about code structure instead of grepping raw text.
+
+- tokenize() splits a file into names, strings, numbers, template/regex
+  literals and punctuation, skipping comments. In JSX-capable files
+  (.tsx/.jsx/.js) elements are recognised: each `<Tag` yields a JSX_TAG
+  token and each attribute a JSX_ATTR token, expression containers keep
+  their `{ }` and JSX text is skipped, so braces and parentheses in the
+  token stream are always balanced.
+- module_info() extracts what other files need to know about a module:
+  imports (static, dynamic `import()`, require, re-exports) with their
+  bindings, exports, and its 'use client' / 'use server' directive. The
+  result is JSON-serialisable, so auditors can keep it in their cache.
+- ImportGraph resolves every import the way TypeScript does: relative
+  paths, `paths`/`baseUrl` of the nearest tsconfig.json (e.g. `@/*` ->
+  `src/*`), extension and index-file lookup, `.js` specifiers of `.ts`
+  files. Everything else is a package. It is built once per run and
+  answers cross-file questions (who imports this module, statically or
+  dynamically?).
+
+Usage:
+    from js_modules import ImportGraph, module_info, tokenize
+
+    tokens = tokenize(source, jsx=True)
+    info = module_info(tokens)
+    graph = ImportGraph(index, {path: info, ...})
+    for importer, imp in graph.importers(path):
+        ...
+"""
+
+import json
+import re
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+SOURCE_EXTENSIONS = {'.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs'}
+JSX_EXTENSIONS = {'.tsx', '.jsx', '.js'}
+# Lookup order of extensionless specifiers (TypeScript "bundler" resolution)
+RESOLVE_EXTENSIONS = ('.ts', '.tsx', '.d.ts', '.js', '.jsx', '.mjs', '.cjs', '.json')
+
+NAME, NUM, STRING, TEMPLATE, REGEX, PUNCT, JSX_TAG, JSX_ATTR = (
+    'name', 'num', 'string', 'template', 'regex', 'punct', 'jsx_tag', 'jsx_attr')
+
+
+class Token(NamedTuple):
+    kind: str
+    value: str
+    start: int
+
+
+# ============================================================================
+#  TOKENIZER
+# ============================================================================
+
+_CODE_RE = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))
+  | (?P<name>(?:[^\W\d]|\$)[\w$]*)
+  | (?P<num>\.?\d[\w.]*)
+  | (?P<string>"(?:[^"\\\n]|\\[\s\S])*"|'(?:[^'\\\n]|\\[\s\S])*')
+  | (?P<punct>=>|\.\.\.|\?\?=?|\?\.(?!\d)|[=!]==?|\*\*=?|<<=?|>>>?=?|&&=?|\|\|=?|[-+*/%&|^<>]=|\+\+|--|[{}()\[\];,<>+\-*/%&|^!~?:=.@#])
+  | (?P<other>[\s\S])
+''', re.X)
+_BOM = chr(0xFEFF)
+_REGEX_RE = re.compile(r'/(?![*/])(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+_TEMPLATE_CHUNK_RE = re.compile(r'(?:[^`\\$]|\\[\s\S]|\$(?!\{))*')
+_JSX_START_RE = re.compile(r'[A-Za-z_$>]')
+_JSX_NAME_RE = re.compile(r'[A-Za-z_$][\w$.:\-]*')
+_JSX_SPACE_RE = re.compile(r'(?:\s+|//[^\n]*|/\*[\s\S]*?\*/)*')
+_JSX_TEXT_RE = re.compile(r'[^<{]*')
+_JSX_CLOSE_RE = re.compile(r'</\s*([^>\s]*)\s*>')
+
+# Keywords after which `/` starts a regex and `<` a JSX element
+_EXPRESSION_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete',
+                        'void', 'throw', 'instanceof', 'yield', 'await', 'default', 'extends'}
+
+
+class _Unterminated(Exception):
+    """A `${`/`{` expression or a JSX element ran to the end of the file."""
+
+
+class _Lexer:
+    def __init__(self, source: str, jsx: bool):
+        self.src = source
+        self.jsx = jsx
+        self.tokens: List[Token] = []
+
+    def add(self, kind: str, value: str, start: int) -> None:
+        self.tokens.append(Token(kind, value, start))
+
+    def expression_expected(self) -> bool:
+        if not self.tokens:
+            return True
+        kind, value, _ = self.tokens[-1]
+        if kind == PUNCT:
+            return value not in (')', ']')
+        if kind == NAME:
+            return value in _EXPRESSION_KEYWORDS
+        return False
+
+    def code(self, pos: int, until_brace: bool = False) -> int:
+        """Tokenize code from `pos`; with until_brace, stop after the `}` closing the current expression."""
+        src, n = self.src, len(self.src)
+        depth = 0
+        while pos < n:
+            ch = src[pos]
+            if ch == '`':
+                pos = self.template(pos)
+                continue
+            if ch == '/' and self.expression_expected():
+                match = _REGEX_RE.match(src, pos)
+                if match:
+                    self.add(REGEX, match.group(), pos)
+                    pos = match.end()
+                    continue
+            if ch == '<' and self.jsx and self.expression_expected() and _JSX_START_RE.match(src, pos + 1):
+                end = self.jsx_element(pos)
+                if end is not None:
+                    pos = end
+                    continue
+            match = _CODE_RE.match(src, pos)
+            kind = match.lastgroup
+            if kind == 'punct':
+                value = match.group()
+                if value == '{':
+                    depth += 1
+                elif value == '}':
+                    if depth == 0 and until_brace:
+                        return match.end()
+                    depth -= 1
+                self.add(PUNCT, value, pos)
+            elif kind in (NAME, NUM, STRING):
+                self.add(kind, match.group(), pos)
+            pos = match.end()
+        if until_brace:
+            raise _Unterminated()
+        return pos
+
+    def template(self, pos: int) -> int:
+        src, n = self.src, len(self.src)
+        index = len(self.tokens)
+        self.add(TEMPLATE, '', pos)
+        i = pos + 1
+        while True:
+            i = _TEMPLATE_CHUNK_RE.match(src, i).end()
+            if i >= n:
+                break
+            if src[i] == '`':
+                i += 1
+                break
+            try:
+                i = self.code(i + 2, until_brace=True)  # `${ ... }`
+            except _Unterminated:
+                i = n
+                break
+        self.tokens[index] = Token(TEMPLATE, src[pos:i], pos)
+        return i
+
+    def jsx_element(self, pos: int) -> Optional[int]:
+        """End of the JSX element at `pos`, or None (tokens rolled back) if it is not one."""
+        mark = len(self.tokens)
+        try:
+            return self._element(pos)
+        except _Unterminated:
+            del self.tokens[mark:]
+            return None
+
+    def _expression_container(self, pos: int) -> int:
+        self.add(PUNCT, '{', pos)
+        end = self.code(pos + 1, until_brace=True)
+        self.add(PUNCT, '}', end - 1)
+        return end
+
+    def _element(self, pos: int) -> int:
+        src, n = self.src, len(self.src)
+        pos += 1
+        if src.startswith('>', pos):  # fragment
+            self.add(JSX_TAG, '', pos - 1)
+            return self._children(pos + 1, '')
+        match = _JSX_NAME_RE.match(src, pos)
+        if not match:
+            raise _Unterminated()
+        tag = match.group()
+        self.add(JSX_TAG, tag, pos - 1)
+        pos = match.end()
+        while True:
+            pos = _JSX_SPACE_RE.match(src, pos).end()
+            if pos >= n:
+                raise _Unterminated()
+            if src.startswith('/>', pos):
+                return pos + 2
+            ch = src[pos]
+            if ch == '>':
+                return self._children(pos + 1, tag)
+            if ch == '{':  # {...spread}
+                pos = self._expression_container(pos)
+                continue
+            match = _JSX_NAME_RE.match(src, pos)
+            if not match:
+                raise _Unterminated()
+            self.add(JSX_ATTR, match.group(), pos)
+            pos = _JSX_SPACE_RE.match(src, match.end()).end()
+            if not src.startswith('=', pos):
+                continue
+            pos = _JSX_SPACE_RE.match(src, pos + 1).end()
+            ch = src[pos:pos + 1]
+            if ch in ('"', "'"):
+                end = src.find(ch, pos + 1)
+                if end == -1:
+                    raise _Unterminated()
+                self.add(STRING, src[pos:end + 1], pos)
+                pos = end + 1
+            elif ch == '{':
+                pos = self._expression_container(pos)
+            elif ch == '<':
+                pos = self._element(pos)
+            else:
+                raise _Unterminated()
+
+    def _children(self, pos: int, tag: str) -> int:
+        src, n = self.src, len(self.src)
+        while True:
+            pos = _JSX_TEXT_RE.match(src, pos).end()
+            if pos >= n:
+                raise _Unterminated()
+            if src[pos] == '{':
+                pos = self._expression_container(pos)
+            elif src.startswith('</', pos):
+                match = _JSX_CLOSE_RE.match(src, pos)
+                if not match or match.group(1) != tag:
+                    raise _Unterminated()
+                return match.end()
+            else:
+                pos = self._element(pos)
+
+
+def tokenize(source: str, jsx: bool = True) -> List[Token]:
+    """Tokens of a JS/TS source; `jsx` enables JSX elements (see module docstring)."""
+    if source.startswith(_BOM):
+        source = ' ' + source[1:]  # keep offsets
+    lexer = _Lexer(source, jsx)
+    lexer.code(0)
+    return lexer.tokens
+
+
+def is_jsx_file(path: Path) -> bool:
+    return path.suffix.lower() in JSX_EXTENSIONS
+
+
+def line_starts(source: str) -> List[int]:
+    """Offsets at which each line starts (for line_of)."""
+    return [0] + [m.end() for m in re.finditer('\n', source)]
+
+
+def line_of(starts: List[int], offset: int) -> int:
+    """1-based line of a character offset."""
+    return bisect_right(starts, offset)
+
+
+def token_lines(tokens: List[Token], source: str) -> List[int]:
+    """1-based line of every token (tokens are in source order)."""
+    lines = []
+    line, pos = 1, 0
+    for token in tokens:
+        line += source.count('\n', pos, token.start)
+        pos = token.start
+        lines.append(line)
+    return lines
+
+
+def matching_brackets(tokens: List[Token]) -> Dict[int, int]:
+    """Token index of each `(`, `[` and `{` -> index of its closing bracket."""
+    pairs = {'(': ')', '[': ']', '{': '}'}
+    closing = {')', ']', '}'}
+    stack: List[int] = []
+    matches: Dict[int, int] = {}
+    for i, token in enumerate(tokens):
+        if token.kind != PUNCT:
+            continue
+        if token.value in pairs:
+            stack.append(i)
+        elif token.value in closing and stack:
+            # Recover from a stray closer by unwinding to its own opener
+            for depth in range(len(stack) - 1, -1, -1):
+                if pairs[tokens[stack[depth]].value] == token.value:
+                    matches[stack[depth]] = i
+                    del stack[depth:]
+                    break
+    return matches
+
+
+def string_value(token: Token) -> str:
+    """Contents of a STRING token (or of a template literal without substitutions)."""
+    return token.value[1:-1]
+
+
+# ============================================================================
+#  MODULE INFO
+# ============================================================================
+
+def _is_member(tokens: List[Token], i: int) -> bool:
+    return i > 0 and tokens[i - 1].kind == PUNCT and tokens[i - 1].value in ('.', '?.')
+
+
+def _specifier(tokens: List[Token], i: int) -> Optional[str]:
+    if i < len(tokens) and (tokens[i].kind == STRING or
+                            (tokens[i].kind == TEMPLATE and '${' not in tokens[i].value)):
+        return string_value(tokens[i])
+    return None
+
+
+def _import_clause(tokens: List[Token], i: int, end: int) -> Dict[str, str]:
+    """Bindings (local name -> imported name) of `import a, { b as c }, * as d` between i and end."""
+    bindings = {}
+    while i < end:
+        token = tokens[i]
+        if token.kind == PUNCT and token.value == '{':
+            i += 1
+            while i < end and not (tokens[i].kind == PUNCT and tokens[i].value == '}'):
+                if tokens[i].kind == NAME and tokens[i].value == 'type' and i + 1 < end and tokens[i + 1].kind == NAME:
+                    i += 1  # inline `type X`
+                if tokens[i].kind in (NAME, STRING):
+                    imported = tokens[i].value.strip('\'"')
+                    local = imported
+                    if i + 2 < end and tokens[i + 1].value == 'as':
+                        local = tokens[i + 2].value
+                        i += 2
+                    bindings[local] = imported
+                i += 1
+        elif token.kind == PUNCT and token.value == '*':
+            if i + 2 < end and tokens[i + 1].value == 'as':
+                bindings[tokens[i + 2].value] = '*'
+                i += 2
+        elif token.kind == NAME and token.value != 'type':
+            bindings[token.value] = 'default'
+        i += 1
+    return bindings
+
+
+def module_info(tokens: List[Token], source: Optional[str] = None) -> dict:
+    """
+    Imports, exports and directive of a module.
+
+    {"directive": "use client" | "use server" | None,
+     "imports": [{"source", "kind": static|dynamic|require|reexport, "bindings": {local: imported},
+                  "type_only": bool, "line"}],
+     "exports": {"default": local name | None, "names": [...], "local": n, "reexports": n}}
+    """
+    starts = line_starts(source) if source is not None else None
+    line = (lambda i: line_of(starts, tokens[i].start)) if starts else (lambda i: None)
+
+    directive = None
+    if tokens and tokens[0].kind == STRING and string_value(tokens[0]) in ('use client', 'use server'):
+        directive = string_value(tokens[0])
+
+    imports = []
+    exports = {"default": None, "names": [], "local": 0, "reexports": 0}
+    n = len(tokens)
+    i = 0
+    while i < n:
+        token = tokens[i]
+        if token.kind != NAME or _is_member(tokens, i):
+            i += 1
+            continue
+        nxt = tokens[i + 1] if i + 1 < n else None
+
+        if token.value == 'import' and nxt is not None:
+            if nxt.kind == PUNCT and nxt.value == '(':  # import('x')
+                source_ = _specifier(tokens, i + 2)
+                if source_ is not None:
+                    imports.append({"source": source_, "kind": "dynamic", "bindings": {},
+                                    "type_only": False, "line": line(i)})
+                i += 2
+                continue
+            if nxt.kind == PUNCT and nxt.value == '.':  # import.meta
+                i += 2
+                continue
+            source_ = _specifier(tokens, i + 1)
+            if source_ is not None:  # import 'side-effect'
+                imports.append({"source": source_, "kind": "static", "bindings": {},
+                                "type_only": False, "line": line(i)})
+                i += 2
+                continue
+            j = i + 1
+            while j < n and not (tokens[j].kind == NAME and tokens[j].value == 'from' and _specifier(tokens, j + 1) is not None):
+                if tokens[j].kind == PUNCT and tokens[j].value in (';', '='):
+                    break  # `import x = require(...)` / not an import declaration
+                j += 1
+            if j < n and tokens[j].value == 'from':
+                type_only = nxt.kind == NAME and nxt.value == 'type' and not (
+                    tokens[i + 2].kind == NAME and tokens[i + 2].value == 'from')
+                imports.append({"source": _specifier(tokens, j + 1), "kind": "static",
+                                "bindings": _import_clause(tokens, i + 1, j),
+                                "type_only": type_only, "line": line(i)})
+                i = j + 2
+                continue
+
+        elif token.value == 'require' and nxt is not None and nxt.kind == PUNCT and nxt.value == '(':
+            source_ = _specifier(tokens, i + 2)
+            if source_ is not None:
+                imports.append({"source": source_, "kind": "require", "bindings": {},
+                                "type_only": False, "line": line(i)})
+
+        elif token.value == 'export' and nxt is not None:
+            j = i + 1
+            type_only = nxt.kind == NAME and nxt.value == 'type' and i + 2 < n and tokens[i + 2].value in ('{', '*')
+            if type_only:
+                j += 1
+            head = tokens[j]
+            if head.kind == PUNCT and head.value in ('{', '*'):
+                k = j
+                while k < n and not (tokens[k].kind == PUNCT and tokens[k].value == ';') and not (
+                        tokens[k].kind == NAME and tokens[k].value == 'from'):
+                    if tokens[k].kind == PUNCT and tokens[k].value == '}':
+                        k += 1
+                        break
+                    k += 1
+                if k < n and tokens[k].kind == NAME and tokens[k].value == 'from' and _specifier(tokens, k + 1) is not None:
+                    bindings = _import_clause(tokens, j, k) if head.value == '{' else {'*': '*'}
+                    imports.append({"source": _specifier(tokens, k + 1), "kind": "reexport",
+                                    "bindings": bindings, "type_only": type_only, "line": line(i)})
+                    exports["reexports"] += 1
+                    exports["names"].extend(bindings)
+                    i = k + 2
+                    continue
+                if head.value == '{':  # export { a, b as c }
+                    exports["names"].extend(_import_clause(tokens, j, k))
+                i = k
+                continue
+            if head.kind == NAME and head.value == 'default':
+                k = j + 1
+                if k < n and tokens[k].kind == NAME and tokens[k].value == 'async':
+                    k += 1
+                target = tokens[k] if k < n else None
+                after = tokens[k + 1] if k + 1 < n else None
+                if target is not None and target.kind == NAME and target.value in ('function', 'class'):
+                    # export default function Name() / class Name
+                    exports["default"] = after.value if after is not None and after.kind == NAME else 'default'
+                elif target is not None and target.kind == NAME and (
+                        after is None or after.kind == NAME or (after.kind == PUNCT and after.value in (';', '}'))):
+                    exports["default"] = target.value  # export default Name
+                else:
+                    exports["default"] = 'default'
+                exports["local"] += 1
+                i = j + 1
+                continue
+            # export const/function/class/... Name
+            k = j
+            while k < n and tokens[k].kind == NAME and tokens[k].value in (
+                    'async', 'const', 'let', 'var', 'function', 'class', 'abstract', 'declare',
+                    'type', 'interface', 'enum', 'namespace'):
+                k += 1
+            if k < n and tokens[k].kind == PUNCT and tokens[k].value == '*':
+                k += 1  # export function* gen
+            if k < n and tokens[k].kind == NAME:
+                exports["names"].append(tokens[k].value)
+                exports["local"] += 1
+        i += 1
+
+    return {"directive": directive, "imports": imports, "exports": exports}
+
+
+# ============================================================================
+#  IMPORT GRAPH
+# ============================================================================
+
+def load_jsonc(text: str) -> dict:
+    """Parse tsconfig-style JSON (comments and trailing commas allowed)."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    text = re.sub(r'("(?:[^"\\]|\\.)*")|//[^\n]*|/\*[\s\S]*?\*/', lambda m: m.group(1) or '', text)
+    text = re.sub(r',(\s*[}\]])', r'\1', text)
+    return json.loads(text)
+
+
+def package_name(specifier: str) -> str:
+    """npm package of a bare specifier (`@scope/pkg/sub` -> `@scope/pkg`)."""
+    parts = specifier.split('/')
+    return '/'.join(parts[:2]) if specifier.startswith('@') and len(parts) > 1 else parts[0]
+
+
+Target = Union[Path, str]  # a project file, or "package:<name>"
+
+
+class ImportGraph:
+    """Resolved imports of a set of modules, queryable in both directions."""
+
+    def __init__(self, index, modules: Dict[Path, dict]):
+        self.index = index
+        self.root = index.root
+        self.modules = modules
+        self._files = set(index.paths)
+        self._tsconfigs: Dict[Path, Optional[Tuple[Path, Path, dict]]] = {}
+        self.edges: Dict[Path, List[Tuple[Target, dict]]] = {}
+        self._importers: Dict[Path, List[Tuple[Path, dict]]] = {}
+        for path, info in modules.items():
+            resolved = []
+            for imp in info["imports"]:
+                target = self.resolve(path, imp["source"])
+                if target is None:
+                    continue
+                resolved.append((target, imp))
+                if isinstance(target, Path):
+                    self._importers.setdefault(target, []).append((path, imp))
+            self.edges[path] = resolved
+
+    # -------------------------------------------------------------- resolution
+
+    def _tsconfig(self, directory: Path) -> Optional[Tuple[Path, Path, dict]]:
+        """(tsconfig dir, base dir for `paths`, paths) of the nearest tsconfig.json/jsconfig.json."""
+        if directory in self._tsconfigs:
+            return self._tsconfigs[directory]
+        found = None
+        for name in ('tsconfig.json', 'jsconfig.json'):
+            candidate = directory / name
+            if candidate in self._files:
+                try:
+                    options = load_jsonc(candidate.read_text(encoding='utf-8')).get('compilerOptions') or {}
+                except (OSError, ValueError, AttributeError):
+                    options = {}
+                base = directory / options['baseUrl'] if options.get('baseUrl') else directory
+                found = (directory, base, options.get('paths') or {})
+                break
+        if found is None and directory != self.root and self.root in directory.parents:
+            found = self._tsconfig(directory.parent)
+        self._tsconfigs[directory] = found
+        return found
+
+    def _file(self, base: Path) -> Optional[Path]:
+        """Project file a specifier path designates (extension and index lookup)."""
+        candidates = [base]
+        name = base.name
+        if name.endswith(('.js', '.jsx', '.mjs', '.cjs')):
+            stem = base.with_suffix('')
+            candidates += [stem.with_name(stem.name + ext) for ext in ('.ts', '.tsx', '.mts', '.cts')]
+        candidates += [base.with_name(name + ext) for ext in RESOLVE_EXTENSIONS]
+        candidates += [base / f"index{ext}" for ext in RESOLVE_EXTENSIONS]
+        for candidate in candidates:
+            candidate = Path(_normalize(candidate))
+            if candidate in self._files:
+                return candidate
+        return None
+
+    def resolve(self, importer: Path, specifier: str) -> Optional[Target]:
+        """Project file or "package:<name>" an import resolves to (None: unresolvable local path)."""
+        spec = specifier.split('?', 1)[0]
+        if spec.startswith(('./', '../')) or spec in ('.', '..'):
+            return self._file(importer.parent / spec)
+        if spec.startswith('/'):
+            return None
+        config = self._tsconfig(importer.parent)
+        if config is not None:
+            _directory, base, paths = config
+            for pattern, targets in paths.items():
+                if '*' in pattern:
+                    prefix, _, suffix = pattern.partition('*')
+                    if not (spec.startswith(prefix) and spec.endswith(suffix) and len(spec) >= len(prefix) + len(suffix)):
+                        continue
+                    wildcard = spec[len(prefix):len(spec) - len(suffix)]
+                elif spec != pattern:
+                    continue
+                else:
+                    wildcard = ''
+                for target in targets:
+                    found = self._file(base / target.replace('*', wildcard))
+                    if found is not None:
+                        return found
+            if base != _directory:
+                found = self._file(base / spec)  # baseUrl-relative import
+                if found is not None:
+                    return found
+        if spec.startswith(('node:',)) or ':' in spec.split('/')[0]:
+            return f"package:{spec}"
+        return f"package:{package_name(spec)}"
+
+    # ----------------------------------------------------------------- queries
+
+    def imports(self, path: Path) -> List[Tuple[Target, dict]]:
+        """Resolved imports of a module: (target, import record)."""
+        return self.edges.get(path, [])
+
+    def importers(self, path: Path) -> List[Tuple[Path, dict]]:
+        """Modules importing `path`: (importer, import record)."""
+        return self._importers.get(path, [])
+
+    def dependencies(self, path: Path, include_dynamic: bool = False) -> Iterator[Path]:
+        """Project files reachable from `path` through static imports (and dynamic ones if asked)."""
+        seen = {path}
+        stack = [path]
+        while stack:
+            for target, imp in self.edges.get(stack.pop(), ()):
+                if not isinstance(target, Path) or target in seen or imp["type_only"]:
+                    continue
+                if imp["kind"] == "dynamic" and not include_dynamic:
+                    continue
+                seen.add(target)
+                stack.append(target)
+                yield target
+
+
+def _normalize(path: Path) -> str:
+    """Lexically normalised path (no filesystem access): collapses `.` and `..`."""
+    parts: List[str] = []
+    for part in path.parts:
+        if part == '..':
+            if len(parts) > 1:
+                parts.pop()
+        elif part != '.':
+            parts.append(part)
+    return str(Path(*parts)) if parts else str(path)
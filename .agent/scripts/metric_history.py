@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Columnar Metric History - Antigravity Kit
+=========================================
+
+Append-only table of measurements (one row per audited page and run),
+stored column-wise in a single JSON file so trend queries read one column
+instead of every record, and repeated strings (routes, locales, commits)
+are written once.
+
+- Numeric / null columns are stored as plain arrays.
+- String columns are dictionary encoded: {"values": [...], "codes": [...]}.
+- Rows appended later may add columns; earlier rows read them as None.
+
+Usage (from a skill script under .agent/skills/<skill>/scripts/):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+    from metric_history import MetricHistory
+
+    history = MetricHistory(project_path / ".agent" / "lighthouse_history.json")
+    history.append([{"timestamp": "...", "route": "/courses", "locale": "es", "lcp": 2310.4}])
+    history.save()
+    for key, points in history.series("lcp", ("route", "locale")).items():
+        ...
+
+git_commit() tags rows (and other history records) with the audited commit.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+HISTORY_FORMAT = 1
+
+
+def git_commit(project_path: Path) -> Optional[str]:
+    """Short hash of the project's HEAD, or None outside a git work tree."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_path,
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None if result.returncode == 0 else None
+
+
+def _encode(column: list):
+    if any(isinstance(v, str) for v in column) and all(v is None or isinstance(v, str) for v in column):
+        values: List[str] = []
+        positions: Dict[str, int] = {}
+        codes = []
+        for v in column:
+            if v is None:
+                codes.append(None)
+                continue
+            if v not in positions:
+                positions[v] = len(values)
+                values.append(v)
+            codes.append(positions[v])
+        return {"values": values, "codes": codes}
+    return column
+
+
+def _decode(stored) -> list:
+    if isinstance(stored, dict):
+        values = stored.get("values", [])
+        return [None if c is None else values[c] for c in stored.get("codes", [])]
+    return list(stored)
+
+
+class MetricHistory:
+    """Column-oriented, append-only history of measurement rows."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.columns: Dict[str, list] = {}
+        self.rows_count = 0
+        self._dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            if data.get("format") == HISTORY_FORMAT:
+                self.rows_count = int(data.get("rows", 0))
+                for name, stored in data.get("columns", {}).items():
+                    column = _decode(stored)
+                    self.columns[name] = (column + [None] * self.rows_count)[:self.rows_count]
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass  # missing or unreadable history: start a new one
+
+    def __len__(self) -> int:
+        return self.rows_count
+
+    def append(self, rows: Sequence[dict]) -> None:
+        for row in rows:
+            for name in row:
+                if name not in self.columns:
+                    self.columns[name] = [None] * self.rows_count
+            for name, column in self.columns.items():
+                column.append(row.get(name))
+            self.rows_count += 1
+            self._dirty = True
+
+    def column(self, name: str) -> list:
+        return self.columns.get(name, [None] * self.rows_count)
+
+    def rows(self, **where) -> Iterator[dict]:
+        """Rows (oldest first) whose columns equal every `where` value."""
+        filters = [(self.column(name), value) for name, value in where.items()]
+        names = list(self.columns)
+        for i in range(self.rows_count):
+            if all(column[i] == value for column, value in filters):
+                yield {name: self.columns[name][i] for name in names}
+
+    def series(self, metric: str, group_by: Sequence[str] = (), time_column: str = "timestamp",
+               last: Optional[int] = None) -> Dict[Tuple, List[Tuple[object, object]]]:
+        """Metric values over time per group: {group key tuple: [(time, value), ...]} (None values skipped)."""
+        values = self.column(metric)
+        times = self.column(time_column)
+        keys = [self.column(name) for name in group_by]
+        series: Dict[Tuple, List[Tuple[object, object]]] = {}
+        for i, value in enumerate(values):
+            if value is None:
+                continue
+            series.setdefault(tuple(k[i] for k in keys), []).append((times[i], value))
+        if last:
+            series = {key: points[-last:] for key, points in series.items()}
+        return series
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        data = {
+            "format": HISTORY_FORMAT,
+            "rows": self.rows_count,
+            "columns": {name: _encode(column) for name, column in self.columns.items()},
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.stem}.", suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"[!] Could not write metric history {self.path}: {e}", file=sys.stderr)
+        self._dirty = False
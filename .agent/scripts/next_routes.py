@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Next.js App Router Model - Antigravity Kit
+==========================================
+
+Routes of a Next.js App Router project and the modules each one is built
+from, on top of the import graph of js_modules.py. Shared by the tools that
+reason per route (bundle_analyzer.py, locale_splitter.py).
+
+- discover_routes(): every `page` and `route` file under app/, with its
+  entry modules (the page plus the layout/template/loading/error/not-found
+  files of every enclosing segment).
+- route_closure(): static import closure of those entries. A module is
+  client-side once a 'use client' module is on its import path; dynamic
+  imports (next/dynamic, import()) end the walk and are returned as lazy
+  chunks.
+
+Usage (from a skill script under .agent/skills/<skill>/scripts/):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+    from next_routes import discover_routes, find_app_dir, route_closure
+
+    for route in discover_routes(find_app_dir(index.root), set(modules)):
+        closure = route_closure(graph, route["entries"])
+"""
+
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+# App Router files that wrap every page below them
+SEGMENT_FILES = ('layout', 'template', 'loading', 'error', 'not-found')
+ENTRY_EXTENSIONS = ('.tsx', '.ts', '.jsx', '.js')
+
+
+def find_app_dir(root: Path) -> Optional[Path]:
+    """The App Router directory: src/app or app."""
+    for candidate in (root / "src" / "app", root / "app"):
+        if candidate.is_dir():
+            return candidate
+    return None
+
+
+def route_path(app_dir: Path, directory: Path) -> str:
+    """URL pattern of a route directory: route groups `(name)` and slots `@name` dropped."""
+    parts = [p for p in directory.relative_to(app_dir).parts
+             if not (p.startswith('(') and p.endswith(')')) and not p.startswith('@')]
+    return '/' + '/'.join(parts)
+
+
+def _segment_file(directory: Path, stem: str, files: Set[Path]) -> Optional[Path]:
+    for ext in ENTRY_EXTENSIONS:
+        candidate = directory / f"{stem}{ext}"
+        if candidate in files:
+            return candidate
+    return None
+
+
+def discover_routes(app_dir: Path, files: Set[Path]) -> List[dict]:
+    """Pages and route handlers of the App Router, each with the entry modules it is built from."""
+    routes = []
+    for path in sorted(files):
+        if path.parent != app_dir and app_dir not in path.parents:
+            continue
+        if path.suffix not in ENTRY_EXTENSIONS or path.stem not in ('page', 'route'):
+            continue
+        entries = [path]
+        if path.stem == 'page':
+            directory = path.parent
+            chain = [directory] + [d for d in directory.parents if d == app_dir or app_dir in d.parents]
+            for segment in reversed(chain):
+                entries += [f for f in (_segment_file(segment, stem, files) for stem in SEGMENT_FILES) if f]
+        routes.append({
+            "route": route_path(app_dir, path.parent),
+            "kind": "page" if path.stem == 'page' else "api",
+            "file": path,
+            "entries": entries,
+        })
+    return routes
+
+
+def route_closure(graph, entries: List[Path]) -> dict:
+    """
+    Static closure of a route's entry modules over `graph` (a js_modules.ImportGraph).
+
+    Returns {"modules", "client", "lazy", "packages"}: all statically reached
+    modules, the client-side ones, the modules only reachable through dynamic
+    imports, and package name -> (imported from client code, import chain of
+    paths ending with the package name).
+    """
+    modules_info = graph.modules
+
+    def is_client_module(path: Path) -> bool:
+        return modules_info.get(path, {}).get("directive") == "use client"
+
+    server: Set[Path] = set()
+    client: Set[Path] = set()
+    lazy: Set[Path] = set()
+    packages: Dict[str, Tuple[bool, list]] = {}
+    parents: Dict[Tuple[Path, bool], Optional[Tuple[Path, bool]]] = {}
+    queue = deque()
+    for entry in entries:
+        state = (entry, is_client_module(entry))
+        if state not in parents:
+            parents[state] = None
+            queue.append(state)
+
+    def chain(state) -> list:
+        paths = []
+        while state is not None:
+            paths.append(state[0])
+            state = parents[state]
+        return paths[::-1]
+
+    while queue:
+        state = queue.popleft()
+        path, is_client = state
+        (client if is_client else server).add(path)
+        for target, imp in graph.imports(path):
+            if imp["type_only"]:
+                continue
+            if not isinstance(target, Path):
+                name = target[len("package:"):]
+                if name not in packages or (is_client and not packages[name][0]):
+                    packages[name] = (is_client, chain(state) + [name])
+                continue
+            if imp["kind"] == "dynamic":
+                lazy.add(target)
+                continue
+            next_state = (target, is_client or is_client_module(target))
+            if next_state not in parents:
+                parents[next_state] = state
+                queue.append(next_state)
+
+    modules = server | client
+    lazy_closure = set(lazy - client)
+    for path in lazy - client:
+        lazy_closure.update(graph.dependencies(path))
+    lazy_closure -= modules
+    return {
+        "modules": modules,
+        "client": client,
+        "lazy": lazy_closure,
+        "packages": packages,
+    }
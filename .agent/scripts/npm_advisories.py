@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Offline npm Audit - Antigravity Kit
+===================================
+
+Dependency audit without `npm audit`: package-lock.json is parsed into the
+installed dependency graph and matched against a local advisory database,
+so the check needs no network and runs in milliseconds (air-gapped CI).
+
+- The graph follows Node's resolution rules over the lockfile's install
+  locations (lockfileVersion 2/3 `packages`; v1 `dependencies` is converted),
+  including workspace links. Every vulnerable install is reported with its
+  shortest path from the project root and its depth (1 = direct dependency).
+- The database is `<project>/.agent/cache/npm-advisories.json` by default
+  (any path can be given, e.g. a file copied into an air-gapped runner). It
+  is refreshed separately with refresh_advisories(), which queries the npm
+  registry's bulk advisory endpoint (the one `npm audit` uses) for every
+  package of the lockfile. The database records which versions it was built
+  for, so a lockfile that has moved on is reported instead of silently passing.
+
+Usage:
+    from npm_advisories import audit_lockfile, load_advisories, refresh_advisories
+
+    refresh_advisories("package-lock.json", ".agent/cache/npm-advisories.json")  # online, once
+    db = load_advisories(".agent/cache/npm-advisories.json")
+    report = audit_lockfile("package-lock.json", db)
+"""
+
+import json
+import os
+import re
+import tempfile
+import urllib.request
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from audit_cache import CACHE_DIR
+
+ADVISORY_DB = CACHE_DIR / "npm-advisories.json"
+BULK_ADVISORY_URL = "https://registry.npmjs.org/-/npm/v1/security/advisories/bulk"
+# Packages per bulk request
+REFRESH_BATCH = 500
+SEVERITY_ORDER = ["info", "low", "moderate", "high", "critical"]
+
+
+# ============================================================================
+#  SEMVER RANGES
+# ============================================================================
+
+_VERSION_RE = re.compile(r'^[v=\s]*(\d+)\.(\d+)\.(\d+)(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?\s*$')
+_PARTIAL_RE = re.compile(r'^[v=\s]*([0-9xX*]+)(?:\.([0-9xX*]+))?(?:\.([0-9xX*]+))?(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$')
+_COMPARATOR_RE = re.compile(r'^(<=|>=|<|>|=|\^|~>?)?(.*)$')
+_OPERATOR_SPACE_RE = re.compile(r'(<=|>=|<|>|=|\^|~>?)\s+')
+
+
+def _prerelease_key(pre: Optional[str]) -> tuple:
+    # A release sorts after all of its prereleases; numeric identifiers before alphanumeric ones
+    if not pre:
+        return (1,)
+    return (0,) + tuple((0, int(p), '') if p.isdigit() else (1, 0, p) for p in pre.split('.'))
+
+
+def parse_version(text: str) -> Optional[tuple]:
+    """Sortable key of a semver version, or None if `text` is not one."""
+    match = _VERSION_RE.match(text or '')
+    if not match:
+        return None
+    major, minor, patch, pre = match.groups()
+    return (int(major), int(minor), int(patch), _prerelease_key(pre))
+
+
+def _partial(text: str) -> Optional[tuple]:
+    """(major, minor, patch, prerelease) of a possibly partial version; x/*/missing parts are None."""
+    match = _PARTIAL_RE.match(text)
+    if not match:
+        return None
+    parts = [None if p is None or p in 'xX*' else int(p) for p in match.groups()[:3]]
+    for i in range(1, 3):
+        if parts[i - 1] is None:
+            parts[i] = None
+    return (*parts, match.group(4))
+
+
+def _key(major: int, minor: int = 0, patch: int = 0, pre: Optional[str] = None) -> tuple:
+    return (major, minor, patch, _prerelease_key(pre))
+
+
+def _comparators(token: str) -> Optional[List[Tuple[str, tuple]]]:
+    """One range token as (operator, version key) comparators; [] matches anything, None is unparsable."""
+    op, rest = _COMPARATOR_RE.match(token).groups()
+    op = op or '='
+    if rest in ('', '*', 'x', 'X'):
+        return [] if op in ('=', '>=', '^', '~', '~>') else None
+    partial = _partial(rest)
+    if partial is None:
+        return None
+    major, minor, patch, pre = partial
+    if major is None:
+        return []
+    lower = _key(major, minor or 0, patch or 0, pre)
+
+    if op == '^':
+        if major > 0 or minor is None:
+            upper = _key(major + 1)
+        elif minor > 0 or patch is None:
+            upper = _key(0, minor + 1)
+        else:
+            upper = _key(0, 0, patch + 1)
+        return [('>=', lower), ('<', upper)]
+    if op in ('~', '~>'):
+        upper = _key(major + 1) if minor is None else _key(major, minor + 1)
+        return [('>=', lower), ('<', upper)]
+
+    # Upper bound of an x-range (1.x -> <2.0.0, 1.2.x -> <1.3.0)
+    if minor is None:
+        bump = _key(major + 1)
+    elif patch is None:
+        bump = _key(major, minor + 1)
+    else:
+        bump = None
+
+    if op == '=':
+        return [('>=', lower), ('<', bump)] if bump else [('=', lower)]
+    if op == '<=' and bump:
+        return [('<', bump)]
+    if op == '>' and bump:
+        return [('>=', bump)]
+    return [(op, lower)]
+
+
+def _compare(version: tuple, op: str, bound: tuple) -> bool:
+    if op == '<':
+        return version < bound
+    if op == '<=':
+        return version <= bound
+    if op == '>':
+        return version > bound
+    if op == '>=':
+        return version >= bound
+    return version == bound
+
+
+def satisfies(version: str, range_: str) -> bool:
+    """
+    Whether `version` is in an npm range (`<1.2.3`, `>=2.0.0 <2.1.4 || 3.x`,
+    `^1.2.0`, `1.0.0 - 1.4.2`...). Prereleases are ordered like releases
+    (more inclusive than node-semver, which is the safe side for advisories).
+    """
+    key = parse_version(version)
+    if key is None:
+        return False
+    for alternative in (range_ or '*').split('||'):
+        alternative = _OPERATOR_SPACE_RE.sub(r'\1', alternative.strip())
+        hyphen = re.match(r'^(\S+)\s+-\s+(\S+)$', alternative)
+        if hyphen:
+            low, high = hyphen.groups()
+            tokens = [f'>={low}', f'<={high}']
+        else:
+            tokens = alternative.split() or ['*']
+        comparators = []
+        for token in tokens:
+            parsed = _comparators(token)
+            if parsed is None:
+                break
+            comparators.extend(parsed)
+        else:
+            if all(_compare(key, op, bound) for op, bound in comparators):
+                return True
+    return False
+
+
+# ============================================================================
+#  LOCKFILE GRAPH
+# ============================================================================
+
+def _package_name(location: str) -> str:
+    return location.rsplit('node_modules/', 1)[-1]
+
+
+def _parent_location(location: str) -> Optional[str]:
+    """Install location one node_modules level up (None above the root)."""
+    if not location:
+        return None
+    cut = location.rfind('/node_modules/')
+    return location[:cut] if cut != -1 else ''
+
+
+class DependencyGraph:
+    """Installed packages of a lockfile (by install location) and who requires whom."""
+
+    def __init__(self, packages: Dict[str, dict]):
+        self.packages = packages
+        self.edges: Dict[str, List[str]] = {}
+        for location, meta in packages.items():
+            if meta.get('link'):
+                continue
+            wanted = dict(meta.get('peerDependencies') or {})
+            wanted.update(meta.get('optionalDependencies') or {})
+            wanted.update(meta.get('dependencies') or {})
+            if location == '' or not location.count('node_modules/'):
+                wanted.update(meta.get('devDependencies') or {})  # root and workspaces only
+            targets = []
+            for name in wanted:
+                target = self.resolve(location, name)
+                if target is not None:
+                    targets.append(target)
+            self.edges[location] = targets
+
+    @classmethod
+    def from_lockfile(cls, lockfile) -> "DependencyGraph":
+        data = json.loads(Path(lockfile).read_text(encoding='utf-8'))
+        packages = data.get('packages')
+        if packages is None:  # lockfileVersion 1
+            packages = {'': {'name': data.get('name'), 'version': data.get('version'),
+                             'dependencies': {name: dep.get('version', '*')
+                                              for name, dep in (data.get('dependencies') or {}).items()}}}
+            cls._flatten_v1(data.get('dependencies') or {}, '', packages)
+        return cls(packages)
+
+    @staticmethod
+    def _flatten_v1(dependencies: dict, base: str, packages: Dict[str, dict]) -> None:
+        for name, dep in dependencies.items():
+            location = f"{base}/node_modules/{name}" if base else f"node_modules/{name}"
+            packages[location] = {'version': dep.get('version'), 'dev': dep.get('dev', False),
+                                  'optional': dep.get('optional', False),
+                                  'dependencies': dep.get('requires') or {}}
+            DependencyGraph._flatten_v1(dep.get('dependencies') or {}, location, packages)
+
+    def resolve(self, location: str, name: str) -> Optional[str]:
+        """Location `name` resolves to when required from `location` (Node's node_modules walk)."""
+        base = location
+        while base is not None:
+            candidate = f"{base}/node_modules/{name}" if base else f"node_modules/{name}"
+            meta = self.packages.get(candidate)
+            if meta is not None:
+                if meta.get('link'):
+                    return meta.get('resolved') if meta.get('resolved') in self.packages else None
+                return candidate
+            base = _parent_location(base)
+        return None
+
+    def name(self, location: str) -> str:
+        meta = self.packages.get(location, {})
+        return meta.get('name') or (_package_name(location) if location else 'root')
+
+    def installed(self) -> Iterator[Tuple[str, str, str]]:
+        """(location, package name, version) of every installed package."""
+        for location, meta in self.packages.items():
+            if location and not meta.get('link') and meta.get('version') and 'node_modules/' in location:
+                yield location, self.name(location), meta['version']
+
+    def shortest_paths(self) -> Dict[str, List[str]]:
+        """Shortest chain of locations from the root to every reachable location (BFS)."""
+        parents: Dict[str, Optional[str]] = {'': None}
+        queue = deque([''])
+        while queue:
+            location = queue.popleft()
+            for target in self.edges.get(location, ()):
+                if target not in parents:
+                    parents[target] = location
+                    queue.append(target)
+        paths = {}
+        for location in parents:
+            chain = []
+            node = location
+            while node is not None:
+                chain.append(node)
+                node = parents[node]
+            paths[location] = chain[::-1]
+        return paths
+
+
+# ============================================================================
+#  ADVISORY DATABASE
+# ============================================================================
+
+def load_advisories(path) -> Optional[dict]:
+    """Advisory database written by refresh_advisories(), or None if missing/unreadable."""
+    try:
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data.get('advisories'), dict) else None
+
+
+def refresh_advisories(lockfile, db_path, url: str = BULK_ADVISORY_URL, timeout: int = 60) -> dict:
+    """
+    Rebuild the advisory database for every package version of `lockfile`
+    (needs network; raises OSError/ValueError on failure, keeping the old file).
+    """
+    graph = DependencyGraph.from_lockfile(lockfile)
+    queried: Dict[str, set] = {}
+    for _location, name, version in graph.installed():
+        queried.setdefault(name, set()).add(version)
+
+    advisories: Dict[str, list] = {}
+    names = sorted(queried)
+    for start in range(0, len(names), REFRESH_BATCH):
+        batch = {name: sorted(queried[name]) for name in names[start:start + REFRESH_BATCH]}
+        request = urllib.request.Request(url, data=json.dumps(batch).encode('utf-8'), method='POST',
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            found = json.loads(response.read().decode('utf-8'))
+        for name, entries in found.items():
+            advisories[name] = [{key: entry.get(key) for key in
+                                 ('id', 'title', 'severity', 'vulnerable_versions', 'url', 'cwe')}
+                                for entry in entries]
+
+    db = {
+        "source": url,
+        "fetched": datetime.now().isoformat(timespec='seconds'),
+        "queried": {name: sorted(versions) for name, versions in queried.items()},
+        "advisories": advisories,
+    }
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=db_path.parent, prefix=".npm-advisories.", suffix=".tmp")
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(db, f, separators=(',', ':'))
+    os.replace(tmp, db_path)
+    return db
+
+
+# ============================================================================
+#  AUDIT
+# ============================================================================
+
+def _severity_rank(severity: Optional[str]) -> int:
+    return SEVERITY_ORDER.index(severity) if severity in SEVERITY_ORDER else 0
+
+
+def audit_lockfile(lockfile, db: dict, max_paths: int = 5) -> dict:
+    """
+    Vulnerable packages of a lockfile according to `db`.
+
+    Returns {"vulnerabilities": [...], "severity_count": {...}, "packages": N,
+    "uncovered": [name@version, ...]}. Each vulnerability is one package name
+    with its matching advisories (highest severity first), installed versions,
+    and shortest dependency paths from the root with their depth.
+    """
+    graph = DependencyGraph.from_lockfile(lockfile)
+    paths = graph.shortest_paths()
+    advisories = db.get('advisories', {})
+    queried = db.get('queried')
+
+    by_name: Dict[str, dict] = {}
+    uncovered = set()
+    installed = 0
+    for location, name, version in graph.installed():
+        installed += 1
+        if queried is not None and version not in queried.get(name, ()):
+            uncovered.add(f"{name}@{version}")
+        matching = [a for a in advisories.get(name, ()) if satisfies(version, a.get('vulnerable_versions') or '')]
+        if not matching:
+            continue
+        vuln = by_name.setdefault(name, {"package": name, "versions": set(), "advisories": {}, "installs": []})
+        vuln["versions"].add(version)
+        for advisory in matching:
+            vuln["advisories"][advisory.get('id') or advisory.get('url')] = advisory
+        chain = paths.get(location)
+        meta = graph.packages[location]
+        vuln["installs"].append({
+            "path": [graph.name(loc) + (f"@{graph.packages[loc].get('version')}" if loc else '')
+                     for loc in chain] if chain else None,
+            "depth": len(chain) - 1 if chain else None,
+            "dev": bool(meta.get('dev') or meta.get('devOptional')),
+        })
+
+    severity_count = {"critical": 0, "high": 0, "moderate": 0, "low": 0}
+    vulnerabilities = []
+    for name, vuln in by_name.items():
+        found = sorted(vuln["advisories"].values(), key=lambda a: -_severity_rank(a.get('severity')))
+        severity = found[0].get('severity') or 'low'
+        if severity in severity_count:
+            severity_count[severity] += 1
+        installs = sorted(vuln["installs"], key=lambda i: (i["depth"] is None, i["depth"] or 0))
+        depths = [i["depth"] for i in installs if i["depth"] is not None]
+        vulnerabilities.append({
+            "package": name,
+            "severity": severity,
+            "versions": sorted(vuln["versions"], key=lambda v: parse_version(v) or ()),
+            "advisories": found,
+            "depth": min(depths) if depths else None,
+            "direct": 1 in depths,
+            "dev": all(i["dev"] for i in installs),
+            "installs": len(installs),
+            "paths": [i["path"] for i in installs[:max_paths] if i["path"]],
+        })
+
+    vulnerabilities.sort(key=lambda v: (-_severity_rank(v["severity"]), v["package"]))
+    return {"vulnerabilities": vulnerabilities, "severity_count": severity_count,
+            "packages": installed, "uncovered": sorted(uncovered)}
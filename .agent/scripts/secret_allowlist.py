@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Secret Scan Allowlist - Antigravity Kit
+=======================================
+
+Reviewed false positives of the secret scanner (.env.example values, test
+fixtures...), so they stop being reported on every run.
+
+- Entries are fingerprints (truncated SHA-256) of the flagged text, never the
+  text itself. The reviewed list is `<project>/.agent/secrets.allowlist`, one
+  fingerprint per line followed by a free-form note, and is meant to be
+  committed.
+- Scans never parse that list. It is compiled once per edit into
+  `<project>/.agent/cache/secrets.allowlist.bin`: a bloom filter followed by
+  the sorted fingerprints, memory-mapped on load. A lookup probes a few
+  filter bits (O(1)); only the rare filter hits are confirmed by a binary
+  search of the sorted table, so a false-positive of the filter can never
+  hide a real secret.
+- The compiled file records the size and mtime of the list it was built
+  from and is rebuilt automatically when the list changes.
+
+Usage (from a skill script under .agent/skills/<skill>/scripts/):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+    from secret_allowlist import SecretAllowlist, fingerprint
+
+    allowlist = SecretAllowlist(project_path)
+    if fingerprint(matched_text) not in allowlist:
+        report(...)
+    allowlist.add([(fp, "fixture in tests/auth.spec.ts")])
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from audit_cache import CACHE_DIR
+
+ALLOWLIST_FILE = Path(".agent") / "secrets.allowlist"
+COMPILED_FILE = CACHE_DIR / "secrets.allowlist.bin"
+
+FINGERPRINT_BYTES = 16
+FALSE_POSITIVE_RATE = 0.001
+
+# magic, source size, source mtime (ns), entries, filter bits, probes per lookup
+_HEADER = struct.Struct("<8sqqIII")
+_MAGIC = b"AGSALW01"
+_FINGERPRINT_RE = re.compile(r'[0-9a-f]{%d}' % (FINGERPRINT_BYTES * 2))
+
+
+def fingerprint(text: str) -> str:
+    """Allowlist key of a flagged string (hex, FINGERPRINT_BYTES long)."""
+    return hashlib.sha256(text.encode('utf-8', errors='replace')).hexdigest()[:FINGERPRINT_BYTES * 2]
+
+
+def _probes(key: bytes, bits: int, hashes: int) -> Iterable[int]:
+    """Filter bit positions of a fingerprint (double hashing; the key is already uniform)."""
+    h1 = int.from_bytes(key[:8], 'little')
+    h2 = int.from_bytes(key[8:16], 'little') | 1
+    return ((h1 + i * h2) % bits for i in range(hashes))
+
+
+def _filter_size(entries: int) -> Tuple[int, int]:
+    """(bits, probes) of a bloom filter for `entries` keys at FALSE_POSITIVE_RATE."""
+    bits = max(64, math.ceil(-entries * math.log(FALSE_POSITIVE_RATE) / math.log(2) ** 2))
+    bits = (bits + 7) // 8 * 8
+    hashes = max(1, round(bits / max(1, entries) * math.log(2)))
+    return bits, hashes
+
+
+def compile_allowlist(keys: List[bytes], source_size: int, source_mtime: int) -> bytes:
+    """Compiled allowlist image: header, bloom filter, sorted fingerprint table."""
+    keys = sorted(set(keys))
+    bits, hashes = _filter_size(len(keys))
+    bloom = bytearray(bits // 8)
+    for key in keys:
+        for bit in _probes(key, bits, hashes):
+            bloom[bit >> 3] |= 1 << (bit & 7)
+    header = _HEADER.pack(_MAGIC, source_size, source_mtime, len(keys), bits, hashes)
+    return header + bytes(bloom) + b''.join(keys)
+
+
+class SecretAllowlist:
+    """Membership test for reviewed secret fingerprints, backed by the compiled on-disk filter."""
+
+    def __init__(self, project_path, enabled: bool = True):
+        root = Path(project_path).resolve()
+        self.source = root / ALLOWLIST_FILE
+        self.compiled = root / COMPILED_FILE
+        self.size = 0
+        self.hits = 0
+        self._data = b''
+        self._bits = 0
+        self._hashes = 0
+        self._table = 0
+        if enabled:
+            self._load()
+
+    # ------------------------------------------------------------------ load
+
+    def _load(self) -> None:
+        try:
+            stat = self.source.stat()
+        except OSError:
+            return  # no reviewed entries yet
+        data = self._map_compiled(stat)
+        if data is None:
+            data = compile_allowlist(self._parse_source(), stat.st_size, stat.st_mtime_ns)
+            self._write_compiled(data)
+        self._attach(data)
+
+    def _map_compiled(self, stat: os.stat_result):
+        """The compiled file, memory-mapped, if it was built from the current list."""
+        try:
+            with open(self.compiled, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(data) < _HEADER.size:
+            data.close()
+            return None
+        magic, size, mtime, *_ = _HEADER.unpack_from(data)
+        if magic != _MAGIC or size != stat.st_size or mtime != stat.st_mtime_ns:
+            data.close()
+            return None
+        return data
+
+    def _attach(self, data) -> None:
+        _magic, _size, _mtime, self.size, self._bits, self._hashes = _HEADER.unpack_from(data)
+        self._table = _HEADER.size + self._bits // 8
+        if len(data) < self._table + self.size * FINGERPRINT_BYTES:
+            self.size = 0  # truncated image: treat as empty rather than misreport
+            return
+        self._data = data
+
+    def _parse_source(self) -> List[bytes]:
+        keys = []
+        try:
+            lines = self.source.read_text(encoding='utf-8', errors='replace').splitlines()
+        except OSError:
+            return keys
+        for line in lines:
+            token = line.split('#', 1)[0].strip().split(None, 1)
+            if token and _FINGERPRINT_RE.fullmatch(token[0].lower()):
+                keys.append(bytes.fromhex(token[0]))
+        return keys
+
+    def _write_compiled(self, data: bytes) -> None:
+        try:
+            self.compiled.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.compiled.parent, prefix=".secrets-allowlist-")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, self.compiled)
+        except OSError:
+            pass  # read-only checkout: the in-memory image is still used for this run
+
+    # ---------------------------------------------------------------- queries
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, fp: str) -> bool:
+        if not self.size:
+            return False
+        try:
+            key = bytes.fromhex(fp)
+        except (TypeError, ValueError):
+            return False
+        if len(key) != FINGERPRINT_BYTES:
+            return False
+        data = self._data
+        for bit in _probes(key, self._bits, self._hashes):
+            if not data[_HEADER.size + (bit >> 3)] & (1 << (bit & 7)):
+                return False
+        # Filter hit: confirm against the sorted table
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = self._table + mid * FINGERPRINT_BYTES
+            entry = data[offset:offset + FINGERPRINT_BYTES]
+            if entry < key:
+                lo = mid + 1
+            elif entry > key:
+                hi = mid
+            else:
+                self.hits += 1
+                return True
+        return False
+
+    # ----------------------------------------------------------------- update
+
+    def add(self, entries: Iterable[Tuple[str, Optional[str]]]) -> int:
+        """Append (fingerprint, note) pairs not already listed and recompile; returns how many were added."""
+        new_lines = []
+        seen = set()
+        for fp, note in entries:
+            fp = fp.strip().lower()
+            if not _FINGERPRINT_RE.fullmatch(fp):
+                raise ValueError(f"Not a secret fingerprint: {fp!r}")
+            if fp in self or fp in seen:
+                continue
+            seen.add(fp)
+            new_lines.append(f"{fp}  # {note}\n" if note else f"{fp}\n")
+        if not new_lines:
+            return 0
+
+        self.source.parent.mkdir(parents=True, exist_ok=True)
+        prefix = ""
+        if not self.source.exists():
+            prefix = ("# Reviewed false positives of security_scan.py (see .agent/scripts/secret_allowlist.py)\n"
+                      "# <fingerprint>  # note\n")
+        elif not self.source.read_bytes().endswith(b"\n"):
+            prefix = "\n"
+        with open(self.source, 'a', encoding='utf-8') as f:
+            f.write(prefix + ''.join(new_lines))
+
+        self.close()
+        self.size = 0
+        self._load()
+        return len(new_lines)
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = b''
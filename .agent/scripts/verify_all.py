@@ -20,15 +20,21 @@ Includes ALL checks:
     ✅ Playwright E2E
     ✅ Bundle Analysis (if applicable)
     ✅ Mobile Audit (if applicable)
+
+Checks run serially by default; --workers N runs independent checks
+concurrently in a worker pool (see check_runner.py). Results stream as they
+complete; the final report keeps P0 -> P9 order.
 """
 
 import sys
-import subprocess
 import argparse
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Optional
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from check_runner import run_checks
+
 # ANSI colors
 class Colors:
     HEADER = '\033[95m'
@@ -147,59 +153,25 @@ VERIFICATION_SUITE = [
     },
 ]
 
-def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None) -> dict:
-    """Run validation script"""
-    if not script_path.exists():
+def print_result(result: dict):
+    """Stream one completed check (called as soon as it finishes)"""
+    name = result["name"]
+    duration = result.get("duration", 0)
+    if result.get("skipped"):
         print_warning(f"{name}: Script not found, skipping")
-        return {"name": name, "passed": True, "skipped": True, "duration": 0}
-    
-    print_step(f"Running: {name}")
-    start_time = datetime.now()
-    
-    # Build command
-    cmd = ["python", str(script_path), project_path]
-    if url and ("lighthouse" in script_path.name.lower() or "playwright" in script_path.name.lower()):
-        cmd.append(url)
-    
-    # Run
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=600  # 10 minute timeout for slow checks
-        )
-        
-        duration = (datetime.now() - start_time).total_seconds()
-        passed = result.returncode == 0
-        
-        if passed:
-            print_success(f"{name}: PASSED ({duration:.1f}s)")
-        else:
-            print_error(f"{name}: FAILED ({duration:.1f}s)")
-            if result.stderr:
-                print(f"  {result.stderr[:300]}")
-        
-        return {
-            "name": name,
-            "passed": passed,
-            "output": result.stdout,
-            "error": result.stderr,
-            "skipped": False,
-            "duration": duration
-        }
-    
-    except subprocess.TimeoutExpired:
-        duration = (datetime.now() - start_time).total_seconds()
+    elif result.get("timeout"):
         print_error(f"{name}: TIMEOUT (>{duration:.0f}s)")
-        return {"name": name, "passed": False, "skipped": False, "duration": duration, "error": "Timeout"}
-    
-    except Exception as e:
-        duration = (datetime.now() - start_time).total_seconds()
-        print_error(f"{name}: ERROR - {str(e)}")
-        return {"name": name, "passed": False, "skipped": False, "duration": duration, "error": str(e)}
+    elif result["passed"]:
+        print_success(f"{name}: PASSED ({duration:.1f}s)")
+    else:
+        print_error(f"{name}: FAILED ({duration:.1f}s)")
+        if result.get("error"):
+            print(f"  {result['error'][:300]}")
+    summary = result.get("findings_summary")
+    if summary:
+        print(f"  {summary['findings']} finding(s) -> {result['findings_file']}")
 
-def print_final_report(results: List[dict], start_time: datetime):
+def print_final_report(results: List[dict], start_time: datetime, timing: Optional[dict] = None):
     """Print comprehensive final report"""
     total_duration = (datetime.now() - start_time).total_seconds()
     
@@ -212,6 +184,10 @@ def print_final_report(results: List[dict], start_time: datetime):
     skipped = sum(1 for r in results if r.get("skipped"))
     
     print(f"Total Duration: {total_duration:.1f}s")
+    if timing:
+        cpu = timing["cpu_time"]
+        speedup = cpu / timing["wall_time"] if timing["wall_time"] else 0
+        print(f"CPU Time (all checks): {cpu:.1f}s on {timing['workers']} worker(s) - {speedup:.1f}x parallelism")
     print(f"Total Checks: {total}")
     print(f"{Colors.GREEN}✅ Passed: {passed}{Colors.ENDC}")
     print(f"{Colors.RED}❌ Failed: {failed}{Colors.ENDC}")
@@ -235,7 +211,7 @@ def print_final_report(results: List[dict], start_time: datetime):
         else:
             status = f"{Colors.RED}❌{Colors.ENDC}"
         
-        duration_str = f"({r.get('duration', 0):.1f}s)" if not r.get("skipped") else ""
+        duration_str = f"({r.get('duration', 0):.1f}s, cpu {r.get('cpu_time', 0):.1f}s)" if not r.get("skipped") else ""
         print(f"  {status} {r['name']} {duration_str}")
     
     print()
@@ -268,12 +244,21 @@ def main():
 Examples:
   python scripts/verify_all.py . --url http://localhost:3000
   python scripts/verify_all.py . --url https://staging.example.com --no-e2e
+  python scripts/verify_all.py . --url http://localhost:3000 --workers 4   # Parallel
+  python scripts/verify_all.py . --url http://localhost:3000 --since origin/main
+  python scripts/verify_all.py . --url http://localhost:3000 --jsonl-dir .agent/reports
         """
     )
     parser.add_argument("project", help="Project path to validate")
     parser.add_argument("--url", required=True, help="URL for performance & E2E checks")
     parser.add_argument("--no-e2e", action="store_true", help="Skip E2E tests")
     parser.add_argument("--stop-on-fail", action="store_true", help="Stop on first failure")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Checks run in parallel (default: 1 = serial)")
+    parser.add_argument("--since", metavar="REF",
+                        help="Only audit files changed since a git ref (e.g. origin/main)")
+    parser.add_argument("--jsonl-dir", metavar="DIR",
+                        help="Auditors stream every finding to DIR/<script>.jsonl as they run")
     
     args = parser.parse_args()
     
@@ -289,9 +274,9 @@ Examples:
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     start_time = datetime.now()
-    results = []
+    checks = []
     
-    # Run all verification categories
+    # Collect all verification categories
     for suite in VERIFICATION_SUITE:
         category = suite["category"]
         requires_url = suite.get("requires_url", False)
@@ -304,22 +289,38 @@ Examples:
         if args.no_e2e and category == "E2E Testing":
             continue
         
-        print_header(f"📋 {category.upper()}")
-        
         for name, script_path, required in suite["checks"]:
-            script = project_path / script_path
-            result = run_script(name, script, str(project_path), args.url)
-            result["category"] = category
-            results.append(result)
-            
-            # Stop on critical failure if flag set
-            if args.stop_on_fail and required and not result["passed"] and not result.get("skipped"):
-                print_error(f"CRITICAL: {name} failed. Stopping verification.")
-                print_final_report(results, start_time)
-                sys.exit(1)
+            checks.append({
+                "name": name,
+                "script": project_path / script_path,
+                "required": required,
+                "category": category
+            })
+    
+    print_header("📋 RUNNING CHECKS")
+    print(f"{len(checks)} checks on {min(args.workers, len(checks))} worker(s)\n")
+    
+    results, timing = run_checks(
+        checks,
+        str(project_path),
+        url=args.url,
+        workers=args.workers,
+        timeout=600,  # 10 minute timeout for slow checks
+        since=args.since,
+        jsonl_dir=args.jsonl_dir,
+        stop_on_fail=args.stop_on_fail,
+        on_start=lambda check: print_step(f"Running: {check['name']}"),
+        on_result=print_result
+    )
+    
+    # Stop on critical failure if flag set
+    if timing["stopped_by"]:
+        print_error(f"CRITICAL: {timing['stopped_by']} failed. Stopping verification.")
+        print_final_report(results, start_time, timing)
+        sys.exit(1)
     
     # Print final report
-    all_passed = print_final_report(results, start_time)
+    all_passed = print_final_report(results, start_time, timing)
     
     sys.exit(0 if all_passed else 1)
 
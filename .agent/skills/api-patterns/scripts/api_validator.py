@@ -8,6 +8,10 @@ import json
 import re
 from pathlib import Path
 
+# Shared JSONL findings stream (.agent/scripts/findings_stream.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from findings_stream import findings_flag, open_emitter
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -162,6 +166,7 @@ def check_api_code(file_path: Path) -> dict:
 def main():
     target = sys.argv[1] if len(sys.argv) > 1 else "."
     project_path = Path(target)
+    emitter = open_emitter("api_validator", findings_flag(sys.argv))
     
     print("\n" + "=" * 60)
     print("  API VALIDATOR - Endpoint Best Practices Check")
@@ -172,6 +177,7 @@ def main():
     if not api_files:
         print("[!] No API files found.")
         print("   Looking for: routes/, controllers/, api/, openapi.json/yaml")
+        emitter.summary(passed=True, files_checked=0)
         sys.exit(0)
     
     results = []
@@ -180,6 +186,9 @@ def main():
             result = check_openapi_spec(file_path)
         else:
             result = check_api_code(file_path)
+        for item in result['issues']:
+            emitter.finding("critical" if item.startswith("[X]") else "warning", item,
+                            file=result['file'], file_type=result['type'])
         results.append(result)
     
     # Print results
@@ -200,6 +209,7 @@ def main():
     print(f"[RESULTS] {total_passed} passed, {total_issues} critical issues")
     print("=" * 60)
     
+    emitter.summary(passed=total_issues == 0, files_checked=len(results), critical_issues=total_issues)
     if total_issues == 0:
         print("[OK] API validation passed")
         sys.exit(0)
@@ -5,6 +5,7 @@ Validates Prisma schemas and checks for common issues.
 
 Usage:
     python schema_validator.py <project_path>
+    python schema_validator.py <project_path> --jsonl[=<file>]   # Stream findings as JSONL
 
 Checks:
     - Prisma schema syntax
@@ -19,6 +20,10 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+# Shared JSONL findings stream (.agent/scripts/findings_stream.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from findings_stream import findings_flag, open_emitter
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -93,6 +98,7 @@ def validate_prisma_schema(file_path: Path) -> list:
 
 def main():
     project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    emitter = open_emitter("schema_validator", findings_flag(sys.argv))
     
     print(f"\n{'='*60}")
     print(f"[SCHEMA VALIDATOR] Database Schema Validation")
@@ -115,6 +121,7 @@ def main():
             "message": "No schema files found"
         }
         print(json.dumps(output, indent=2))
+        emitter.summary(passed=True, schemas_checked=0)
         sys.exit(0)
     
     # Validate each schema
@@ -128,6 +135,8 @@ def main():
         else:
             issues = []  # Drizzle validation could be added
         
+        emitter.findings("warning", issues, file=str(file_path.name), schema_type=schema_type)
+        
         if issues:
             all_issues.append({
                 "file": str(file_path.name),
@@ -165,6 +174,7 @@ def main():
     
     print("\n" + json.dumps(output, indent=2))
     
+    emitter.summary(passed=passed, schemas_checked=len(schemas))
     sys.exit(0)
 
 
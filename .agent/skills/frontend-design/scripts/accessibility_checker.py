@@ -5,6 +5,9 @@ Checks HTML files for accessibility issues.
 
 Usage:
     python accessibility_checker.py <project_path>
+    python accessibility_checker.py <project_path> --since origin/main   # Only files changed since a ref
+    python accessibility_checker.py <project_path> --no-cache            # Ignore cached results
+    python accessibility_checker.py <project_path> --jsonl[=<file>]      # Stream findings as JSONL
 
 Checks:
     - Form labels
@@ -20,6 +23,12 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+# Shared file walker + incremental result cache (.agent/scripts/file_index.py, audit_cache.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from file_index import get_project_index
+from audit_cache import incremental_flags, open_incremental
+from findings_stream import findings_flag, open_emitter
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -27,26 +36,23 @@ except:
     pass
 
 
-def find_html_files(project_path: Path) -> list:
-    """Find all HTML/JSX/TSX files."""
-    patterns = ['**/*.html', '**/*.jsx', '**/*.tsx']
+def find_html_files(project_path: Path, index=None) -> list:
+    """Find all HTML/JSX/TSX files (of `index`, e.g. a --since view, if given)."""
+    extensions = {'.html', '.jsx', '.tsx'}
     skip_dirs = {'node_modules', '.next', 'dist', 'build', '.git'}
     
-    files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            if not any(skip in f.parts for skip in skip_dirs):
-                files.append(f)
+    files = (index or get_project_index(project_path)).files(extensions, skip_dirs=skip_dirs)
     
-    return files[:50]
+    return files
 
 
-def check_accessibility(file_path: Path) -> list:
+def check_accessibility(file_path: Path, content: str = None) -> list:
     """Check a single file for accessibility issues."""
     issues = []
     
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
+        if content is None:
+            content = file_path.read_text(encoding='utf-8', errors='ignore')
         
         # Check for form inputs without labels
         inputs = re.findall(r'<input[^>]*>', content, re.IGNORECASE)
@@ -110,6 +116,7 @@ def check_accessibility(file_path: Path) -> list:
 
 def main():
     project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    emitter = open_emitter("accessibility_checker", findings_flag(sys.argv))
     
     print(f"\n{'='*60}")
     print(f"[ACCESSIBILITY CHECKER] WCAG Compliance Audit")
@@ -118,8 +125,12 @@ def main():
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("-"*60)
     
+    # Only changed files are re-checked (--since <ref> limits the scan to a git diff)
+    since, use_cache = incremental_flags(sys.argv)
+    index, cache = open_incremental(project_path, "accessibility_checker", __file__, since, use_cache)
+    
     # Find HTML files
-    files = find_html_files(project_path)
+    files = find_html_files(project_path, index)
     print(f"Found {len(files)} HTML/JSX/TSX files")
     
     if not files:
@@ -132,19 +143,32 @@ def main():
             "message": "No HTML files found"
         }
         print(json.dumps(output, indent=2))
+        emitter.summary(passed=True, files_checked=0)
         sys.exit(0)
     
     # Check each file
     all_issues = []
     
     for f in files:
-        issues = check_accessibility(f)
+        try:
+            content = index.read(f)
+        except OSError as e:
+            all_issues.append({"file": str(f.name), "issues": [f"Error reading file: {str(e)[:50]}"]})
+            emitter.finding("issue", f"Error reading file: {str(e)[:50]}", file=index.relpath(f))
+            continue
+        issues = cache.get(f, content)
+        if issues is None:
+            issues = check_accessibility(f, content)
+            cache.put(f, content, issues)
+        emitter.findings("issue", issues, file=index.relpath(f))
         if issues:
             all_issues.append({
                 "file": str(f.name),
                 "issues": issues
             })
     
+    cache.save()
+    
     # Summary
     print("\n" + "="*60)
     print("ACCESSIBILITY ISSUES")
@@ -176,6 +200,7 @@ def main():
     
     print("\n" + json.dumps(output, indent=2))
     
+    emitter.summary(passed=passed, files_checked=len(files), files_with_issues=len(all_issues))
     sys.exit(0 if passed else 1)
 
 
@@ -95,51 +95,315 @@ import re
 import json
 from pathlib import Path
 
+# Shared file walker + incremental result cache (.agent/scripts/file_index.py, audit_cache.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from audit_cache import incremental_flags, open_incremental
+from findings_stream import FindingsEmitter, finding_count, findings_flag, open_emitter
+from case_fold import fold_case, fold_pattern
+
+
+# ============================================================================
+#  RULE ENGINE
+# ============================================================================
+#
+# Every pattern the audit uses is declared once in RULES and compiled at import
+# time. Case-insensitive rules are not compiled with re.IGNORECASE (which
+# disables sre's literal-prefix scan and costs ~5x per search); instead their
+# pattern is folded to lowercase and matched against a case-folded copy of the
+# file, built once (case_fold.py). Folding is length-preserving, so spans (and
+# therefore extracted groups, taken from the original text) are identical.
+
+def _literal_alternatives(pattern: str):
+    """
+    The alternatives of a pattern made only of literals ('a|b\\(|c'), or None.
+    Presence of such a rule is answered with `in` (fast substring search)
+    instead of a regex scan that tries every alternative at every position.
+    """
+    literals, current, i = [], [], 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\':
+            nxt = pattern[i + 1:i + 2]
+            if not nxt or nxt.isalnum():
+                return None  # \b, \d, \s... are not literals
+            current.append(nxt)
+            i += 2
+            continue
+        if c == '|':
+            literals.append(''.join(current))
+            current = []
+        elif c in '.^$*+?{}[]()':
+            return None
+        else:
+            current.append(c)
+        i += 1
+    literals.append(''.join(current))
+    return tuple(literals) if all(literals) else None
+
+
+class Rule:
+    """A named pattern. `ignore_case` rules run over the case-folded file text."""
+    __slots__ = ('name', 'pattern', 'ignore_case', 'regex', 'literals')
+
+    def __init__(self, name: str, pattern: str, ignore_case: bool = False):
+        self.name = name
+        self.pattern = pattern
+        self.ignore_case = ignore_case
+        compiled = fold_pattern(pattern) if ignore_case else pattern
+        self.regex = re.compile(compiled)
+        self.literals = _literal_alternatives(compiled)
+
+
+RULES = {rule.name: rule for rule in (
+    # Shared flags
+    Rule('long_text', r'<p\b|<div[^>]*class=[^>]*text|<article\b|<span[^>]*text', ignore_case=True),
+    Rule('form', r'<form\b|<input\b', ignore_case=True),
+    Rule('complex_elements', r'<input\b|<select\b|<textarea\b|<option\b', ignore_case=True),
+
+    # 1. Psychology laws
+    Rule('nav_items', r'<NavLink|<Link|<a\s+href|nav-item', ignore_case=True),
+    Rule('small_height_px', r'height:\s*([0-3]\d)px'),
+    Rule('small_height_tw', r'h-[1-9]\b|h-10\b'),
+    Rule('form_fields', r'<input|<select|<textarea', ignore_case=True),
+    Rule('multi_step', r'step|wizard|stage', ignore_case=True),
+    Rule('primary_cta', r'primary|bg-primary|Button.*primary|variant=["\']primary', ignore_case=True),
+    Rule('nav_labels', r'<NavLink|<Link|<a\s+href[^>]*>([^<]+)</a>', ignore_case=True),
+
+    # 1.5 Emotional design
+    Rule('hero', r'hero|<h1|banner', ignore_case=True),
+    Rule('gradient', r'gradient|linear-gradient|radial-gradient'),
+    Rule('animation', r'@keyframes|transition:|animate-'),
+    Rule('background', r'background:|bg-'),
+    Rule('feedback', r'transition|animate|hover:|focus:|disabled|loading|spinner', ignore_case=True),
+    Rule('state_change', r'setState|useState|disabled|loading'),
+    Rule('reflective', r'about|story|mission|values|why we|our journey|testimonials', ignore_case=True),
+
+    # 1.6 Trust building
+    Rule('security_signals', r'ssl|secure|encrypt|lock|padlock|https', ignore_case=True),
+    Rule('checkout', r'checkout|payment', ignore_case=True),
+    Rule('social_proof', r'review|testimonial|rating|star|trust|trusted by|customer|logo', ignore_case=True),
+    Rule('footer', r'footer|<footer', ignore_case=True),
+    Rule('authority', r'certif|award|media|press|featured|as seen in', ignore_case=True),
+
+    # 1.7 Cognitive load
+    Rule('progressive_disclosure', r'step|wizard|stage|accordion|collapsible|tab|more\.\.\.|advanced|show more', ignore_case=True),
+    Rule('colors', r'#[0-9a-fA-F]{3,6}|rgb|hsl'),
+    Rule('borders', r'border:|border-'),
+    Rule('labels', r'<label\b|placeholder=|aria-label=', ignore_case=True),
+
+    # 1.8 Persuasive design
+    Rule('defaults', r'checked|selected|default|value=["\'].*["\']'),
+    Rule('radio', r'type=["\']radio', ignore_case=True),
+    Rule('price', r'price|pricing|cost|\$\d+', ignore_case=True),
+    Rule('price_anchor', r'original|was|strike|del|save \d+%', ignore_case=True),
+    Rule('social', r'join|subscriber|member|user', ignore_case=True),
+    Rule('social_count', r'\d+[+kmb]|\d+,\d+'),
+    Rule('progress', r'progress|step \d+|complete|%|bar', ignore_case=True),
+
+    # 2. Typography
+    Rule('font_face', r'@font-face\s*\{[^}]*family:\s*["\']?([^;"\'\s}]+)', ignore_case=True),
+    Rule('google_fonts', r'fonts\.googleapis\.com[^"\']*family=([^"&]+)', ignore_case=True),
+    Rule('font_family', r'font-family:\s*([^;]+)', ignore_case=True),
+    Rule('line_length', r'max-w-(?:prose|[\[\\]?\d+ch[\]\\]?)|max-width:\s*\d+ch'),
+    Rule('text_elements', r'<p|<span|<div.*text|<h[1-6]', ignore_case=True),
+    Rule('line_height', r'leading-|line-height:'),
+    Rule('heading_or_large', r'<h[1-6]|text-(?:xl|2xl|3xl|4xl|5xl|6xl)', ignore_case=True),
+    Rule('line_height_values', r'(?:leading-|line-height:\s*)([\d.]+)'),
+    Rule('uppercase', r'uppercase|text-transform:\s*uppercase', ignore_case=True),
+    Rule('tracking', r'tracking-|letter-spacing:'),
+    Rule('display_text', r'text-(?:4xl|5xl|6xl|7xl|8xl|9xl)|font-size:\s*[3-9]\dpx'),
+    Rule('tracking_tight', r'tracking-tight|letter-spacing:\s*-[0-9]'),
+    Rule('font_weights', r'font-weight:\s*(\d+)|font-(?:thin|extralight|light|normal|medium|semibold|bold|extrabold|black)|fw-(\d+)', ignore_case=True),
+    Rule('font_sizes', r'font-size:|text-(?:xs|sm|base|lg|xl|2xl)'),
+    Rule('clamp', r'clamp\(|responsive:'),
+    Rule('headings', r'<(h[1-6])', ignore_case=True),
+    Rule('font_size_values', r'font-size:\s*(\d+(?:\.\d+)?)(px|rem|em)'),
+    Rule('paragraphs', r'<p[^>]*>([^<]+)</p>', ignore_case=True),
+    Rule('subheadings', r'<h[2-6]', ignore_case=True),
+
+    # 3. Visual effects
+    Rule('glass_background', r'background:\s*rgba|bg-opacity|bg-[a-z0-9]+\/\d+'),
+    Rule('css_animation', r'@keyframes|transition:'),
+    Rule('expensive_props', r'width|height|top|left|right|bottom|margin|padding'),
+    Rule('reduced_motion', r'prefers-reduced-motion'),
+    Rule('box_shadows', r'box-shadow:\s*([^;]+)'),
+    Rule('rgba_opacities', r'rgba?\([^)]+,\s*([\d.]+)\)'),
+    Rule('any_gradient', r'gradient|linear-gradient|radial-gradient|conic-gradient'),
+    Rule('gradient_mentions', r'gradient', ignore_case=True),
+    Rule('border_declarations', r'border:'),
+    Rule('text_shadows', r'text-shadow:'),
+    Rule('glow_shadows', r'box-shadow:\s*[^;]*0\s+0\s+'),
+    Rule('images', r'<img|background-image:|bg-\[url'),
+    Rule('overlay', r'overlay|rgba\(0|gradient.*transparent|::after|::before'),
+    Rule('will_change', r'will-change:'),
+    Rule('will_change_props', r'will-change:\s*([^;]+)'),
+    Rule('blur', r'backdrop-filter|blur\('),
+
+    # 4. Color system
+    Rule('hex_colors', r'#[0-9a-fA-F]{3,6}'),
+    Rule('hsl', r'hsl\('),
+    Rule('bg_declarations', r'(?:background|bg-|bg\[)([^;}\s]+)'),
+    Rule('text_declarations', r'(?:color|text-)([^;}\s]+)'),
+    Rule('hex6_colors', r'#[0-9a-fA-F]{6}'),
+    Rule('hsl_hues', r'hsl\((\d+),\s*\d+%,\s*\d+%\)'),
+    Rule('pure_black', r'color:\s*#000000|#000\b'),
+    Rule('pure_white', r'background:\s*#ffffff|#fff\b'),
+    Rule('dark_mode', r'dark:\s*|dark:'),
+    Rule('light_low_contrast', r'bg-(?:gray|slate|zinc)-50|bg-white.*text-(?:gray|slate)-[12]'),
+    Rule('dark_low_contrast', r'bg-(?:gray|slate|zinct)-9|bg-black.*text-(?:gray|slate)-[89]'),
+    Rule('blue', r'bg-blue|text-blue|from-blue|#[0-9a-fA-F]*00[0-9A-Fa-f]{2}|#[0-9a-fA-F]*1[0-9A-Fa-f]{2}'),
+    Rule('food_context', r'restaurant|food|cooking|recipe|menu|dish|meal', ignore_case=True),
+    Rule('color_vars', r'--color-|color-|primary-|secondary-'),
+
+    # 5. Animation guide
+    Rule('durations', r'(?:duration|animation-duration|transition-duration):\s*([\d.]+)(s|ms)'),
+    Rule('ease_in_entry', r'ease-in\s+.*entry|fade-in.*ease-in'),
+    Rule('ease_out_exit', r'ease-out\s+.*exit|fade-out.*ease-out'),
+    Rule('interactive', r'<button|<a\s+href|onClick|@click'),
+    Rule('hover_focus', r'hover:|focus:|:hover|:focus'),
+    Rule('async', r'async|await|fetch|axios|loading|isLoading'),
+    Rule('loading_indicator', r'skeleton|spinner|progress|loading|<circle.*animate'),
+    Rule('routing', r'router|navigate|Link.*to|useHistory'),
+    Rule('page_transition', r'AnimatePresence|motion\.|transition.*page|fade.*route'),
+    Rule('scroll_animation', r'onScroll|scroll.*trigger|IntersectionObserver'),
+    Rule('scroll_layout', r'onScroll.*[^\w](width|height|top|left)'),
+
+    # 6. Motion graphics
+    Rule('lottie', r'lottie|Lottie|@lottie-react'),
+    Rule('lottie_fallback', r'prefers-reduced-motion.*lottie|lottie.*isPaused|lottie.*stop'),
+    Rule('gsap', r'gsap|ScrollTrigger|from\(.*gsap'),
+    Rule('gsap_cleanup', r'kill\(|revert\(|useEffect.*return.*gsap'),
+    Rule('svg_animations', r'<animate|<animateTransform|stroke-dasharray|stroke-dashoffset'),
+    Rule('transform_3d', r'transform3d|perspective\(|rotate3d|translate3d'),
+    Rule('perspective', r'perspective:\s*\d+px|perspective\s*\('),
+    Rule('particles', r'particle|canvas.*loop|requestAnimationFrame.*draw|Three\.js'),
+    Rule('scroll_driven', r'IntersectionObserver.*animate|scroll.*progress|view-timeline'),
+    Rule('throttle', r'throttle|debounce|requestAnimationFrame'),
+    Rule('functional_states', r'hover:|focus:|disabled|loading|error|success'),
+
+    # 7. Accessibility
+    Rule('img_without_alt', r'<img(?![^>]*alt=)[^>]*>'),
+)}
+
+# Applied to extracted box-shadow values, not to the whole file
+SHADOW_Y_OFFSET = re.compile(r'\d+px\s+[1-9]\d*px')
+
+
+class RuleMatcher:
+    """Evaluates RULES lazily against one file; each rule scans the file at most once."""
+
+    def __init__(self, content: str):
+        self.content = content
+        self._folded = None
+        self._lower = None
+        self._found = {}
+        self._matches = {}
+
+    @property
+    def lower(self) -> str:
+        """content.lower(), computed once (substring checks)."""
+        if self._lower is None:
+            self._lower = self.content.lower()
+        return self._lower
+
+    def _text(self, rule: Rule) -> str:
+        if not rule.ignore_case:
+            return self.content
+        if self._folded is None:
+            self._folded = fold_case(self.content)
+        return self._folded
+
+    def _all(self, name: str) -> list:
+        matches = self._matches.get(name)
+        if matches is None:
+            rule = RULES[name]
+            matches = self._matches[name] = list(rule.regex.finditer(self._text(rule)))
+            self._found[name] = bool(matches)
+        return matches
+
+    def has(self, name: str) -> bool:
+        """Equivalent of bool(re.search(...))."""
+        found = self._found.get(name)
+        if found is None:
+            rule = RULES[name]
+            text = self._text(rule)
+            if rule.literals:
+                found = any(literal in text for literal in rule.literals)
+            else:
+                found = rule.regex.search(text) is not None
+            self._found[name] = found
+        return found
+
+    def count(self, name: str) -> int:
+        """Equivalent of len(re.findall(...))."""
+        return len(self._all(name))
+
+    def findall(self, name: str) -> list:
+        """Equivalent of re.findall(...); groups are sliced from the original text."""
+        content = self.content
+
+        def text(m, group):
+            start, end = m.span(group)
+            return content[start:end] if start != -1 else ''
+
+        groups = RULES[name].regex.groups
+        matches = self._all(name)
+        if groups == 0:
+            return [text(m, 0) for m in matches]
+        if groups == 1:
+            return [text(m, 1) for m in matches]
+        return [tuple(text(m, g) for g in range(1, groups + 1)) for m in matches]
+
+
 class UXAuditor:
-    def __init__(self):
-        self.issues = []
-        self.warnings = []
+    def __init__(self, emitter: FindingsEmitter = None):
+        self.emitter = emitter or open_emitter("ux_audit", None)
+        # Bounded while findings are streamed: the stream has all of them
+        self.issues = self.emitter.report_list()
+        self.warnings = self.emitter.report_list()
         self.passed_count = 0
         self.files_checked = 0
     
-    def audit_file(self, filepath: str) -> None:
-        try:
-            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-        except: return
+    def audit_file(self, filepath: str, content: str = None) -> None:
+        if content is None:
+            try:
+                with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+                    content = f.read()
+            except: return
         
         self.files_checked += 1
         filename = os.path.basename(filepath)
+        m = RuleMatcher(content)
 
         # Pre-calculate common flags
         is_css = filename.endswith('.css')
-        has_long_text = not is_css and bool(re.search(r'<p\b|<div[^>]*class=[^>]*text|<article\b|<span[^>]*text', content, re.IGNORECASE))
-        has_form = not is_css and bool(re.search(r'<form\b|<input\b', content, re.IGNORECASE))
-        complex_elements = len(re.findall(r'<input\b|<select\b|<textarea\b|<option\b', content, re.IGNORECASE)) if not is_css else 0
+        has_long_text = not is_css and m.has('long_text')
+        has_form = not is_css and m.has('form')
+        complex_elements = m.count('complex_elements') if not is_css else 0
 
         # --- 1. PSYCHOLOGY LAWS ---
         # Hick's Law
-        nav_items = len(re.findall(r'<NavLink|<Link|<a\s+href|nav-item', content, re.IGNORECASE))
+        nav_items = m.count('nav_items')
         if nav_items > 7:
             self.warnings.append(f"[Hick's Law] {filename}: {nav_items} nav items (Max 7)")
         
         # Fitts' Law
-        if re.search(r'height:\s*([0-3]\d)px', content) or re.search(r'h-[1-9]\b|h-10\b', content):
+        if m.has('small_height_px') or m.has('small_height_tw'):
             self.warnings.append(f"[Fitts' Law] {filename}: Small targets (< 44px)")
         
         # Miller's Law
-        form_fields = len(re.findall(r'<input|<select|<textarea', content, re.IGNORECASE))
-        if form_fields > 7 and not re.search(r'step|wizard|stage', content, re.IGNORECASE):
+        form_fields = m.count('form_fields')
+        if form_fields > 7 and not m.has('multi_step'):
             self.warnings.append(f"[Miller's Law] {filename}: Complex form ({form_fields} fields)")
             
         # Von Restorff
-        if 'button' in content.lower() and not re.search(r'primary|bg-primary|Button.*primary|variant=["\']primary', content, re.IGNORECASE):
+        if 'button' in m.lower and not m.has('primary_cta'):
             self.warnings.append(f"[Von Restorff] {filename}: No primary CTA")
 
         # Serial Position Effect - Important items at beginning/end
         if nav_items > 3:
             # Check if last nav item is important (contact, login, etc.)
-            nav_content = re.findall(r'<NavLink|<Link|<a\s+href[^>]*>([^<]+)</a>', content, re.IGNORECASE)
+            nav_content = m.findall('nav_labels')
             if nav_content and len(nav_content) > 2:
                 last_item = nav_content[-1].lower() if nav_content else ''
                 if not any(x in last_item for x in ['contact', 'login', 'sign', 'get started', 'cta', 'button']):
@@ -148,26 +412,26 @@ class UXAuditor:
         # --- 1.5 EMOTIONAL DESIGN (Don Norman) ---
 
         # Visceral: First impressions (aesthetics, gradients, animations)
-        has_hero = bool(re.search(r'hero|<h1|banner', content, re.IGNORECASE))
+        has_hero = m.has('hero')
         if has_hero:
             # Check for visual appeal elements
-            has_gradient = bool(re.search(r'gradient|linear-gradient|radial-gradient', content))
-            has_animation = bool(re.search(r'@keyframes|transition:|animate-', content))
+            has_gradient = m.has('gradient')
+            has_animation = m.has('animation')
             has_visual_interest = has_gradient or has_animation
 
-            if not has_visual_interest and not re.search(r'background:|bg-', content):
+            if not has_visual_interest and not m.has('background'):
                 self.warnings.append(f"[Visceral] {filename}: Hero section lacks visual appeal. Consider gradients or subtle animations.")
 
         # Behavioral: Instant feedback and usability
         if 'onClick' in content or '@click' in content or 'onclick' in content:
-            has_feedback = re.search(r'transition|animate|hover:|focus:|disabled|loading|spinner', content, re.IGNORECASE)
-            has_state_change = re.search(r'setState|useState|disabled|loading', content)
+            has_feedback = m.has('feedback')
+            has_state_change = m.has('state_change')
 
             if not has_feedback and not has_state_change:
                 self.warnings.append(f"[Behavioral] {filename}: Interactive elements lack immediate feedback. Add hover/focus/disabled states.")
 
         # Reflective: Brand story, values, identity
-        has_reflective = bool(re.search(r'about|story|mission|values|why we|our journey|testimonials', content, re.IGNORECASE))
+        has_reflective = m.has('reflective')
         if has_long_text and not has_reflective:
             self.warnings.append(f"[Reflective] {filename}: Long-form content without brand story/values. Add 'About' or 'Why We Exist' section.")
 
@@ -175,42 +439,39 @@ class UXAuditor:
 
         # Security signals
         if has_form:
-            security_signals = re.findall(r'ssl|secure|encrypt|lock|padlock|https', content, re.IGNORECASE)
-            if len(security_signals) == 0 and not re.search(r'checkout|payment', content, re.IGNORECASE):
+            if not m.has('security_signals') and not m.has('checkout'):
                 self.warnings.append(f"[Trust] {filename}: Form without security indicators. Add 'SSL Secure' or lock icon.")
 
         # Social proof elements
-        social_proof = re.findall(r'review|testimonial|rating|star|trust|trusted by|customer|logo', content, re.IGNORECASE)
-        if len(social_proof) > 0:
+        if m.has('social_proof'):
             self.passed_count += 1
         else:
             if has_long_text:
                 self.warnings.append(f"[Trust] {filename}: No social proof detected. Consider adding testimonials, ratings, or 'Trusted by' logos.")
 
         # Authority indicators
-        has_footer = bool(re.search(r'footer|<footer', content, re.IGNORECASE))
+        has_footer = m.has('footer')
         if has_footer:
-            authority = re.findall(r'certif|award|media|press|featured|as seen in', content, re.IGNORECASE)
-            if len(authority) == 0:
+            if not m.has('authority'):
                 self.warnings.append(f"[Trust] {filename}: Footer lacks authority signals. Add certifications, awards, or media mentions.")
 
         # --- 1.7 COGNITIVE LOAD MANAGEMENT ---
 
         # Progressive disclosure
         if complex_elements > 5:
-            has_progressive = re.search(r'step|wizard|stage|accordion|collapsible|tab|more\.\.\.|advanced|show more', content, re.IGNORECASE)
+            has_progressive = m.has('progressive_disclosure')
             if not has_progressive:
                 self.warnings.append(f"[Cognitive Load] {filename}: Many form elements without progressive disclosure. Consider accordion, tabs, or 'Advanced' toggle.")
 
         # Visual noise check
-        has_many_colors = len(re.findall(r'#[0-9a-fA-F]{3,6}|rgb|hsl', content)) > 15
-        has_many_borders = len(re.findall(r'border:|border-', content)) > 10
+        has_many_colors = m.count('colors') > 15
+        has_many_borders = m.count('borders') > 10
         if has_many_colors and has_many_borders:
             self.warnings.append(f"[Cognitive Load] {filename}: High visual noise detected. Many colors and borders increase cognitive load.")
 
         # Familiar patterns
         if has_form:
-            has_standard_labels = bool(re.search(r'<label\b|placeholder=|aria-label=', content, re.IGNORECASE))
+            has_standard_labels = m.has('labels')
             if not has_standard_labels:
                 self.warnings.append(f"[Cognitive Load] {filename}: Form inputs without labels. Use <label> for accessibility and clarity.")
 
@@ -218,27 +479,27 @@ class UXAuditor:
 
         # Smart defaults
         if has_form:
-            has_defaults = bool(re.search(r'checked|selected|default|value=["\'].*["\']', content))
-            radio_inputs = len(re.findall(r'type=["\']radio', content, re.IGNORECASE))
+            has_defaults = m.has('defaults')
+            radio_inputs = m.count('radio')
             if radio_inputs > 0 and not has_defaults:
                 self.warnings.append(f"[Persuasion] {filename}: Radio buttons without default selection. Pre-select recommended option.")
 
         # Anchoring (showing original price)
-        if re.search(r'price|pricing|cost|\$\d+', content, re.IGNORECASE):
-            has_anchor = bool(re.search(r'original|was|strike|del|save \d+%', content, re.IGNORECASE))
+        if m.has('price'):
+            has_anchor = m.has('price_anchor')
             if not has_anchor:
                 self.warnings.append(f"[Persuasion] {filename}: Prices without anchoring. Show original price to frame discount value.")
 
         # Social proof live indicators
-        has_social = bool(re.search(r'join|subscriber|member|user', content, re.IGNORECASE))
+        has_social = m.has('social')
         if has_social:
-            has_count = bool(re.findall(r'\d+[+kmb]|\d+,\d+', content))
+            has_count = m.has('social_count')
             if not has_count:
                 self.warnings.append(f"[Persuasion] {filename}: Social proof without specific numbers. Use 'Join 10,000+' format.")
 
         # Progress indicators
         if has_form:
-            has_progress = bool(re.search(r'progress|step \d+|complete|%|bar', content, re.IGNORECASE))
+            has_progress = m.has('progress')
             if complex_elements > 5 and not has_progress:
                 self.warnings.append(f"[Persuasion] {filename}: Long form without progress indicator. Add progress bar or 'Step X of Y'.")
 
@@ -247,9 +508,9 @@ class UXAuditor:
         # 2.1 Font Pairing - Too many font families
         font_families = set()
         # Check for @font-face, Google Fonts, font-family declarations
-        font_faces = re.findall(r'@font-face\s*\{[^}]*family:\s*["\']?([^;"\'\s}]+)', content, re.IGNORECASE)
-        google_fonts = re.findall(r'fonts\.googleapis\.com[^"\']*family=([^"&]+)', content, re.IGNORECASE)
-        font_family_css = re.findall(r'font-family:\s*([^;]+)', content, re.IGNORECASE)
+        font_faces = m.findall('font_face')
+        google_fonts = m.findall('google_fonts')
+        font_family_css = m.findall('font_family')
 
         for font in font_faces: font_families.add(font.strip().lower())
         for font in google_fonts:
@@ -266,37 +527,36 @@ class UXAuditor:
             self.issues.append(f"[Typography] {filename}: {len(font_families)} font families detected. Limit to 2-3 for cohesion.")
 
         # 2.2 Line Length - Character-based width
-        if has_long_text and not re.search(r'max-w-(?:prose|[\[\\]?\d+ch[\]\\]?)|max-width:\s*\d+ch', content):
+        if has_long_text and not m.has('line_length'):
             self.warnings.append(f"[Typography] {filename}: No line length constraint (45-75ch). Use max-w-prose or max-w-[65ch].")
 
         # 2.3 Line Height - Proper leading ratios
         # Check for text without proper line-height
-        text_elements = len(re.findall(r'<p|<span|<div.*text|<h[1-6]', content, re.IGNORECASE))
-        if text_elements > 0 and not re.search(r'leading-|line-height:', content):
+        if m.has('text_elements') and not m.has('line_height'):
             self.warnings.append(f"[Typography] {filename}: Text elements found without line-height. Body: 1.4-1.6, Headings: 1.1-1.3")
 
         # Check for heading-specific line height issues
-        if re.search(r'<h[1-6]|text-(?:xl|2xl|3xl|4xl|5xl|6xl)', content, re.IGNORECASE):
+        if m.has('heading_or_large'):
             # Extract line-height values
-            line_heights = re.findall(r'(?:leading-|line-height:\s*)([\d.]+)', content)
+            line_heights = m.findall('line_height_values')
             for lh in line_heights:
                 if float(lh) > 1.5:
                     self.warnings.append(f"[Typography] {filename}: Heading has line-height {lh} (>1.3). Headings should be tighter (1.1-1.3).")
 
         # 2.4 Letter Spacing (Tracking)
         # Uppercase without tracking
-        if re.search(r'uppercase|text-transform:\s*uppercase', content, re.IGNORECASE):
-            if not re.search(r'tracking-|letter-spacing:', content):
+        if m.has('uppercase'):
+            if not m.has('tracking'):
                 self.warnings.append(f"[Typography] {filename}: Uppercase text without tracking. ALL CAPS needs +5-10% spacing.")
 
         # Large text (display/hero) should have negative tracking
-        if re.search(r'text-(?:4xl|5xl|6xl|7xl|8xl|9xl)|font-size:\s*[3-9]\dpx', content):
-            if not re.search(r'tracking-tight|letter-spacing:\s*-[0-9]', content):
+        if m.has('display_text'):
+            if not m.has('tracking_tight'):
                 self.warnings.append(f"[Typography] {filename}: Large display text without tracking-tight. Big text needs -1% to -4% spacing.")
 
         # 2.5 Weight and Emphasis - Contrast levels
         # Check for adjacent weight levels (poor contrast)
-        weights = re.findall(r'font-weight:\s*(\d+)|font-(?:thin|extralight|light|normal|medium|semibold|bold|extrabold|black)|fw-(\d+)', content, re.IGNORECASE)
+        weights = m.findall('font_weights')
         weight_values = []
         for w in weights:
             val = w[0] or w[1]
@@ -320,12 +580,12 @@ class UXAuditor:
             self.warnings.append(f"[Typography] {filename}: {len(unique_weights)} font weights. Limit to 3-4 per page.")
 
         # 2.6 Responsive Typography - Fluid sizing with clamp()
-        has_font_sizes = bool(re.search(r'font-size:|text-(?:xs|sm|base|lg|xl|2xl)', content))
-        if has_font_sizes and not re.search(r'clamp\(|responsive:', content):
+        has_font_sizes = m.has('font_sizes')
+        if has_font_sizes and not m.has('clamp'):
             self.warnings.append(f"[Typography] {filename}: Fixed font sizes without clamp(). Consider fluid typography: clamp(MIN, PREFERRED, MAX)")
 
         # 2.7 Hierarchy - Heading structure
-        headings = re.findall(r'<(h[1-6])', content, re.IGNORECASE)
+        headings = m.findall('headings')
         if headings:
             # Check for skipped levels (h1 -> h3)
             for i in range(len(headings) - 1):
@@ -340,7 +600,7 @@ class UXAuditor:
 
         # 2.8 Modular Scale - Consistent sizing
         # Extract font-size values
-        font_sizes = re.findall(r'font-size:\s*(\d+(?:\.\d+)?)(px|rem|em)', content)
+        font_sizes = m.findall('font_size_values')
         size_values = []
         for size, unit in font_sizes:
             if unit == 'rem' or unit == 'em':
@@ -365,7 +625,7 @@ class UXAuditor:
 
         # 2.9 Readability - Content chunking
         # Check for very long paragraphs (>5 lines estimated)
-        paragraphs = re.findall(r'<p[^>]*>([^<]+)</p>', content, re.IGNORECASE)
+        paragraphs = m.findall('paragraphs')
         for p in paragraphs:
             word_count = len(p.split())
             if word_count > 100:  # ~5-6 lines
@@ -373,38 +633,36 @@ class UXAuditor:
 
         # Check for missing subheadings in long content
         if len(paragraphs) > 5:
-            subheadings = len(re.findall(r'<h[2-6]', content, re.IGNORECASE))
-            if subheadings == 0:
+            if not m.has('subheadings'):
                 self.warnings.append(f"[Typography] {filename}: Long content without subheadings. Add h2/h3 to break up text.")
 
         # --- 3. VISUAL EFFECTS (visual-effects.md) ---
         
         # Glassmorphism Check
         if 'backdrop-filter' in content or 'blur(' in content:
-            if not re.search(r'background:\s*rgba|bg-opacity|bg-[a-z0-9]+\/\d+', content):
+            if not m.has('glass_background'):
                 self.warnings.append(f"[Visual] {filename}: Blur used without semi-transparent background (Glassmorphism fail)")
         
         # GPU Acceleration / Performance
-        if re.search(r'@keyframes|transition:', content):
-            expensive_props = re.findall(r'width|height|top|left|right|bottom|margin|padding', content)
+        if m.has('css_animation'):
+            expensive_props = m.findall('expensive_props')
             if expensive_props:
                 self.warnings.append(f"[Performance] {filename}: Animating expensive properties ({', '.join(set(expensive_props))}). Use transform/opacity where possible.")
             
             # Reduced Motion
-            if not re.search(r'prefers-reduced-motion', content):
+            if not m.has('reduced_motion'):
                 self.warnings.append(f"[Accessibility] {filename}: Animations found without prefers-reduced-motion check")
 
         # Natural Shadows
-        shadows = re.findall(r'box-shadow:\s*([^;]+)', content)
+        shadows = m.findall('box_shadows')
         for shadow in shadows:
             # Check if natural (Y > X) or multiple layers
-            if ',' not in shadow and not re.search(r'\d+px\s+[1-9]\d*px', shadow): # Simple heuristic for Y-offset
+            if ',' not in shadow and not SHADOW_Y_OFFSET.search(shadow): # Simple heuristic for Y-offset
                  self.warnings.append(f"[Visual] {filename}: Simple/Unnatural shadow detected. Consider multiple layers or Y > X offset for realism.")
 
         # --- 3.1 NEOMORPHISM CHECK ---
         # Check for neomorphism patterns (dual shadows with opposite directions)
-        neo_shadows = re.findall(r'box-shadow:\s*([^;]+)', content)
-        for shadow in neo_shadows:
+        for shadow in shadows:
             # Neomorphism has two shadows: positive offset + negative offset
             if ',' in shadow and '-' in shadow:
                 # Check for inset pattern (pressed state)
@@ -416,7 +674,7 @@ class UXAuditor:
         shadow_count = len(shadows)
         if shadow_count > 0:
             # Check for shadow opacity levels (should indicate hierarchy)
-            opacities = re.findall(r'rgba?\([^)]+,\s*([\d.]+)\)', content)
+            opacities = m.findall('rgba_opacities')
             shadow_opacities = [float(o) for o in opacities if float(o) < 0.5]
             if shadow_count >= 3 and len(shadow_opacities) > 0:
                 # Check if there's variety in shadow opacities for different elevations
@@ -426,58 +684,57 @@ class UXAuditor:
 
         # --- 3.3 GRADIENT CHECKS ---
         # Check for gradient usage
-        has_gradient = bool(re.search(r'gradient|linear-gradient|radial-gradient|conic-gradient', content))
+        has_gradient = m.has('any_gradient')
         if has_gradient:
             # Warn about mesh/aurora gradients (can be overused)
-            gradient_count = len(re.findall(r'gradient', content, re.IGNORECASE))
+            gradient_count = m.count('gradient_mentions')
             if gradient_count > 5:
                 self.warnings.append(f"[Visual] {filename}: Many gradients detected ({gradient_count}). Ensure this serves purpose, not decoration.")
         else:
             # Check if hero section exists without gradient
-            if has_hero and not re.search(r'background:|bg-', content):
+            if has_hero and not m.has('background'):
                 self.warnings.append(f"[Visual] {filename}: Hero section without visual interest. Consider gradient for depth.")
 
         # --- 3.4 BORDER EFFECTS ---
         # Check for gradient borders or animated borders
-        has_border = bool(re.search(r'border:|border-', content))
+        has_border = m.has('borders')
         if has_border:
             # Check for overly complex borders
-            border_count = len(re.findall(r'border:', content))
+            border_count = m.count('border_declarations')
             if border_count > 8:
                 self.warnings.append(f"[Visual] {filename}: Many border declarations ({border_count}). Simplify for cleaner look.")
 
         # --- 3.5 GLOW EFFECTS ---
         # Check for text-shadow or multiple box-shadow layers (glow effects)
-        text_shadows = re.findall(r'text-shadow:', content)
+        text_shadows = m.findall('text_shadows')
         for ts in text_shadows:
             # Multiple text-shadow layers indicate glow
             if ',' in ts:
                 self.warnings.append(f"[Visual] {filename}: Text glow effect detected. Ensure readability is maintained.")
 
         # Check for box-shadow glow (multiple layers with 0 offset)
-        glow_shadows = re.findall(r'box-shadow:\s*[^;]*0\s+0\s+', content)
-        if len(glow_shadows) > 2:
+        if m.count('glow_shadows') > 2:
             self.warnings.append(f"[Visual] {filename}: Multiple glow effects detected. Use sparingly for emphasis only.")
 
         # --- 3.6 OVERLAY TECHNIQUES ---
         # Check for image overlays (for readability)
-        has_images = bool(re.search(r'<img|background-image:|bg-\[url', content))
+        has_images = m.has('images')
         if has_images and has_long_text:
-            has_overlay = bool(re.search(r'overlay|rgba\(0|gradient.*transparent|::after|::before', content))
+            has_overlay = m.has('overlay')
             if not has_overlay:
                 self.warnings.append(f"[Visual] {filename}: Text over image without overlay. Add gradient overlay for readability.")
 
         # --- 3.7 PERFORMANCE: will-change ---
         # Check for will-change usage
-        if re.search(r'will-change:', content):
-            will_change_props = re.findall(r'will-change:\s*([^;]+)', content)
+        if m.has('will_change'):
+            will_change_props = m.findall('will_change_props')
             for prop in will_change_props:
                 prop = prop.strip().lower()
                 if prop in ['width', 'height', 'top', 'left', 'right', 'bottom', 'margin', 'padding']:
                     self.issues.append(f"[Performance] {filename}: will-change on '{prop}' (layout property). Use only for transform/opacity.")
 
         # Check for excessive will-change usage
-        will_change_count = len(re.findall(r'will-change:', content))
+        will_change_count = m.count('will_change')
         if will_change_count > 3:
             self.warnings.append(f"[Performance] {filename}: Many will-change declarations ({will_change_count}). Use sparingly, only for heavy animations.")
 
@@ -486,8 +743,8 @@ class UXAuditor:
         effect_count = (
             (1 if has_gradient else 0) +
             shadow_count +
-            len(re.findall(r'backdrop-filter|blur\(', content)) +
-            len(re.findall(r'text-shadow:', content))
+            m.count('blur') +
+            len(text_shadows)
         )
         if effect_count > 10:
             self.warnings.append(f"[Visual] {filename}: Many visual effects ({effect_count}). Ensure effects serve purpose, not decoration.")
@@ -504,28 +761,24 @@ class UXAuditor:
                         '#8b5cf6', '#a855f7', '#9333ea', '#7c3aed', '#6d28d9',
                         'purple', 'violet', 'fuchsia', 'magenta', 'lavender']
         for purple in purple_hexes:
-            if purple.lower() in content.lower():
+            if purple.lower() in m.lower:
                 self.warnings.append(f"[Color] {filename}: PURPLE DETECTED ('{purple}'). Banned by Maestro rules. Use Teal/Cyan/Emerald instead.")
                 break
 
         # 4.2 60-30-10 Rule check
         # Count color usage to estimate ratio
-        color_hex_count = len(re.findall(r'#[0-9a-fA-F]{3,6}', content))
-        hsl_count = len(re.findall(r'hsl\(', content))
-        total_colors = color_hex_count + hsl_count
+        total_colors = m.count('hex_colors') + m.count('hsl')
         if total_colors > 3:
             # Check for dominant colors (should be ~60%)
-            bg_declarations = re.findall(r'(?:background|bg-|bg\[)([^;}\s]+)', content)
-            text_declarations = re.findall(r'(?:color|text-)([^;}\s]+)', content)
-            if len(bg_declarations) > 0 and len(text_declarations) > 0:
+            if m.has('bg_declarations') and m.has('text_declarations'):
                 # Just warn if too many distinct colors
-                unique_hexes = set(re.findall(r'#[0-9a-fA-F]{6}', content))
+                unique_hexes = set(m.findall('hex6_colors'))
                 if len(unique_hexes) > 5:
                     self.warnings.append(f"[Color] {filename}: {len(unique_hexes)} distinct colors. Consider 60-30-10 rule: dominant (60%), secondary (30%), accent (10%).")
 
         # 4.3 Color Scheme Pattern Detection
         # Detect monochromatic (same hue, different lightness)
-        hsl_matches = re.findall(r'hsl\((\d+),\s*\d+%,\s*\d+%\)', content)
+        hsl_matches = m.findall('hsl_hues')
         if len(hsl_matches) >= 3:
             hues = [int(h) for h in hsl_matches]
             hue_range = max(hues) - min(hues)
@@ -534,108 +787,91 @@ class UXAuditor:
 
         # 4.4 Dark Mode Compliance
         # Check for pure black (#000000) or pure white (#FFFFFF) text (forbidden)
-        if re.search(r'color:\s*#000000|#000\b', content):
+        if m.has('pure_black'):
             self.warnings.append(f"[Color] {filename}: Pure black (#000000) detected. Use #1a1a1a or darker grays for better dark mode.")
-        if re.search(r'background:\s*#ffffff|#fff\b', content) and re.search(r'dark:\s*|dark:', content):
+        if m.has('pure_white') and m.has('dark_mode'):
             self.warnings.append(f"[Color] {filename}: Pure white background in dark mode context. Use slight off-white (#f9fafb) for reduced eye strain.")
 
         # 4.5 WCAG Contrast Pattern Check
         # Look for potential low-contrast combinations
-        light_bg_light_text = bool(re.search(r'bg-(?:gray|slate|zinc)-50|bg-white.*text-(?:gray|slate)-[12]', content))
-        dark_bg_dark_text = bool(re.search(r'bg-(?:gray|slate|zinct)-9|bg-black.*text-(?:gray|slate)-[89]', content))
-        if light_bg_light_text or dark_bg_dark_text:
+        if m.has('light_low_contrast') or m.has('dark_low_contrast'):
             self.warnings.append(f"[Color] {filename}: Possible low-contrast combination detected. Verify WCAG AA (4.5:1 for text).")
 
         # 4.6 Color Psychology Context Check
         # Warn if blue used for food/restaurant context
-        has_blue = bool(re.search(r'bg-blue|text-blue|from-blue|#[0-9a-fA-F]*00[0-9A-Fa-f]{2}|#[0-9a-fA-F]*1[0-9A-Fa-f]{2}', content))
-        has_food_context = bool(re.search(r'restaurant|food|cooking|recipe|menu|dish|meal', content, re.IGNORECASE))
-        if has_blue and has_food_context:
+        if m.has('blue') and m.has('food_context'):
             self.warnings.append(f"[Color] {filename}: Blue color in food context. Blue suppresses appetite; consider warm colors (red, orange, yellow).")
 
         # 4.7 HSL-Based Palette Detection
         # Check if using HSL for palette (recommended in color-system.md)
-        has_color_vars = bool(re.search(r'--color-|color-|primary-|secondary-', content))
-        if has_color_vars and not re.search(r'hsl\(', content):
+        if m.has('color_vars') and not m.has('hsl'):
             self.warnings.append(f"[Color] {filename}: Color variables without HSL. Consider HSL for easier palette adjustment (Hue, Saturation, Lightness).")
 
         # --- 5. ANIMATION GUIDE (animation-guide.md) ---
 
         # 5.1 Duration Appropriateness
         # Check for excessively long or short animations
-        durations = re.findall(r'(?:duration|animation-duration|transition-duration):\s*([\d.]+)(s|ms)', content)
+        durations = m.findall('durations')
         for duration, unit in durations:
             duration_ms = float(duration) * (1000 if unit == 's' else 1)
             if duration_ms < 50:
                 self.warnings.append(f"[Animation] {filename}: Very fast animation ({duration}{unit}). Minimum 50ms for visibility.")
-            elif duration_ms > 1000 and 'transition' in content.lower():
+            elif duration_ms > 1000 and 'transition' in m.lower:
                 self.warnings.append(f"[Animation] {filename}: Long transition ({duration}{unit}). Transitions should be 100-300ms for responsiveness.")
 
         # 5.2 Easing Function Correctness
         # Check for incorrect easing patterns
-        if re.search(r'ease-in\s+.*entry|fade-in.*ease-in', content):
+        if m.has('ease_in_entry'):
             self.warnings.append(f"[Animation] {filename}: Entry animation with ease-in. Entry should use ease-out for snappy feel.")
-        if re.search(r'ease-out\s+.*exit|fade-out.*ease-out', content):
+        if m.has('ease_out_exit'):
             self.warnings.append(f"[Animation] {filename}: Exit animation with ease-out. Exit should use ease-in for natural feel.")
 
         # 5.3 Micro-interaction Feedback Patterns
         # Check for interactive elements without hover/focus states
-        interactive_elements = len(re.findall(r'<button|<a\s+href|onClick|@click', content))
-        has_hover_focus = bool(re.search(r'hover:|focus:|:hover|:focus', content))
-        if interactive_elements > 2 and not has_hover_focus:
+        if m.count('interactive') > 2 and not m.has('hover_focus'):
             self.warnings.append(f"[Animation] {filename}: Interactive elements without hover/focus states. Add micro-interactions for feedback.")
 
         # 5.4 Loading State Indicators
         # Check for loading patterns
-        has_async = bool(re.search(r'async|await|fetch|axios|loading|isLoading', content))
-        has_loading_indicator = bool(re.search(r'skeleton|spinner|progress|loading|<circle.*animate', content))
-        if has_async and not has_loading_indicator:
+        if m.has('async') and not m.has('loading_indicator'):
             self.warnings.append(f"[Animation] {filename}: Async operations without loading indicator. Add skeleton or spinner for perceived performance.")
 
         # 5.5 Page Transition Patterns
         # Check for page/view transitions
-        has_routing = bool(re.search(r'router|navigate|Link.*to|useHistory', content))
-        has_page_transition = bool(re.search(r'AnimatePresence|motion\.|transition.*page|fade.*route', content))
-        if has_routing and not has_page_transition:
+        if m.has('routing') and not m.has('page_transition'):
             self.warnings.append(f"[Animation] {filename}: Routing detected without page transitions. Consider fade/slide for context continuity.")
 
         # 5.6 Scroll Animation Performance
         # Check for scroll-driven animations
-        has_scroll_anim = bool(re.search(r'onScroll|scroll.*trigger|IntersectionObserver', content))
-        if has_scroll_anim:
+        if m.has('scroll_animation'):
             # Check if using expensive properties in scroll handlers
-            if re.search(r'onScroll.*[^\w](width|height|top|left)', content):
+            if m.has('scroll_layout'):
                 self.issues.append(f"[Animation] {filename}: Scroll handler animating layout properties. Use transform/opacity for 60fps.")
 
         # --- 6. MOTION GRAPHICS (motion-graphics.md) ---
 
         # 6.1 Lottie Animation Checks
-        has_lottie = bool(re.search(r'lottie|Lottie|@lottie-react', content))
+        has_lottie = m.has('lottie')
         if has_lottie:
             # Check for reduced motion fallback
-            has_lottie_fallback = bool(re.search(r'prefers-reduced-motion.*lottie|lottie.*isPaused|lottie.*stop', content))
-            if not has_lottie_fallback:
+            if not m.has('lottie_fallback'):
                 self.warnings.append(f"[Motion] {filename}: Lottie animation without reduced-motion fallback. Add pause/stop for accessibility.")
 
         # 6.2 GSAP Memory Leak Risks
-        has_gsap = bool(re.search(r'gsap|ScrollTrigger|from\(.*gsap', content))
+        has_gsap = m.has('gsap')
         if has_gsap:
             # Check for cleanup patterns
-            has_gsap_cleanup = bool(re.search(r'kill\(|revert\(|useEffect.*return.*gsap', content))
-            if not has_gsap_cleanup:
+            if not m.has('gsap_cleanup'):
                 self.issues.append(f"[Motion] {filename}: GSAP animation without cleanup (kill/revert). Memory leak risk on unmount.")
 
         # 6.3 SVG Animation Performance
-        svg_animations = re.findall(r'<animate|<animateTransform|stroke-dasharray|stroke-dashoffset', content)
-        if len(svg_animations) > 3:
+        if m.count('svg_animations') > 3:
             self.warnings.append(f"[Motion] {filename}: Multiple SVG animations detected. Ensure stroke-dashoffset is used sparingly for mobile performance.")
 
         # 6.4 3D Transform Performance
-        has_3d_transform = bool(re.search(r'transform3d|perspective\(|rotate3d|translate3d', content))
-        if has_3d_transform:
+        if m.has('transform_3d'):
             # Check for perspective on parent
-            has_perspective_parent = bool(re.search(r'perspective:\s*\d+px|perspective\s*\(', content))
-            if not has_perspective_parent:
+            if not m.has('perspective'):
                 self.warnings.append(f"[Motion] {filename}: 3D transform without perspective parent. Add perspective: 1000px for realistic depth.")
 
             # Warn about mobile performance
@@ -643,51 +879,78 @@ class UXAuditor:
 
         # 6.5 Particle Effect Warnings
         # Check for canvas/WebGL particle systems
-        has_particles = bool(re.search(r'particle|canvas.*loop|requestAnimationFrame.*draw|Three\.js', content))
-        if has_particles:
+        if m.has('particles'):
             self.warnings.append(f"[Motion] {filename}: Particle effects detected. Ensure fallback or reduced-quality option for mobile devices.")
 
         # 6.6 Scroll-Driven Animation Performance
-        has_scroll_driven = bool(re.search(r'IntersectionObserver.*animate|scroll.*progress|view-timeline', content))
-        if has_scroll_driven:
+        if m.has('scroll_driven'):
             # Check for throttling/debouncing
-            has_throttle = bool(re.search(r'throttle|debounce|requestAnimationFrame', content))
-            if not has_throttle:
+            if not m.has('throttle'):
                 self.issues.append(f"[Motion] {filename}: Scroll-driven animation without throttling. Add requestAnimationFrame for 60fps.")
 
         # 6.7 Motion Decision Tree - Context Check
         # Check if animation serves purpose (not just decoration)
         total_animations = (
-            len(re.findall(r'@keyframes|transition:|animate-', content)) +
+            m.count('animation') +
             (1 if has_lottie else 0) +
             (1 if has_gsap else 0)
         )
         if total_animations > 5:
             # Check if animations are functional
-            functional_animations = len(re.findall(r'hover:|focus:|disabled|loading|error|success', content))
+            functional_animations = m.count('functional_states')
             if functional_animations < total_animations / 2:
                 self.warnings.append(f"[Motion] {filename}: Many animations ({total_animations}). Ensure majority serve functional purpose (feedback, guidance), not decoration.")
 
         # --- 7. ACCESSIBILITY ---
-        if re.search(r'<img(?![^>]*alt=)[^>]*>', content):
+        if m.has('img_without_alt'):
             self.issues.append(f"[Accessibility] {filename}: Missing img alt text")
 
-    def audit_directory(self, directory: str) -> None:
+    def audit_directory(self, directory: str, since: str = None, use_cache: bool = True) -> None:
         extensions = {'.tsx', '.jsx', '.html', '.vue', '.svelte', '.css'}
-        for root, dirs, files in os.walk(directory):
-            # Ignore hidden directories (starting with .) and common build/dependency folders
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in {'node_modules', 'dist', 'build', 'coverage', 'out', 'tmp', 'dashboard', 'orchestrator-api', 'orchestration', 'ios', 'android', 'backups', 'mission-control'}]
-            for file in files:
-                if Path(file).suffix in extensions:
-                    self.audit_file(os.path.join(root, file))
+        # Ignore hidden directories (starting with .) and common build/dependency folders
+        skip_dirs = {'node_modules', 'dist', 'build', 'coverage', 'out', 'tmp', 'dashboard', 'orchestrator-api', 'orchestration', 'ios', 'android', 'backups', 'mission-control'}
+        index, cache = open_incremental(directory, "ux_audit", __file__, since, use_cache)
+        for path in index.files(extensions, skip_dirs=skip_dirs, skip_hidden=True):
+            try:
+                content = index.read(path)
+            except OSError:
+                continue
+            # Reuse findings of unchanged files, audit the rest
+            findings = cache.get(path, content)
+            if findings is None:
+                findings = self._audit_findings(str(path), content)
+                cache.put(path, content, findings)
+            self.record(index.relpath(path), findings)
+        cache.save()
+
+    def record(self, filepath: str, findings: dict) -> None:
+        """Add one file's findings to the report and stream them right away (findings_stream.py)."""
+        self.files_checked += 1
+        self.issues.extend(findings["issues"])
+        self.warnings.extend(findings["warnings"])
+        self.passed_count += findings["passed"]
+        self.emitter.findings("issue", findings["issues"], file=filepath)
+        self.emitter.findings("warning", findings["warnings"], file=filepath)
+
+    def _audit_findings(self, filepath: str, content: str) -> dict:
+        """Findings of a single file (the unit stored in the audit cache)."""
+        saved = self.issues, self.warnings, self.passed_count, self.files_checked
+        self.issues, self.warnings, self.passed_count = [], [], 0
+        try:
+            self.audit_file(filepath, content)
+            return {"issues": self.issues, "warnings": self.warnings, "passed": self.passed_count}
+        finally:
+            self.issues, self.warnings, self.passed_count, self.files_checked = saved
 
     def get_report(self):
         return {
             "files_checked": self.files_checked,
             "issues": self.issues,
             "warnings": self.warnings,
+            "issue_count": finding_count(self.issues),
+            "warning_count": finding_count(self.warnings),
             "passed_checks": self.passed_count,
-            "compliant": len(self.issues) == 0
+            "compliant": finding_count(self.issues) == 0
         }
 
 def main():
@@ -695,10 +958,13 @@ def main():
     
     path = sys.argv[1]
     is_json = "--json" in sys.argv
+    since, use_cache = incremental_flags(sys.argv)
+    emitter = open_emitter("ux_audit", findings_flag(sys.argv))
     
-    auditor = UXAuditor()
-    if os.path.isfile(path): auditor.audit_file(path)
-    else: auditor.audit_directory(path)
+    auditor = UXAuditor(emitter)
+    if os.path.isfile(path):
+        auditor.record(path, auditor._audit_findings(path, None))
+    else: auditor.audit_directory(path, since, use_cache)
     
     report = auditor.get_report()
     
@@ -709,15 +975,17 @@ def main():
         print(f"\n[UX AUDIT] {report['files_checked']} files checked")
         print("-" * 50)
         if report['issues']:
-            print(f"[!] ISSUES ({len(report['issues'])}):")
+            print(f"[!] ISSUES ({report['issue_count']}):")
             for i in report['issues'][:10]: print(f"  - {i}")
         if report['warnings']:
-            print(f"[*] WARNINGS ({len(report['warnings'])}):")
+            print(f"[*] WARNINGS ({report['warning_count']}):")
             for w in report['warnings'][:15]: print(f"  - {w}")
         print(f"[+] PASSED CHECKS: {report['passed_checks']}")
         status = "PASS" if report['compliant'] else "FAIL"
         print(f"STATUS: {status}")
 
+    emitter.summary(passed=report['compliant'], files_checked=report['files_checked'],
+                    passed_checks=report['passed_checks'])
     sys.exit(0 if report['compliant'] else 1)
 
 if __name__ == "__main__":
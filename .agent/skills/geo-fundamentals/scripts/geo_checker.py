@@ -15,12 +15,21 @@ WHAT IT CHECKS:
 
 Usage:
     python geo_checker.py <project_path>
+    python geo_checker.py <project_path> --since origin/main   # Only files changed since a ref
+    python geo_checker.py <project_path> --no-cache            # Ignore cached results
+    python geo_checker.py <project_path> --jsonl[=<file>]      # Stream findings as JSONL
 """
 import sys
 import re
 import json
 from pathlib import Path
 
+# Shared file walker + incremental result cache (.agent/scripts/file_index.py, audit_cache.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from file_index import get_project_index
+from audit_cache import incremental_flags, open_incremental
+from findings_stream import findings_flag, open_emitter
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -78,28 +87,25 @@ def is_page_file(file_path: Path) -> bool:
     return False
 
 
-def find_web_pages(project_path: Path) -> list:
-    """Find public-facing web pages only."""
-    patterns = ['**/*.html', '**/*.htm', '**/*.jsx', '**/*.tsx']
+def find_web_pages(project_path: Path, index=None) -> list:
+    """Find public-facing web pages only (of `index`, e.g. a --since view, if given)."""
+    extensions = {'.html', '.htm', '.jsx', '.tsx'}
     
     files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            # Skip excluded directories
-            if any(skip in f.parts for skip in SKIP_DIRS):
-                continue
-            
-            # Check if it's likely a page
-            if is_page_file(f):
-                files.append(f)
+    # Excluded directories are filtered by the shared index
+    for f in (index or get_project_index(project_path)).files(extensions, skip_dirs=SKIP_DIRS):
+        # Check if it's likely a page
+        if is_page_file(f):
+            files.append(f)
     
     return files[:30]  # Limit to 30 pages
 
 
-def check_page(file_path: Path) -> dict:
+def check_page(file_path: Path, content: str = None) -> dict:
     """Check a single web page for GEO elements."""
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
+        if content is None:
+            content = file_path.read_text(encoding='utf-8', errors='ignore')
     except Exception as e:
         return {'file': str(file_path.name), 'passed': [], 'issues': [f"Error: {e}"], 'score': 0}
     
@@ -222,6 +228,7 @@ def check_page(file_path: Path) -> dict:
 def main():
     target = sys.argv[1] if len(sys.argv) > 1 else "."
     target_path = Path(target).resolve()
+    emitter = open_emitter("geo_checker", findings_flag(sys.argv))
     
     print("\n" + "=" * 60)
     print("  GEO CHECKER - AI Citation Readiness Audit")
@@ -229,8 +236,12 @@ def main():
     print(f"Project: {target_path}")
     print("-" * 60)
     
+    # Only changed files are re-checked (--since <ref> limits the scan to a git diff)
+    since, use_cache = incremental_flags(sys.argv)
+    index, cache = open_incremental(target_path, "geo_checker", __file__, since, use_cache)
+    
     # Find web pages only
-    pages = find_web_pages(target_path)
+    pages = find_web_pages(target_path, index)
     
     if not pages:
         print("\n[!] No public web pages found.")
@@ -238,6 +249,7 @@ def main():
         print("    Skipping: docs, tests, config files, node_modules")
         output = {"script": "geo_checker", "pages_found": 0, "passed": True}
         print("\n" + json.dumps(output, indent=2))
+        emitter.summary(passed=True, pages_checked=0)
         sys.exit(0)
     
     print(f"Found {len(pages)} public pages to analyze\n")
@@ -245,8 +257,19 @@ def main():
     # Check each page
     results = []
     for page in pages:
-        result = check_page(page)
+        try:
+            content = index.read(page)
+        except OSError as e:
+            results.append({'file': str(page.name), 'passed': [], 'issues': [f"Error: {e}"], 'score': 0})
+            emitter.finding("issue", f"Error: {e}", file=index.relpath(page), score=0)
+            continue
+        result = cache.get(page, content)
+        if result is None:
+            result = check_page(page, content)
+            cache.put(page, content, result)
+        emitter.findings("issue", result['issues'], file=index.relpath(page), score=result['score'])
         results.append(result)
+    cache.save()
     
     # Print results
     for result in results:
@@ -282,6 +305,7 @@ def main():
     }
     print("\n" + json.dumps(output, indent=2))
     
+    emitter.summary(passed=output["passed"], pages_checked=len(results), average_score=output["average_score"])
     sys.exit(0 if avg_score >= 60 else 1)
 
 
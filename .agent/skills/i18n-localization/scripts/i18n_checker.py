@@ -2,11 +2,27 @@
 """
 i18n Checker - Detects hardcoded strings and missing translations.
 Scans for untranslated text in React, Vue, and Python files.
+
+In one pass over the code it also builds a key-usage index: every
+`t('key')` / `t.rich('key')` call of a `useTranslations(ns)` /
+`getTranslations(ns)` binding, resolved to its full key, with its call
+sites. The index is diffed against the flattened locale trees to report
+missing, unused (dead payload) and untranslated keys. Per-file results and
+flattened locales are cached by content hash.
 """
+import bisect
 import sys
 import re
 import json
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Shared file walker, incremental result cache and JS/TS tokenizer (.agent/scripts/)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from file_index import get_project_index
+from audit_cache import AuditCache, checker_version, incremental_flags
+from findings_stream import FindingsEmitter, findings_flag, open_emitter
+from js_modules import JSX_ATTR, NAME, PUNCT, STRING, TEMPLATE, matching_brackets, string_value, token_lines, tokenize
 
 # Fix Windows console encoding for Unicode output
 try:
@@ -50,59 +66,96 @@ I18N_PATTERNS = [
     r'i18n\.',             # Generic i18n
 ]
 
+CODE_EXTENSIONS = {
+    '.tsx': 'jsx', '.jsx': 'jsx', '.ts': 'jsx', '.js': 'jsx',
+    '.vue': 'vue',
+    '.py': 'python'
+}
+CODE_SKIP = ['node_modules', '.git', 'dist', 'build', '__pycache__', 'venv', 'test', 'spec']
+
+# next-intl translator factories and the translator methods that take a key
+TRANSLATOR_FACTORIES = {'useTranslations', 'getTranslations'}
+TRANSLATOR_METHODS = {'rich', 'raw', 'markup', 'has'}
+
+# Default locale (reference tree) and the locales whose translations are checked
+DEFAULT_LOCALE = 'es'
+TRANSLATION_LOCALES = ('es', 'eu', 'en')
+# Shorter values are often legitimately identical across locales ("OK", "Email", brand names)
+UNTRANSLATED_MIN_LENGTH = 12
+# Examples listed per report line
+MAX_EXAMPLES = 5
+_LOCALE_CODE = re.compile(r'^[a-z]{2,3}(?:[-_][A-Za-z]{2,4})?$')
+
 def find_locale_files(project_path: Path) -> list:
     """Find translation/locale files."""
-    patterns = [
-        "**/locales/**/*.json",
-        "**/translations/**/*.json",
-        "**/lang/**/*.json",
-        "**/i18n/**/*.json",
-        "**/messages/*.json",
-        "**/*.po",  # gettext
-    ]
+    locale_dirs = {'locales', 'translations', 'lang', 'i18n'}
+    index = get_project_index(project_path)
     
     files = []
-    for pattern in patterns:
-        files.extend(project_path.glob(pattern))
+    # Completeness compares locales with each other: never limited to a diff
+    for f in index.files({'.json', '.po'}, include_unchanged=True):
+        dirs = Path(index.relpath(f)).parts[:-1]
+        if f.suffix == '.po':  # gettext
+            files.append(f)
+        elif any(d in locale_dirs for d in dirs) or (dirs and dirs[-1] == 'messages'):
+            files.append(f)
     
-    return [f for f in files if 'node_modules' not in str(f)]
+    return files
+
+def locale_of(f: Path) -> Tuple[str, Optional[str]]:
+    """(language, namespace file) of a locale file: `<lang>/<ns>.json`, or `messages/<lang>.json` (namespace None)."""
+    if _LOCALE_CODE.match(f.stem) and not _LOCALE_CODE.match(f.parent.name):
+        return f.stem, None
+    return f.parent.name, f.stem
 
-def check_locale_completeness(locale_files: list) -> dict:
+def load_locales(locale_files: list, cache: AuditCache = None) -> Dict[str, Dict[str, str]]:
+    """Flattened key -> value of every JSON locale (flattened trees cached by content hash)."""
+    locales: Dict[str, Dict[str, str]] = {}
+    for f in locale_files:
+        if f.suffix != '.json':
+            continue
+        try:
+            text = f.read_text(encoding='utf-8')
+        except OSError:
+            continue
+        flat = cache.get(f, text) if cache else None
+        if flat is None:
+            try:
+                flat = flatten_values(json.loads(text))
+            except ValueError:
+                continue
+            if cache:
+                cache.put(f, text, flat)
+        lang, namespace = locale_of(f)
+        tree = locales.setdefault(lang, {})
+        for key, value in flat.items():
+            tree[f"{namespace}.{key}" if namespace else key] = value
+    return locales
+
+def check_locale_completeness(locales: Dict[str, Dict[str, str]], file_count: int = 0) -> dict:
     """Check if all locales have the same keys."""
     issues = []
     passed = []
     
-    if not locale_files:
+    if not file_count:
         return {'passed': [], 'issues': ["[!] No locale files found"]}
     
-    # Group by parent folder (language)
-    locales = {}
-    for f in locale_files:
-        if f.suffix == '.json':
-            try:
-                lang = f.parent.name
-                content = json.loads(f.read_text(encoding='utf-8'))
-                if lang not in locales:
-                    locales[lang] = {}
-                locales[lang][f.stem] = set(flatten_keys(content))
-            except:
-                continue
-    
     if len(locales) < 2:
-        passed.append(f"[OK] Found {len(locale_files)} locale file(s)")
+        passed.append(f"[OK] Found {file_count} locale file(s)")
         return {'passed': passed, 'issues': issues}
     
     passed.append(f"[OK] Found {len(locales)} language(s): {', '.join(locales.keys())}")
     
-    # Compare keys across locales
+    # Compare keys across locales, namespace by namespace (first key segment)
     all_langs = list(locales.keys())
-    base_lang = all_langs[0]
+    base_lang = DEFAULT_LOCALE if DEFAULT_LOCALE in locales else all_langs[0]
+    by_namespace = {lang: _namespaces(keys) for lang, keys in locales.items()}
     
-    for namespace in locales.get(base_lang, {}):
-        base_keys = locales[base_lang].get(namespace, set())
-        
-        for lang in all_langs[1:]:
-            other_keys = locales.get(lang, {}).get(namespace, set())
+    for namespace, base_keys in by_namespace[base_lang].items():
+        for lang in all_langs:
+            if lang == base_lang:
+                continue
+            other_keys = by_namespace[lang].get(namespace, set())
             
             missing = base_keys - other_keys
             if missing:
@@ -117,6 +170,12 @@ def check_locale_completeness(locale_files: list) -> dict:
     
     return {'passed': passed, 'issues': issues}
 
+def _namespaces(keys) -> Dict[str, set]:
+    grouped: Dict[str, set] = {}
+    for key in keys:
+        grouped.setdefault(key.split('.', 1)[0], set()).add(key)
+    return grouped
+
 def flatten_keys(d, prefix=''):
     """Flatten nested dict keys."""
     keys = set()
@@ -128,61 +187,332 @@ def flatten_keys(d, prefix=''):
             keys.add(new_key)
     return keys
 
-def check_hardcoded_strings(project_path: Path) -> dict:
-    """Check for hardcoded strings in code files."""
+def flatten_values(d, prefix='') -> Dict[str, str]:
+    """Flatten nested dict to key -> leaf value (non-string leaves as JSON)."""
+    values = {}
+    for k, v in d.items():
+        new_key = f"{prefix}.{k}" if prefix else k
+        if isinstance(v, dict):
+            values.update(flatten_values(v, new_key))
+        else:
+            values[new_key] = v if isinstance(v, str) else json.dumps(v, ensure_ascii=False)
+    return values
+
+# ============================================================================
+#  KEY-USAGE INDEX
+# ============================================================================
+
+def _translator_namespace(tokens, match, i: int) -> Optional[str]:
+    """Namespace passed to useTranslations(...) / getTranslations(...) whose `(` is tokens[i] ('' = root)."""
+    close = match.get(i)
+    if close is None:
+        return None
+    args = tokens[i + 1:close]
+    if not args:
+        return ''
+    if len(args) == 1 and args[0].kind == STRING:
+        return string_value(args[0])
+    # getTranslations({ locale, namespace: 'footer' })
+    for k, token in enumerate(args[:-2]):
+        if token.kind == NAME and token.value == 'namespace' and args[k + 1].kind == PUNCT \
+                and args[k + 1].value == ':' and args[k + 2].kind == STRING:
+            return string_value(args[k + 2])
+    if args[0].kind == PUNCT and args[0].value == '{':
+        return ''  # getTranslations({ locale }): root namespace
+    return None  # computed namespace
+
+def _join(namespace: str, key: str) -> str:
+    return f"{namespace}.{key}" if namespace and key else (namespace or key)
+
+def translation_refs(content: str, jsx: bool = True) -> List[dict]:
+    """
+    Translation key references of one file:
+    {"key", "line", "kind": "static" | "prefix" | "namespace"}. A template key
+    (`status.${s}`) is a prefix reference; a computed key (t(item.label)) marks
+    its whole namespace as used. A translator passed on as a prop or argument
+    resolves through the receiving `t` parameter when that component is in the
+    same file; otherwise its namespace counts as dynamically used.
+    """
+    tokens = tokenize(content, jsx)
+    match = matching_brackets(tokens)
+    lines = token_lines(tokens, content)
+    n = len(tokens)
+
+    # Innermost `{` block of every token, to scope translator bindings, and innermost bracket of any kind
+    block = [-1] * n
+    bracket = [-1] * n
+    stack: List[int] = []
+    brackets: List[int] = []
+    for i, token in enumerate(tokens):
+        block[i] = stack[-1] if stack else -1
+        bracket[i] = brackets[-1] if brackets else -1
+        if token.kind == PUNCT:
+            if token.value == '{':
+                stack.append(i)
+            elif token.value == '}' and stack:
+                stack.pop()
+            if token.value in ('(', '[', '{'):
+                brackets.append(i)
+            elif token.value in (')', ']', '}') and brackets:
+                brackets.pop()
+
+    # const t = useTranslations('ns') / const t = await getTranslations({ namespace: 'ns' })
+    bindings: Dict[str, List[Tuple[int, int, Optional[str]]]] = {}
+    for i, token in enumerate(tokens):
+        if token.kind != NAME or token.value not in TRANSLATOR_FACTORIES or i + 1 >= n:
+            continue
+        if not (tokens[i + 1].kind == PUNCT and tokens[i + 1].value == '('):
+            continue
+        k = i - 1
+        if k >= 0 and tokens[k].kind == NAME and tokens[k].value == 'await':
+            k -= 1
+        if k >= 1 and tokens[k].kind == PUNCT and tokens[k].value == '=' and tokens[k - 1].kind == NAME:
+            scope = block[i]
+            scope_end = match.get(scope, n) if scope >= 0 else n
+            bindings.setdefault(tokens[k - 1].value, []).append(
+                (scope, scope_end, _translator_namespace(tokens, match, i + 1)))
+
+    def scoped_namespace(i: int):
+        """(found, namespace) of the innermost binding of tokens[i] whose scope encloses it."""
+        scoped = [b for b in bindings.get(tokens[i].value, ()) if b[0] < i < b[1]]
+        return (True, max(scoped, key=lambda b: b[0])[2]) if scoped else (False, None)
+
+    def call_paren(i: int) -> int:
+        """Index of the `(` of a t(...) / t.rich(...) call on tokens[i], or -1."""
+        k = i + 1
+        if k + 1 < n and tokens[k].kind == PUNCT and tokens[k].value == '.' \
+                and tokens[k + 1].kind == NAME and tokens[k + 1].value in TRANSLATOR_METHODS:
+            k += 2
+        return k if k + 1 < n and tokens[k].kind == PUNCT and tokens[k].value == '(' else -1
+
+    # Translators handed on as values: <Step t={t} />, render(t), { t }. The receiving
+    # parameter is known by the prop name (or the translator's own name).
+    passed: Dict[str, List[Tuple[Optional[str], int]]] = {}
+    for i, token in enumerate(tokens):
+        if token.kind != NAME or token.value not in bindings or call_paren(i) >= 0:
+            continue
+        prev = tokens[i - 1] if i > 0 else None
+        after = tokens[i + 1] if i + 1 < n else None
+        if prev is not None and prev.kind == PUNCT and prev.value in ('.', '?.'):
+            continue
+        if after is not None and after.kind == PUNCT and after.value in ('=', ':', '.', '?.', '[', '=>'):
+            continue  # the binding itself, an object key, a property access, or a shadowing arrow parameter
+        if bracket[i] >= 0 and tokens[bracket[i]].value == '[':
+            continue  # hook dependency list
+        found, namespace = scoped_namespace(i)
+        if not found:
+            continue
+        prop = token.value
+        if prev is not None and prev.kind == PUNCT and prev.value == '{' and i >= 2 and tokens[i - 2].kind == JSX_ATTR:
+            prop = tokens[i - 2].value
+        passed.setdefault(prop, []).append((namespace, i))
+
+    refs = []
+    received = set()
+    for i, token in enumerate(tokens):
+        if token.kind != NAME or (token.value not in bindings and token.value not in passed):
+            continue
+        if i > 0 and tokens[i - 1].kind == PUNCT and tokens[i - 1].value in ('.', '?.'):
+            continue
+        k = call_paren(i)
+        if k < 0:
+            continue
+        found, namespace = scoped_namespace(i)
+        if not found:
+            # t(...) on a parameter that receives a translator passed in this file
+            namespaces = {ns for ns, _ in passed.get(token.value, ())}
+            if not namespaces:
+                continue
+            received.add(token.value)
+            if len(namespaces) != 1:
+                refs.extend({"key": ns or '', "line": lines[i], "kind": "namespace"}
+                            for ns in namespaces if ns is not None)
+                continue
+            namespace = next(iter(namespaces))
+        if namespace is None:
+            continue
+        arg = tokens[k + 1]
+        after = tokens[k + 2] if k + 2 < n else None
+        single = after is not None and after.kind == PUNCT and after.value in (')', ',')
+        if arg.kind == STRING and single:
+            refs.append({"key": _join(namespace, string_value(arg)), "line": lines[i], "kind": "static"})
+        elif arg.kind == TEMPLATE:
+            literal = arg.value[1:]
+            static = literal.split('${', 1)[0] if '${' in literal else literal[:-1]
+            if '${' not in literal and single:
+                refs.append({"key": _join(namespace, static), "line": lines[i], "kind": "static"})
+            else:
+                prefix = static.rsplit('.', 1)[0] if '.' in static else ''
+                refs.append({"key": _join(namespace, prefix), "line": lines[i],
+                             "kind": "prefix" if prefix else "namespace"})
+        else:
+            refs.append({"key": namespace, "line": lines[i], "kind": "namespace"})
+
+    # Translators passed to another module: their keys cannot be followed, keep the namespace alive
+    for prop, uses in passed.items():
+        if prop in received:
+            continue
+        for namespace, i in uses:
+            if namespace is not None:
+                refs.append({"key": namespace, "line": lines[i], "kind": "namespace"})
+    return refs
+
+def build_key_index(file_refs: Dict[str, List[dict]]) -> dict:
+    """Key -> call sites, plus the prefixes / namespaces used with computed keys."""
+    static: Dict[str, List[str]] = {}
+    dynamic: Dict[str, List[str]] = {}
+    for relpath, refs in file_refs.items():
+        for ref in refs:
+            site = f"{relpath}:{ref['line']}"
+            target = static if ref['kind'] == 'static' else dynamic
+            target.setdefault(ref['key'], []).append(site)
+    return {"static": static, "dynamic": dynamic}
+
+def _covered_by_dynamic(key: str, dynamic: Dict[str, list]) -> bool:
+    """Whether a computed-key reference (prefix or whole namespace) may resolve to `key`."""
+    if '' in dynamic:
+        return True
+    parts = key.split('.')
+    return any('.'.join(parts[:i]) in dynamic for i in range(1, len(parts)))
+
+def _is_leaf_or_parent(key: str, keys) -> bool:
+    """t('ns.group') is valid for t.raw() / t.rich() objects too: accept a parent of existing keys."""
+    if key in keys:
+        return True
+    prefix = key + '.'
+    return any(k.startswith(prefix) for k in keys)
+
+def check_key_usage(key_index: dict, locales: Dict[str, Dict[str, str]]) -> dict:
+    """Diff the key-usage index against the locale trees: missing, unused and untranslated keys."""
+    issues = []
+    passed = []
+    details = {"missing": {}, "unused": [], "untranslated": {}}
+    if not locales:
+        return {'passed': passed, 'issues': issues, 'details': details}
+
+    base_lang = DEFAULT_LOCALE if DEFAULT_LOCALE in locales else next(iter(locales))
+    base = locales[base_lang]
+    static, dynamic = key_index["static"], key_index["dynamic"]
+    passed.append(f"[OK] Key index: {len(static)} keys referenced statically, "
+                  f"{len(dynamic)} computed prefix(es)/namespace(s)")
+
+    # Missing: referenced keys absent from a checked locale
+    check_langs = [lang for lang in TRANSLATION_LOCALES if lang in locales] or [base_lang]
+    for lang in check_langs:
+        keys = locales[lang]
+        sorted_keys = sorted(keys)
+        missing = sorted(key for key in static if key not in keys and not _has_prefix(sorted_keys, key))
+        if missing:
+            details["missing"][lang] = {key: static[key] for key in missing}
+            examples = ', '.join(f"{key} ({static[key][0]})" for key in missing[:MAX_EXAMPLES])
+            issues.append(f"[X] {lang}: {len(missing)} referenced key(s) missing: {examples}")
+
+    # Unused: keys of the default locale no reference can reach (dead client payload)
+    used_parents = set()
+    for key in static:
+        parts = key.split('.')
+        used_parents.update('.'.join(parts[:i]) for i in range(1, len(parts) + 1))
+    unused = sorted(key for key in base if key not in used_parents and not _covered_by_dynamic(key, dynamic))
+    details["unused"] = unused
+    if unused:
+        dead_bytes = sum(len(json.dumps({key.rsplit('.', 1)[-1]: base[key]}, ensure_ascii=False).encode('utf-8'))
+                         for key in unused)
+        by_ns = _namespaces(unused)
+        top = sorted(by_ns.items(), key=lambda item: -len(item[1]))[:MAX_EXAMPLES]
+        issues.append(f"[!] {base_lang}: {len(unused)} of {len(base)} keys never referenced "
+                      f"(~{dead_bytes / 1024:.1f} KB of messages payload per locale); top namespaces: "
+                      + ', '.join(f"{ns} ({len(keys)})" for ns, keys in top))
+    else:
+        passed.append("[OK] Every locale key is referenced")
+
+    # Untranslated: copies of the default-locale text in another checked locale
+    for lang in check_langs:
+        if lang == base_lang:
+            continue
+        same = sorted(key for key, value in locales[lang].items()
+                      if isinstance(value, str) and (value.strip() == '' or (
+                          len(value) >= UNTRANSLATED_MIN_LENGTH and base.get(key) == value
+                          and re.search(r'[^\W\d_]{3}', value))))
+        if same:
+            details["untranslated"][lang] = same
+            issues.append(f"[!] {lang}: {len(same)} key(s) left untranslated (empty or same as {base_lang}): "
+                          + ', '.join(same[:MAX_EXAMPLES]))
+
+    return {'passed': passed, 'issues': issues, 'details': details}
+
+def _has_prefix(sorted_keys: List[str], key: str) -> bool:
+    """Whether `key` is a parent of some key in the sorted list (binary search)."""
+    prefix = key + '.'
+    i = bisect.bisect_left(sorted_keys, prefix)
+    return i < len(sorted_keys) and sorted_keys[i].startswith(prefix)
+
+def hardcoded_file_findings(content: str, file_type: str, name: str) -> dict:
+    """i18n usage and hardcoded-string examples of one file (the unit stored in the audit cache)."""
+    has_i18n = any(re.search(p, content) for p in I18N_PATTERNS)
+    examples = []
+    if not has_i18n:
+        for pattern in HARDCODED_PATTERNS.get(file_type, []):
+            matches = re.findall(pattern, content)
+            if matches:
+                examples.append(f"{name}: {str(matches[0])[:40]}...")
+    refs = []
+    if file_type == 'jsx' and 'Translations' in content:
+        refs = translation_refs(content, not name.endswith('.ts'))
+    return {'has_i18n': has_i18n, 'examples': examples, 'refs': refs}
+
+def check_hardcoded_strings(project_path: Path, cache: AuditCache = None,
+                            emitter: FindingsEmitter = None) -> dict:
+    """Check for hardcoded strings in code files (and collect translation key references)."""
     issues = []
     passed = []
     
     # Find code files
-    extensions = {
-        '.tsx': 'jsx', '.jsx': 'jsx', '.ts': 'jsx', '.js': 'jsx',
-        '.vue': 'vue',
-        '.py': 'python'
-    }
-    
-    code_files = []
-    for ext in extensions:
-        code_files.extend(project_path.rglob(f"*{ext}"))
+    extensions = CODE_EXTENSIONS
     
-    code_files = [f for f in code_files if not any(x in str(f) for x in 
-                  ['node_modules', '.git', 'dist', 'build', '__pycache__', 'venv', 'test', 'spec'])]
+    index = cache.index if cache is not None else get_project_index(project_path)
+    # The key index needs every file; hardcoded strings are reported for the scanned (--since) ones
+    code_files = [f for f in index.files(extensions, include_unchanged=True) if not any(x in index.relpath(f) for x in
+                  CODE_SKIP)]
+    scanned = set(index.files(extensions))
     
     if not code_files:
-        return {'passed': ["[!] No code files found"], 'issues': []}
+        return {'passed': ["[!] No code files found"], 'issues': [], 'refs': {}}
     
     files_with_i18n = 0
     files_with_hardcoded = 0
     hardcoded_examples = []
+    file_refs = {}
     
-    for file_path in code_files[:50]:  # Limit
+    for file_path in code_files:
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            ext = file_path.suffix
-            file_type = extensions.get(ext, 'jsx')
+            content = index.read(file_path)
+            file_type = extensions.get(file_path.suffix, 'jsx')
             
-            # Check for i18n usage
-            has_i18n = any(re.search(p, content) for p in I18N_PATTERNS)
-            if has_i18n:
-                files_with_i18n += 1
-            
-            # Check for hardcoded strings
-            patterns = HARDCODED_PATTERNS.get(file_type, [])
-            hardcoded_found = False
+            findings = cache.get(file_path, content) if cache else None
+            if findings is None:
+                findings = hardcoded_file_findings(content, file_type, file_path.name)
+                if cache:
+                    cache.put(file_path, content, findings)
+
+            if findings['refs']:
+                file_refs[index.relpath(file_path)] = findings['refs']
+            if file_path not in scanned:
+                continue
             
-            for pattern in patterns:
-                matches = re.findall(pattern, content)
-                if matches and not has_i18n:
-                    hardcoded_found = True
-                    if len(hardcoded_examples) < 5:
-                        hardcoded_examples.append(f"{file_path.name}: {str(matches[0])[:40]}...")
+            if findings['has_i18n']:
+                files_with_i18n += 1
             
-            if hardcoded_found:
+            if findings['examples']:
                 files_with_hardcoded += 1
+                if emitter:
+                    emitter.findings("warning", findings['examples'], file=index.relpath(file_path),
+                                     kind="hardcoded_string")
+                hardcoded_examples.extend(findings['examples'][:5 - len(hardcoded_examples)])
                 
-        except:
+        except Exception:
             continue
     
-    passed.append(f"[OK] Analyzed {len(code_files)} code files")
+    passed.append(f"[OK] Analyzed {len(scanned & set(code_files))} code files")
     
     if files_with_i18n > 0:
         passed.append(f"[OK] {files_with_i18n} files use i18n")
@@ -194,22 +524,60 @@ def check_hardcoded_strings(project_path: Path) -> dict:
     else:
         passed.append("[OK] No obvious hardcoded strings detected")
     
-    return {'passed': passed, 'issues': issues}
+    return {'passed': passed, 'issues': issues, 'refs': file_refs}
+
+def open_caches(project_path: Path, since: Optional[str] = None,
+                use_cache: bool = True) -> Tuple[AuditCache, AuditCache]:
+    """(per-file code cache, flattened-locale cache) of the checker."""
+    index = get_project_index(project_path)
+    if since:
+        index = index.restrict_to_changes(since)
+    version = checker_version(__file__)
+    return (AuditCache(index, "i18n_checker", version, enabled=use_cache),
+            AuditCache(index, "i18n_checker.locales", version, enabled=use_cache))
 
 def main():
     target = sys.argv[1] if len(sys.argv) > 1 else "."
     project_path = Path(target)
+    emitter = open_emitter("i18n_checker", findings_flag(sys.argv))
     
     print("\n" + "=" * 60)
     print("  i18n CHECKER - Internationalization Audit")
     print("=" * 60 + "\n")
     
+    # Only changed files are re-analyzed (--since <ref> limits hardcoded-string reports to a git diff)
+    since, use_cache = incremental_flags(sys.argv)
+    code_cache, locale_cache = open_caches(project_path, since, use_cache)
+
     # Check locale files
     locale_files = find_locale_files(project_path)
-    locale_result = check_locale_completeness(locale_files)
+    locales = load_locales(locale_files, locale_cache)
+    locale_cache.save()
+    locale_result = check_locale_completeness(locales, len(locale_files))
+    for item in locale_result['issues']:
+        emitter.finding("critical" if item.startswith("[X]") else "warning", item, kind="locale")
     
-    # Check hardcoded strings
-    code_result = check_hardcoded_strings(project_path)
+    # Check hardcoded strings and index translation key references
+    code_result = check_hardcoded_strings(project_path, code_cache, emitter)
+    code_cache.save()
+    for item in code_result['issues']:
+        if item.startswith("["):  # example lines were already streamed per file
+            emitter.finding("critical" if item.startswith("[X]") else "warning", item, kind="code")
+
+    # Diff key usage against the locale trees
+    key_index = build_key_index(code_result['refs'])
+    usage_result = check_key_usage(key_index, locales)
+    details = usage_result['details']
+    for lang, missing in details['missing'].items():
+        for key, sites in missing.items():
+            emitter.finding("critical", f"Missing key {key} in {lang}", kind="missing_key",
+                            key=key, locale=lang, file=sites[0].rsplit(':', 1)[0], sites=sites)
+    for key in details['unused']:
+        emitter.finding("warning", f"Unused key {key}", kind="unused_key", key=key)
+    for lang, keys in details['untranslated'].items():
+        for key in keys:
+            emitter.finding("warning", f"Untranslated key {key} in {lang}", kind="untranslated_key",
+                            key=key, locale=lang)
     
     # Print results
     print("[LOCALE FILES]")
@@ -226,10 +594,20 @@ def main():
     for item in code_result['issues']:
         print(f"  {item}")
     
+    print("\n[KEY USAGE]")
+    print("-" * 40)
+    for item in usage_result['passed']:
+        print(f"  {item}")
+    for item in usage_result['issues']:
+        print(f"  {item}")
+
     # Summary
-    critical_issues = sum(1 for i in locale_result['issues'] + code_result['issues'] if i.startswith("[X]"))
+    critical_issues = sum(1 for i in locale_result['issues'] + code_result['issues'] + usage_result['issues']
+                          if i.startswith("[X]"))
     
     print("\n" + "=" * 60)
+    emitter.summary(passed=critical_issues == 0, critical_issues=critical_issues,
+                    keys_referenced=len(key_index['static']), keys_unused=len(details['unused']))
     if critical_issues == 0:
         print("[OK] i18n CHECK: PASSED")
         sys.exit(0)
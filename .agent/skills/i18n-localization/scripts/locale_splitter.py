@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Locale Splitter - Per-route message payloads for next-intl.
+
+The root layout hands the whole `messages/<locale>.json` dictionary to
+NextIntlClientProvider, so every page ships every translation. This tool
+measures what each page actually needs and emits split message files:
+
+- For each page under src/app, the client-side modules of the route
+  (next_routes.py: 'use client' boundaries, plus lazily loaded chunks) are
+  scanned for translation keys (i18n_checker.translation_refs). Computed
+  keys keep their whole prefix/namespace.
+- The key subset is resolved against each locale tree and measured as the
+  JSON payload the provider would serialize: full dictionary, only the
+  namespaces touched, only the keys used.
+- `--write[=<dir>]` writes `<dir>/<locale>/<namespace>.json` pruned to the
+  keys any client module uses, and `<dir>/manifest.json` mapping each
+  route to the namespaces it needs.
+
+Server components (getTranslations) read messages on the server and are not
+part of the client payload. Translators passed down as props cannot be
+resolved statically: check the manifest before wiring it into a layout.
+
+Usage: python locale_splitter.py <project_path> [--route=<substring>] [--write[=<dir>]]
+           [--json[=<file>]] [--no-cache]
+"""
+import bisect
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+# Shared file index, result cache, JS/TS import graph and App Router model (.agent/scripts/)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+# Key extraction and locale flattening of the i18n checker (same directory)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from audit_cache import AuditCache, checker_version
+from file_index import get_project_index
+from js_modules import SOURCE_EXTENSIONS, ImportGraph, is_jsx_file, module_info, tokenize
+from next_routes import discover_routes, find_app_dir, route_closure
+from i18n_checker import DEFAULT_LOCALE, find_locale_files, flatten_keys, locale_of, translation_refs
+
+SKIP_DIRS = {'node_modules', 'dist', 'build', '.next', 'out', 'coverage'}
+MAX_SOURCE_BYTES = 500_000
+DEFAULT_SPLIT_DIR = Path("messages") / "split"
+
+
+def payload_bytes(tree: dict) -> int:
+    """Size of a message tree as serialized into the page (compact JSON, UTF-8)."""
+    return len(json.dumps(tree, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def pick(tree: dict, keys: Set[str], prefix: str = '') -> dict:
+    """Sub-tree of `tree` holding only the flattened `keys`."""
+    picked = {}
+    for k, v in tree.items():
+        key = f"{prefix}.{k}" if prefix else k
+        if isinstance(v, dict):
+            sub = pick(v, keys, key)
+            if sub:
+                picked[k] = sub
+        elif key in keys:
+            picked[k] = v
+    return picked
+
+
+def resolve_keys(refs: List[dict], sorted_keys: List[str]) -> Set[str]:
+    """Leaf keys of a locale (sorted flattened keys) that translation references may read."""
+    leaves = set()
+    key_set = set(sorted_keys)
+
+    def under(prefix: str) -> List[str]:
+        if not prefix:
+            return sorted_keys
+        start = bisect.bisect_left(sorted_keys, prefix + '.')
+        end = bisect.bisect_left(sorted_keys, prefix + '/')  # '/' sorts right after '.'
+        return sorted_keys[start:end]
+
+    for ref in refs:
+        key = ref['key']
+        if ref['kind'] == 'static' and key in key_set:
+            leaves.add(key)
+        else:
+            # A parent key (t.raw('group')), a template prefix or a computed key's namespace
+            leaves.update(under(key))
+    return leaves
+
+
+class LocaleSplitter:
+    def __init__(self, project_path: str, use_cache: bool = True):
+        self.project_path = Path(project_path)
+        self.index = get_project_index(project_path)
+        self.cache = AuditCache(self.index, "locale_splitter",
+                                checker_version(__file__),
+                                enabled=use_cache)
+        self.modules: Dict[Path, dict] = {}
+        self.refs: Dict[Path, List[dict]] = {}
+        self.locales: Dict[str, dict] = {}
+        self.graph: Optional[ImportGraph] = None
+
+    def relpath(self, path: Path) -> str:
+        return self.index.relpath(path)
+
+    def load_locales(self):
+        """Nested message tree of every flat `messages/<locale>.json` file."""
+        for f in find_locale_files(self.project_path):
+            lang, namespace = locale_of(f)
+            if f.suffix != '.json' or namespace is not None:
+                continue  # per-namespace layouts are already split
+            try:
+                self.locales[lang] = json.loads(self.index.read(f))
+            except (OSError, ValueError):
+                continue
+
+    def build_graph(self, under: Optional[str] = None):
+        """Import graph and translation references of the app sources (cached per content hash)."""
+        for path in self.index.files(SOURCE_EXTENSIONS, skip_dirs=SKIP_DIRS, skip_hidden=True,
+                                     under=under, include_unchanged=True):
+            if path.name.endswith('.d.ts'):
+                continue
+            try:
+                if path.stat().st_size > MAX_SOURCE_BYTES:
+                    continue
+                content = self.index.read(path)
+            except OSError:
+                continue
+            entry = self.cache.get(path, content)
+            if entry is None:
+                jsx = is_jsx_file(path)
+                entry = {"module": module_info(tokenize(content, jsx), content),
+                         "refs": translation_refs(content, jsx) if 'Translations' in content else []}
+                self.cache.put(path, content, entry)
+            self.modules[path] = entry["module"]
+            if entry["refs"]:
+                self.refs[path] = entry["refs"]
+        self.cache.save()
+        self.graph = ImportGraph(self.index, self.modules)
+
+    def analyze(self, route_filter: Optional[str] = None) -> dict:
+        root = self.index.root
+        app_dir = find_app_dir(root)
+        self.load_locales()
+        if app_dir is None or not self.locales:
+            return {"app_dir": None if app_dir is None else self.relpath(app_dir),
+                    "locales": sorted(self.locales), "routes": []}
+        under = self.relpath(app_dir.parent) if app_dir.parent != root else None
+        self.build_graph(under)
+
+        base_lang = DEFAULT_LOCALE if DEFAULT_LOCALE in self.locales else sorted(self.locales)[0]
+        flat_keys = {lang: sorted(flatten_keys(tree)) for lang, tree in self.locales.items()}
+        full_bytes = {lang: payload_bytes(tree) for lang, tree in self.locales.items()}
+
+        routes = []
+        client_keys: Dict[str, Set[str]] = {lang: set() for lang in self.locales}
+        for route in discover_routes(app_dir, set(self.modules)):
+            if route["kind"] != "page" or (route_filter and route_filter not in route["route"]):
+                continue
+            closure = route_closure(self.graph, route["entries"])
+            client_modules = closure["client"] | closure["lazy"]
+            refs = [ref for path in client_modules for ref in self.refs.get(path, ())]
+            result = {"route": route["route"], "file": self.relpath(route["file"]),
+                      "client_modules": len(client_modules),
+                      "translating_modules": sum(1 for p in client_modules if p in self.refs),
+                      "locales": {}}
+            for lang, tree in self.locales.items():
+                keys = resolve_keys(refs, flat_keys[lang])
+                client_keys[lang] |= keys
+                namespaces = sorted({key.split('.', 1)[0] for key in keys})
+                key_bytes = payload_bytes(pick(tree, keys)) if keys else 0
+                result["locales"][lang] = {
+                    "keys": len(keys),
+                    "total_keys": len(flat_keys[lang]),
+                    "namespaces": namespaces,
+                    "full_bytes": full_bytes[lang],
+                    "namespace_bytes": payload_bytes({ns: tree[ns] for ns in namespaces if ns in tree}),
+                    "key_bytes": key_bytes,
+                    "saved_bytes": full_bytes[lang] - key_bytes,
+                }
+            routes.append(result)
+
+        routes.sort(key=lambda r: (-r["locales"][base_lang]["key_bytes"], r["route"]))
+        return {
+            "app_dir": self.relpath(app_dir),
+            "base_locale": base_lang,
+            "locales": sorted(self.locales),
+            "cache": self.cache.stats(),
+            "routes": routes,
+            "client_keys": {lang: sorted(keys) for lang, keys in client_keys.items()},
+        }
+
+    def write_split(self, report: dict, out_dir: Path) -> int:
+        """Per-locale, per-namespace message files pruned to client-used keys, plus the route manifest."""
+        written = 0
+        for lang, keys in report["client_keys"].items():
+            pruned = pick(self.locales[lang], set(keys))
+            for namespace, subtree in pruned.items():
+                target = out_dir / lang / f"{namespace}.json"
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_text(json.dumps({namespace: subtree}, ensure_ascii=False, indent=2) + "\n",
+                                  encoding='utf-8')
+                written += 1
+        base = report["base_locale"]
+        manifest = {r["route"]: {"file": r["file"], "namespaces": r["locales"][base]["namespaces"]}
+                    for r in sorted(report["routes"], key=lambda r: r["route"])}
+        (out_dir / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n",
+                                               encoding='utf-8')
+        return written
+
+
+def _kb(size: int) -> str:
+    return f"{size / 1024:.1f} KB"
+
+
+def print_report(report: dict, top: int = 20):
+    print("\n" + "=" * 78)
+    print("LOCALE PAYLOAD PER ROUTE (client messages, static analysis)")
+    print("=" * 78)
+    if not report["routes"]:
+        reason = "no app/ directory" if report["app_dir"] is None else "no flat messages/<locale>.json"
+        print(f"\n[!] Nothing to split: {reason}")
+        return
+    base = report["base_locale"]
+    routes = report["routes"]
+    full = routes[0]["locales"][base]["full_bytes"]
+    print(f"Locales: {', '.join(report['locales'])} | base {base}: {_kb(full)} sent to every page")
+    print(f"\n  {'Route':<42} {'Keys':>10} {'Namespaces':>11} {'Keys only':>10} {'Saved':>7}")
+    for route in routes[:top]:
+        stats = route["locales"][base]
+        saved = stats["saved_bytes"] / stats["full_bytes"] * 100 if stats["full_bytes"] else 0
+        print(f"  {route['route'][:42]:<42} {stats['keys']:>4}/{stats['total_keys']:<5} "
+              f"{_kb(stats['namespace_bytes']):>11} {_kb(stats['key_bytes']):>10} {saved:>6.0f}%")
+    if len(routes) > top:
+        print(f"  ... and {len(routes) - top} more route(s)")
+
+    total_full = sum(r["locales"][base]["full_bytes"] for r in routes)
+    total_saved = sum(r["locales"][base]["saved_bytes"] for r in routes)
+    print(f"\n[SUMMARY] {len(routes)} page(s): {_kb(total_saved)} of {_kb(total_full)} "
+          f"({total_saved / total_full * 100:.0f}%) of {base} message payload is unused by client code")
+    academy = [r for r in routes if '/academy' in r["route"]]
+    if academy:
+        saved = sum(r["locales"][base]["saved_bytes"] for r in academy) / len(academy)
+        print(f"  Academy pages ({len(academy)}): {_kb(saved)} saved per page load on average")
+    print("=" * 78)
+
+
+def _option(name: str) -> Optional[str]:
+    """Value of `--name` ('' when given without `=value`), None when absent."""
+    for arg in sys.argv[1:]:
+        if arg == name:
+            return ''
+        if arg.startswith(name + '='):
+            return arg.split('=', 1)[1]
+    return None
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if not args:
+        print("Usage: python locale_splitter.py <project_path> [--route=<substring>] [--write[=<dir>]] "
+              "[--json[=<file>]] [--no-cache]")
+        sys.exit(1)
+    project_path = args[0]
+    if not os.path.exists(project_path):
+        print(f"[ERROR] Path not found: {project_path}")
+        sys.exit(1)
+
+    splitter = LocaleSplitter(project_path, use_cache='--no-cache' not in sys.argv)
+    report = splitter.analyze(_option('--route'))
+
+    json_target = _option('--json')
+    if json_target == '':
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_report(report)
+        if json_target:
+            Path(json_target).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+            print(f"JSON report: {json_target}")
+
+    write = _option('--write')
+    if write is not None and report["routes"]:
+        out_dir = Path(write) if write else splitter.index.root / DEFAULT_SPLIT_DIR
+        written = splitter.write_split(report, out_dir)
+        print(f"Wrote {written} namespace file(s) and manifest.json to {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,34 @@
 """
 Type Coverage Checker - Measures TypeScript/Python type coverage.
 Identifies untyped functions, any usage, and type safety issues.
+
+Every file is analysed (TypeScript through the shared tokenizer, Python through
+`ast`, so multi-line signatures count like any other); per-file stats are
+cached by content hash and cache misses are computed in a process pool.
+Coverage is rolled up per directory, and `--record` appends the run to a
+trend history that `--fail-on-regression` compares against (CI gate for
+GATED_DIRECTORIES, or the `--gate` list; a gated directory without any
+measured function fails the gate rather than passing it unchecked).
+
+Usage: python type_coverage.py <project_path> [--record] [--fail-on-regression]
+           [--gate=src/lib,src/app/api] [--history=<file>] [--no-cache] [--jsonl[=<file>]]
 """
+import ast
+import json
+import multiprocessing
+import os
 import sys
-import re
-import subprocess
+import time
 from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Shared file walker, incremental result cache, JS/TS tokenizer and commit lookup (.agent/scripts/)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from file_index import get_project_index
+from audit_cache import AuditCache, checker_version, incremental_flags
+from findings_stream import findings_flag, open_emitter
+from metric_history import git_commit
+from js_modules import NAME, PUNCT, JSX_ATTR, matching_brackets, tokenize
 
 # Fix Windows console encoding for Unicode output
 try:
@@ -15,41 +38,367 @@ try:
 except AttributeError:
     pass  # Python < 3.7
 
-def check_typescript_coverage(project_path: Path) -> dict:
-    """Check TypeScript type coverage."""
+# Trend history, one JSON record per recorded run (meant to be committed or kept as a CI artifact)
+HISTORY_FILE = Path(".agent") / "type_coverage_history.jsonl"
+# Directories whose coverage may not regress in CI (--fail-on-regression)
+GATED_DIRECTORIES = ("src/lib", "src/app/api")
+# Allowed coverage drop (percentage points) before a gated directory counts as regressed
+REGRESSION_TOLERANCE = 0.5
+# Directory depth of the per-directory rollup kept in the report and history
+DIRECTORY_DEPTH = 2
+# Files with fewer cache misses than this are analysed in-process (pool startup costs more)
+PARALLEL_MIN_FILES = 64
+
+PYTHON_SKIP = ['venv', '__pycache__', '.git', 'node_modules']
+_TS_KEYWORDS = {'if', 'for', 'while', 'switch', 'catch', 'with', 'return', 'function', 'typeof',
+                'await', 'yield', 'new', 'delete', 'void', 'in', 'of', 'instanceof', 'super', 'import'}
+_ANY_CONTEXT = {':', '<', '|', '&', ',', '(', '[', '=>'}
+# Tokens that may follow a type annotation
+_TYPE_END = {';', ',', '}', ')', ']', '=', '>', '>>', '>>>', '|', '&'}
+
+
+# ============================================================================
+#  TYPESCRIPT
+# ============================================================================
+
+def _skip_type(tokens, match: Dict[int, int], i: int) -> int:
+    """Index just past the type annotation starting at tokens[i]."""
+    n = len(tokens)
+    start = i
+    angle = 0
+    while i < n:
+        token = tokens[i]
+        if token.kind == PUNCT:
+            value = token.value
+            expecting = i == start or (tokens[i - 1].kind == PUNCT and tokens[i - 1].value in (':', '|', '&', '<', ',', '=>'))
+            if value in ('(', '[', '{') and i in match and (expecting or angle or value == '['):
+                i = match[i] + 1
+                continue
+            if value == '<':
+                angle += 1
+            elif value in ('>', '>>', '>>>') and angle:
+                angle = max(0, angle - len(value))
+            elif value == '=>' and (angle or match.get(start) == i - 1):
+                pass  # function type: (a: A) => B
+            elif value in ('|', '&', '.', '?', '[', ']') or (value == ',' and angle):
+                pass
+            elif angle and value in (':', '=', '...'):
+                pass
+            else:
+                return i
+        elif token.kind == NAME and i > 0 and tokens[i - 1].kind == NAME \
+                and tokens[i - 1].value not in ('typeof', 'keyof', 'readonly', 'unique', 'infer', 'is', 'asserts'):
+            return i
+        i += 1
+    return i
+
+
+def _params_typed(tokens, match: Dict[int, int], lo: int, hi: int) -> bool:
+    """Whether every parameter in the token range (lo, hi) has a type annotation or a default."""
+    annotated = True
+    seen_param = False
+    i = lo + 1
+    while i < hi:
+        token = tokens[i]
+        if token.kind == PUNCT and token.value == ',':
+            if seen_param and not annotated:
+                return False
+            annotated, seen_param = False, False
+        elif token.kind == PUNCT and token.value in (':', '='):
+            annotated = True
+            seen_param = True
+        else:
+            if not seen_param and not (token.kind == NAME and token.value == 'this'):
+                annotated = False
+            seen_param = True
+        end = match.get(i)
+        i = (end if end is not None else i) + 1
+    return annotated or not seen_param
+
+
+def _declared_type(tokens, i: int) -> bool:
+    """Whether the `=` at tokens[i] assigns a variable declared with a type (`const f: Handler = ...`)."""
+    k = i - 1
+    while k >= 0 and i - k < 40:
+        token = tokens[k]
+        if token.kind == NAME and token.value in ('const', 'let', 'var'):
+            return any(t.kind == PUNCT and t.value == ':' for t in tokens[k + 1:i])
+        if token.kind == PUNCT and token.value in (';', '{', '}'):
+            return False
+        k -= 1
+    return False
+
+
+def _contextual(tokens, start: int) -> bool:
+    """Whether a function expression starting at tokens[start] gets its types from its context."""
+    k = start - 1
+    if k >= 0 and tokens[k].kind == NAME and tokens[k].value == 'async':
+        k -= 1
+    if k < 0:
+        return False
+    prev = tokens[k]
+    if prev.kind != PUNCT:
+        return False
+    if prev.value in ('(', ','):
+        return True  # callback argument
+    if prev.value == '{' and k > 0 and tokens[k - 1].kind == JSX_ATTR:
+        return True  # JSX event handler
+    if prev.value == '=':
+        return _declared_type(tokens, k)
+    return False
+
+
+def _type_arrow(tokens, match: Dict[int, int], start: int, arrow: int) -> bool:
+    """Whether the arrow `(...) => X` at tokens[start:arrow + 1] is a function type, not a function."""
+    k = start - 1
+    if k < 0 or tokens[k].kind != PUNCT:
+        return False
+    if tokens[k].value == '=':
+        # type Handler = (e: Event) => void
+        if not (k >= 2 and tokens[k - 1].kind == NAME and tokens[k - 2].kind == NAME and tokens[k - 2].value == 'type'):
+            return False
+    elif tokens[k].value not in (':', '|', '&', '<', ',', '=>'):
+        return False
+    if arrow + 1 >= len(tokens) or (tokens[arrow + 1].kind == PUNCT and tokens[arrow + 1].value == '{'):
+        return False  # a block body
+    end = _skip_type(tokens, match, arrow + 1)
+    return end >= len(tokens) or (tokens[end].kind == PUNCT and tokens[end].value in _TYPE_END)
+
+
+def typescript_file_stats(content: str, jsx: bool = True) -> dict:
+    """Type stats of a single TypeScript file (the unit stored in the audit cache)."""
+    tokens = tokenize(content, jsx)
+    match = matching_brackets(tokens)
+    n = len(tokens)
+    any_count = 0
+    typed = untyped = contextual = explicit_returns = 0
+
+    def record(start: int, params: Tuple[int, int], returns: bool, expression: bool):
+        nonlocal typed, untyped, contextual, explicit_returns
+        if returns:
+            explicit_returns += 1
+        if expression and not returns and _contextual(tokens, start):
+            contextual += 1
+        elif params is None or _params_typed(tokens, match, *params):
+            typed += 1
+        else:
+            untyped += 1
+
+    for i, token in enumerate(tokens):
+        if token.kind == NAME:
+            if token.value == 'any' and i > 0 and (
+                    (tokens[i - 1].kind == PUNCT and tokens[i - 1].value in _ANY_CONTEXT)
+                    or (tokens[i - 1].kind == NAME and tokens[i - 1].value in ('as', 'keyof', 'readonly'))):
+                if not (i + 1 < n and tokens[i + 1].kind == PUNCT and tokens[i + 1].value in ('(', '.', '=')):
+                    any_count += 1
+            elif token.value == 'function' and not (i > 0 and tokens[i - 1].kind == PUNCT and tokens[i - 1].value == '.'):
+                # function name<T>(params): R { / function (params) {
+                k = i + 1
+                if k < n and tokens[k].kind == PUNCT and tokens[k].value == '*':
+                    k += 1
+                named = k < n and tokens[k].kind == NAME
+                if named:
+                    k += 1
+                if k < n and tokens[k].kind == PUNCT and tokens[k].value == '<':
+                    k = _skip_type(tokens, match, k)
+                if k >= n or not (tokens[k].kind == PUNCT and tokens[k].value == '(') or k not in match:
+                    continue
+                close = match[k]
+                returns = close + 1 < n and tokens[close + 1].kind == PUNCT and tokens[close + 1].value == ':'
+                start = i - 1 if i > 0 and tokens[i - 1].kind == NAME and tokens[i - 1].value == 'async' else i
+                record(start, (k, close), returns, expression=not named or (
+                    start > 0 and tokens[start - 1].kind == PUNCT and tokens[start - 1].value in ('(', ',', '=')))
+            elif i + 1 < n and tokens[i + 1].kind == PUNCT and tokens[i + 1].value == '=>':
+                # x => ...: a lone parameter cannot carry an annotation
+                if not (i > 0 and tokens[i - 1].kind == PUNCT and tokens[i - 1].value == '.'):
+                    if not _type_arrow(tokens, match, i, i + 1):
+                        record(i, (i - 1, i + 1), False, expression=True)
+            continue
+
+        if token.kind != PUNCT or token.value != '(' or i not in match:
+            continue
+        close = match[i]
+        after = close + 1
+        returns = False
+        if after < n and tokens[after].kind == PUNCT and tokens[after].value == ':':
+            end = _skip_type(tokens, match, after + 1)
+            if end < n and tokens[end].kind == PUNCT and tokens[end].value in ('=>', '{'):
+                returns = True
+                after = end
+        if after >= n or tokens[after].kind != PUNCT:
+            continue
+        prev = tokens[i - 1] if i > 0 else None
+        if tokens[after].value == '=>':
+            # (params) => / async (params) => / <T>(params) =>
+            start = i
+            if prev is not None and prev.kind == PUNCT and prev.value in ('>', '>>'):
+                continue  # generic arrow: counted the same, rare enough to skip
+            if prev is not None and prev.kind == NAME and prev.value not in ('async',):
+                continue  # call followed by => is not valid; be safe
+            if returns or not _type_arrow(tokens, match, start, after):
+                record(start, (i, close), returns, expression=True)
+        elif tokens[after].value == '{' and prev is not None and prev.kind == NAME \
+                and prev.value not in _TS_KEYWORDS and prev.value != 'function' \
+                and not (i > 1 and tokens[i - 2].kind == NAME and tokens[i - 2].value == 'function') \
+                and not (i > 1 and tokens[i - 2].kind == PUNCT and tokens[i - 2].value in ('.', '?.')):
+            # method(params) { ... } in a class or object literal
+            record(i - 1, (i, close), returns, expression=False)
+
+    return {'any_count': any_count, 'typed_functions': typed, 'untyped_functions': untyped,
+            'total_functions': typed + untyped, 'contextual_functions': contextual,
+            'explicit_returns': explicit_returns}
+
+
+# ============================================================================
+#  PYTHON
+# ============================================================================
+
+def _annotation_any(node) -> int:
+    return sum(1 for sub in ast.walk(node) if (isinstance(sub, ast.Name) and sub.id == 'Any')
+               or (isinstance(sub, ast.Attribute) and sub.attr == 'Any'))
+
+
+def python_file_stats(content: str) -> dict:
+    """Type-hint stats of a single Python file (the unit stored in the audit cache)."""
+    stats = {'any_count': 0, 'typed_functions': 0, 'partial_functions': 0,
+             'untyped_functions': 0, 'total_functions': 0, 'syntax_error': False}
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        stats['syntax_error'] = True
+        return stats
+
+    methods = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            methods.update(id(child) for child in node.body
+                           if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)))
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.AnnAssign):
+            stats['any_count'] += _annotation_any(node.annotation)
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        args = node.args
+        params = args.posonlyargs + args.args + args.kwonlyargs
+        if id(node) in methods and params and not any(
+                isinstance(d, ast.Name) and d.id == 'staticmethod' for d in node.decorator_list):
+            params = params[1:]  # self / cls
+        params += [a for a in (args.vararg, args.kwarg) if a is not None]
+        annotations = [p.annotation for p in params if p.annotation is not None]
+        # __init__ and friends return None by definition
+        needs_return = node.name not in ('__init__', '__init_subclass__', '__post_init__')
+        slots = len(params) + (1 if needs_return else 0)
+        filled = len(annotations) + (1 if needs_return and node.returns is not None else 0)
+        stats['any_count'] += sum(_annotation_any(a) for a in annotations)
+        if node.returns is not None:
+            stats['any_count'] += _annotation_any(node.returns)
+
+        stats['total_functions'] += 1
+        if filled == slots:
+            stats['typed_functions'] += 1
+        elif filled:
+            stats['partial_functions'] += 1
+    stats['untyped_functions'] = stats['total_functions'] - stats['typed_functions']
+    return stats
+
+
+# ============================================================================
+#  COLLECTION
+# ============================================================================
+
+def _stats_job(job) -> dict:
+    """Pool worker: stats of one file."""
+    language, content, jsx = job
+    if language == 'typescript':
+        return typescript_file_stats(content, jsx)
+    return python_file_stats(content)
+
+
+def _run_jobs(jobs: list, workers: Optional[int] = None) -> Iterator[dict]:
+    """Results of `jobs` in order, sharded across a process pool when worthwhile."""
+    workers = max(1, workers or os.cpu_count() or 1)
+    # Checks run by check_runner.py live in daemonic pool workers, which cannot fork a pool
+    if workers == 1 or len(jobs) < PARALLEL_MIN_FILES or multiprocessing.current_process().daemon:
+        yield from map(_stats_job, jobs)
+        return
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with multiprocessing.Pool(processes=workers) as pool:
+        yield from pool.imap(_stats_job, jobs, chunksize=chunksize)
+
+
+def collect_stats(index, language: str, files: List[Path], cache: AuditCache = None,
+                  workers: Optional[int] = None) -> Dict[str, dict]:
+    """Per-file stats (relative path -> stats): cached entries reused, the rest computed in parallel."""
+    results: Dict[str, dict] = {}
+    misses = []
+    for path in files:
+        try:
+            content = index.read(path)
+        except OSError:
+            continue
+        stats = cache.get(path, content) if cache else None
+        if stats is None:
+            misses.append((path, content))
+        else:
+            results[index.relpath(path)] = stats
+    jobs = [(language, content, path.suffix.lower() == '.tsx') for path, content in misses]
+    for (path, content), stats in zip(misses, _run_jobs(jobs, workers)):
+        if cache:
+            cache.put(path, content, stats)
+        results[index.relpath(path)] = stats
+    return results
+
+
+def _directories(relpath: str, depth: int) -> List[str]:
+    parts = Path(relpath).parts[:-1]
+    return ['.'] + ['/'.join(parts[:i]) for i in range(1, min(depth, len(parts)) + 1)]
+
+
+def rollup(file_stats: Dict[str, dict], depth: int = DIRECTORY_DEPTH,
+           extra: Tuple[str, ...] = GATED_DIRECTORIES) -> Dict[str, dict]:
+    """Per-directory totals (files, typed, total, any, coverage) for directories up to `depth`, plus `extra`."""
+    dirs: Dict[str, dict] = {}
+    for relpath, stats in file_stats.items():
+        rel = relpath.replace(os.sep, '/')
+        keys = set(_directories(rel, depth))
+        keys.update(d for d in extra if rel.startswith(d + '/'))
+        for key in keys:
+            entry = dirs.setdefault(key, {'files': 0, 'typed': 0, 'total': 0, 'any': 0})
+            entry['files'] += 1
+            entry['typed'] += stats['typed_functions']
+            entry['total'] += stats['total_functions']
+            entry['any'] += stats['any_count']
+    for entry in dirs.values():
+        entry['coverage'] = round(entry['typed'] / entry['total'] * 100, 2) if entry['total'] else None
+    return dict(sorted(dirs.items()))
+
+
+def _totals(file_stats: Dict[str, dict], keys: List[str]) -> dict:
+    totals = dict.fromkeys(keys, 0)
+    for stats in file_stats.values():
+        for key in keys:
+            totals[key] += stats.get(key, 0)
+    return totals
+
+
+def check_typescript_coverage(project_path: Path, cache: AuditCache = None,
+                              gated: Tuple[str, ...] = GATED_DIRECTORIES) -> dict:
+    """Check TypeScript type coverage (directory rollup includes the `gated` directories)."""
     issues = []
     passed = []
-    stats = {'any_count': 0, 'untyped_functions': 0, 'total_functions': 0}
-    
-    ts_files = list(project_path.rglob("*.ts")) + list(project_path.rglob("*.tsx"))
-    ts_files = [f for f in ts_files if 'node_modules' not in str(f) and '.d.ts' not in str(f)]
-    
+
+    index = get_project_index(project_path)
+    ts_files = [f for f in index.files({'.ts', '.tsx'}, include_unchanged=True) if not f.name.endswith('.d.ts')]
+
     if not ts_files:
-        return {'type': 'typescript', 'files': 0, 'passed': [], 'issues': ["[!] No TypeScript files found"], 'stats': stats}
-    
-    for file_path in ts_files[:30]:  # Limit
-        try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            
-            # Count 'any' usage
-            any_matches = re.findall(r':\s*any\b', content)
-            stats['any_count'] += len(any_matches)
-            
-            # Find functions without return types
-            # function name(params) { - no return type
-            untyped = re.findall(r'function\s+\w+\s*\([^)]*\)\s*{', content)
-            # Arrow functions without types: const fn = (x) => or (x) =>
-            untyped += re.findall(r'=\s*\([^:)]*\)\s*=>', content)
-            stats['untyped_functions'] += len(untyped)
-            
-            # Count typed functions
-            typed = re.findall(r'function\s+\w+\s*\([^)]*\)\s*:\s*\w+', content)
-            typed += re.findall(r':\s*\([^)]*\)\s*=>\s*\w+', content)
-            stats['total_functions'] += len(typed) + len(untyped)
-            
-        except Exception:
-            continue
-    
+        return {'type': 'typescript', 'files': 0, 'passed': [], 'issues': ["[!] No TypeScript files found"],
+                'stats': {}, 'directories': {}}
+
+    file_stats = collect_stats(index, 'typescript', ts_files, cache)
+    stats = _totals(file_stats, ['any_count', 'typed_functions', 'untyped_functions', 'total_functions',
+                                 'contextual_functions', 'explicit_returns'])
+
     # Analyze results
     if stats['any_count'] == 0:
         passed.append("[OK] No 'any' types found")
@@ -57,98 +406,189 @@ def check_typescript_coverage(project_path: Path) -> dict:
         issues.append(f"[!] {stats['any_count']} 'any' types found (acceptable)")
     else:
         issues.append(f"[X] {stats['any_count']} 'any' types found (too many)")
-    
+
     if stats['total_functions'] > 0:
-        typed_ratio = (stats['total_functions'] - stats['untyped_functions']) / stats['total_functions'] * 100
+        typed_ratio = stats['typed_functions'] / stats['total_functions'] * 100
         if typed_ratio >= 80:
             passed.append(f"[OK] Type coverage: {typed_ratio:.0f}%")
         elif typed_ratio >= 50:
             issues.append(f"[!] Type coverage: {typed_ratio:.0f}% (improve)")
         else:
             issues.append(f"[X] Type coverage: {typed_ratio:.0f}% (too low)")
-    
-    passed.append(f"[OK] Analyzed {len(ts_files)} TypeScript files")
-    
-    return {'type': 'typescript', 'files': len(ts_files), 'passed': passed, 'issues': issues, 'stats': stats}
 
-def check_python_coverage(project_path: Path) -> dict:
-    """Check Python type hints coverage."""
+    passed.append(f"[OK] Analyzed {len(file_stats)} TypeScript files "
+                  f"({stats['contextual_functions']} contextually typed callbacks not counted)")
+
+    return {'type': 'typescript', 'files': len(file_stats), 'passed': passed, 'issues': issues,
+            'stats': stats, 'directories': rollup(file_stats, extra=gated)}
+
+def check_python_coverage(project_path: Path, cache: AuditCache = None,
+                          gated: Tuple[str, ...] = GATED_DIRECTORIES) -> dict:
+    """Check Python type hints coverage (directory rollup includes the `gated` directories)."""
     issues = []
     passed = []
-    stats = {'untyped_functions': 0, 'typed_functions': 0, 'any_count': 0}
-    
-    py_files = list(project_path.rglob("*.py"))
-    py_files = [f for f in py_files if not any(x in str(f) for x in ['venv', '__pycache__', '.git', 'node_modules'])]
-    
+
+    index = get_project_index(project_path)
+    py_files = [f for f in index.files({'.py'}, include_unchanged=True)
+                if not any(x in index.relpath(f) for x in PYTHON_SKIP)]
+
     if not py_files:
-        return {'type': 'python', 'files': 0, 'passed': [], 'issues': ["[!] No Python files found"], 'stats': stats}
-    
-    for file_path in py_files[:30]:  # Limit
-        try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            
-            # Count Any usage
-            any_matches = re.findall(r':\s*Any\b', content)
-            stats['any_count'] += len(any_matches)
-            
-            # Find functions with type hints
-            typed_funcs = re.findall(r'def\s+\w+\s*\([^)]*:[^)]+\)', content)
-            typed_funcs += re.findall(r'def\s+\w+\s*\([^)]*\)\s*->', content)
-            stats['typed_functions'] += len(typed_funcs)
-            
-            # Find functions without type hints
-            all_funcs = re.findall(r'def\s+\w+\s*\(', content)
-            stats['untyped_functions'] += len(all_funcs) - len(typed_funcs)
-            
-        except Exception:
-            continue
-    
-    total = stats['typed_functions'] + stats['untyped_functions']
-    
+        return {'type': 'python', 'files': 0, 'passed': [], 'issues': ["[!] No Python files found"],
+                'stats': {}, 'directories': {}}
+
+    file_stats = collect_stats(index, 'python', py_files, cache)
+    stats = _totals(file_stats, ['any_count', 'typed_functions', 'partial_functions', 'untyped_functions',
+                                 'total_functions', 'syntax_error'])
+    total = stats['total_functions']
+
     if total > 0:
         typed_ratio = stats['typed_functions'] / total * 100
         if typed_ratio >= 70:
             passed.append(f"[OK] Type hints coverage: {typed_ratio:.0f}%")
         elif typed_ratio >= 40:
-            issues.append(f"[!] Type hints coverage: {typed_ratio:.0f}%")
+            issues.append(f"[!] Type hints coverage: {typed_ratio:.0f}% ({stats['partial_functions']} partially typed)")
         else:
             issues.append(f"[X] Type hints coverage: {typed_ratio:.0f}% (add type hints)")
-    
+
     if stats['any_count'] == 0:
         passed.append("[OK] No 'Any' types found")
     elif stats['any_count'] <= 3:
         issues.append(f"[!] {stats['any_count']} 'Any' types found")
     else:
         issues.append(f"[X] {stats['any_count']} 'Any' types found")
-    
-    passed.append(f"[OK] Analyzed {len(py_files)} Python files")
-    
-    return {'type': 'python', 'files': len(py_files), 'passed': passed, 'issues': issues, 'stats': stats}
+
+    if stats['syntax_error']:
+        issues.append(f"[!] {stats['syntax_error']} Python file(s) could not be parsed")
+    passed.append(f"[OK] Analyzed {len(file_stats)} Python files")
+
+    return {'type': 'python', 'files': len(file_stats), 'passed': passed, 'issues': issues,
+            'stats': stats, 'directories': rollup(file_stats, extra=gated)}
+
+
+# ============================================================================
+#  TREND HISTORY
+# ============================================================================
+
+def load_history(path: Path) -> List[dict]:
+    """Recorded runs, oldest first (unreadable lines skipped)."""
+    records = []
+    try:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return records
+
+
+def history_record(project_path: Path, results: List[dict]) -> dict:
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": git_commit(project_path),
+        "languages": {r['type']: {"files": r['files'], **r['stats']} for r in results},
+        "directories": {r['type']: r['directories'] for r in results},
+    }
+
+
+def append_history(path: Path, record: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def find_regressions(current: dict, baseline: dict, gated: Tuple[str, ...]) -> List[str]:
+    """Gated directories whose coverage dropped (beyond REGRESSION_TOLERANCE) or whose `any` count grew."""
+    regressions = []
+    for language, dirs in current["directories"].items():
+        before_dirs = baseline.get("directories", {}).get(language, {})
+        for directory in gated:
+            now, before = dirs.get(directory), before_dirs.get(directory)
+            if not now or not before:
+                continue
+            if now['coverage'] is not None and before.get('coverage') is not None \
+                    and now['coverage'] < before['coverage'] - REGRESSION_TOLERANCE:
+                regressions.append(f"{directory} ({language}): coverage {before['coverage']:.1f}% -> "
+                                   f"{now['coverage']:.1f}%")
+            if now['any'] > before.get('any', 0):
+                regressions.append(f"{directory} ({language}): 'any' types {before.get('any', 0)} -> {now['any']}")
+    return regressions
+
+
+def missing_gated(current: dict, gated: Tuple[str, ...]) -> List[str]:
+    """Gated directories without a rollup entry in any language (typo, moved, or no functions)."""
+    present = {d for dirs in current["directories"].values() for d, entry in dirs.items() if entry['total']}
+    return [d for d in gated if d not in present]
+
+
+def _option(argv: List[str], name: str) -> Optional[str]:
+    for i, arg in enumerate(argv):
+        if arg == name and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith(name + "="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+def _print_directories(result: dict, gated: Tuple[str, ...], baseline: Optional[dict]):
+    before_dirs = (baseline or {}).get("directories", {}).get(result['type'], {})
+    print(f"  {'Directory':<36} {'Files':>6} {'Typed':>12} {'Cover':>7} {'Any':>5} {'Trend':>8}")
+    for directory, entry in result['directories'].items():
+        if directory.count('/') >= DIRECTORY_DEPTH - 1 and directory not in gated and directory != '.':
+            if entry['total'] < 20:
+                continue  # keep the table short: small leaves are in --jsonl/history
+        coverage = f"{entry['coverage']:.0f}%" if entry['coverage'] is not None else "-"
+        trend = ""
+        before = before_dirs.get(directory)
+        if before and before.get('coverage') is not None and entry['coverage'] is not None:
+            trend = f"{entry['coverage'] - before['coverage']:+.1f}"
+        marker = "*" if directory in gated else " "
+        print(f" {marker}{directory[:36]:<36} {entry['files']:>6} {entry['typed']:>5}/{entry['total']:<6} "
+              f"{coverage:>7} {entry['any']:>5} {trend:>8}")
+
 
 def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
+    target = sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].startswith('--') else "."
     project_path = Path(target)
-    
+    emitter = open_emitter("type_coverage", findings_flag(sys.argv))
+    gate = _option(sys.argv, "--gate")
+    gated = tuple(d.strip().strip('/') for d in gate.split(',') if d.strip()) if gate else GATED_DIRECTORIES
+    history_path = Path(_option(sys.argv, "--history") or project_path / HISTORY_FILE)
+
     print("\n" + "=" * 60)
     print("  TYPE COVERAGE CHECKER")
     print("=" * 60 + "\n")
-    
+
     results = []
-    
+
+    # Coverage is a whole-tree measure: every file is counted, unchanged ones straight from the cache
+    # (--since is accepted for check_runner.py compatibility)
+    _since, use_cache = incremental_flags(sys.argv)
+    index = get_project_index(project_path)
+    cache = AuditCache(index, "type_coverage", checker_version(__file__), enabled=use_cache)
+
     # Check TypeScript
-    ts_result = check_typescript_coverage(project_path)
+    ts_result = check_typescript_coverage(project_path, cache, gated)
     if ts_result['files'] > 0:
         results.append(ts_result)
-    
+
     # Check Python
-    py_result = check_python_coverage(project_path)
+    py_result = check_python_coverage(project_path, cache, gated)
     if py_result['files'] > 0:
         results.append(py_result)
-    
+
+    cache.save()
+
     if not results:
         print("[!] No TypeScript or Python files found.")
+        emitter.summary(passed=True, critical_issues=0)
         sys.exit(0)
-    
+
+    history = load_history(history_path)
+    baseline = history[-1] if history else None
+
     # Print results
     critical_issues = 0
     for result in results:
@@ -160,8 +600,47 @@ def main():
             print(f"  {item}")
             if item.startswith("[X]"):
                 critical_issues += 1
-    
+            emitter.finding("critical" if item.startswith("[X]") else "warning", item,
+                            language=result['type'], stats=result['stats'])
+        print()
+        _print_directories(result, gated, baseline)
+
+    record = history_record(project_path, results)
+    regressions = find_regressions(record, baseline, gated) if baseline else []
+    # A gate that matches nothing would always pass: report it instead
+    missing = missing_gated(record, gated)
+    for directory in missing:
+        print(f"\n[!] Gated directory '{directory}' has no typed functions to measure")
+        emitter.finding("warning", f"Gated directory '{directory}' has no typed functions to measure",
+                        directory=directory)
+    if baseline:
+        since_label = baseline.get('commit') or baseline.get('timestamp')
+        print(f"\n[TREND] Compared with the run recorded at {since_label}")
+        for regression in regressions:
+            print(f"  [X] Regression: {regression}")
+            emitter.finding("regression", regression)
+        for directory in gated:
+            if directory not in missing and not any(directory in dirs for dirs in baseline.get("directories", {}).values()):
+                print(f"  [!] {directory}: not in the baseline run, compared from the next recorded run")
+        if not regressions:
+            print(f"  [OK] No regression in {', '.join(d for d in gated if d not in missing) or '-'}")
+    else:
+        print(f"\n[TREND] No history yet ({index.relpath(history_path)}): run with --record to start one")
+
+    if '--record' in sys.argv:
+        append_history(history_path, record)
+        print(f"  Recorded this run in {index.relpath(history_path)}")
+
+    failed_gate = bool(regressions or missing) and '--fail-on-regression' in sys.argv
     print("\n" + "=" * 60)
+    emitter.summary(passed=critical_issues == 0 and not failed_gate, critical_issues=critical_issues,
+                    regressions=len(regressions), missing_gates=missing)
+    if failed_gate:
+        if missing:
+            print(f"[X] TYPE COVERAGE: gated directory not found: {', '.join(missing)}")
+        if regressions:
+            print(f"[X] TYPE COVERAGE: {len(regressions)} regression(s) in {', '.join(gated)}")
+        sys.exit(1)
     if critical_issues == 0:
         print("[OK] TYPE COVERAGE: ACCEPTABLE")
         sys.exit(0)
@@ -69,32 +69,82 @@ import sys
 import os
 import re
 import json
+import mmap
 from pathlib import Path
+from typing import Optional
+
+# Shared file walker + incremental result cache (.agent/scripts/file_index.py, audit_cache.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from audit_cache import incremental_flags, open_incremental
+from findings_stream import FindingsEmitter, finding_count, findings_flag, open_emitter
+
+# Framework markers, grouped per framework. A file without any of them is not
+# mobile code and is skipped before it is decoded or hashed.
+FRAMEWORK_MARKERS = {
+    'react-native': ('react-native', '@react-navigation', 'React.Native'),
+    'flutter': ("import 'package:flutter", 'MaterialApp', 'Widget.build'),
+}
+_FRAMEWORK_BYTES = {
+    framework: tuple(marker.encode('ascii') for marker in markers)
+    for framework, markers in FRAMEWORK_MARKERS.items()
+}
+
+
+def detect_framework(content: str) -> Optional[str]:
+    """'react-native', 'flutter' or None (React Native wins when both match)."""
+    for framework, markers in FRAMEWORK_MARKERS.items():
+        if any(marker in content for marker in markers):
+            return framework
+    return None
+
+
+def detect_framework_file(path) -> Optional[str]:
+    """
+    Same as detect_framework(), on the raw bytes of a file (mmap, no decoding).
+
+    The markers are ASCII, so a byte search matches exactly where a search of
+    the UTF-8 decoded text would. Raises OSError if the file cannot be read.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for framework, markers in _FRAMEWORK_BYTES.items():
+                if any(data.find(marker) != -1 for marker in markers):
+                    return framework
+    return None
+
 
 class MobileAuditor:
-    def __init__(self):
-        self.issues = []
-        self.warnings = []
+    def __init__(self, emitter: FindingsEmitter = None):
+        self.emitter = emitter or open_emitter("mobile_audit", None)
+        # Bounded while findings are streamed: the stream has all of them
+        self.issues = self.emitter.report_list()
+        self.warnings = self.emitter.report_list()
         self.passed_count = 0
         self.files_checked = 0
 
-    def audit_file(self, filepath: str) -> None:
-        try:
-            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-        except:
-            return
+    def audit_file(self, filepath: str, content: str = None, framework: str = None) -> None:
+        if content is None:
+            try:
+                with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+                    content = f.read()
+            except:
+                return
 
         self.files_checked += 1
         filename = os.path.basename(filepath)
 
-        # Detect framework
-        is_react_native = bool(re.search(r'react-native|@react-navigation|React\.Native', content))
-        is_flutter = bool(re.search(r'import \'package:flutter|MaterialApp|Widget\.build', content))
-
-        if not (is_react_native or is_flutter):
+        # Detect framework (audit_directory already knows it from the byte prefilter)
+        if framework is None:
+            framework = detect_framework(content)
+        if framework is None:
             return  # Skip non-mobile files
 
+        # Shared checks run for every framework; React Native rules are grouped
+        # under is_react_native, so Flutter files never evaluate them.
+        is_react_native = framework == 'react-native'
+
         # --- 1. TOUCH PSYCHOLOGY CHECKS ---
 
         # 1.1 Touch Target Size Check
@@ -610,21 +660,59 @@ class MobileAuditor:
             # This is more of a configuration check, not code pattern
             self.passed_count += 1  # Hermes is default in RN 0.70+
 
-    def audit_directory(self, directory: str) -> None:
+    def audit_directory(self, directory: str, since: str = None, use_cache: bool = True) -> None:
         extensions = {'.tsx', '.ts', '.jsx', '.js', '.dart'}
-        for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if d not in {'node_modules', '.git', 'dist', 'build', '.next', 'ios', 'android', 'build', '.idea'}]
-            for file in files:
-                if Path(file).suffix in extensions:
-                    self.audit_file(os.path.join(root, file))
+        skip_dirs = {'node_modules', '.git', 'dist', 'build', '.next', 'ios', 'android', '.idea'}
+        index, cache = open_incremental(directory, "mobile_audit", __file__, since, use_cache)
+        for path in index.files(extensions, skip_dirs=skip_dirs):
+            # Cheap prefilter: non-mobile files are never decoded, hashed or audited
+            try:
+                framework = detect_framework_file(path)
+            except OSError:
+                continue
+            if framework is None:
+                self.files_checked += 1
+                continue
+            try:
+                content = index.read(path)
+            except OSError:
+                continue
+            # Reuse findings of unchanged files, audit the rest
+            findings = cache.get(path, content)
+            if findings is None:
+                findings = self._audit_findings(str(path), content, framework)
+                cache.put(path, content, findings)
+            self.record(index.relpath(path), findings)
+        cache.save()
+
+    def record(self, filepath: str, findings: dict) -> None:
+        """Add one file's findings to the report and stream them right away (findings_stream.py)."""
+        self.files_checked += 1
+        self.issues.extend(findings["issues"])
+        self.warnings.extend(findings["warnings"])
+        self.passed_count += findings["passed"]
+        self.emitter.findings("issue", findings["issues"], file=filepath)
+        self.emitter.findings("warning", findings["warnings"], file=filepath)
+
+    def _audit_findings(self, filepath: str, content: str, framework: str = None) -> dict:
+        """Findings of a single file (the unit stored in the audit cache)."""
+        saved = self.issues, self.warnings, self.passed_count, self.files_checked
+        self.issues, self.warnings, self.passed_count = [], [], 0
+        try:
+            self.audit_file(filepath, content, framework)
+            return {"issues": self.issues, "warnings": self.warnings, "passed": self.passed_count}
+        finally:
+            self.issues, self.warnings, self.passed_count, self.files_checked = saved
 
     def get_report(self):
         return {
             "files_checked": self.files_checked,
             "issues": self.issues,
             "warnings": self.warnings,
+            "issue_count": finding_count(self.issues),
+            "warning_count": finding_count(self.warnings),
             "passed_checks": self.passed_count,
-            "compliant": len(self.issues) == 0
+            "compliant": finding_count(self.issues) == 0
         }
 
 
@@ -635,12 +723,14 @@ def main():
 
     path = sys.argv[1]
     is_json = "--json" in sys.argv
+    since, use_cache = incremental_flags(sys.argv)
+    emitter = open_emitter("mobile_audit", findings_flag(sys.argv))
 
-    auditor = MobileAuditor()
+    auditor = MobileAuditor(emitter)
     if os.path.isfile(path):
-        auditor.audit_file(path)
+        auditor.record(path, auditor._audit_findings(path, None))
     else:
-        auditor.audit_directory(path)
+        auditor.audit_directory(path, since, use_cache)
 
     report = auditor.get_report()
 
@@ -650,17 +740,19 @@ def main():
         print(f"\n[MOBILE AUDIT] {report['files_checked']} mobile files checked")
         print("-" * 50)
         if report['issues']:
-            print(f"[!] ISSUES ({len(report['issues'])}):")
+            print(f"[!] ISSUES ({report['issue_count']}):")
             for i in report['issues'][:10]:
                 print(f"  - {i}")
         if report['warnings']:
-            print(f"[*] WARNINGS ({len(report['warnings'])}):")
+            print(f"[*] WARNINGS ({report['warning_count']}):")
             for w in report['warnings'][:15]:
                 print(f"  - {w}")
         print(f"[+] PASSED CHECKS: {report['passed_checks']}")
         status = "PASS" if report['compliant'] else "FAIL"
         print(f"STATUS: {status}")
 
+    emitter.summary(passed=report['compliant'], files_checked=report['files_checked'],
+                    passed_checks=report['passed_checks'])
     sys.exit(0 if report['compliant'] else 1)
 
 
@@ -3,180 +3,557 @@
 React Performance Checker
 Automated performance audit for React/Next.js projects
 Based on Vercel Engineering best practices
+
+Every source file is tokenized once (.agent/scripts/js_modules.py) and
+analysed on its own (waterfalls, effects, memoization, images); the results
+are cached by content hash. Cross-file checks (barrel imports, static
+imports of large components, memo defeated by inline props) are answered
+from an import graph built once per run.
 """
 
 import os
-import re
-import json
+import sys
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Dict, List, Optional, Set, Tuple
+
+# Shared single-pass file walker, result cache, JS/TS tokenizer + import graph and
+# JSONL findings stream (.agent/scripts/file_index.py, audit_cache.py, js_modules.py, findings_stream.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from file_index import get_project_index
+from audit_cache import AuditCache, checker_version
+from findings_stream import FindingsEmitter, finding_count, findings_flag, open_emitter
+from js_modules import (JSX_TAG, JSX_ATTR, NAME, PUNCT, SOURCE_EXTENSIONS, ImportGraph,
+                        is_jsx_file, matching_brackets, module_info, token_lines, tokenize)
+
+SKIP_DIRS = {'node_modules', 'dist', 'build', '.next', 'out', 'coverage'}
+# Larger files are bundles/generated code, not sources
+MAX_SOURCE_BYTES = 500_000
+# Components above this size should be code-split when they are not needed up front
+LARGE_COMPONENT_BYTES = 10_000
+# A module re-exporting at least this many modules (and declaring no more) is a barrel
+BARREL_MIN_REEXPORTS = 3
+# Array methods whose chains are worth a useMemo when run on every render
+ARRAY_DERIVATIONS = {'filter', 'map', 'sort', 'toSorted', 'reduce', 'flatMap'}
+EXPENSIVE_DERIVATIONS = {'sort', 'toSorted', 'reduce'}
+MEMO_WRAPPERS = {'memo'}
+COMPONENT_WRAPPERS = {'memo', 'forwardRef'}
+
+# Tokens after which a new line starts a new statement (automatic semicolon insertion)
+_VALUE_END_KINDS = {'name', 'num', 'string', 'template', 'regex'}
+_NEW_STATEMENT_KINDS = {'name', 'num', 'string', 'template'}
+
+
+# ============================================================================
+#  PER-FILE ANALYSIS
+# ============================================================================
+
+def _is_member(tokens, i: int) -> bool:
+    return i > 0 and tokens[i - 1].kind == PUNCT and tokens[i - 1].value in ('.', '?.')
+
+
+def _is_punct(token, value: str) -> bool:
+    return token.kind == PUNCT and token.value == value
+
+
+def _statements(tokens, match: Dict[int, int], lines: List[int], lo: int, hi: int) -> List[Tuple[int, int]]:
+    """Top-level statements of the token range [lo, hi) as (start, end) ranges; bracket groups are skipped whole."""
+    statements = []
+    start = lo
+    prev = None
+    i = lo
+    while i < hi:
+        token = tokens[i]
+        if _is_punct(token, ';'):
+            if start < i:
+                statements.append((start, i))
+            start = i + 1
+            prev = None
+            i += 1
+            continue
+        if (prev is not None and start < i and lines[i] != lines[prev] and token.kind in _NEW_STATEMENT_KINDS
+                and (tokens[prev].kind in _VALUE_END_KINDS or
+                     (tokens[prev].kind == PUNCT and tokens[prev].value in (')', ']', '}')))):
+            statements.append((start, i))
+            start = i
+        end = match.get(i)
+        prev = end if end is not None else i
+        i = (end if end is not None else i) + 1
+    if start < hi:
+        statements.append((start, hi))
+    return statements
+
+
+def _declaration(tokens, match: Dict[int, int], start: int, end: int) -> Optional[Tuple[Set[str], int]]:
+    """(declared names, index of the first value token) of a `const|let|var ... =` statement."""
+    if tokens[start].kind != NAME or tokens[start].value not in ('const', 'let', 'var'):
+        return None
+    names = set()
+    i = start + 1
+    while i < end:
+        token = tokens[i]
+        if _is_punct(token, '='):
+            return names, i + 1
+        if token.kind == NAME:
+            names.add(token.value)
+        i += 1
+    return None
+
+
+def _referenced(tokens, lo: int, hi: int) -> Set[str]:
+    return {tokens[i].value for i in range(lo, hi) if tokens[i].kind == NAME and not _is_member(tokens, i)}
+
+
+def find_waterfalls(tokens, match: Dict[int, int], lines: List[int]) -> List[dict]:
+    """
+    Runs of consecutive `const x = await ...` statements in one block where a
+    later await does not use any value produced by the earlier ones.
+    """
+    blocks = [(0, len(tokens))] + [(i + 1, end) for i, end in match.items() if _is_punct(tokens[i], '{')]
+    waterfalls = []
+    for lo, hi in blocks:
+        run: List[Tuple[Set[str], Set[str], int]] = []
+        for start, end in _statements(tokens, match, lines, lo, hi) + [(hi, hi)]:
+            decl = _declaration(tokens, match, start, end) if start < hi else None
+            if decl is not None and decl[1] < end and tokens[decl[1]].kind == NAME and tokens[decl[1]].value == 'await':
+                run.append((decl[0], _referenced(tokens, decl[1], end), lines[start]))
+                continue
+            if len(run) > 1:
+                produced: Set[str] = set(run[0][0])
+                independent = [run[0][2]]
+                for declared, used, line in run[1:]:
+                    if not used & produced:
+                        independent.append(line)
+                    produced |= declared
+                if len(independent) > 1:
+                    waterfalls.append({"line": independent[0], "lines": independent,
+                                       "awaits": len(run)})
+            run = []
+    return sorted(waterfalls, key=lambda w: w["line"])
+
+
+def _inline_kind(tokens, match: Dict[int, int], lo: int, hi: int) -> Optional[str]:
+    """'function' / 'object' / 'array' if the expression tokens [lo, hi) create a new value each render."""
+    if lo >= hi:
+        return None
+    first = tokens[lo]
+    if _is_punct(first, '{'):
+        return 'object'
+    if _is_punct(first, '['):
+        return 'array'
+    if first.kind == NAME and first.value == 'function':
+        return 'function'
+    i = lo
+    while i < hi:
+        if _is_punct(tokens[i], '=>'):
+            return 'function'
+        end = match.get(i)
+        i = (end if end is not None else i) + 1
+    return None
+
+
+def _component_spans(tokens, match: Dict[int, int]) -> List[dict]:
+    """Function components: name, first token, props, body range and memo wrapping."""
+    components = []
+    n = len(tokens)
+    for i, token in enumerate(tokens):
+        if token.kind != NAME or not token.value[:1].isupper() or _is_member(tokens, i):
+            continue
+        prev = tokens[i - 1] if i else None
+
+        # function Name(props) { ... }
+        if prev is not None and prev.kind == NAME and prev.value == 'function' and i + 1 < n and _is_punct(tokens[i + 1], '('):
+            params_end = match.get(i + 1)
+            if params_end is None:
+                continue
+            body = next((k for k in range(params_end + 1, min(n, params_end + 40)) if _is_punct(tokens[k], '{')), None)
+            if body is None or body not in match:
+                continue
+            components.append({"name": token.value, "start": i, "props": params_end > i + 2,
+                               "body": (body + 1, match[body]), "span": (i, match[body]), "memo": False})
+            continue
+
+        # const Name = (props) => ... | function (...) | memo(...) | forwardRef(...)
+        if prev is None or prev.kind != NAME or prev.value not in ('const', 'let', 'var'):
+            continue
+        eq = next((k for k in range(i + 1, min(n, i + 30)) if _is_punct(tokens[k], '=') or _is_punct(tokens[k], ';')), None)
+        if eq is None or not _is_punct(tokens[eq], '='):
+            continue
+        k = eq + 1
+        memo = False
+        # Unwrap memo(...) / React.memo(...) / forwardRef(...)
+        while k + 1 < n and tokens[k].kind == NAME:
+            name_k = k + 2 if tokens[k].value == 'React' and k + 2 < n and _is_punct(tokens[k + 1], '.') else k
+            if tokens[name_k].value in COMPONENT_WRAPPERS and name_k + 1 < n and _is_punct(tokens[name_k + 1], '('):
+                memo = memo or tokens[name_k].value in MEMO_WRAPPERS
+                k = name_k + 2
+            else:
+                break
+        if k < n and tokens[k].kind == NAME and tokens[k].value == 'async':
+            k += 1
+        if k >= n:
+            continue
+        if tokens[k].kind == NAME and tokens[k].value == 'function':
+            k += 1
+            if k < n and tokens[k].kind == NAME:
+                k += 1
+        if k < n and _is_punct(tokens[k], '('):
+            params_end = match.get(k)
+            props = params_end is not None and params_end > k + 1
+        elif k < n and tokens[k].kind == NAME:
+            params_end, props = k, True  # single parameter: props => ...
+        else:
+            continue
+        if params_end is None:
+            continue
+        arrow = next((a for a in range(params_end + 1, min(n, params_end + 40))
+                      if _is_punct(tokens[a], '=>') or _is_punct(tokens[a], '{')), None)
+        if arrow is None:
+            continue
+        body_open = arrow + 1 if _is_punct(tokens[arrow], '=>') else arrow
+        if body_open < n and _is_punct(tokens[body_open], '{') and body_open in match:
+            body = (body_open + 1, match[body_open])
+        elif body_open < n and body_open in match:
+            body = None  # expression body: (<div/>)
+            match_end = match[body_open]
+            components.append({"name": token.value, "start": i, "props": props, "body": body,
+                               "span": (i, match_end), "memo": memo})
+            continue
+        else:
+            continue
+        components.append({"name": token.value, "start": i, "props": props, "body": body,
+                           "span": (i, body[1]), "memo": memo})
+    return components
+
+
+def analyze_source(source: str, jsx: bool) -> dict:
+    """Everything the checks need to know about one file (the unit stored in the audit cache)."""
+    tokens = tokenize(source, jsx)
+    match = matching_brackets(tokens)
+    lines = token_lines(tokens, source)
+    info = module_info(tokens, source)
+    n = len(tokens)
+
+    # Components, and memo() wrapping applied after their declaration
+    components = {}
+    for comp in _component_spans(tokens, match):
+        lo, hi = comp["span"]
+        if comp["name"] in components:
+            # memo(function Name() {...}): the inner declaration is the same component
+            components[comp["name"]]["memo"] |= comp["memo"]
+        elif any(t.kind == JSX_TAG for t in tokens[lo:hi + 1]):
+            components[comp["name"]] = {"line": lines[comp["start"]], "props": comp["props"],
+                                        "memo": comp["memo"], "body": comp["body"]}
+    default_component = info["exports"]["default"]
+    for i, token in enumerate(tokens):
+        if token.kind == NAME and token.value in MEMO_WRAPPERS and i + 2 < n and _is_punct(tokens[i + 1], '(') \
+                and tokens[i + 2].kind == NAME:
+            wrapped = tokens[i + 2].value
+            if wrapped in components:
+                components[wrapped]["memo"] = True
+            # export default memo(Name) / export default React.memo(Name)
+            head = i - 2 if i >= 2 and _is_punct(tokens[i - 1], '.') else i
+            if head >= 2 and tokens[head - 1].value == 'default' and tokens[head - 2].value == 'export':
+                default_component = wrapped
+
+    # Sequential independent awaits
+    waterfalls = find_waterfalls(tokens, match, lines)
+
+    # Data fetching inside useEffect
+    effect_fetches = []
+    for i, token in enumerate(tokens):
+        if token.kind == NAME and token.value == 'useEffect' and i + 1 < n and _is_punct(tokens[i + 1], '('):
+            end = match.get(i + 1, n)
+            for k in range(i + 2, end):
+                t = tokens[k]
+                if t.kind == NAME and not _is_member(tokens, k) and (
+                        (t.value == 'fetch' and k + 1 < n and _is_punct(tokens[k + 1], '(')) or t.value == 'axios'):
+                    effect_fetches.append(lines[i])
+                    break
+
+    # JSX: inline props, context values, <img>
+    inline_props = []
+    provider_values = []
+    img_lines = []
+    for i, token in enumerate(tokens):
+        if token.kind != JSX_TAG:
+            continue
+        tag = token.value
+        if tag == 'img':
+            img_lines.append(lines[i])
+        if not tag[:1].isupper():
+            continue
+        k = i + 1
+        while k < n:
+            if tokens[k].kind == JSX_ATTR:
+                attr = tokens[k].value
+                if k + 1 < n and _is_punct(tokens[k + 1], '{') and (k + 1) in match:
+                    close = match[k + 1]
+                    kind = _inline_kind(tokens, match, k + 2, close)
+                    if kind and attr not in ('key', 'children'):
+                        record = {"tag": tag, "attr": attr, "kind": kind, "line": lines[k]}
+                        if tag.endswith('.Provider') and attr == 'value':
+                            provider_values.append(record)
+                        elif '.' not in tag:
+                            inline_props.append(record)
+                    k = close + 1
+                else:
+                    k += 2 if k + 1 < n and tokens[k + 1].kind == 'string' else 1
+            elif _is_punct(tokens[k], '{') and k + 1 < n and _is_punct(tokens[k + 1], '...') and k in match:
+                k = match[k] + 1  # {...spread}
+            else:
+                break
+
+    # Array derivations recomputed on every render
+    derivations = []
+    for name, comp in components.items():
+        if not comp["body"]:
+            continue
+        lo, hi = comp["body"]
+        for start, end in _statements(tokens, match, lines, lo, hi):
+            decl = _declaration(tokens, match, start, end)
+            if decl is None or decl[1] >= end:
+                continue
+            first = tokens[decl[1]]
+            if first.kind == NAME and first.value.startswith('use'):
+                continue  # useMemo / useState / any hook
+            ops = []
+            k = decl[1]
+            while k < end:
+                t = tokens[k]
+                if t.kind == NAME and t.value in ARRAY_DERIVATIONS and _is_member(tokens, k) \
+                        and k + 1 < end and _is_punct(tokens[k + 1], '('):
+                    ops.append(t.value)
+                close = match.get(k)
+                k = (close if close is not None else k) + 1
+            if ops and (len(ops) > 1 or ops[0] in EXPENSIVE_DERIVATIONS):
+                derivations.append({"component": name, "names": sorted(decl[0]), "ops": ops, "line": lines[start]})
+
+    for comp in components.values():
+        del comp["body"]
+    return {
+        "module": info,
+        "size": len(source),
+        "components": components,
+        "default_component": default_component,
+        "waterfalls": waterfalls,
+        "effect_fetches": effect_fetches,
+        "img_lines": img_lines,
+        "inline_props": inline_props,
+        "provider_values": provider_values,
+        "derivations": derivations,
+    }
+
+
+def _is_test_file(relpath: str) -> bool:
+    name = Path(relpath).name
+    return '.test.' in name or '.spec.' in name or '__tests__' in Path(relpath).parts
+
+
+# ============================================================================
+#  CHECKER
+# ============================================================================
 
 class PerformanceChecker:
-    def __init__(self, project_path: str):
+    def __init__(self, project_path: str, emitter: FindingsEmitter = None, use_cache: bool = True):
         self.project_path = Path(project_path)
-        self.issues = []
-        self.warnings = []
+        self.index = get_project_index(project_path)
+        self.emitter = emitter or open_emitter("react_performance_checker", None)
+        self.cache = AuditCache(self.index, "react_performance_checker",
+                                checker_version(__file__), enabled=use_cache)
+        # Bounded while findings are streamed: the stream has all of them
+        self.issues = self.emitter.report_list()
+        self.warnings = self.emitter.report_list()
+        self.critical = 0
         self.passed = []
+        self.files: Dict[Path, dict] = {}
+        self.graph: Optional[ImportGraph] = None
+
+    def add_issue(self, issue: dict):
+        """Record an issue and stream it (findings_stream.py)"""
+        self.issues.append(issue)
+        if issue['type'] == 'CRITICAL':
+            self.critical += 1
+        self.emitter.finding(issue['type'], issue['issue'], kind='issue',
+                             **{k: v for k, v in issue.items() if k not in ('type', 'issue')})
+
+    def add_warning(self, warning: dict):
+        """Record a warning and stream it (findings_stream.py)"""
+        self.warnings.append(warning)
+        self.emitter.finding(warning['type'], warning['issue'], kind='warning',
+                             **{k: v for k, v in warning.items() if k not in ('type', 'issue')})
+
+    def source_files(self, extensions=SOURCE_EXTENSIONS):
+        """Source files of the shared project index (dependencies, build output and hidden dirs excluded)"""
+        return [f for f in self.index.files(extensions, skip_dirs=SKIP_DIRS, skip_hidden=True)
+                if f.suffix.lower() in extensions]
+
+    def relpath(self, filepath: Path) -> str:
+        return self.index.relpath(filepath)
+
+    def analyze(self):
+        """Tokenize and analyse every source file once (cached), then build the import graph"""
+        print("\n[*] Analyzing sources...")
+        for filepath in self.source_files():
+            try:
+                content = self.index.read(filepath)
+            except Exception:
+                continue
+            if len(content) > MAX_SOURCE_BYTES:
+                continue
+            analysis = self.cache.get(filepath, content)
+            if analysis is None:
+                analysis = analyze_source(content, is_jsx_file(filepath))
+                self.cache.put(filepath, content, analysis)
+            self.files[filepath] = analysis
+        self.cache.save()
+        self.graph = ImportGraph(self.index, {path: a["module"] for path, a in self.files.items()})
+        print(f"    {len(self.files)} files, {sum(len(e) for e in self.graph.edges.values())} imports "
+              f"(cache: {self.cache.hits} hit(s), {self.cache.misses} miss(es))")
 
     def check_waterfalls(self):
         """Check for sequential await patterns (Section 1)"""
-        print("\n[*] Checking for waterfalls (sequential awaits)...")
-
-        for filepath in self.project_path.rglob('*.{ts,tsx,js,jsx}'):
-            if 'node_modules' in str(filepath):
-                continue
-
-            try:
-                content = filepath.read_text(encoding='utf-8')
-
-                # Pattern: multiple awaits in sequence without Promise.all
-                sequential_awaits = re.findall(r'await\s+\w+.*?\n\s*await\s+\w+', content)
-
-                if sequential_awaits:
-                    self.issues.append({
-                        'file': str(filepath.relative_to(self.project_path)),
-                        'type': 'CRITICAL',
-                        'issue': 'Sequential awaits detected (waterfall)',
-                        'fix': 'Use Promise.all() for parallel fetching',
-                        'section': '1-async-eliminating-waterfalls.md'
-                    })
-            except Exception as e:
-                continue
+        print("[*] Checking for waterfalls (sequential awaits)...")
+
+        for filepath, analysis in self.files.items():
+            for waterfall in analysis['waterfalls']:
+                self.add_issue({
+                    'file': self.relpath(filepath),
+                    'line': waterfall['line'],
+                    'type': 'CRITICAL',
+                    'issue': f"Sequential independent awaits (waterfall) at lines "
+                             f"{', '.join(map(str, waterfall['lines']))}",
+                    'fix': 'Use Promise.all() for parallel fetching',
+                    'section': '1-async-eliminating-waterfalls.md'
+                })
 
     def check_barrel_imports(self):
         """Check for barrel imports (Section 2)"""
         print("[*] Checking for barrel imports...")
 
-        for filepath in self.project_path.rglob('*.{ts,tsx,js,jsx}'):
-            if 'node_modules' in str(filepath):
-                continue
+        barrels = {path: a['module']['exports']['reexports'] for path, a in self.files.items()
+                   if a['module']['exports']['reexports'] >= BARREL_MIN_REEXPORTS
+                   and a['module']['exports']['local'] <= a['module']['exports']['reexports']}
 
-            try:
-                content = filepath.read_text(encoding='utf-8')
-
-                # Pattern: import from index files or barrel exports
-                barrel_imports = re.findall(r"import.*from\s+['\"](@/.*?)/index['\"]", content)
-                barrel_imports += re.findall(r"import.*from\s+['\"]\.\.?/.*?['\"](?!.*?\.tsx?)", content)
-
-                if barrel_imports:
-                    self.warnings.append({
-                        'file': str(filepath.relative_to(self.project_path)),
-                        'type': 'CRITICAL',
-                        'issue': 'Potential barrel imports detected',
-                        'fix': 'Import directly from specific files',
-                        'section': '2-bundle-bundle-size-optimization.md'
-                    })
-            except Exception as e:
+        for filepath in self.files:
+            if _is_test_file(self.relpath(filepath)):
                 continue
+            used = sorted({self.relpath(target) for target, imp in self.graph.imports(filepath)
+                           if target in barrels and imp['kind'] == 'static' and not imp['type_only']})
+            if used:
+                self.add_warning({
+                    'file': self.relpath(filepath),
+                    'type': 'CRITICAL',
+                    'issue': f"Imports from barrel module(s): {', '.join(used)}",
+                    'fix': 'Import directly from specific files',
+                    'section': '2-bundle-bundle-size-optimization.md'
+                })
 
     def check_dynamic_imports(self):
         """Check if large components use dynamic imports (Section 2)"""
         print("[*] Checking for missing dynamic imports...")
 
-        for filepath in self.project_path.rglob('*.{ts,tsx}'):
-            if 'node_modules' in str(filepath):
-                continue
-
-            try:
-                content = filepath.read_text(encoding='utf-8')
-
-                # Check file size - if > 10KB, should probably use dynamic import
-                if len(content) > 10000:
-                    # Check if it's imported statically somewhere
-                    filename = filepath.stem
-
-                    # Search for static imports of this component
-                    for check_file in self.project_path.rglob('*.{ts,tsx}'):
-                        if check_file == filepath or 'node_modules' in str(check_file):
-                            continue
-
-                        check_content = check_file.read_text(encoding='utf-8')
-                        if f"import {filename}" in check_content or f"import {{ {filename}" in check_content:
-                            if 'dynamic(' not in check_content:
-                                self.warnings.append({
-                                    'file': str(check_file.relative_to(self.project_path)),
-                                    'type': 'CRITICAL',
-                                    'issue': f'Large component {filename} imported statically',
-                                    'fix': 'Use dynamic() for code splitting',
-                                    'section': '2-bundle-bundle-size-optimization.md'
-                                })
-                                break
-            except Exception as e:
+        for filepath, analysis in self.files.items():
+            if filepath.suffix != '.tsx' or analysis['size'] <= LARGE_COMPONENT_BYTES or not analysis['components']:
                 continue
+            importers = [(importer, imp) for importer, imp in self.graph.importers(filepath)
+                         if not _is_test_file(self.relpath(importer))]
+            if any(imp['kind'] == 'dynamic' for _, imp in importers):
+                continue  # already code-split somewhere
+            static = [importer for importer, imp in importers if imp['kind'] == 'static' and not imp['type_only']]
+            if static:
+                self.add_warning({
+                    'file': self.relpath(static[0]),
+                    'type': 'CRITICAL',
+                    'issue': f"Large component {filepath.stem} ({analysis['size'] // 1024} KB) imported statically "
+                             f"by {len(static)} module(s), never with dynamic()",
+                    'component': self.relpath(filepath),
+                    'fix': 'Use dynamic() for code splitting',
+                    'section': '2-bundle-bundle-size-optimization.md'
+                })
 
     def check_useEffect_fetching(self):
         """Check for data fetching in useEffect (Section 4)"""
         print("[*] Checking for useEffect data fetching...")
 
-        for filepath in self.project_path.rglob('*.{ts,tsx}'):
-            if 'node_modules' in str(filepath):
-                continue
-
-            try:
-                content = filepath.read_text(encoding='utf-8')
-
-                # Pattern: fetch or axios in useEffect
-                if 'useEffect' in content:
-                    if re.search(r'useEffect.*?fetch\(', content, re.DOTALL):
-                        self.warnings.append({
-                            'file': str(filepath.relative_to(self.project_path)),
-                            'type': 'MEDIUM-HIGH',
-                            'issue': 'Data fetching in useEffect',
-                            'fix': 'Consider using SWR or React Query for deduplication',
-                            'section': '4-client-client-side-data-fetching.md'
-                        })
-            except Exception as e:
+        for filepath, analysis in self.files.items():
+            if analysis['effect_fetches']:
+                self.add_warning({
+                    'file': self.relpath(filepath),
+                    'line': analysis['effect_fetches'][0],
+                    'type': 'MEDIUM-HIGH',
+                    'issue': f"Data fetching in useEffect ({len(analysis['effect_fetches'])} effect(s))",
+                    'fix': 'Consider using SWR or React Query for deduplication',
+                    'section': '4-client-client-side-data-fetching.md'
+                })
+
+    def _memoized(self, filepath: Path, tag: str) -> Optional[str]:
+        """Where the memoized component rendered as <tag> in `filepath` is defined, if it is memoized"""
+        analysis = self.files[filepath]
+        local = analysis['components'].get(tag)
+        if local is not None:
+            return self.relpath(filepath) if local['memo'] else None
+        for target, imp in self.graph.imports(filepath):
+            imported = imp['bindings'].get(tag)
+            if imported is None or not isinstance(target, Path) or target not in self.files:
                 continue
+            defined = self.files[target]
+            name = defined['default_component'] if imported == 'default' else imported
+            component = defined['components'].get(name)
+            return self.relpath(target) if component and component['memo'] else None
+        return None
 
     def check_missing_memoization(self):
-        """Check for missing React.memo, useMemo, useCallback (Section 5)"""
+        """Check for memoization defeated or missing on re-renders (Section 5)"""
         print("[*] Checking for missing memoization...")
 
-        for filepath in self.project_path.rglob('*.{tsx}'):
-            if 'node_modules' in str(filepath):
-                continue
-
-            try:
-                content = filepath.read_text(encoding='utf-8')
-
-                # Check for component definitions without memo
-                components = re.findall(r'(?:export\s+)?(?:const|function)\s+([A-Z]\w+)', content)
-
-                if components and 'React.memo' not in content and 'memo(' not in content:
-                    # Check if component receives props
-                    if 'props:' in content or 'Props>' in content:
-                        self.warnings.append({
-                            'file': str(filepath.relative_to(self.project_path)),
-                            'type': 'MEDIUM',
-                            'issue': 'Component with props not memoized',
-                            'fix': 'Consider using React.memo if props are stable',
-                            'section': '5-rerender-re-render-optimization.md'
-                        })
-            except Exception as e:
-                continue
+        for filepath, analysis in self.files.items():
+            for prop in analysis['inline_props']:
+                defined = self._memoized(filepath, prop['tag'])
+                if defined:
+                    self.add_warning({
+                        'file': self.relpath(filepath),
+                        'line': prop['line'],
+                        'type': 'MEDIUM',
+                        'issue': f"Inline {prop['kind']} passed as {prop['attr']} to memoized <{prop['tag']}> "
+                                 f"({defined}) re-renders it every time",
+                        'fix': 'Hoist the value or wrap it in useCallback/useMemo',
+                        'section': '5-rerender-re-render-optimization.md'
+                    })
+            for value in analysis['provider_values']:
+                self.add_warning({
+                    'file': self.relpath(filepath),
+                    'line': value['line'],
+                    'type': 'MEDIUM',
+                    'issue': f"Inline {value['kind']} as <{value['tag']}> value re-renders every consumer",
+                    'fix': 'Memoize the context value with useMemo',
+                    'section': '5-rerender-re-render-optimization.md'
+                })
+            for derivation in analysis['derivations']:
+                self.add_warning({
+                    'file': self.relpath(filepath),
+                    'line': derivation['line'],
+                    'type': 'MEDIUM',
+                    'issue': f"{derivation['component']}: {', '.join(derivation['names'])} recomputed on every "
+                             f"render (.{'().'.join(derivation['ops'])}())",
+                    'fix': 'Wrap the derivation in useMemo',
+                    'section': '5-rerender-re-render-optimization.md'
+                })
 
     def check_image_optimization(self):
         """Check for unoptimized images (Section 6)"""
         print("[*] Checking for image optimization...")
 
-        for filepath in self.project_path.rglob('*.{ts,tsx,js,jsx}'):
-            if 'node_modules' in str(filepath):
-                continue
-
-            try:
-                content = filepath.read_text(encoding='utf-8')
-
-                # Check for <img> tags instead of next/image
-                if '<img' in content and 'next/image' not in content:
-                    self.warnings.append({
-                        'file': str(filepath.relative_to(self.project_path)),
-                        'type': 'MEDIUM',
-                        'issue': 'Using <img> instead of next/image',
-                        'fix': 'Use next/image for automatic optimization',
-                        'section': '6-rendering-rendering-performance.md'
-                    })
-            except Exception as e:
-                continue
+        for filepath, analysis in self.files.items():
+            # Check for <img> tags instead of next/image
+            if analysis['img_lines'] and not any(imp['source'] == 'next/image' for imp in analysis['module']['imports']):
+                self.add_warning({
+                    'file': self.relpath(filepath),
+                    'line': analysis['img_lines'][0],
+                    'type': 'MEDIUM',
+                    'issue': 'Using <img> instead of next/image',
+                    'fix': 'Use next/image for automatic optimization',
+                    'section': '6-rendering-rendering-performance.md'
+                })
 
     def generate_report(self):
         """Generate final report"""
@@ -184,31 +561,35 @@ class PerformanceChecker:
         print("REACT PERFORMANCE AUDIT REPORT")
         print("="*60)
 
-        print(f"\n[CRITICAL ISSUES] ({len([i for i in self.issues if i['type'] == 'CRITICAL'])})")
+        def location(finding):
+            return f"{finding['file']}:{finding['line']}" if finding.get('line') else finding['file']
+
+        warnings = finding_count(self.warnings)
+        print(f"\n[CRITICAL ISSUES] ({self.critical})")
         for issue in self.issues:
             if issue['type'] == 'CRITICAL':
-                print(f"  - {issue['file']}")
+                print(f"  - {location(issue)}")
                 print(f"    Issue: {issue['issue']}")
                 print(f"    Fix: {issue['fix']}")
                 print(f"    Reference: {issue['section']}\n")
 
-        print(f"\n[WARNINGS] ({len(self.warnings)})")
+        print(f"\n[WARNINGS] ({warnings})")
         for warning in self.warnings[:10]:  # Show first 10
-            print(f"  - {warning['file']}")
+            print(f"  - {location(warning)}")
             print(f"    Issue: {warning['issue']}")
             print(f"    Fix: {warning['fix']}")
             print(f"    Reference: {warning['section']}\n")
 
-        if len(self.warnings) > 10:
-            print(f"  ... and {len(self.warnings) - 10} more warnings")
+        if warnings > 10:
+            print(f"  ... and {warnings - 10} more warnings")
 
         print("\n" + "="*60)
         print(f"SUMMARY:")
-        print(f"  Critical Issues: {len([i for i in self.issues if i['type'] == 'CRITICAL'])}")
-        print(f"  Warnings: {len(self.warnings)}")
+        print(f"  Critical Issues: {self.critical}")
+        print(f"  Warnings: {warnings}")
         print("="*60)
 
-        if len(self.issues) == 0 and len(self.warnings) == 0:
+        if finding_count(self.issues) == 0 and warnings == 0:
             print("\n[SUCCESS] No major performance issues detected!")
         else:
             print("\n[ACTION REQUIRED] Review and fix issues above")
@@ -221,6 +602,7 @@ class PerformanceChecker:
         print("="*60)
         print(f"Scanning: {self.project_path}")
 
+        self.analyze()
         self.check_waterfalls()
         self.check_barrel_imports()
         self.check_dynamic_imports()
@@ -230,12 +612,13 @@ class PerformanceChecker:
 
         self.generate_report()
 
+        self.emitter.summary(passed=self.critical == 0, critical_issues=self.critical,
+                             warnings=finding_count(self.warnings))
 
-def main():
-    import sys
 
+def main():
     if len(sys.argv) < 2:
-        print("Usage: python react_performance_checker.py <project_path>")
+        print("Usage: python react_performance_checker.py <project_path> [--no-cache] [--jsonl[=<file>]]")
         sys.exit(1)
 
     project_path = sys.argv[1]
@@ -244,7 +627,8 @@ def main():
         print(f"[ERROR] Path not found: {project_path}")
         sys.exit(1)
 
-    checker = PerformanceChecker(project_path)
+    checker = PerformanceChecker(project_path, open_emitter("react_performance_checker", findings_flag(sys.argv)),
+                                 use_cache='--no-cache' not in sys.argv)
     checker.run()
 
 
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Skill: performance-profiling
+Script: bundle_analyzer.py
+Purpose: Estimate the bundle impact of every Next.js route without running a build
+Usage: python bundle_analyzer.py <project_path> [--json[=<file>]] [--no-cache] [--jsonl[=<file>]]
+Output: Per-route module set and source bytes, heavy client-side imports
+
+Builds the import graph of the app sources once (.agent/scripts/js_modules.py,
+tsconfig `paths` such as `@/*` resolved), caching each file's imports by
+content hash. For each route under app/ (page or route handler, plus its
+layouts, templates and boundaries) it follows static imports transitively:
+
+- modules / bytes: everything the route pulls in (server and client)
+- client modules / bytes: what crosses a 'use client' boundary and ships
+  to the browser; dynamic() / import() targets are counted apart as lazy
+- heavy client imports: HEAVY_PACKAGES reached statically from client
+  code, with the import chain that brings them in
+
+Sizes are source bytes of project files (a relative measure, not the
+minified output); heavy packages carry an approximate gzip weight.
+"""
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Shared file index, result cache, JS/TS import graph, App Router model and JSONL findings stream (.agent/scripts/)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from audit_cache import AuditCache, checker_version
+from file_index import get_project_index
+from findings_stream import findings_flag, open_emitter
+from js_modules import SOURCE_EXTENSIONS, ImportGraph, module_info, tokenize, is_jsx_file
+from next_routes import discover_routes, find_app_dir, route_closure
+
+SKIP_DIRS = {'node_modules', 'dist', 'build', '.next', 'out', 'coverage'}
+MAX_SOURCE_BYTES = 500_000
+
+# Packages that are expensive to ship to the browser (approximate min+gzip KB)
+HEAVY_PACKAGES = {
+    "three": 155,
+    "@react-three/fiber": 45,
+    "@react-three/drei": 60,
+    "@react-pdf/renderer": 420,
+    "jspdf": 110,
+    "jspdf-autotable": 10,
+    "html2canvas": 45,
+    "xlsx": 140,
+    "@turf/turf": 180,
+    "recharts": 100,
+    "leaflet": 40,
+    "react-leaflet": 5,
+    "firebase-admin": 300,
+    "googleapis": 500,
+}
+
+# ============================================================================
+#  ANALYZER
+# ============================================================================
+
+class BundleAnalyzer:
+    def __init__(self, project_path: str, use_cache: bool = True):
+        self.project_path = Path(project_path)
+        self.index = get_project_index(project_path)
+        self.cache = AuditCache(self.index, "bundle_analyzer",
+                                checker_version(__file__), enabled=use_cache)
+        self.modules: Dict[Path, dict] = {}
+        self.sizes: Dict[Path, int] = {}
+        self.graph: Optional[ImportGraph] = None
+
+    def relpath(self, path: Path) -> str:
+        return self.index.relpath(path)
+
+    def build_graph(self, under: Optional[str] = None) -> ImportGraph:
+        """Import graph of the project sources (module info cached per content hash)."""
+        for path in self.index.files(SOURCE_EXTENSIONS, skip_dirs=SKIP_DIRS, skip_hidden=True,
+                                     under=under, include_unchanged=True):
+            if path.name.endswith('.d.ts'):
+                continue
+            try:
+                size = path.stat().st_size
+                if size > MAX_SOURCE_BYTES:
+                    continue
+                content = self.index.read(path)
+            except OSError:
+                continue
+            info = self.cache.get(path, content)
+            if info is None:
+                info = module_info(tokenize(content, is_jsx_file(path)), content)
+                self.cache.put(path, content, info)
+            self.modules[path] = info
+            self.sizes[path] = size
+        self.cache.save()
+        self.graph = ImportGraph(self.index, self.modules)
+        return self.graph
+
+    def analyze(self) -> dict:
+        root = self.index.root
+        app_dir = find_app_dir(root)
+        under = self.index.relpath(app_dir.parent) if app_dir and app_dir.parent != root else None
+        self.build_graph(under)
+        if app_dir is None:
+            return {"app_dir": None, "routes": [], "heavy": []}
+
+        routes = []
+        heavy: Dict[Tuple[str, str], dict] = {}
+        for route in discover_routes(app_dir, set(self.modules)):
+            closure = route_closure(self.graph, route["entries"])
+            client_packages = sorted(name for name, (is_client, _) in closure["packages"].items() if is_client)
+            result = {
+                "route": route["route"],
+                "kind": route["kind"],
+                "file": self.relpath(route["file"]),
+                "modules": len(closure["modules"]),
+                "bytes": sum(self.sizes.get(p, 0) for p in closure["modules"]),
+                "client_modules": len(closure["client"]),
+                "client_bytes": sum(self.sizes.get(p, 0) for p in closure["client"]),
+                "lazy_modules": len(closure["lazy"]),
+                "lazy_bytes": sum(self.sizes.get(p, 0) for p in closure["lazy"]),
+                "packages": sorted(closure["packages"]),
+                "client_packages": client_packages,
+                "heavy_client_packages": [p for p in client_packages if p in HEAVY_PACKAGES],
+            }
+            routes.append(result)
+            for name in result["heavy_client_packages"]:
+                path = [self.relpath(p) for p in closure["packages"][name][1][:-1]] + [name]
+                importer = path[-2] if len(path) > 1 else result["file"]
+                entry = heavy.setdefault((name, importer), {
+                    "package": name,
+                    "approx_kb": HEAVY_PACKAGES[name],
+                    "importer": importer,
+                    "chain": path,
+                    "routes": [],
+                })
+                entry["routes"].append(result["route"])
+
+        routes.sort(key=lambda r: (-r["client_bytes"], r["route"]))
+        heavy_list = sorted(heavy.values(), key=lambda h: (-h["approx_kb"] * len(h["routes"]), h["package"]))
+        return {
+            "app_dir": self.relpath(app_dir),
+            "files": len(self.modules),
+            "imports": sum(len(edges) for edges in self.graph.edges.values()),
+            "cache": self.cache.stats(),
+            "routes": routes,
+            "heavy": heavy_list,
+        }
+
+
+def _kb(size: int) -> str:
+    return f"{size / 1024:.1f} KB"
+
+
+def print_report(report: dict, top: int = 15):
+    print("\n" + "=" * 70)
+    print("BUNDLE IMPACT ESTIMATE (source bytes, no build)")
+    print("=" * 70)
+    if report["app_dir"] is None:
+        print("\n[!] No app/ or src/app/ directory: nothing to analyze")
+        return
+    cache = report["cache"]
+    print(f"App dir: {report['app_dir']} | {report['files']} modules, {report['imports']} imports "
+          f"(cache: {cache['hits']} hit(s), {cache['misses']} miss(es))")
+
+    pages = [r for r in report["routes"] if r["kind"] == "page"]
+    apis = [r for r in report["routes"] if r["kind"] == "api"]
+    print(f"\n[ROUTES] {len(pages)} page(s), {len(apis)} API route(s) - heaviest client bundles:")
+    print(f"  {'Route':<48} {'Client':>10} {'Mods':>5} {'Total':>10} {'Lazy':>10}")
+    for route in pages[:top]:
+        print(f"  {route['route'][:48]:<48} {_kb(route['client_bytes']):>10} {route['client_modules']:>5} "
+              f"{_kb(route['bytes']):>10} {_kb(route['lazy_bytes']):>10}")
+    if len(pages) > top:
+        print(f"  ... and {len(pages) - top} more page(s)")
+
+    print(f"\n[HEAVY CLIENT IMPORTS] ({len(report['heavy'])})")
+    for heavy in report["heavy"]:
+        routes = heavy["routes"]
+        shown = ', '.join(routes[:3]) + (f" (+{len(routes) - 3})" if len(routes) > 3 else "")
+        print(f"  - {heavy['package']} (~{heavy['approx_kb']} KB gz) imported by {heavy['importer']}")
+        print(f"    Via: {' -> '.join(heavy['chain'])}")
+        print(f"    Routes: {shown}")
+        print(f"    Fix: load it with next/dynamic (ssr: false) or import() inside the handler that needs it\n")
+    if not report["heavy"]:
+        print("  [OK] No heavy package is statically reachable from client code")
+    print("=" * 70)
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if not args:
+        print("Usage: python bundle_analyzer.py <project_path> [--json[=<file>]] [--no-cache] [--jsonl[=<file>]]")
+        sys.exit(1)
+    project_path = args[0]
+    if not os.path.exists(project_path):
+        print(f"[ERROR] Path not found: {project_path}")
+        sys.exit(1)
+
+    json_target = None
+    for arg in sys.argv[1:]:
+        if arg == '--json':
+            json_target = '-'
+        elif arg.startswith('--json='):
+            json_target = arg.split('=', 1)[1] or '-'
+
+    emitter = open_emitter("bundle_analyzer", findings_flag(sys.argv))
+    analyzer = BundleAnalyzer(project_path, use_cache='--no-cache' not in sys.argv)
+    report = analyzer.analyze()
+
+    for heavy in report["heavy"]:
+        emitter.finding("warning", f"{heavy['package']} (~{heavy['approx_kb']} KB gz) statically imported by "
+                        f"client code in {len(heavy['routes'])} route(s)",
+                        file=heavy["importer"], package=heavy["package"], chain=heavy["chain"],
+                        routes=heavy["routes"])
+
+    if json_target == '-':
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+        if json_target:
+            Path(json_target).write_text(json.dumps(report, indent=2), encoding='utf-8')
+            print(f"JSON report: {json_target}")
+
+    emitter.summary(passed=True, routes=len(report["routes"]), heavy_client_imports=len(report["heavy"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,64 +2,359 @@
 """
 Skill: performance-profiling
 Script: lighthouse_audit.py
-Purpose: Run Lighthouse performance audit on a URL
+Purpose: Run Lighthouse performance audits on one URL or on every locale route of the app
 Usage: python lighthouse_audit.py https://example.com
-Output: JSON with performance scores
-Note: Requires lighthouse CLI (npm install -g lighthouse)
+       python lighthouse_audit.py <project_path> [<url>]
+       python lighthouse_audit.py <project_path> --batch [<base_url>] [--serve] [--routes=/,/courses]
+                                  [--locales=es,eu,en] [--runs=N] [--desktop] [--keep-reports]
+                                  [--budget[=<file>]] [--history=<file>] [--json]
+       python lighthouse_audit.py <project_path> --ingest <report.json>... [--history=<file>]
+       python lighthouse_audit.py <project_path> --trend[=<metric>] [--history=<file>]
+Output: JSON with performance scores (single URL); batch table and history rows otherwise
+Note: Requires lighthouse CLI (npm install -g lighthouse) and, for --batch, Chrome/Chromium
+      (CHROME_PATH, a chrome/chromium binary on PATH, or Playwright's bundled Chromium)
+
+Batch mode audits ROUTES x LOCALES (e.g. /es/courses, /eu/courses, ...)
+serially against ONE headless Chrome started with remote debugging: each
+Lighthouse run attaches to it through --port instead of launching its own
+browser. With --serve the built app is started (`npm run start`) on the
+base URL's port for the duration of the batch. With --runs=N every page is
+audited N times and the median run (by performance score) is kept.
+
+Every audited page becomes one row of the columnar history
+(.agent/lighthouse_history.json, see .agent/scripts/metric_history.py):
+category scores, the metric audits (FCP, LCP, TBT, CLS, SI, TTI, TTFB) and
+transfer size / request count per resource type. --keep-reports stores the
+full reports gzipped under .agent/cache/lighthouse/ and records their path;
+--ingest indexes reports saved elsewhere (e.g. the ones at the repo root).
+
+--budget checks every audited page against the per-route budgets of
+.agent/performance-budget.json (see performance_budget.py), which also
+supplies the routes and locales when --routes / --locales are not given.
+The batch exits 1 naming the resources behind each violation.
 """
-import subprocess
+import contextlib
+import gzip
 import json
-import sys
 import os
+import shutil
+import subprocess
+import sys
 import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
 
-def run_lighthouse(url: str) -> dict:
-    """Run Lighthouse audit on URL."""
+# Shared columnar history (.agent/scripts/)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from metric_history import MetricHistory, git_commit
+# Per-route budgets (same directory)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import performance_budget
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+CATEGORIES = ("performance", "accessibility", "best-practices", "seo")
+
+# Metric audits kept per page: history column -> Lighthouse audit id (numericValue, ms except CLS)
+METRIC_AUDITS = {
+    "fcp": "first-contentful-paint",
+    "lcp": "largest-contentful-paint",
+    "tbt": "total-blocking-time",
+    "cls": "cumulative-layout-shift",
+    "si": "speed-index",
+    "tti": "interactive",
+    "ttfb": "server-response-time",
+    "total_bytes": "total-byte-weight",
+}
+
+# resource-summary rows kept as <type>_bytes / <type>_requests columns
+RESOURCE_TYPES = ("total", "document", "script", "stylesheet", "image", "font", "media", "other", "third-party")
+
+# Parts of a saved report that load_report() keeps when streaming; the rest
+# (screenshots, treemap data, i18n strings, timings) is skipped while parsing
+REPORT_KEYS = ("requestedUrl", "finalUrl", "finalDisplayedUrl", "fetchTime", "lighthouseVersion",
+               "runtimeError", "configSettings", "categories", "entities")
+SKIPPED_AUDITS = {"screenshot-thumbnails", "final-screenshot", "full-page-screenshot", "script-treemap-data"}
+
+DEFAULT_BASE_URL = "http://localhost:3000"
+DEFAULT_ROUTES = ("/", "/courses", "/rental")
+DEFAULT_LOCALES = ("es", "eu", "en")
+
+# History columns --trend can plot
+TREND_METRICS = ({name.replace('-', '_') for name in CATEGORIES} | set(METRIC_AUDITS)
+                 | {f"{kind.replace('-', '_')}_{unit}" for kind in RESOURCE_TYPES for unit in ("bytes", "requests")})
+
+HISTORY_FILE = Path(".agent") / "lighthouse_history.json"
+REPORTS_DIR = Path(".agent") / "cache" / "lighthouse"
+
+LIGHTHOUSE_TIMEOUT = 180
+SERVER_START_TIMEOUT = 90
+CHROME_START_TIMEOUT = 30
+
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+# ============================================================================
+#  REPORT EXTRACTION
+# ============================================================================
+
+def _stream_report(f) -> dict:
+    """Build only REPORT_KEYS (minus SKIPPED_AUDITS) from the ijson event stream of a report."""
+    report: dict = {}
+    builder, depth, target = None, 0, None
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            depth += event in ('start_map', 'start_array')
+            depth -= event in ('end_map', 'end_array')
+            if depth == 0:
+                target[0][target[1]] = builder.value
+                builder = None
+            continue
+        if event == 'map_key':
+            if prefix == '' and value == 'audits':
+                report['audits'] = {}
+            elif prefix == '' and value in REPORT_KEYS:
+                target = (report, value)
+            elif prefix == 'audits' and value not in SKIPPED_AUDITS:
+                target = (report['audits'], value)
+            else:
+                target = None
+            continue
+        if target is not None and event != 'end_map':
+            builder = ObjectBuilder()
+            builder.event(event, value)
+            depth = int(event in ('start_map', 'start_array'))
+            if depth == 0:
+                target[0][target[1]] = builder.value
+                builder = None
+            else:
+                continue
+        target = None
+    return report
+
+
+def load_report(path: Path) -> dict:
+    """A Lighthouse JSON report, plain or gzipped (streamed without screenshots when ijson is installed)."""
+    gzipped = str(path).endswith('.gz')
+    if IJSON_AVAILABLE:
+        with (gzip.open(path, 'rb') if gzipped else open(path, 'rb')) as f:
+            return _stream_report(f)
+    with (gzip.open(path, 'rt', encoding='utf-8') if gzipped else open(path, encoding='utf-8')) as f:
+        return json.load(f)
+
+
+def _score(categories: dict, name: str) -> Optional[int]:
+    score = categories.get(name, {}).get("score")
+    return None if score is None else int(round(score * 100))
+
+
+def extract_metrics(report: dict) -> dict:
+    """Category scores, metric audits and resource summary of a report (None where the run failed)."""
+    audits = report.get("audits", {})
+    categories = report.get("categories", {})
+    metrics = {}
+    for column, audit_id in METRIC_AUDITS.items():
+        value = audits.get(audit_id, {}).get("numericValue")
+        metrics[column] = None if value is None else round(value, 4 if column == "cls" else 1)
+
+    resources = {}
+    for item in audits.get("resource-summary", {}).get("details", {}).get("items", []):
+        if item.get("resourceType") in RESOURCE_TYPES:
+            resources[item["resourceType"]] = {"bytes": item.get("transferSize", 0),
+                                               "requests": item.get("requestCount", 0)}
+
+    error = report.get("runtimeError") or {}
+    return {
+        "url": report.get("requestedUrl"),
+        "final_url": report.get("finalDisplayedUrl") or report.get("finalUrl"),
+        "fetch_time": report.get("fetchTime"),
+        "lighthouse_version": report.get("lighthouseVersion"),
+        "form_factor": report.get("configSettings", {}).get("formFactor"),
+        "error": error.get("code"),
+        "scores": {name.replace('-', '_'): _score(categories, name) for name in CATEGORIES if name in categories},
+        "metrics": metrics,
+        "resources": resources,
+    }
+
+
+def history_row(extracted: dict, route: str, locale: Optional[str], **extra) -> dict:
+    """Flat history row of an extracted report."""
+    row = {
+        "timestamp": extracted["fetch_time"],
+        "url": extracted["url"],
+        "host": urlparse(extracted["url"] or "").netloc or None,
+        "route": route,
+        "locale": locale,
+        "form_factor": extracted["form_factor"],
+        "lighthouse_version": extracted["lighthouse_version"],
+        "error": extracted["error"],
+    }
+    row.update(extracted["scores"])
+    row.update(extracted["metrics"])
+    for kind in RESOURCE_TYPES:
+        summary = extracted["resources"].get(kind)
+        column = kind.replace('-', '_')
+        row[f"{column}_bytes"] = summary["bytes"] if summary else None
+        row[f"{column}_requests"] = summary["requests"] if summary else None
+    row.update(extra)
+    return row
+
+
+def split_route(url: str, locales=DEFAULT_LOCALES) -> Tuple[str, Optional[str]]:
+    """(route, locale) of an audited URL: /eu/courses/ -> ('/courses', 'eu')."""
+    parts = [p for p in urlparse(url or "").path.split('/') if p]
+    locale = None
+    if parts and parts[0] in locales:
+        locale = parts.pop(0)
+    return '/' + '/'.join(parts), locale
+
+
+def route_url(base_url: str, locale: str, route: str) -> str:
+    return base_url.rstrip('/') + '/' + locale + ('' if route == '/' else '/' + route.strip('/'))
+
+# ============================================================================
+#  BROWSER, SERVER AND LIGHTHOUSE
+# ============================================================================
+
+def find_chrome() -> Optional[str]:
+    """Chrome/Chromium executable: CHROME_PATH, a binary on PATH, or Playwright's Chromium."""
+    if os.environ.get("CHROME_PATH"):
+        return os.environ["CHROME_PATH"]
+    for name in CHROME_BINARIES:
+        found = shutil.which(name)
+        if found:
+            return found
     try:
-        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
-            output_path = f.name
-        
-        result = subprocess.run(
-            [
-                "lighthouse",
-                url,
-                "--output=json",
-                f"--output-path={output_path}",
-                "--chrome-flags=--headless",
-                "--only-categories=performance,accessibility,best-practices,seo"
-            ],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
-        
-        if os.path.exists(output_path):
-            with open(output_path, 'r') as f:
-                report = json.load(f)
-            os.unlink(output_path)
-            
-            categories = report.get("categories", {})
-            return {
-                "url": url,
-                "scores": {
-                    "performance": int(categories.get("performance", {}).get("score", 0) * 100),
-                    "accessibility": int(categories.get("accessibility", {}).get("score", 0) * 100),
-                    "best_practices": int(categories.get("best-practices", {}).get("score", 0) * 100),
-                    "seo": int(categories.get("seo", {}).get("score", 0) * 100)
-                },
-                "summary": get_summary(categories)
-            }
-        else:
-            return {"error": "Lighthouse failed to generate report", "stderr": result.stderr[:500]}
-            
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        return None
+    try:
+        with sync_playwright() as p:
+            path = p.chromium.executable_path
+        return path if path and os.path.exists(path) else None
+    except Exception:
+        return None
+
+
+@contextlib.contextmanager
+def warm_chrome(chrome: str, extra_flags: Tuple[str, ...] = ()) -> Iterator[int]:
+    """Headless Chrome with remote debugging for the whole batch; yields its debugging port."""
+    profile = tempfile.mkdtemp(prefix="lighthouse-chrome-")
+    process = subprocess.Popen(
+        [chrome, "--headless=new", "--remote-debugging-port=0", f"--user-data-dir={profile}",
+         "--no-first-run", "--no-default-browser-check", "--disable-gpu", *extra_flags, "about:blank"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        # Chrome writes the port it picked to <profile>/DevToolsActivePort
+        port_file = Path(profile) / "DevToolsActivePort"
+        deadline = time.monotonic() + CHROME_START_TIMEOUT
+        port = None
+        while port is None:
+            if process.poll() is not None:
+                raise RuntimeError(f"Chrome exited during startup (code {process.returncode})")
+            if time.monotonic() > deadline:
+                raise RuntimeError("Chrome did not open its debugging port in time")
+            try:
+                port = int(port_file.read_text().split()[0])
+            except (OSError, ValueError, IndexError):
+                time.sleep(0.2)
+        yield port
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        shutil.rmtree(profile, ignore_errors=True)
+
+
+def _reachable(url: str) -> bool:
+    try:
+        urllib.request.urlopen(url, timeout=5).close()
+        return True
+    except urllib.error.HTTPError:
+        return True  # the server answers, even if not with a 2xx
+    except (urllib.error.URLError, OSError):
+        return False
+
+
+@contextlib.contextmanager
+def local_server(project_path: Path, base_url: str) -> Iterator[None]:
+    """`npm run start` (next start) on the base URL's port, unless something already serves it."""
+    if _reachable(base_url):
+        yield
+        return
+    port = urlparse(base_url).port or 3000
+    npm = shutil.which("npm") or "npm"
+    process = subprocess.Popen([npm, "run", "start", "--", "-p", str(port)], cwd=project_path,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        while not _reachable(base_url):
+            if process.poll() is not None:
+                raise RuntimeError(f"`npm run start` exited (code {process.returncode}): is the app built?")
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Server did not answer on {base_url} in {SERVER_START_TIMEOUT}s")
+            time.sleep(1)
+        yield
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def lighthouse_report(url: str, port: Optional[int] = None, categories=CATEGORIES,
+                      desktop: bool = False) -> Tuple[Optional[dict], Optional[str]]:
+    """Run Lighthouse on URL; attaches to the Chrome on `port` when given. Returns (report, error)."""
+    command = ["lighthouse", url, "--output=json", "--output-path=stdout", "--quiet",
+               f"--only-categories={','.join(categories)}"]
+    if port:
+        command.append(f"--port={port}")
+    else:
+        command.append("--chrome-flags=--headless")
+    if desktop:
+        command.append("--preset=desktop")
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=LIGHTHOUSE_TIMEOUT)
     except subprocess.TimeoutExpired:
-        return {"error": "Lighthouse audit timed out"}
+        return None, "Lighthouse audit timed out"
     except FileNotFoundError:
-        return {"error": "Lighthouse CLI not found. Install with: npm install -g lighthouse"}
+        return None, "Lighthouse CLI not found. Install with: npm install -g lighthouse"
+    try:
+        return json.loads(result.stdout), None
+    except ValueError:
+        return None, f"Lighthouse failed to generate report: {result.stderr[:500]}"
+
+
+def run_lighthouse(url: str) -> dict:
+    """Run Lighthouse audit on URL."""
+    report, error = lighthouse_report(url)
+    if report is None:
+        return {"error": error}
+    extracted = extract_metrics(report)
+    scores = extracted["scores"]
+    return {
+        "url": url,
+        "scores": {name: scores.get(name) or 0 for name in ("performance", "accessibility", "best_practices", "seo")},
+        "metrics": extracted["metrics"],
+        "summary": get_summary(report.get("categories", {}))
+    }
+
 
 def get_summary(categories: dict) -> str:
     """Generate summary based on scores."""
-    perf = categories.get("performance", {}).get("score", 0) * 100
+    perf = (categories.get("performance", {}).get("score") or 0) * 100
     if perf >= 90:
         return "[OK] Excellent performance"
     elif perf >= 50:
@@ -67,10 +362,258 @@ def get_summary(categories: dict) -> str:
     else:
         return "[X] Poor performance"
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print(json.dumps({"error": "Usage: python lighthouse_audit.py <url>"}))
+# ============================================================================
+#  BATCH
+# ============================================================================
+
+def median_run(runs: List[dict]) -> dict:
+    """The run with the median performance score (Lighthouse's advice for variance)."""
+    ranked = sorted(runs, key=lambda r: r["scores"].get("performance") or 0)
+    return ranked[len(ranked) // 2]
+
+
+def keep_report(project_path: Path, report: dict, locale: str, route: str) -> str:
+    """Store a full report gzipped under REPORTS_DIR; returns its project-relative path."""
+    stamp = (report.get("fetchTime") or time.strftime("%Y-%m-%dT%H:%M:%S")).replace(':', '').split('.')[0]
+    slug = route.strip('/').replace('/', '_') or "index"
+    relative = REPORTS_DIR / locale / f"{slug}-{stamp}.json.gz"
+    target = project_path / relative
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(target, 'wt', encoding='utf-8') as f:
+        json.dump(report, f, separators=(',', ':'))
+    return relative.as_posix()
+
+
+def run_batch(project_path: Path, base_url: str, routes, locales, runs: int = 1, desktop: bool = False,
+              keep_reports: bool = False, on_result=None) -> List[dict]:
+    """
+    Audit every locale route against one warm Chrome; one history row per page.
+
+    on_result(row, report) is called after each page with the kept report (None if every run failed).
+    """
+    chrome = find_chrome()
+    if chrome is None:
+        raise RuntimeError("Chrome/Chromium not found: set CHROME_PATH or install chromium")
+    commit = git_commit(project_path)
+    rows = []
+    with warm_chrome(chrome) as port:
+        for route in routes:
+            for locale in locales:
+                url = route_url(base_url, locale, route)
+                attempts, reports, error, chosen_report = [], [], None, None
+                for _ in range(runs):
+                    report, error = lighthouse_report(url, port, desktop=desktop)
+                    if report is not None:
+                        reports.append(report)
+                        attempts.append(extract_metrics(report))
+                if not attempts:
+                    row = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "url": url,
+                           "host": urlparse(url).netloc, "route": route, "locale": locale, "error": error, "commit": commit, "source": "batch"}
+                else:
+                    chosen = median_run(attempts)
+                    chosen_report = reports[attempts.index(chosen)]
+                    extra = {"commit": commit, "source": "batch", "runs": len(attempts)}
+                    if keep_reports:
+                        extra["report"] = keep_report(project_path, chosen_report, locale, route)
+                    row = history_row(chosen, route, locale, **extra)
+                rows.append(row)
+                if on_result:
+                    on_result(row, chosen_report)
+    return rows
+
+
+def ingest_reports(paths: List[str], history: MetricHistory, project_path: Path,
+                   locales=DEFAULT_LOCALES) -> List[dict]:
+    """History rows for saved reports not already indexed (same URL and fetch time)."""
+    seen = set(zip(history.column("url"), history.column("timestamp")))
+    rows = []
+    for name in paths:
+        path = Path(name)
+        try:
+            extracted = extract_metrics(load_report(path))
+        except (OSError, ValueError) as e:
+            print(f"[!] Skipping {name}: {e}", file=sys.stderr)
+            continue
+        if (extracted["url"], extracted["fetch_time"]) in seen:
+            continue
+        seen.add((extracted["url"], extracted["fetch_time"]))
+        route, locale = split_route(extracted["url"], locales)
+        try:
+            report_path = path.resolve().relative_to(project_path.resolve()).as_posix()
+        except ValueError:
+            report_path = str(path)
+        rows.append(history_row(extracted, route, locale, source="ingest", report=report_path))
+    return rows
+
+# ============================================================================
+#  OUTPUT
+# ============================================================================
+
+def _fmt(value, metric: str = "") -> str:
+    """A value (or delta) of a history column, formatted by what the column measures, never by its size."""
+    if value is None:
+        return "-"
+    if metric == "cls":
+        return f"{value:.3f}"
+    if metric.endswith("_bytes"):
+        return f"{value / 1024:.0f}KB"
+    if metric in METRIC_AUDITS:
+        return f"{value:.0f}ms"
+    if isinstance(value, float):
+        return f"{value:.0f}"
+    return f"{value}"
+
+
+def print_row(row: dict):
+    page = f"{row.get('locale') or '-'} {row['route']}"
+    if row.get("performance") is None and row.get("lcp") is None:
+        print(f"  {page:<28} [X] {row.get('error') or 'no result'}")
+        return
+    flag = f" [!] {row['error']}" if row.get("error") else ""
+    print(f"  {page:<28} perf {_fmt(row.get('performance')):>3}  LCP {_fmt(row.get('lcp'), 'lcp'):>7}  "
+          f"TBT {_fmt(row.get('tbt'), 'tbt'):>6}  CLS {_fmt(row.get('cls'), 'cls'):>5}  "
+          f"JS {_fmt(row.get('script_bytes'), 'script_bytes'):>6}  "
+          f"IMG {_fmt(row.get('image_bytes'), 'image_bytes'):>6}{flag}")
+
+
+def print_trend(history: MetricHistory, metric: str, last: int = 8):
+    print(f"\n[TREND] {metric} - last {last} value(s) per page ({len(history)} row(s) in history)")
+    series = history.series(metric, ("host", "route", "locale"), last=last)
+    if not series:
+        print(f"  No '{metric}' values recorded yet")
+        return
+    for (host, route, locale), points in sorted(series.items(), key=lambda item: tuple(map(str, item[0]))):
+        values = ' '.join(_fmt(v, metric) for _, v in points)
+        delta = ""
+        if len(points) > 1 and isinstance(points[-1][1], (int, float)):
+            change = points[-1][1] - points[0][1]
+            delta = f"  ({'+' if change >= 0 else ''}{_fmt(change, metric)})"
+        print(f"  {host or '-'} {locale or '-'} {route:<24} {values}{delta}")
+
+
+def _option(argv: List[str], name: str) -> Optional[str]:
+    for i, arg in enumerate(argv):
+        if arg == name and i + 1 < len(argv) and not argv[i + 1].startswith('--'):
+            return argv[i + 1]
+        if arg.startswith(name + "="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+def _int_option(argv: List[str], name: str, default: int, minimum: int = 1) -> int:
+    """Integer value of an option (at least `minimum`); a malformed value is a usage error (exit 1)."""
+    value = _option(argv, name)
+    if value is None:
+        return default
+    try:
+        return max(minimum, int(value))
+    except ValueError:
+        print(json.dumps({"error": f"{name} expects an integer, got '{value}'"}))
         sys.exit(1)
-    
-    result = run_lighthouse(sys.argv[1])
-    print(json.dumps(result, indent=2))
+
+
+def _list_option(argv: List[str], name: str, default) -> List[str]:
+    value = _option(argv, name)
+    return [v.strip() for v in value.split(',') if v.strip()] if value else list(default)
+
+
+def main():
+    argv = sys.argv[1:]
+    option_values = {argv[i + 1] for i, a in enumerate(argv[:-1])
+                     if a in ("--history", "--routes", "--locales", "--runs", "--budget", "--trend")}
+    args = [a for a in argv if not a.startswith('--') and a not in option_values]
+    if not args:
+        print(json.dumps({"error": "Usage: python lighthouse_audit.py <url> | <project_path> --batch [<base_url>]"}))
+        sys.exit(1)
+
+    # Single URL: `<url>` or `<project_path> <url>` (verify_all / checklist convention)
+    if args[0].startswith(("http://", "https://")):
+        project_path, rest = Path("."), args
+    else:
+        project_path, rest = Path(args[0]), args[1:]
+    batch = '--batch' in argv
+    ingest = '--ingest' in argv
+    trend = None
+    if any(a == '--trend' or a.startswith('--trend=') for a in argv):
+        trend = _option(argv, "--trend") or "performance"
+        if trend not in TREND_METRICS:
+            print(json.dumps({"error": f"--trend: unknown metric '{trend}' "
+                                       f"(one of {', '.join(sorted(TREND_METRICS))})"}))
+            sys.exit(1)
+
+    if not (batch or ingest or trend):
+        if not rest:
+            print(json.dumps({"error": "Usage: python lighthouse_audit.py <url>"}))
+            sys.exit(1)
+        result = run_lighthouse(rest[0])
+        print(json.dumps(result, indent=2))
+        return
+
+    history = MetricHistory(Path(_option(argv, "--history") or project_path / HISTORY_FILE))
+    budget_config = None
+    if '--budget' in argv or _option(argv, "--budget"):
+        budget_path = Path(_option(argv, "--budget") or project_path / performance_budget.BUDGET_FILE)
+        try:
+            budget_config = performance_budget.load_budgets(budget_path)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Could not load budget file {budget_path}: {e}")
+            sys.exit(1)
+    locales = _list_option(argv, "--locales", (budget_config or {}).get("locales") or DEFAULT_LOCALES)
+    exit_code = 0
+
+    if ingest:
+        rows = ingest_reports(rest, history, project_path, locales)
+        history.append(rows)
+        history.save()
+        print(f"[INGEST] {len(rows)} new report(s) indexed in {history.path}")
+        for row in rows:
+            print_row(row)
+
+    if batch:
+        base_url = rest[0] if rest else DEFAULT_BASE_URL
+        routes = _list_option(argv, "--routes", (budget_config or {}).get("routes") or DEFAULT_ROUTES)
+        runs = _int_option(argv, "--runs", 1)
+        as_json = '--json' in argv
+        if not as_json:
+            print(f"[BATCH] {len(routes)} route(s) x {len(locales)} locale(s) on {base_url}"
+                  f" ({runs} run(s) per page, median kept)")
+        budget_results = []
+
+        def on_result(row: dict, report: Optional[dict]):
+            if not as_json:
+                print_row(row)
+            if budget_config is None:
+                return
+            if report is None:
+                report = {"requestedUrl": row["url"], "runtimeError": {"code": row.get("error")}}
+            budget_results.append(performance_budget.check_report(report, row["route"], row["locale"],
+                                                                  budget_config["budgets"]))
+
+        server = local_server(project_path, base_url) if '--serve' in argv else contextlib.nullcontext()
+        try:
+            with server:
+                rows = run_batch(project_path, base_url, routes, locales, runs, desktop='--desktop' in argv,
+                                 keep_reports='--keep-reports' in argv,
+                                 on_result=on_result)
+        except RuntimeError as e:
+            print(json.dumps({"error": str(e)}) if as_json else f"[ERROR] {e}")
+            sys.exit(1)
+        history.append(rows)
+        history.save()
+        failed = [r for r in rows if r.get("performance") is None]
+        if as_json:
+            print(json.dumps({"pages": rows, "budgets": budget_results} if budget_config else rows, indent=2))
+        else:
+            print(f"\n{len(rows) - len(failed)}/{len(rows)} page(s) audited; history: {history.path}")
+            if budget_config:
+                performance_budget.print_results(budget_results)
+        if failed or not performance_budget.budget_passed(budget_results):
+            exit_code = 1
+
+    if trend:
+        print_trend(history, trend)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Skill: performance-profiling
+Script: lighthouse_diff.py
+Purpose: Compare two Lighthouse reports and rank what regressed
+Usage: python lighthouse_diff.py <before.json> <after.json> [--gate=lcp=250,tbt=100,...] [--top=N]
+                                 [--json[=<file>]] [--jsonl[=<file>]]
+Output: Score/metric deltas, ranked regressions, newly failing audits, gate verdict (exit 1 on failure)
+
+Reports are loaded with lighthouse_audit.load_report (streamed with ijson
+when installed, gzipped reports accepted) and aligned on three levels:
+
+- metrics: scores, metric audits and resource-summary transfer sizes
+  (the flat columns of the lighthouse history)
+- opportunities: audits that estimate savings (metricSavings,
+  overallSavingsMs/Bytes) and their items, matched by URL
+- network requests: matched by URL; first-party URLs are compared by path
+  with build hashes stripped, so two builds or hosts (live vs local) line up
+
+Regressions are ranked by estimated impact in ms. Byte growth is converted
+with the throughput of the "after" run's throttling settings (the time the
+extra bytes take on the simulated connection). Each audit is ranked once: a
+metric audit that also estimates savings (server-response-time for TTFB)
+is ranked by its measured delta, not again as an opportunity.
+
+The gate (exit code 1) fails when a metric delta exceeds its allowance:
+DEFAULT_GATE, overridden per run with --gate=<column>=<max increase> (any
+history column: lcp, tbt, cls, script_bytes, third_party_requests, ...;
+scores take the maximum drop in points). A malformed --gate or --top is a
+usage error (exit 1, like a failed gate, but nothing is compared).
+"""
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+# Shared JSONL findings stream (.agent/scripts/)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+# Report loading and metric extraction of the Lighthouse runner (same directory)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from findings_stream import findings_flag, open_emitter
+from lighthouse_audit import METRIC_AUDITS, extract_metrics, history_row, load_report, split_route
+from performance_budget import first_party_hosts
+
+# Allowed increase per run (scores: allowed drop in points)
+DEFAULT_GATE = {
+    "performance": 5,
+    "lcp": 250,
+    "tbt": 100,
+    "cls": 0.02,
+    "total_bytes": 50 * 1024,
+}
+SCORE_COLUMNS = {"performance", "accessibility", "best_practices", "seo"}
+MS_COLUMNS = {"fcp", "lcp", "tbt", "si", "tti", "ttfb"}
+HISTORY_META = {"timestamp", "url", "host", "route", "locale", "form_factor", "lighthouse_version", "error"}
+
+# Lighthouse's default mobile throttling (simulated 1.6 Mbps)
+DEFAULT_THROUGHPUT_KBPS = 1638.4
+
+# Ignore noise below these deltas
+MIN_BYTES_DELTA = 1024
+MIN_MS_DELTA = 10
+
+# Content hashes of Next.js build output, build id directories and RSC cache-busting params
+BUILD_HASH = re.compile(r'(?<![0-9a-z])[0-9a-f]{16,}(?![0-9a-z])', re.IGNORECASE)
+BUILD_ID_DIR = re.compile(r'/_next/static/[^/]+/(_buildManifest|_ssgManifest)')
+VOLATILE_PARAMS = {"_rsc", "v", "ts"}
+
+# ============================================================================
+#  ALIGNMENT
+# ============================================================================
+
+def request_key(url: str, first_party: set) -> str:
+    """Alignment key of a request URL: hashes stripped, first-party hosts dropped."""
+    parsed = urlparse(url)
+    path = BUILD_ID_DIR.sub(r'/_next/static/*/\1', BUILD_HASH.sub('*', parsed.path))
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parsed.query) if k not in VOLATILE_PARAMS))
+    host = '' if parsed.netloc in first_party else parsed.netloc
+    return host + path.rstrip('/') + ('?' + query if query else '')
+
+
+def network_requests(report: dict) -> Dict[str, dict]:
+    """Requests per alignment key: {key: {"type", "bytes", "count", "urls"}}."""
+    first_party = first_party_hosts(report)
+    requests: Dict[str, dict] = {}
+    items = report.get("audits", {}).get("network-requests", {}).get("details", {}).get("items", [])
+    for item in items:
+        url = item.get("url", "")
+        if url.startswith("data:"):
+            continue
+        entry = requests.setdefault(request_key(url, first_party),
+                                    {"type": item.get("resourceType") or "Other", "bytes": 0, "count": 0,
+                                     "urls": []})
+        entry["bytes"] += item.get("transferSize") or 0
+        entry["count"] += 1
+        entry["urls"].append(url)
+    return requests
+
+
+def opportunities(report: dict) -> Dict[str, dict]:
+    """Audits estimating savings: {id: {"title", "ms", "bytes", "items": {key: (ms, bytes)}}}."""
+    first_party = first_party_hosts(report)
+    found = {}
+    for audit_id, audit in report.get("audits", {}).items():
+        details = audit.get("details") or {}
+        savings = audit.get("metricSavings") or {}
+        if not savings and details.get("type") != "opportunity":
+            continue
+        ms = max([v for k, v in savings.items() if k != "CLS" and v] + [details.get("overallSavingsMs") or 0])
+        items = {}
+        for item in details.get("items", []) if isinstance(details.get("items"), list) else []:
+            url = item.get("url") if isinstance(item, dict) else None
+            if isinstance(url, str):
+                key = request_key(url, first_party)
+                before_ms, before_bytes = items.get(key, (0, 0))
+                items[key] = (before_ms + (item.get("wastedMs") or 0), before_bytes + (item.get("wastedBytes") or 0))
+        found[audit_id] = {
+            "title": audit.get("title", audit_id),
+            "ms": ms,
+            "bytes": details.get("overallSavingsBytes") or 0,
+            "items": items,
+        }
+    return found
+
+
+def audit_scores(report: dict) -> Dict[str, Tuple[float, str]]:
+    """Scored audits (binary and numeric): {id: (score, title)}."""
+    return {audit_id: (audit["score"], audit.get("title", audit_id))
+            for audit_id, audit in report.get("audits", {}).items()
+            if isinstance(audit.get("score"), (int, float))
+            and audit.get("scoreDisplayMode") in ("binary", "numeric", "metricSavings")}
+
+
+def throughput_kbps(report: dict) -> float:
+    throttling = report.get("configSettings", {}).get("throttling", {})
+    return throttling.get("throughputKbps") or DEFAULT_THROUGHPUT_KBPS
+
+
+def bytes_to_ms(size: float, kbps: float) -> float:
+    """Transfer time of `size` bytes at `kbps` (kilobits per second)."""
+    return size * 8 / kbps
+
+# ============================================================================
+#  DIFF
+# ============================================================================
+
+def _flat(report: dict) -> dict:
+    extracted = extract_metrics(report)
+    route, locale = split_route(extracted["url"])
+    return history_row(extracted, route, locale)
+
+
+def diff_reports(before: dict, after: dict, gate: Optional[Dict[str, float]] = None) -> dict:
+    """Aligned comparison of two reports, with ranked regressions and the gate verdict."""
+    gate = DEFAULT_GATE if gate is None else gate
+    kbps = throughput_kbps(after)
+    flat_before, flat_after = _flat(before), _flat(after)
+    # A run that produced no metrics (NO_FCP, page load errors) has nothing to align against
+    errors = [f"{flat['url']}: {flat['error'] or 'no metrics'}"
+              for flat in (flat_before, flat_after) if flat.get("lcp") is None]
+
+    metrics = {}
+    for column in flat_after:
+        if column in HISTORY_META:
+            continue
+        old, new = flat_before.get(column), flat_after.get(column)
+        if isinstance(old, (int, float)) and isinstance(new, (int, float)):
+            metrics[column] = {"before": old, "after": new, "delta": round(new - old, 4)}
+
+    regressions: List[dict] = []
+    improvements: List[dict] = []
+
+    def rank(entry: dict):
+        (regressions if entry["impact_ms"] > 0 else improvements).append(entry)
+
+    for column, values in metrics.items():
+        delta = values["delta"]
+        if column in MS_COLUMNS and abs(delta) >= MIN_MS_DELTA:
+            rank({"kind": "metric", "id": column, "title": column.upper(), **values, "unit": "ms",
+                  "impact_ms": delta})
+
+    # Opportunities: growing estimated savings = more wasted work than before.
+    # Metric audits are already ranked by their measured delta above.
+    metric_audits = {METRIC_AUDITS[column] for column in MS_COLUMNS if column in metrics}
+    opp_before, opp_after = (opportunities(before), opportunities(after)) if not errors else ({}, {})
+    for audit_id in sorted((set(opp_before) | set(opp_after)) - metric_audits):
+        old = opp_before.get(audit_id, {"ms": 0, "bytes": 0, "items": {}})
+        new = opp_after.get(audit_id, {"ms": 0, "bytes": 0, "items": {}})
+        delta_ms, delta_bytes = new["ms"] - old["ms"], new["bytes"] - old["bytes"]
+        if abs(delta_ms) < MIN_MS_DELTA and abs(delta_bytes) < MIN_BYTES_DELTA:
+            continue
+        impact = delta_ms if abs(delta_ms) >= MIN_MS_DELTA else bytes_to_ms(delta_bytes, kbps)
+        grown = sorted(((key, ms_bytes[1] - old["items"].get(key, (0, 0))[1])
+                        for key, ms_bytes in new["items"].items()), key=lambda kv: -kv[1])
+        rank({"kind": "opportunity", "id": audit_id, "title": (new.get("title") or old.get("title")),
+              "before": {"ms": old["ms"], "bytes": old["bytes"]}, "after": {"ms": new["ms"], "bytes": new["bytes"]},
+              "delta_ms": delta_ms, "delta_bytes": delta_bytes, "impact_ms": round(impact, 1),
+              "items": [{"url": key, "delta_bytes": d} for key, d in grown if d >= MIN_BYTES_DELTA][:5]})
+
+    # Network requests aligned by key
+    req_before, req_after = network_requests(before), network_requests(after)
+    added, removed = [], []
+    for key in sorted(set(req_before) | set(req_after)) if not errors else ():
+        old, new = req_before.get(key), req_after.get(key)
+        old_bytes, new_bytes = (old or {}).get("bytes", 0), (new or {}).get("bytes", 0)
+        delta = new_bytes - old_bytes
+        if old is None:
+            added.append(key)
+        elif new is None:
+            removed.append(key)
+        if abs(delta) < MIN_BYTES_DELTA:
+            continue
+        entry = new or old
+        rank({"kind": "request", "id": key, "title": entry["type"],
+              "before": {"bytes": old_bytes, "count": (old or {}).get("count", 0)},
+              "after": {"bytes": new_bytes, "count": (new or {}).get("count", 0)},
+              "delta_bytes": delta, "impact_ms": round(bytes_to_ms(delta, kbps), 1),
+              "status": "added" if old is None else "removed" if new is None else "changed"})
+
+    regressions.sort(key=lambda e: -e["impact_ms"])
+    improvements.sort(key=lambda e: e["impact_ms"])
+
+    # Audits that went from passing to failing (and back)
+    scores_before, scores_after = audit_scores(before), audit_scores(after)
+    newly_failing = sorted(({"id": a, "title": scores_after[a][1], "before": scores_before[a][0],
+                             "after": scores_after[a][0]}
+                            for a in set(scores_before) & set(scores_after)
+                            if scores_before[a][0] >= 0.9 > scores_after[a][0]),
+                           key=lambda e: e["after"])
+    fixed = sorted(a for a in set(scores_before) & set(scores_after) if scores_after[a][0] >= 0.9 > scores_before[a][0])
+
+    violations = []
+    for column, allowance in gate.items():
+        values = metrics.get(column)
+        if values is None:
+            continue
+        worse = -values["delta"] if column in SCORE_COLUMNS else values["delta"]
+        if worse > allowance:
+            violations.append({"metric": column, "before": values["before"], "after": values["after"],
+                               "delta": values["delta"], "allowed": allowance})
+
+    return {
+        "before": {"url": flat_before["url"], "fetch_time": flat_before["timestamp"], "error": flat_before["error"]},
+        "after": {"url": flat_after["url"], "fetch_time": flat_after["timestamp"], "error": flat_after["error"]},
+        "throughput_kbps": kbps,
+        "metrics": metrics,
+        "regressions": regressions,
+        "improvements": improvements,
+        "requests": {"before": len(req_before), "after": len(req_after), "added": added, "removed": removed},
+        "newly_failing_audits": newly_failing,
+        "fixed_audits": fixed,
+        "gate": {"passed": not violations and not errors, "violations": violations, "errors": errors,
+                 "allowances": gate},
+    }
+
+# ============================================================================
+#  OUTPUT
+# ============================================================================
+
+def _num(value, column: str = "") -> str:
+    if column.endswith("_bytes"):
+        return f"{value / 1024:.1f}KB"
+    if column in MS_COLUMNS:
+        return f"{value:.0f}ms"
+    return f"{value:.3f}".rstrip('0').rstrip('.') if isinstance(value, float) else str(value)
+
+
+def _signed(value, column: str = "") -> str:
+    text = _num(abs(value), column)
+    return ("+" if value > 0 else "-" if value < 0 else "") + text
+
+
+def _describe(entry: dict) -> str:
+    if entry["kind"] == "metric":
+        return f"{entry['title']} {_num(entry['before'], entry['id'])} -> {_num(entry['after'], entry['id'])}"
+    if entry["kind"] == "opportunity":
+        parts = []
+        if entry["delta_ms"]:
+            parts.append(f"savings {_signed(entry['delta_ms'], 'lcp')}")
+        if entry["delta_bytes"]:
+            parts.append(f"{_signed(entry['delta_bytes'], 'x_bytes')} wasted")
+        return f"{entry['title']} [{entry['id']}]: {', '.join(parts)}"
+    return (f"{entry['status']} {entry['title'].lower()} {entry['id']} "
+            f"({_signed(entry['delta_bytes'], 'x_bytes')}, {entry['before']['count']} -> {entry['after']['count']} req)")
+
+
+def print_report(diff: dict, top: int = 15):
+    print("\n" + "=" * 70)
+    print("LIGHTHOUSE DIFF")
+    print("=" * 70)
+    for side in ("before", "after"):
+        info = diff[side]
+        flag = f"  [!] runtime error: {info['error']}" if info["error"] else ""
+        print(f"{side.capitalize():<7} {info['url']} ({info['fetch_time']}){flag}")
+
+    print(f"\n[METRICS]")
+    print(f"  {'Metric':<24} {'Before':>10} {'After':>10} {'Delta':>10}")
+    for column, values in diff["metrics"].items():
+        if values["delta"] == 0 and (column.endswith("_requests") or values["before"] == 0):
+            continue
+        print(f"  {column:<24} {_num(values['before'], column):>10} {_num(values['after'], column):>10} "
+              f"{_signed(values['delta'], column):>10}")
+
+    print(f"\n[REGRESSIONS] ranked by estimated impact ({len(diff['regressions'])}, "
+          f"bytes at {diff['throughput_kbps']:.0f} Kbps)")
+    for entry in diff["regressions"][:top]:
+        print(f"  +{entry['impact_ms']:>7.0f}ms  {_describe(entry)}")
+        for item in entry.get("items", [])[:3]:
+            print(f"              {item['url']} ({_signed(item['delta_bytes'], 'x_bytes')})")
+    if len(diff["regressions"]) > top:
+        print(f"  ... and {len(diff['regressions']) - top} more")
+    if not diff["regressions"]:
+        print("  [OK] Nothing regressed")
+
+    print(f"\n[IMPROVEMENTS] ({len(diff['improvements'])})")
+    for entry in diff["improvements"][:min(top, 5)]:
+        print(f"  {entry['impact_ms']:>8.0f}ms  {_describe(entry)}")
+
+    requests = diff["requests"]
+    print(f"\n[REQUESTS] {requests['before']} -> {requests['after']} aligned URLs "
+          f"({len(requests['added'])} added, {len(requests['removed'])} removed)")
+    if diff["newly_failing_audits"]:
+        print(f"\n[NEWLY FAILING AUDITS] ({len(diff['newly_failing_audits'])})")
+        for audit in diff["newly_failing_audits"]:
+            print(f"  - {audit['title']} [{audit['id']}]: {audit['before']:.2f} -> {audit['after']:.2f}")
+    if diff["fixed_audits"]:
+        print(f"\n[FIXED AUDITS] {', '.join(diff['fixed_audits'])}")
+
+    gate = diff["gate"]
+    print("\n[GATE] " + ("[OK] Within allowances" if gate["passed"] else "[X] FAILED"))
+    for violation in gate["violations"]:
+        column = violation["metric"]
+        print(f"  - {column}: {_num(violation['before'], column)} -> {_num(violation['after'], column)} "
+              f"({_signed(violation['delta'], column)}, allowed {_num(violation['allowed'], column)})")
+    for error in gate["errors"]:
+        print(f"  - failed run, not comparable: {error}")
+    print("=" * 70)
+
+
+def parse_gate(argv: List[str]) -> Dict[str, float]:
+    """DEFAULT_GATE overridden by --gate=<column>=<allowance>,...; ValueError on a malformed entry."""
+    gate = dict(DEFAULT_GATE)
+    for arg in argv:
+        if arg.startswith("--gate="):
+            for part in arg.split("=", 1)[1].split(','):
+                if not part.strip():
+                    continue
+                column, sep, value = part.partition('=')
+                if not sep or not column.strip():
+                    raise ValueError(f"--gate entry '{part}' is not <column>=<max increase>")
+                try:
+                    gate[column.strip()] = float(value)
+                except ValueError:
+                    raise ValueError(f"--gate allowance for '{column.strip()}' is not a number: '{value}'")
+    return gate
+
+
+def parse_top(argv: List[str], default: int = 15) -> int:
+    """--top=N (regressions printed); ValueError unless N is a non-negative integer."""
+    top = default
+    for arg in argv:
+        if arg.startswith('--top='):
+            value = arg.split('=', 1)[1]
+            try:
+                top = int(value)
+            except ValueError:
+                top = -1
+            if top < 0:
+                raise ValueError(f"--top expects a non-negative integer, got '{value}'")
+    return top
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if len(args) != 2:
+        print("Usage: python lighthouse_diff.py <before.json> <after.json> [--gate=lcp=250,...] [--json[=<file>]]")
+        sys.exit(1)
+    json_target = None
+    for arg in sys.argv[1:]:
+        if arg == '--json':
+            json_target = '-'
+        elif arg.startswith('--json='):
+            json_target = arg.split('=', 1)[1] or '-'
+    try:
+        gate, top = parse_gate(sys.argv), parse_top(sys.argv)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        print("Usage: python lighthouse_diff.py <before.json> <after.json> [--gate=lcp=250,...] [--top=N]")
+        sys.exit(1)
+
+    emitter = open_emitter("lighthouse_diff", findings_flag(sys.argv))
+    try:
+        before, after = load_report(Path(args[0])), load_report(Path(args[1]))
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Could not read report: {e}")
+        emitter.summary(passed=False, error=str(e))
+        sys.exit(1)
+    diff = diff_reports(before, after, gate)
+
+    for violation in diff["gate"]["violations"]:
+        emitter.finding("critical", f"{violation['metric']} regressed by {violation['delta']} "
+                        f"(allowed {violation['allowed']})", **violation)
+    violated = {violation["metric"] for violation in diff["gate"]["violations"]}
+    for entry in diff["regressions"]:
+        if entry["kind"] == "metric" and entry["id"] in violated:
+            continue  # already reported as a gate violation
+        emitter.finding("warning", _describe(entry), kind=entry["kind"], id=entry["id"],
+                        impact_ms=entry["impact_ms"])
+
+    if json_target == '-':
+        print(json.dumps(diff, indent=2))
+    else:
+        print_report(diff, top)
+        if json_target:
+            Path(json_target).write_text(json.dumps(diff, indent=2), encoding='utf-8')
+            print(f"JSON report: {json_target}")
+
+    emitter.summary(passed=diff["gate"]["passed"], regressions=len(diff["regressions"]),
+                    violations=len(diff["gate"]["violations"]))
+    sys.exit(0 if diff["gate"]["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Skill: performance-profiling
+Script: performance_budget.py
+Purpose: Check Lighthouse reports against per-route performance budgets
+Usage: python performance_budget.py <project_path> <report.json>... [--budget=<file>] [--json] [--jsonl[=<file>]]
+       (lighthouse_audit.py --batch applies the same budgets with --budget[=<file>])
+Output: Budget violations per locale route, each with the resources behind it (exit 1 on violation,
+        or when a report could not be read or none was checked)
+
+The budget file (default .agent/performance-budget.json) uses the
+Lighthouse budget.json format ("LightWallet"), optionally wrapped with
+the routes and locales to audit:
+
+    {
+      "locales": ["es", "eu", "en"],
+      "routes": ["/", "/courses", "/rental"],
+      "budgets": [
+        {"path": "/*",
+         "timings": [{"metric": "largest-contentful-paint", "budget": 4000}],
+         "resourceSizes": [{"resourceType": "script", "budget": 900}],
+         "resourceCounts": [{"resourceType": "third-party", "budget": 10}]}
+      ]
+    }
+
+Paths match the route without its locale prefix (/eu/courses/x -> /courses/x):
+a plain path is a prefix, `*` is a wildcard and a trailing `$` anchors the
+end. When several budgets match a route, the last one wins. Timings are in
+ms (CLS unitless), resourceSizes in KB of transfer size.
+
+Every violation names what to look at: the heaviest requests of the
+resource type (enough of them to cover the overage), the third-party
+requests, the LCP element and its breakdown, the long tasks behind TBT or
+the elements that shifted.
+"""
+import json
+import re
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Shared JSONL findings stream (.agent/scripts/)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from findings_stream import findings_flag, open_emitter
+
+BUDGET_FILE = Path(".agent") / "performance-budget.json"
+
+TIMING_METRICS = {
+    "first-contentful-paint", "largest-contentful-paint", "total-blocking-time", "cumulative-layout-shift",
+    "speed-index", "interactive", "server-response-time", "max-potential-fid",
+}
+RESOURCE_TYPES = {"total", "document", "script", "stylesheet", "image", "media", "font", "other", "third-party"}
+
+# resource-summary type -> network-requests resourceType values
+REQUEST_TYPES = {
+    "document": {"Document"},
+    "script": {"Script"},
+    "stylesheet": {"Stylesheet"},
+    "image": {"Image"},
+    "media": {"Media"},
+    "font": {"Font"},
+}
+MAX_RESOURCES = 10
+
+# ============================================================================
+#  BUDGET FILE
+# ============================================================================
+
+def load_budgets(path: Path) -> dict:
+    """Budget file as {"budgets": [...], "routes": [...] | None, "locales": [...] | None}."""
+    data = json.loads(Path(path).read_text(encoding='utf-8'))
+    if isinstance(data, list):
+        data = {"budgets": data}
+    budgets = data.get("budgets", [])
+    for budget in budgets:
+        for entry in budget.get("timings", []):
+            if entry.get("metric") not in TIMING_METRICS:
+                raise ValueError(f"Unknown timing metric in budget: {entry.get('metric')}")
+        for key in ("resourceSizes", "resourceCounts"):
+            for entry in budget.get(key, []):
+                if entry.get("resourceType") not in RESOURCE_TYPES:
+                    raise ValueError(f"Unknown resourceType in {key}: {entry.get('resourceType')}")
+    return {"budgets": budgets, "routes": data.get("routes"), "locales": data.get("locales")}
+
+
+def _path_pattern(path: str) -> re.Pattern:
+    anchored = path.endswith('$')
+    body = re.escape(path.rstrip('$')).replace(r'\*', '.*')
+    return re.compile('^' + body + ('$' if anchored else ''))
+
+
+def budget_for(route: str, budgets: List[dict]) -> Optional[dict]:
+    """The budget applying to a (locale-less) route: the last one whose path matches."""
+    match = None
+    for budget in budgets:
+        if _path_pattern(budget.get("path", "/*")).match(route):
+            match = budget
+    return match
+
+# ============================================================================
+#  REPORT HELPERS
+# ============================================================================
+
+def first_party_hosts(report: dict) -> set:
+    """Hosts of the audited page and of the entities Lighthouse marks first-party."""
+    hosts = {urlparse(report.get(key) or "").netloc
+             for key in ("requestedUrl", "finalDisplayedUrl", "finalUrl")}
+    for entity in report.get("entities", []):
+        if entity.get("isFirstParty"):
+            hosts.update(urlparse(origin).netloc for origin in entity.get("origins", []))
+    hosts.discard("")
+    return hosts
+
+
+def _audit(report: dict, audit_id: str) -> dict:
+    return report.get("audits", {}).get(audit_id, {})
+
+
+def _items(report: dict, audit_id: str) -> list:
+    items = (_audit(report, audit_id).get("details") or {}).get("items", [])
+    return items if isinstance(items, list) else []
+
+
+def _requests(report: dict, resource_type: str) -> List[dict]:
+    items = [i for i in _items(report, "network-requests") if not i.get("url", "").startswith("data:")]
+    if resource_type == "total":
+        return items
+    if resource_type == "third-party":
+        hosts = first_party_hosts(report)
+        return [i for i in items if urlparse(i.get("url", "")).netloc not in hosts]
+    if resource_type == "other":
+        known = set().union(*REQUEST_TYPES.values())
+        return [i for i in items if i.get("resourceType") not in known]
+    return [i for i in items if i.get("resourceType") in REQUEST_TYPES[resource_type]]
+
+
+def _summary(report: dict, resource_type: str) -> Tuple[int, int]:
+    """(transfer bytes, request count) of a type from resource-summary."""
+    for item in _items(report, "resource-summary"):
+        if item.get("resourceType") == resource_type:
+            return item.get("transferSize", 0), item.get("requestCount", 0)
+    requests = _requests(report, resource_type)
+    return sum(i.get("transferSize") or 0 for i in requests), len(requests)
+
+
+def _heaviest(requests: List[dict], excess: Optional[float] = None) -> List[dict]:
+    """Largest requests first; when `excess` is given, just enough of them to cover it."""
+    ranked = sorted(requests, key=lambda i: -(i.get("transferSize") or 0))
+    chosen, covered = [], 0
+    for item in ranked[:MAX_RESOURCES]:
+        chosen.append({"url": item.get("url"), "bytes": item.get("transferSize") or 0})
+        covered += item.get("transferSize") or 0
+        if excess is not None and covered >= excess:
+            break
+    return chosen
+
+
+def _node(item: dict) -> str:
+    node = item.get("node", item) if isinstance(item, dict) else {}
+    label = node.get("nodeLabel") or node.get("snippet") or ""
+    selector = node.get("selector") or ""
+    return f"{selector} \"{label[:60]}\"".strip() if label else selector
+
+
+def timing_culprits(report: dict, metric: str) -> List[dict]:
+    """What drives a timing metric, as far as the report tells."""
+    if metric == "largest-contentful-paint":
+        culprits = []
+        for block in _items(report, "lcp-breakdown-insight") + _items(report, "largest-contentful-paint-element"):
+            if block.get("type") == "node":
+                culprits.append({"element": _node(block)})
+            for row in block.get("items", []) if isinstance(block.get("items"), list) else []:
+                if "duration" in row or "timing" in row:
+                    culprits.append({"phase": row.get("label") or row.get("phase"),
+                                     "ms": round(row.get("duration", row.get("timing", 0)))})
+                elif row.get("node"):
+                    culprits.append({"element": _node(row)})
+        return culprits
+    if metric in ("total-blocking-time", "interactive", "max-potential-fid"):
+        tasks = sorted(_items(report, "long-tasks"), key=lambda t: -(t.get("duration") or 0))
+        return [{"url": t.get("url"), "ms": round(t.get("duration") or 0)} for t in tasks[:MAX_RESOURCES]]
+    if metric == "cumulative-layout-shift":
+        shifts = sorted(_items(report, "layout-shifts"), key=lambda s: -(s.get("score") or 0))
+        return [{"element": _node(s), "score": round(s.get("score") or 0, 4)} for s in shifts[:MAX_RESOURCES]]
+    if metric in ("first-contentful-paint", "speed-index"):
+        blocking = _items(report, "render-blocking-insight") or _items(report, "render-blocking-resources")
+        return [{"url": b.get("url"), "bytes": b.get("totalBytes") or 0, "ms": round(b.get("wastedMs") or 0)}
+                for b in blocking if isinstance(b, dict) and b.get("url")][:MAX_RESOURCES]
+    return []
+
+# ============================================================================
+#  EVALUATION
+# ============================================================================
+
+def evaluate_budget(report: dict, budget: dict) -> List[dict]:
+    """Violations of one budget by one report, each with its culprits."""
+    violations = []
+    for entry in budget.get("timings", []):
+        metric = entry["metric"]
+        actual = _audit(report, metric).get("numericValue")
+        if actual is None or actual <= entry["budget"]:
+            continue
+        violations.append({
+            "metric": metric,
+            "limit": entry["budget"],
+            "actual": round(actual, 4 if metric == "cumulative-layout-shift" else 0),
+            "unit": "" if metric == "cumulative-layout-shift" else "ms",
+            "resources": timing_culprits(report, metric),
+        })
+    for entry in budget.get("resourceSizes", []):
+        kind = entry["resourceType"]
+        size, _ = _summary(report, kind)
+        limit = entry["budget"] * 1024
+        if size <= limit:
+            continue
+        violations.append({
+            "metric": f"{kind} bytes",
+            "limit": limit,
+            "actual": size,
+            "unit": "bytes",
+            "resources": _heaviest(_requests(report, kind), excess=size - limit),
+        })
+    for entry in budget.get("resourceCounts", []):
+        kind = entry["resourceType"]
+        _, count = _summary(report, kind)
+        if count <= entry["budget"]:
+            continue
+        violations.append({
+            "metric": f"{kind} requests",
+            "limit": entry["budget"],
+            "actual": count,
+            "unit": "requests",
+            "resources": _heaviest(_requests(report, kind)),
+        })
+    return violations
+
+
+def check_report(report: dict, route: str, locale: Optional[str], budgets: List[dict]) -> dict:
+    """Budget result of one audited page: {"url", "route", "locale", "path", "violations"}."""
+    budget = budget_for(route, budgets)
+    error = (report.get("runtimeError") or {}).get("code")
+    result = {"url": report.get("requestedUrl"), "route": route, "locale": locale,
+              "path": budget.get("path") if budget else None, "violations": [], "error": None}
+    if budget is None:
+        return result
+    if _audit(report, "largest-contentful-paint").get("numericValue") is None:
+        result["error"] = error or "no metrics"  # a failed run cannot prove the budget holds
+        return result
+    result["violations"] = evaluate_budget(report, budget)
+    return result
+
+# ============================================================================
+#  OUTPUT
+# ============================================================================
+
+def _value(value, unit: str) -> str:
+    if unit == "bytes":
+        return f"{value / 1024:.0f} KB"
+    if unit == "ms":
+        return f"{value:.0f} ms"
+    return f"{value}{' ' + unit if unit else ''}"
+
+
+def _resource(resource: dict) -> str:
+    if "url" in resource and "bytes" in resource:
+        blocking = f", blocks {resource['ms']} ms" if resource.get("ms") else ""
+        return f"{resource['url']} ({resource['bytes'] / 1024:.1f} KB{blocking})"
+    if "phase" in resource:
+        return f"{resource['phase']}: {resource['ms']} ms"
+    if "url" in resource:
+        return f"{resource['url']} ({resource['ms']} ms)"
+    if "score" in resource:
+        return f"{resource['element']} (shift {resource['score']})"
+    return resource.get("element", "")
+
+
+def print_results(results: List[dict]):
+    failing = [r for r in results if r["violations"] or r["error"]]
+    print(f"\n[BUDGETS] {len(results)} page(s) checked, {len(failing)} over budget or not measurable")
+    for result in results:
+        page = result['url'] or f"{result['locale'] or '-'} {result['route']}"
+        if result["path"] is None:
+            print(f"  [--] {page}: no budget applies")
+        elif result["error"]:
+            print(f"  [X] {page}: run failed ({result['error']}), budget '{result['path']}' not verified")
+        elif not result["violations"]:
+            print(f"  [OK] {page} within budget '{result['path']}'")
+        for violation in result["violations"]:
+            print(f"  [X] {page}: {violation['metric']} {_value(violation['actual'], violation['unit'])} "
+                  f"> {_value(violation['limit'], violation['unit'])} (budget '{result['path']}')")
+            for resource in violation["resources"]:
+                print(f"        - {_resource(resource)}")
+
+
+def emit_findings(emitter, results: List[dict]):
+    for result in results:
+        for violation in result["violations"]:
+            emitter.finding("critical", f"{violation['metric']} over budget on {result['url']}: "
+                            f"{violation['actual']} > {violation['limit']}",
+                            url=result["url"], route=result["route"], locale=result["locale"],
+                            metric=violation["metric"], resources=violation["resources"])
+        if result["error"]:
+            emitter.finding("high", f"Budget not verified on {result['url']}: run failed ({result['error']})",
+                            url=result["url"], route=result["route"], locale=result["locale"])
+
+
+def budget_passed(results: List[dict]) -> bool:
+    return not any(r["violations"] or r["error"] for r in results)
+
+
+def main():
+    # Report loading and route parsing of the Lighthouse runner (same directory)
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from lighthouse_audit import load_report, split_route
+
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if len(args) < 2:
+        print("Usage: python performance_budget.py <project_path> <report.json>... [--budget=<file>] [--json]")
+        sys.exit(1)
+    project_path = Path(args[0])
+    budget_path = next((a.split('=', 1)[1] for a in sys.argv if a.startswith('--budget=')), None) \
+        or project_path / BUDGET_FILE
+    emitter = open_emitter("performance_budget", findings_flag(sys.argv))
+    try:
+        config = load_budgets(Path(budget_path))
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Could not load budget file {budget_path}: {e}")
+        emitter.summary(passed=False, error=str(e))
+        sys.exit(1)
+
+    results = []
+    skipped = []
+    for name in args[1:]:
+        try:
+            report = load_report(Path(name))
+        except (OSError, ValueError) as e:
+            print(f"[!] Skipping {name}: {e}", file=sys.stderr)
+            skipped.append(name)
+            continue
+        route, locale = split_route(report.get("requestedUrl"), config["locales"] or ("es", "eu", "en"))
+        results.append(check_report(report, route, locale, config["budgets"]))
+
+    emit_findings(emitter, results)
+    if '--json' in sys.argv:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results)
+    # No report checked (or one unreadable) is not a pass: the gate would hold for a run that never measured
+    passed = budget_passed(results) and bool(results) and not skipped
+    if not results:
+        print("[X] No report could be checked against the budgets", file=sys.stderr)
+    elif skipped:
+        print(f"[X] {len(skipped)} report(s) could not be read: {', '.join(skipped)}", file=sys.stderr)
+    emitter.summary(passed=passed, pages=len(results), skipped=len(skipped),
+                    violations=sum(len(r["violations"]) for r in results))
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+CI gate of performance_budget.py: a run that checked no report, or could not
+read one of them, must fail instead of passing an empty result set.
+
+Run: python -m pytest .agent/skills/performance-profiling/tests -q
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "performance_budget.py"
+
+BUDGETS = {"budgets": [{"path": "/*", "timings": [{"metric": "largest-contentful-paint", "budget": 2500}]}]}
+
+
+def _report(url: str, lcp: float) -> dict:
+    return {
+        "requestedUrl": url,
+        "finalDisplayedUrl": url,
+        "audits": {"largest-contentful-paint": {"numericValue": lcp}},
+        "categories": {"performance": {"score": 0.9}},
+    }
+
+
+def _run(tmp_path: Path, *reports: str):
+    budget = tmp_path / "budget.json"
+    budget.write_text(json.dumps(BUDGETS), encoding='utf-8')
+    return subprocess.run([sys.executable, str(SCRIPT), str(tmp_path), *reports, f"--budget={budget}"],
+                          capture_output=True, text=True, timeout=60)
+
+
+def test_missing_report_fails_the_gate(tmp_path):
+    result = _run(tmp_path, str(tmp_path / "nonexistent.json"))
+    assert result.returncode == 1
+    assert "No report could be checked" in result.stderr
+
+
+def test_one_unreadable_report_fails_the_gate(tmp_path):
+    good = tmp_path / "good.json"
+    good.write_text(json.dumps(_report("http://localhost:3000/es", 1200)), encoding='utf-8')
+    bad = tmp_path / "bad.json"
+    bad.write_text("{not json", encoding='utf-8')
+    result = _run(tmp_path, str(good), str(bad))
+    assert result.returncode == 1
+    assert "could not be read" in result.stderr
+
+
+def test_readable_report_within_budget_passes(tmp_path):
+    good = tmp_path / "good.json"
+    good.write_text(json.dumps(_report("http://localhost:3000/es", 1200)), encoding='utf-8')
+    result = _run(tmp_path, str(good))
+    assert result.returncode == 0, result.stdout + result.stderr
@@ -16,6 +16,9 @@ WHAT IT CHECKS:
 
 Usage:
     python seo_checker.py <project_path>
+    python seo_checker.py <project_path> --since origin/main   # Only files changed since a ref
+    python seo_checker.py <project_path> --no-cache            # Ignore cached results
+    python seo_checker.py <project_path> --jsonl[=<file>]      # Stream findings as JSONL
 """
 import sys
 import json
@@ -23,6 +26,12 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+# Shared file walker + incremental result cache (.agent/scripts/file_index.py, audit_cache.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from file_index import get_project_index
+from audit_cache import incremental_flags, open_incremental
+from findings_stream import findings_flag, open_emitter
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -77,30 +86,27 @@ def is_page_file(file_path: Path) -> bool:
     return False
 
 
-def find_pages(project_path: Path) -> list:
-    """Find page files to check."""
-    patterns = ['**/*.html', '**/*.htm', '**/*.jsx', '**/*.tsx']
+def find_pages(project_path: Path, index=None) -> list:
+    """Find page files to check (of `index`, e.g. a --since view, if given)."""
+    extensions = {'.html', '.htm', '.jsx', '.tsx'}
     
     files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            # Skip excluded directories
-            if any(skip in f.parts for skip in SKIP_DIRS):
-                continue
-            
-            # Check if it's likely a page
-            if is_page_file(f):
-                files.append(f)
+    # Excluded directories are filtered by the shared index
+    for f in (index or get_project_index(project_path)).files(extensions, skip_dirs=SKIP_DIRS):
+        # Check if it's likely a page
+        if is_page_file(f):
+            files.append(f)
     
     return files[:50]  # Limit to 50 files
 
 
-def check_page(file_path: Path) -> dict:
+def check_page(file_path: Path, content: str = None) -> dict:
     """Check a single page for SEO issues."""
     issues = []
     
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
+        if content is None:
+            content = file_path.read_text(encoding='utf-8', errors='ignore')
     except Exception as e:
         return {"file": str(file_path.name), "issues": [f"Error: {e}"]}
     
@@ -155,6 +161,7 @@ def check_page(file_path: Path) -> dict:
 
 def main():
     project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    emitter = open_emitter("seo_checker", findings_flag(sys.argv))
     
     print(f"\n{'='*60}")
     print(f"  SEO CHECKER - Search Engine Optimization Audit")
@@ -163,14 +170,19 @@ def main():
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("-"*60)
     
+    # Only changed files are re-checked (--since <ref> limits the scan to a git diff)
+    since, use_cache = incremental_flags(sys.argv)
+    index, cache = open_incremental(project_path, "seo_checker", __file__, since, use_cache)
+    
     # Find pages
-    pages = find_pages(project_path)
+    pages = find_pages(project_path, index)
     
     if not pages:
         print("\n[!] No page files found.")
         print("    Looking for: HTML, JSX, TSX in pages/app/routes directories")
         output = {"script": "seo_checker", "files_checked": 0, "passed": True}
         print("\n" + json.dumps(output, indent=2))
+        emitter.summary(passed=True, files_checked=0)
         sys.exit(0)
     
     print(f"Found {len(pages)} page files to analyze\n")
@@ -178,9 +190,20 @@ def main():
     # Check each page
     all_issues = []
     for f in pages:
-        result = check_page(f)
+        try:
+            content = index.read(f)
+        except OSError as e:
+            all_issues.append({"file": str(f.name), "issues": [f"Error: {e}"]})
+            emitter.finding("issue", f"Error: {e}", file=index.relpath(f))
+            continue
+        result = cache.get(f, content)
+        if result is None:
+            result = check_page(f, content)
+            cache.put(f, content, result)
+        emitter.findings("issue", result["issues"], file=index.relpath(f))
         if result["issues"]:
             all_issues.append(result)
+    cache.save()
     
     # Summary
     print("=" * 60)
@@ -220,6 +243,7 @@ def main():
     
     print("\n" + json.dumps(output, indent=2))
     
+    emitter.summary(passed=passed, files_checked=len(pages), files_with_issues=len(all_issues))
     sys.exit(0 if passed else 1)
 
 
@@ -4,7 +4,11 @@ Skill: vulnerability-scanner
 Script: security_scan.py
 Purpose: Validate that security principles from SKILL.md are applied correctly
 Usage: python security_scan.py <project_path> [--scan-type all|deps|secrets|patterns|config]
-Output: JSON with validation findings
+       [--since <git-ref>] [--no-cache] [--workers N] [--output json|summary|jsonl]
+       [--jsonl[=<file>]] [--paths DIR ...] [--allow FINGERPRINT ... [--note TEXT]]
+       [--advisory-db <file>] [--offline] [--refresh-advisories] [--skip-ignored]
+Output: JSON with validation findings (jsonl: one finding per line as it is found,
+        then a summary record - see .agent/scripts/findings_stream.py)
 
 This script verifies:
 1. Dependencies - Supply chain security (OWASP A03)
@@ -18,10 +22,24 @@ import os
 import sys
 import re
 import argparse
+import fnmatch
+import math
+import multiprocessing
+from bisect import bisect_left
 from pathlib import Path
-from typing import Dict, List, Any
+from collections import Counter
+from typing import Callable, Dict, Iterator, List, Any, Optional
 from datetime import datetime
 
+# Shared file walker + incremental result cache (.agent/scripts/file_index.py, audit_cache.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from file_index import ProjectIndex, get_project_index
+from audit_cache import AuditCache, checker_version, content_hash, open_incremental
+from case_fold import fold_case, fold_pattern
+from findings_stream import REPORT_LIMIT, STDOUT, ReportList, finding_count, open_emitter
+from secret_allowlist import SecretAllowlist, fingerprint
+from npm_advisories import ADVISORY_DB, audit_lockfile, load_advisories, refresh_advisories
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -85,25 +103,380 @@ DANGEROUS_PATTERNS = [
     (r'yaml\.load\s*\([^)]*\)(?!\s*,\s*Loader)', "Unsafe YAML load", "high", "Deserialization risk"),
 ]
 
+NPM_LOCK_FILES = ["package-lock.json", "npm-shrinkwrap.json"]
+# npm advisory severities in this scanner's vocabulary
+NPM_SEVERITY = {"critical": "critical", "high": "high", "moderate": "medium", "low": "low", "info": "low"}
+
 SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '__pycache__', '.venv', 'venv', '.next'}
 CODE_EXTENSIONS = {'.js', '.ts', '.jsx', '.tsx', '.py', '.go', '.java', '.rb', '.php'}
 CONFIG_EXTENSIONS = {'.json', '.yaml', '.yml', '.toml', '.env', '.env.local', '.env.development'}
+# Files that hold credentials by nature. The secret scan reads them even when
+# .gitignore excludes them from the shared index (unless --skip-ignored):
+# local-only does not mean harmless, they leak through backups, images and pastes.
+SECRET_FILES = ('.env', '.env.*', '*.env', '*.pem', '*.key', 'id_rsa', 'id_dsa', 'id_ecdsa', 'id_ed25519',
+                'credentials.json', 'secrets.json', 'secrets.yaml', 'secrets.yml')
+
+# Lowercase literals a match of each pattern must contain (any one of them).
+# Files containing none of them cannot match, so the regex is never run.
+# Every pattern needs an entry; _check_required_literals() enforces it at import.
+REQUIRED_LITERALS = {
+    "API Key": ("api",),
+    "Token": ("token",),
+    "Bearer Token": ("bearer",),
+    "AWS Access Key": ("akia",),
+    "AWS Secret": ("aws",),
+    "Azure Credential": ("azure",),
+    "GCP Credential": ("google",),
+    "Password": ("password",),
+    "Database Connection String": ("mongodb://", "postgres://", "mysql://", "redis://"),
+    "Private Key": ("-----begin",),
+    "SSH Key": ("ssh-rsa",),
+    "JWT Token": ("eyj",),
+    "eval() usage": ("eval",),
+    "exec() usage": ("exec",),
+    "Function constructor": ("function",),
+    "child_process.exec": ("child_process.exec",),
+    "subprocess with shell=True": ("subprocess.call",),
+    "dangerouslySetInnerHTML": ("dangerouslysetinnerhtml",),
+    "innerHTML assignment": (".innerhtml",),
+    "document.write": ("document.write",),
+    "SQL String Concat": ("select", "insert", "update", "delete"),
+    "SQL f-string": ("select", "insert", "update", "delete"),
+    "SSL Verify Disabled": ("verify",),
+    "Insecure flag": ("--insecure",),
+    "SSL Disabled": ("disable",),
+    "pickle usage": ("pickle.load",),
+    "Unsafe YAML load": ("yaml.load",),
+}
+
+# Entropy stage: quoted literals (or .env values) assigned to a name, scored in
+# bits per character against the randomness expected of their alphabet
+ENTROPY_MIN_LENGTH = 20
+ENTROPY_THRESHOLDS = {"hex": 3.0, "base64": 4.5}
+# Name words (camelCase/snake_case parts) that make an assignment a likely credential;
+# a name ending in one of them (ACCESSTOKEN, apikey) counts too
+SECRET_NAME_HINTS = {"key", "secret", "token", "password", "passwd", "pwd", "passphrase", "auth",
+                     "authorization", "credential", "credentials", "private", "signature", "salt",
+                     "session", "cookie", "dsn"}
+# Name words whose values are random by design (lockfile integrity, content hashes...)
+ENTROPY_IGNORED_NAMES = {"integrity", "checksum", "hash", "digest", "sha", "etag", "nonce",
+                         "uuid", "guid", "commit", "revision", "version", "id"}
+
+# Runs with fewer files than this are scanned in-process (pool startup costs more)
+PARALLEL_MIN_FILES = 64
+
+
+# ============================================================================
+#  SCANNING ENGINE
+# ============================================================================
+
+# Patterns are case-insensitive. Rather than re.IGNORECASE, they are folded to
+# lowercase and run over a case-folded copy of each file (case_fold.py); the
+# copy also answers the REQUIRED_LITERALS prefilter.
+
+def _check_required_literals() -> None:
+    """
+    Fail fast when REQUIRED_LITERALS is out of sync with the patterns: a missing
+    entry, or a literal that cannot occur in case-folded text, would silently
+    change which files a pattern runs on.
+    """
+    names = [name for _, name, _ in SECRET_PATTERNS] + [name for _, name, _, _ in DANGEROUS_PATTERNS]
+    problems = [f"no entry for '{name}'" for name in names if name not in REQUIRED_LITERALS]
+    problems += [f"entry '{name}' matches no pattern" for name in REQUIRED_LITERALS if name not in names]
+    problems += [f"entry '{name}' has an empty or non-lowercase literal" for name, literals in REQUIRED_LITERALS.items()
+                 if not literals or any(not literal or fold_case(literal) != literal for literal in literals)]
+    if problems:
+        raise ValueError("REQUIRED_LITERALS: " + "; ".join(problems))
+
+
+_check_required_literals()
+
+
+def _single_line(pattern: str) -> str:
+    """Keep a pattern within one line: patterns run over whole files but are reported per line."""
+    return pattern.replace('[^', '[^\\n').replace(r'\s', r'[^\S\n]')
+
+
+_SECRET_RULES = [
+    (re.compile(fold_pattern(pattern)), REQUIRED_LITERALS[secret_type], secret_type, severity)
+    for pattern, secret_type, severity in SECRET_PATTERNS
+]
+_DANGEROUS_RULES = [
+    (re.compile(fold_pattern(_single_line(pattern))), REQUIRED_LITERALS[name], name, severity, category)
+    for pattern, name, severity, category in DANGEROUS_PATTERNS
+]
+
+
+def _may_match(folded: str, literals) -> bool:
+    return not literals or any(literal in folded for literal in literals)
+
+
+# Candidate token: a quoted run of base64/hex/url-safe characters. The name it
+# is assigned to is checked on the text before the opening quote.
+_QUOTED_TOKEN = re.compile(r'(["\'`])([A-Za-z0-9+/=_\-.~]{%d,})\1' % ENTROPY_MIN_LENGTH)
+_ASSIGNED_NAME = re.compile(r'([A-Za-z_][\w.\-]*)["\']?[^\S\n]*(?:=>|:=|[=:])[^\S\n]*$')
+# .env files: NAME=value, optionally exported and/or quoted
+_ENV_ASSIGNMENT = re.compile(
+    r'^[^\S\n]*(?:export[^\S\n]+)?([A-Za-z_]\w*)[^\S\n]*=[^\S\n]*(["\']?)([A-Za-z0-9+/=_\-.~]{%d,})\2[^\S\n]*$'
+    % ENTROPY_MIN_LENGTH, re.MULTILINE)
+_HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+_NAME_WORD = re.compile(r'[A-Z]?[a-z0-9]+|[A-Z]+(?![a-z])')
+# Longest stretch before a quote searched for the name it is assigned to (minified lines)
+_ASSIGNMENT_LOOKBACK = 200
+
+
+def is_env_file(path: Path) -> bool:
+    """dotenv files (.env, .env.local, .env.example...), which have no scannable suffix."""
+    return path.name == '.env' or path.name.startswith('.env.') or path.suffix == '.env'
+
+
+def is_secret_file(path: Path) -> bool:
+    """dotenv files and key/credential files (SECRET_FILES)."""
+    return is_env_file(path) or any(fnmatch.fnmatchcase(path.name, pattern) for pattern in SECRET_FILES)
+
+
+def shannon_entropy(token: str) -> float:
+    """Shannon entropy of a token, in bits per character."""
+    length = len(token)
+    return -sum(n / length * math.log2(n / length) for n in Counter(token).values())
+
+
+def _entropy_candidates(content: str, env_file: bool) -> Iterator[tuple]:
+    """(name, token, start) of every literal assigned to a name."""
+    if env_file:
+        for match in _ENV_ASSIGNMENT.finditer(content):
+            yield match.group(1), match.group(3), match.start(3)
+        return
+    for match in _QUOTED_TOKEN.finditer(content):
+        lookback = max(0, match.start() - _ASSIGNMENT_LOOKBACK)
+        line_start = content.rfind('\n', lookback, match.start()) + 1 or lookback
+        assigned = _ASSIGNED_NAME.search(content, line_start, match.start())
+        if assigned:
+            yield assigned.group(1), match.group(2), match.start(2)
+
+
+def score_token(name: str, token: str) -> Optional[float]:
+    """
+    Entropy of `token` relative to its alphabet's threshold (>= 1.0 flags it),
+    or None if the assignment cannot hold a credential.
+    """
+    words = {word.lower() for word in _NAME_WORD.findall(name)}
+    lowered = name.lower()
+    if words.isdisjoint(SECRET_NAME_HINTS) and not any(lowered.endswith(hint) for hint in SECRET_NAME_HINTS):
+        return None
+    if not words.isdisjoint(ENTROPY_IGNORED_NAMES):
+        return None
+    alphabet = "hex" if all(c in _HEX_DIGITS for c in token) else "base64"
+    return shannon_entropy(token) / ENTROPY_THRESHOLDS[alphabet]
+
+
+def secret_findings(content: str, relpath: str) -> List[dict]:
+    """
+    Secrets in one file: one finding per secret type, with its match count,
+    lines and per-match fingerprints (the allowlist keys, see secret_allowlist.py).
+
+    Stage 1 runs SECRET_PATTERNS. Stage 2 scores the remaining literals
+    assigned to credential-like names by Shannon entropy ("High Entropy String").
+    """
+    folded = fold_case(content)
+    newlines = None
+    matched_spans = []
+    findings = []
+
+    def located(secret_type: str, severity: str, hits: list) -> dict:
+        nonlocal newlines
+        if newlines is None:
+            newlines = [m.start() for m in re.finditer('\n', content)]
+        return {
+            "file": relpath,
+            "type": secret_type,
+            "severity": severity,
+            "count": len(hits),
+            "lines": [bisect_left(newlines, start) + 1 for start, _text in hits],
+            "fingerprints": [fingerprint(text) for _start, text in hits],
+        }
+
+    for regex, literals, secret_type, severity in _SECRET_RULES:
+        if not _may_match(folded, literals):
+            continue
+        hits = []
+        for match in regex.finditer(folded):
+            hits.append((match.start(), content[match.start():match.end()]))
+            matched_spans.append((match.start(), match.end()))
+        if hits:
+            findings.append(located(secret_type, severity, hits))
+
+    hits = []
+    for name, token, start in _entropy_candidates(content, is_env_file(Path(relpath))):
+        if any(s <= start < e for s, e in matched_spans):
+            continue  # already reported by a pattern
+        score = score_token(name, token)
+        if score is not None and score >= 1.0:
+            hits.append((start, token))
+    if hits:
+        findings.append(located("High Entropy String", "medium", hits))
+    return findings
+
+
+def pattern_findings(content: str, relpath: str) -> List[dict]:
+    """
+    Dangerous patterns in one file: one finding per (line, pattern), in line order.
+
+    Each pattern is searched once over the whole content; match offsets are
+    mapped back to line numbers, and the rest of a matched line is skipped.
+    """
+    folded = fold_case(content)
+    newlines = None
+    hits = []
+    for order, (regex, literals, _name, _severity, _category) in enumerate(_DANGEROUS_RULES):
+        if not _may_match(folded, literals):
+            continue
+        pos = 0
+        while True:
+            match = regex.search(folded, pos)
+            if match is None:
+                break
+            if newlines is None:
+                newlines = [m.start() for m in re.finditer('\n', content)]
+            line = bisect_left(newlines, match.start())
+            hits.append((line, order))
+            if line == len(newlines):
+                break
+            pos = newlines[line] + 1
+
+    findings = []
+    for line, order in sorted(hits):
+        _regex, _literals, name, severity, category = _DANGEROUS_RULES[order]
+        start = newlines[line - 1] + 1 if line else 0
+        end = newlines[line] if line < len(newlines) else len(content)
+        findings.append({
+            "file": relpath,
+            "line": line + 1,
+            "pattern": name,
+            "severity": severity,
+            "category": category,
+            "snippet": content[start:end].strip()[:80]
+        })
+    return findings
+
+
+_FILE_SCANNERS = {"secrets": secret_findings, "patterns": pattern_findings}
+
+
+def _scan_content(scanner: str, relpath: str, content: str, cached: Optional[str]):
+    """(content hash, findings) of one file; findings are None when the hash is `cached`."""
+    digest = content_hash(content)
+    if digest == cached:
+        return digest, None
+    return digest, _FILE_SCANNERS[scanner](content, relpath)
+
+
+def _scan_job(job):
+    """Pool worker: read, hash and scan one file -> (path, hash, findings); hash is None if unreadable."""
+    scanner, path, relpath, cached = job
+    try:
+        content = Path(path).read_bytes().decode('utf-8', errors='replace')
+    except OSError:
+        return path, None, None
+    return (path,) + _scan_content(scanner, relpath, content, cached)
+
+
+def iter_file_findings(index: ProjectIndex, paths: List[Path], scanner: str,
+                       cache: AuditCache = None, workers: Optional[int] = None) -> Iterator[List[dict]]:
+    """
+    Findings of each readable file in `paths`, as they become available.
+
+    Files are fed to a process pool lazily and read, hashed and scanned inside
+    the workers, so the parent never holds more than the pool's pending chunks;
+    a worker skips the scan when the file still has the hash of its cached
+    findings. Results arrive in completion order. Small runs (and runs inside
+    check_runner.py's daemonic workers, which cannot fork a pool) are scanned
+    in-process through the shared index instead.
+    """
+    def job(path: Path):
+        return scanner, str(path), index.relpath(path), cache.cached_hash(path) if cache else None
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    if workers == 1 or len(paths) < PARALLEL_MIN_FILES or multiprocessing.current_process().daemon:
+        def scan_in_process():
+            for path in paths:
+                try:
+                    content = index.read(path)
+                except Exception:
+                    continue
+                _scanner, _path, relpath, cached = job(path)
+                yield (str(path),) + _scan_content(scanner, relpath, content, cached)
+        results = scan_in_process()
+        pool = None
+    else:
+        pool = multiprocessing.Pool(processes=workers)
+        results = pool.imap_unordered(_scan_job, (job(path) for path in paths),
+                                      chunksize=max(1, len(paths) // (workers * 4)))
+    try:
+        for path, digest, findings in results:
+            if digest is None:
+                continue
+            path = Path(path)
+            cached = cache.get_hashed(path, digest) if cache else None
+            if cached is not None:
+                findings = cached
+            elif cache:
+                cache.put_hashed(path, digest, findings)
+            yield findings
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+
+def select_files(index: ProjectIndex, extensions: set, roots: Optional[List[str]] = None,
+                 secret_files: bool = False, ignored: bool = False) -> List[Path]:
+    """
+    Files with `extensions` (plus SECRET_FILES with `secret_files`) outside
+    SKIP_DIRS, limited to `roots` sub-directories. With `ignored`, gitignored
+    SECRET_FILES are added back (see ProjectIndex.ignored_files).
+    """
+    selected = []
+    for root in roots or [None]:
+        selected.extend(path for path in index.files(skip_dirs=SKIP_DIRS, under=root)
+                        if path.suffix.lower() in extensions or (secret_files and is_secret_file(path)))
+        if ignored:
+            selected.extend(path for path in index.ignored_files(SECRET_FILES, under=root)
+                            if not any(part in SKIP_DIRS for part in path.relative_to(index.root).parts[:-1]))
+    return list(dict.fromkeys(selected))
+
+
+def apply_allowlist(finding: dict, allowlist: Optional[SecretAllowlist]) -> Optional[dict]:
+    """A secret finding without its allowlisted matches; None if every match is allowlisted."""
+    if not allowlist:
+        return finding
+    keep = [i for i, fp in enumerate(finding["fingerprints"]) if fp not in allowlist]
+    if len(keep) == finding["count"]:
+        return finding
+    if not keep:
+        return None
+    return {**finding, "count": len(keep),
+            "lines": [finding["lines"][i] for i in keep],
+            "fingerprints": [finding["fingerprints"][i] for i in keep]}
 
 
 # ============================================================================
 #  SCANNING FUNCTIONS
 # ============================================================================
 
-def scan_dependencies(project_path: str) -> Dict[str, Any]:
+def scan_dependencies(project_path: str, advisory_db: Optional[str] = None,
+                      offline: bool = False) -> Dict[str, Any]:
     """
     Validate supply chain security (OWASP A03).
-    Checks: npm audit, lock file presence, dependency age.
+    Checks: lock file presence, known vulnerabilities. When an advisory database
+    exists (npm_advisories.py), package-lock.json is audited offline against it;
+    otherwise `npm audit` is run. `offline` never falls back to npm.
     """
     results = {"tool": "dependency_scanner", "findings": [], "status": "[OK] Secure"}
     
     # Check for lock files
     lock_files = {
-        "npm": ["package-lock.json", "npm-shrinkwrap.json"],
+        "npm": NPM_LOCK_FILES,
         "yarn": ["yarn.lock"],
         "pnpm": ["pnpm-lock.yaml"],
         "pip": ["requirements.txt", "Pipfile.lock", "poetry.lock"],
@@ -128,49 +501,21 @@ def scan_dependencies(project_path: str) -> Dict[str, Any]:
                     "message": f"{manager}: No lock file found. Supply chain integrity at risk."
                 })
     
-    # Run npm audit if applicable
     if (Path(project_path) / "package.json").exists():
-        try:
-            result = subprocess.run(
-                ["npm", "audit", "--json"],
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-            
-            try:
-                audit_data = json.loads(result.stdout)
-                vulnerabilities = audit_data.get("vulnerabilities", {})
-                
-                severity_count = {"critical": 0, "high": 0, "moderate": 0, "low": 0}
-                for vuln in vulnerabilities.values():
-                    sev = vuln.get("severity", "low").lower()
-                    if sev in severity_count:
-                        severity_count[sev] += 1
-                
-                if severity_count["critical"] > 0:
-                    results["status"] = "[!!] Critical vulnerabilities"
-                    results["findings"].append({
-                        "type": "npm audit",
-                        "severity": "critical",
-                        "message": f"{severity_count['critical']} critical vulnerabilities in dependencies"
-                    })
-                elif severity_count["high"] > 0:
-                    results["status"] = "[!] High vulnerabilities"
-                    results["findings"].append({
-                        "type": "npm audit",
-                        "severity": "high",
-                        "message": f"{severity_count['high']} high severity vulnerabilities"
-                    })
-                
-                results["npm_audit"] = severity_count
-                
-            except json.JSONDecodeError:
-                pass
-                
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            pass
+        db_path = Path(advisory_db) if advisory_db else Path(project_path) / ADVISORY_DB
+        if offline or db_path.exists():
+            severity_count = audit_dependencies_offline(project_path, db_path, results)
+        else:
+            severity_count = audit_dependencies_npm(project_path, results)
+        
+        if severity_count is None:
+            results["status"] = "[?] Dependencies not audited"
+        else:
+            results["npm_audit"] = severity_count
+            if severity_count["critical"] > 0:
+                results["status"] = "[!!] Critical vulnerabilities"
+            elif severity_count["high"] > 0:
+                results["status"] = "[!] High vulnerabilities"
     
     if not results["findings"]:
         results["status"] = "[OK] Supply chain checks passed"
@@ -178,47 +523,153 @@ def scan_dependencies(project_path: str) -> Dict[str, Any]:
     return results
 
 
-def scan_secrets(project_path: str) -> Dict[str, Any]:
+def audit_dependencies_npm(project_path: str, results: Dict[str, Any]) -> Optional[Dict[str, int]]:
+    """Vulnerability counts from `npm audit` (needs network); a failed run is reported, not passed."""
+    failure = None
+    try:
+        result = subprocess.run(
+            ["npm", "audit", "--json"],
+            cwd=project_path,
+            capture_output=True,
+            text=True,
+            timeout=60
+        )
+        audit_data = json.loads(result.stdout)
+        if "error" in audit_data:
+            failure = audit_data.get("message") or "npm audit returned an error"
+    except FileNotFoundError:
+        failure = "npm not found"
+    except subprocess.TimeoutExpired:
+        failure = "npm audit timed out"
+    except json.JSONDecodeError:
+        failure = "npm audit returned no JSON report"
+    
+    if failure:
+        results["findings"].append({
+            "type": "npm audit",
+            "severity": "medium",
+            "message": f"Dependencies not audited: {failure}. "
+                       f"Use an offline advisory database (--refresh-advisories, --advisory-db)."
+        })
+        return None
+    
+    vulnerabilities = audit_data.get("vulnerabilities", {})
+    severity_count = {"critical": 0, "high": 0, "moderate": 0, "low": 0}
+    for vuln in vulnerabilities.values():
+        sev = vuln.get("severity", "low").lower()
+        if sev in severity_count:
+            severity_count[sev] += 1
+    
+    if severity_count["critical"] > 0:
+        results["findings"].append({
+            "type": "npm audit",
+            "severity": "critical",
+            "message": f"{severity_count['critical']} critical vulnerabilities in dependencies"
+        })
+    elif severity_count["high"] > 0:
+        results["findings"].append({
+            "type": "npm audit",
+            "severity": "high",
+            "message": f"{severity_count['high']} high severity vulnerabilities"
+        })
+    return severity_count
+
+
+def audit_dependencies_offline(project_path: str, db_path: Path,
+                               results: Dict[str, Any]) -> Optional[Dict[str, int]]:
+    """Vulnerability counts of package-lock.json against a local advisory database, one finding per package."""
+    lockfile = next((Path(project_path) / name for name in NPM_LOCK_FILES
+                     if (Path(project_path) / name).exists()), None)
+    if lockfile is None:
+        return None  # already reported as a missing lock file
+    
+    db = load_advisories(db_path)
+    if db is None:
+        results["findings"].append({
+            "type": "Advisory Database",
+            "severity": "high",
+            "message": f"No advisory database at {db_path}: dependencies not audited "
+                       f"(create it with --refresh-advisories where the npm registry is reachable)"
+        })
+        return None
+    
+    try:
+        report = audit_lockfile(lockfile, db)
+    except (OSError, ValueError) as e:
+        results["findings"].append({
+            "type": "Advisory Database",
+            "severity": "high",
+            "message": f"Could not read {lockfile.name}: {e}"
+        })
+        return None
+    
+    results["advisory_db"] = {"path": str(db_path), "fetched": db.get("fetched"), "packages": report["packages"]}
+    for vuln in report["vulnerabilities"]:
+        top = vuln["advisories"][0]
+        via = " > ".join(vuln["paths"][0]) if vuln["paths"] else "unreachable from the project root"
+        results["findings"].append({
+            "type": "Vulnerable Dependency",
+            **vuln,
+            "severity": NPM_SEVERITY.get(vuln["severity"], "low"),
+            "message": f"{vuln['package']}@{', '.join(vuln['versions'])}: {top.get('title')} "
+                       f"({len(vuln['advisories'])} advisory(ies)), depth {vuln['depth']} via {via}"
+        })
+    
+    if report["uncovered"]:
+        results["findings"].append({
+            "type": "Advisory Database",
+            "severity": "medium",
+            "message": f"Advisory database ({db.get('fetched')}) predates {len(report['uncovered'])} "
+                       f"package version(s) of {lockfile.name}; refresh it with --refresh-advisories",
+            "uncovered": report["uncovered"]
+        })
+    return report["severity_count"]
+
+
+def scan_secrets(project_path: str, cache: AuditCache = None, workers: Optional[int] = None,
+                 on_finding: Optional[Callable[[dict], None]] = None,
+                 allowlist: Optional[SecretAllowlist] = None,
+                 roots: Optional[List[str]] = None, include_ignored: bool = True) -> Dict[str, Any]:
     """
     Validate no hardcoded secrets (OWASP A04).
-    Checks: API keys, tokens, passwords, cloud credentials.
+    Checks: API keys, tokens, passwords, cloud credentials, high-entropy literals.
+    Matches whose fingerprint is in `allowlist` (reviewed false positives) are dropped.
+    With `include_ignored`, gitignored dotenv/key files are scanned too; their
+    findings carry "gitignored": true.
+    While findings are streamed to `on_finding`, the result keeps only the first REPORT_LIMIT.
     """
     results = {
         "tool": "secret_scanner",
-        "findings": [],
+        "findings": ReportList(REPORT_LIMIT if on_finding else None),
         "status": "[OK] No secrets detected",
         "scanned_files": 0,
+        "ignored_files": 0,
+        "allowlisted": 0,
         "by_severity": {"critical": 0, "high": 0, "medium": 0}
     }
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS and ext not in CONFIG_EXTENSIONS:
+    index = cache.index if cache is not None else get_project_index(project_path)
+    paths = select_files(index, CODE_EXTENSIONS | CONFIG_EXTENSIONS, roots, secret_files=True,
+                         ignored=include_ignored)
+    listed = set(index.paths)
+    ignored = {index.relpath(path) for path in paths if path not in listed}
+    results["scanned_files"] = len(paths)
+    results["ignored_files"] = len(ignored)
+    
+    # Cached findings keep every match; the allowlist is applied afterwards so
+    # reviewing a false positive never invalidates the cache
+    for findings in iter_file_findings(index, paths, "secrets", cache, workers):
+        for raw in findings:
+            finding = apply_allowlist(raw, allowlist)
+            results["allowlisted"] += raw["count"] - (finding["count"] if finding else 0)
+            if finding is None:
                 continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, secret_type, severity in SECRET_PATTERNS:
-                        matches = re.findall(pattern, content, re.IGNORECASE)
-                        if matches:
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "type": secret_type,
-                                "severity": severity,
-                                "count": len(matches)
-                            })
-                            results["by_severity"][severity] += len(matches)
-                            
-            except Exception:
-                pass
+            if finding["file"] in ignored:
+                finding = {**finding, "gitignored": True}
+            results["findings"].append(finding)
+            results["by_severity"][finding["severity"]] += finding["count"]
+            if on_finding:
+                on_finding(finding)
     
     if results["by_severity"]["critical"] > 0:
         results["status"] = "[!!] CRITICAL: Secrets exposed!"
@@ -227,58 +678,41 @@ def scan_secrets(project_path: str) -> Dict[str, Any]:
     elif sum(results["by_severity"].values()) > 0:
         results["status"] = "[?] Potential secrets detected"
     
-    # Limit findings for output
-    results["findings"] = results["findings"][:15]
-    
     return results
 
 
-def scan_code_patterns(project_path: str) -> Dict[str, Any]:
+def scan_code_patterns(project_path: str, cache: AuditCache = None, workers: Optional[int] = None,
+                       on_finding: Optional[Callable[[dict], None]] = None,
+                       roots: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Validate dangerous code patterns (OWASP A05).
     Checks: Injection risks, XSS, unsafe deserialization.
+    While findings are streamed to `on_finding`, the result keeps only the first REPORT_LIMIT.
     """
     results = {
         "tool": "pattern_scanner",
-        "findings": [],
+        "findings": ReportList(REPORT_LIMIT if on_finding else None),
         "status": "[OK] No dangerous patterns",
         "scanned_files": 0,
         "by_category": {}
     }
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS:
-                continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    
-                    for line_num, line in enumerate(lines, 1):
-                        for pattern, name, severity, category in DANGEROUS_PATTERNS:
-                            if re.search(pattern, line, re.IGNORECASE):
-                                results["findings"].append({
-                                    "file": str(filepath.relative_to(project_path)),
-                                    "line": line_num,
-                                    "pattern": name,
-                                    "severity": severity,
-                                    "category": category,
-                                    "snippet": line.strip()[:80]
-                                })
-                                results["by_category"][category] = results["by_category"].get(category, 0) + 1
-                                
-            except Exception:
-                pass
-    
-    critical_count = sum(1 for f in results["findings"] if f["severity"] == "critical")
-    high_count = sum(1 for f in results["findings"] if f["severity"] == "high")
+    index = cache.index if cache is not None else get_project_index(project_path)
+    paths = select_files(index, CODE_EXTENSIONS, roots)
+    results["scanned_files"] = len(paths)
+    
+    by_severity = Counter()
+    for findings in iter_file_findings(index, paths, "patterns", cache, workers):
+        for finding in findings:
+            results["findings"].append(finding)
+            category = finding["category"]
+            results["by_category"][category] = results["by_category"].get(category, 0) + 1
+            by_severity[finding["severity"]] += 1
+            if on_finding:
+                on_finding(finding)
+    
+    critical_count = by_severity["critical"]
+    high_count = by_severity["high"]
     
     if critical_count > 0:
         results["status"] = f"[!!] CRITICAL: {critical_count} dangerous patterns"
@@ -287,13 +721,10 @@ def scan_code_patterns(project_path: str) -> Dict[str, Any]:
     elif results["findings"]:
         results["status"] = "[?] Some patterns need review"
     
-    # Limit findings
-    results["findings"] = results["findings"][:20]
-    
     return results
 
 
-def scan_configuration(project_path: str) -> Dict[str, Any]:
+def scan_configuration(project_path: str, index: Optional[ProjectIndex] = None) -> Dict[str, Any]:
     """
     Validate security configuration (OWASP A02).
     Checks: Security headers, CORS, debug modes.
@@ -315,30 +746,25 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
         (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
     ]
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+    index = index or get_project_index(project_path)
+    for filepath in index.files(skip_dirs=SKIP_DIRS):
+        ext = filepath.suffix.lower()
+        if ext not in CONFIG_EXTENSIONS and filepath.name not in ['next.config.js', 'webpack.config.js', '.eslintrc.js']:
+            continue
         
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CONFIG_EXTENSIONS and file not in ['next.config.js', 'webpack.config.js', '.eslintrc.js']:
-                continue
-                
-            filepath = Path(root) / file
+        try:
+            content = index.read(filepath)
             
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
+            for pattern, issue, severity in config_issues:
+                if re.search(pattern, content, re.IGNORECASE):
+                    results["findings"].append({
+                        "file": index.relpath(filepath),
+                        "issue": issue,
+                        "severity": severity
+                    })
                     
-                    for pattern, issue, severity in config_issues:
-                        if re.search(pattern, content, re.IGNORECASE):
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "issue": issue,
-                                "severity": severity
-                            })
-                            
-            except Exception:
-                pass
+        except Exception:
+            pass
     
     # Check for security header configurations
     header_files = ["next.config.js", "next.config.mjs", "middleware.ts", "nginx.conf"]
@@ -369,8 +795,23 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
 #  MAIN
 # ============================================================================
 
-def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
-    """Execute security validation scans."""
+def run_full_scan(project_path: str, scan_type: str = "all", since: str = None,
+                  use_cache: bool = True, workers: Optional[int] = None,
+                  on_finding: Optional[Callable[[str, dict], None]] = None,
+                  roots: Optional[List[str]] = None, advisory_db: Optional[str] = None,
+                  offline: bool = False, include_ignored: bool = True) -> Dict[str, Any]:
+    """
+    Execute security validation scans.
+
+    File scans (secrets, patterns) only re-scan files whose content changed
+    since the previous run, sharded across `workers` processes; `since` limits
+    them to files touched since a git ref and `roots` to sub-directories.
+    Secrets listed in .agent/secrets.allowlist are not reported; gitignored
+    dotenv/key files are scanned for secrets unless `include_ignored` is off
+    (they are skipped anyway with `since`). Dependencies
+    are audited against `advisory_db` when it exists (always with `offline`).
+    `on_finding(scan_name, finding)` is called for every finding as soon as it is known.
+    """
     
     report = {
         "project": project_path,
@@ -385,27 +826,52 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
         }
     }
     
+    index, secrets_cache = open_incremental(project_path, "security_scan.secrets", __file__, since, use_cache)
+    patterns_cache = AuditCache(index, "security_scan.patterns", checker_version(__file__), enabled=use_cache)
+    allowlist = SecretAllowlist(index.root)
+    
+    def tally(finding: dict) -> None:
+        sev = finding.get("severity", "low")
+        if sev == "critical":
+            report["summary"]["critical"] += 1
+        elif sev == "high":
+            report["summary"]["high"] += 1
+    
+    def stream(name: str) -> Optional[Callable[[dict], None]]:
+        # Streamed findings are counted as they pass: the scan result only keeps a sample of them
+        if not on_finding:
+            return None
+        def emit(finding: dict) -> None:
+            tally(finding)
+            on_finding(name, finding)
+        return emit
+    
     scanners = {
-        "deps": ("dependencies", scan_dependencies),
-        "secrets": ("secrets", scan_secrets),
-        "patterns": ("code_patterns", scan_code_patterns),
-        "config": ("configuration", scan_configuration),
+        "deps": ("dependencies", lambda path: scan_dependencies(path, advisory_db, offline)),
+        "secrets": ("secrets", lambda path: scan_secrets(
+            path, secrets_cache, workers, stream("secrets"), allowlist, roots, include_ignored)),
+        "patterns": ("code_patterns", lambda path: scan_code_patterns(
+            path, patterns_cache, workers, stream("code_patterns"), roots)),
+        "config": ("configuration", lambda path: scan_configuration(path, index)),
     }
+    streaming = {"secrets", "patterns"}
     
     for key, (name, scanner) in scanners.items():
         if scan_type == "all" or scan_type == key:
             result = scanner(project_path)
             report["scans"][name] = result
             
-            findings_count = len(result.get("findings", []))
-            report["summary"]["total_findings"] += findings_count
-            
-            for finding in result.get("findings", []):
-                sev = finding.get("severity", "low")
-                if sev == "critical":
-                    report["summary"]["critical"] += 1
-                elif sev == "high":
-                    report["summary"]["high"] += 1
+            findings = result.get("findings", [])
+            report["summary"]["total_findings"] += finding_count(findings)
+            if on_finding and key in streaming:
+                continue
+            for finding in findings:
+                tally(finding)
+                if on_finding:
+                    on_finding(name, finding)
+    
+    secrets_cache.save()
+    patterns_cache.save()
     
     # Determine overall status
     if report["summary"]["critical"] > 0:
@@ -425,8 +891,29 @@ def main():
     parser.add_argument("project_path", nargs="?", default=".", help="Project directory to scan")
     parser.add_argument("--scan-type", choices=["all", "deps", "secrets", "patterns", "config"],
                         default="all", help="Type of scan to run")
-    parser.add_argument("--output", choices=["json", "summary"], default="json",
-                        help="Output format")
+    parser.add_argument("--output", choices=["json", "summary", "jsonl"], default="json",
+                        help="Output format (jsonl streams one finding per line, then a summary record)")
+    parser.add_argument("--since", metavar="REF",
+                        help="Only scan files changed since a git ref (e.g. origin/main)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore cached per-file results in .agent/cache/")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes for the file scans (default: CPU count)")
+    parser.add_argument("--jsonl", nargs="?", const=STDOUT, metavar="FILE",
+                        help="Stream findings as JSONL to FILE (default: stdout, same as --output jsonl)")
+    parser.add_argument("--paths", nargs="+", metavar="DIR",
+                        help="Only scan files under these sub-directories (e.g. src supabase orchestration)")
+    parser.add_argument("--allow", nargs="+", metavar="FINGERPRINT",
+                        help="Record reviewed false positives (fingerprints from secret findings) and exit")
+    parser.add_argument("--note", help="Note stored next to --allow fingerprints (file, reason...)")
+    parser.add_argument("--advisory-db", metavar="FILE",
+                        help=f"Offline npm advisory database (default: <project>/{ADVISORY_DB.as_posix()})")
+    parser.add_argument("--offline", action="store_true",
+                        help="Audit dependencies only against the advisory database, never `npm audit`")
+    parser.add_argument("--refresh-advisories", action="store_true",
+                        help="Rebuild the advisory database for package-lock.json from the npm registry and exit")
+    parser.add_argument("--skip-ignored", action="store_true",
+                        help="Do not scan gitignored dotenv/key files for secrets (scanned by default)")
     
     args = parser.parse_args()
     
@@ -434,7 +921,50 @@ def main():
         print(json.dumps({"error": f"Directory not found: {args.project_path}"}))
         sys.exit(1)
     
-    result = run_full_scan(args.project_path, args.scan_type)
+    if args.allow:
+        allowlist = SecretAllowlist(args.project_path)
+        try:
+            added = allowlist.add((fp, args.note) for fp in args.allow)
+        except ValueError as e:
+            print(json.dumps({"error": str(e)}))
+            sys.exit(1)
+        print(json.dumps({"allowlist": str(allowlist.source), "added": added, "entries": len(allowlist)}))
+        sys.exit(0)
+    
+    if args.refresh_advisories:
+        db_path = Path(args.advisory_db) if args.advisory_db else Path(args.project_path) / ADVISORY_DB
+        lockfile = next((Path(args.project_path) / name for name in NPM_LOCK_FILES
+                         if (Path(args.project_path) / name).exists()), None)
+        if lockfile is None:
+            print(json.dumps({"error": f"No {' or '.join(NPM_LOCK_FILES)} in {args.project_path}"}))
+            sys.exit(1)
+        try:
+            db = refresh_advisories(lockfile, db_path)
+        except (OSError, ValueError) as e:
+            print(json.dumps({"error": f"Advisory refresh failed: {e}"}))
+            sys.exit(1)
+        print(json.dumps({"advisory_db": str(db_path), "fetched": db["fetched"],
+                          "packages": len(db["queried"]), "advisories": sum(map(len, db["advisories"].values()))}))
+        sys.exit(0)
+    
+    emitter = open_emitter("security_scan", STDOUT if args.output == "jsonl" else args.jsonl)
+    
+    def on_finding(scan_name: str, finding: dict) -> None:
+        fields = dict(finding)
+        emitter.finding(fields.pop("severity", "low"), scan=scan_name, **fields)
+    
+    result = run_full_scan(args.project_path, args.scan_type, args.since, not args.no_cache,
+                           args.workers, on_finding if emitter.enabled else None, args.paths,
+                           args.advisory_db, args.offline, not args.skip_ignored)
+    
+    emitter.summary(
+        passed=result["summary"]["critical"] == 0,
+        project=result["project"],
+        timestamp=result["timestamp"],
+        scan_type=result["scan_type"],
+        status={name: scan["status"] for name, scan in result["scans"].items()},
+        **result["summary"]
+    )
     
     if args.output == "summary":
         print(f"\n{'='*60}")
@@ -448,9 +978,14 @@ def main():
         
         for scan_name, scan_result in result['scans'].items():
             print(f"\n{scan_name.upper()}: {scan_result['status']}")
-            for finding in scan_result.get('findings', [])[:5]:
+            if scan_result.get('allowlisted'):
+                print(f"  ({scan_result['allowlisted']} allowlisted match(es) hidden, see .agent/secrets.allowlist)")
+            findings = scan_result.get('findings', [])
+            for finding in findings[:5]:
                 print(f"  - {finding}")
-    else:
+            if finding_count(findings) > 5:
+                print(f"  ... and {finding_count(findings) - 5} more (--output json or jsonl for all)")
+    elif args.output == "json":
         print(json.dumps(result, indent=2))
 
 
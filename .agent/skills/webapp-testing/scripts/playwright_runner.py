@@ -2,17 +2,66 @@
 """
 Skill: webapp-testing
 Script: playwright_runner.py
-Purpose: Run basic Playwright browser tests
-Usage: python playwright_runner.py <url> [--screenshot]
-Output: JSON with page info, health status, and optional screenshot path
+Purpose: Run basic Playwright browser tests, smoke-crawl a site from a seed URL,
+         or trace a scripted user flow
+Usage: python playwright_runner.py <url> [--screenshot] [--a11y]
+       python playwright_runner.py <url> --crawl [--max-pages=50] [--concurrency=4] [--settle-ms=500]
+                                   [--report=<file>]
+       python playwright_runner.py <base_url> --trace-flow=<logbook-map|academy-dashboard|flow.json>
+                                   [--storage-state=<file>] [--out=<dir>] [--baseline=<summary.json>]
+       (a leading <project_path>, as passed by verify_all/checklist, is accepted)
+Output: JSON with page info, health status, and optional screenshot path;
+        for --crawl, the aggregated summary and the path of the full per-page report;
+        for --trace-flow, INP / long tasks / CLS with attribution and the written files
 Note: Requires playwright (pip install playwright && playwright install chromium)
 Screenshots: Saved to system temp directory (auto-cleaned by OS)
+
+Crawl mode starts ONE headless Chromium and visits pages concurrently on a
+pool of --concurrency browser contexts (each keeps its cookies and HTTP
+cache across the pages it visits). Internal links (same origin, no
+/api/ or /_next/ paths, no files) are discovered breadth-first from the
+seed up to --max-pages. Listeners and performance observers are attached
+before navigation, so errors and long tasks during load are captured.
+Every page records:
+
+- navigation timing (Navigation Timing Level 2 entry)
+- resource timing entries (type, transfer size, duration, render-blocking)
+- long tasks (PerformanceObserver 'longtask', buffered)
+- console errors, uncaught exceptions and failed requests
+
+The full report (every page) is written to --report or the temp directory;
+stdout gets the aggregated summary: slowest pages, error messages grouped
+across pages, heaviest resources, pages with the most long-task time.
+
+Trace mode replays a flow (goto / click / hover / fill / press / scroll /
+wheel / drag / wait steps; see FLOWS or pass a JSON file with the same
+shape) while Chromium records a performance trace with V8 CPU sampling.
+Event Timing and Layout Instability observers run in the page, so the
+slowest interaction (INP) and the shifted elements are attributed too.
+Written to --out (temp maestro_traces by default), per flow:
+
+- <flow>.trace.json.gz  - raw trace (DevTools Performance panel can load it)
+- <flow>.folded         - collapsed stacks (flamegraph.pl, speedscope)
+- <flow>.summary.json   - INP, long tasks, CLS and top scripting hot spots
+
+Academy pages need a signed-in session: save one with Playwright
+(context.storage_state(path=...)) and pass it as --storage-state.
+Compare two builds on the same local server with --baseline=<previous
+summary.json>; see trace_analysis.py for the analysis itself.
 """
 import sys
+import gzip
 import json
 import os
+import statistics
 import tempfile
 from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import trace_analysis
 
 # Fix Windows console encoding for Unicode output
 try:
@@ -22,11 +71,81 @@ except AttributeError:
     pass  # Python < 3.7
 
 try:
+    import asyncio
     from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
+VIEWPORT = {"width": 1280, "height": 720}
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# Crawl defaults
+MAX_PAGES = 50
+CONCURRENCY = 4
+SETTLE_MS = 500           # wait after `load` so late long tasks and errors land
+NAVIGATION_TIMEOUT = 30000
+SKIPPED_PATH_PREFIXES = ("/api/", "/_next/", "/auth/callback")
+SKIPPED_EXTENSIONS = (".pdf", ".zip", ".png", ".jpg", ".jpeg", ".webp", ".svg", ".gif", ".ico", ".json",
+                      ".xml", ".txt", ".mp4", ".webm", ".gpx", ".csv")
+LONG_TASK_THRESHOLD = 50  # ms; the part above it is blocking time
+TOP = 10
+
+# Installed before any page script runs: long tasks are observed from the first one
+OBSERVER_SCRIPT = """
+(() => {
+  const store = window.__smokeMetrics = {longTasks: []};
+  try { performance.setResourceTimingBufferSize(2000); } catch (e) {}
+  try {
+    new PerformanceObserver((list) => {
+      for (const entry of list.getEntries()) {
+        store.longTasks.push({
+          start: Math.round(entry.startTime),
+          duration: Math.round(entry.duration),
+          attribution: (entry.attribution || []).map((a) => a.containerSrc || a.containerName || a.name).filter(Boolean),
+        });
+      }
+    }).observe({type: 'longtask', buffered: true});
+  } catch (e) {}
+})();
+"""
+
+# Collected after load: Navigation Timing Level 2, resource entries, long tasks and links
+COLLECT_SCRIPT = """
+() => {
+  const round = (v) => Math.round(v * 10) / 10;
+  const nav = performance.getEntriesByType('navigation')[0];
+  return {
+    navigation: nav ? {
+      type: nav.type,
+      protocol: nav.nextHopProtocol,
+      redirects: nav.redirectCount,
+      dns: round(nav.domainLookupEnd - nav.domainLookupStart),
+      connect: round(nav.connectEnd - nav.connectStart),
+      ttfb: round(nav.responseStart - nav.startTime),
+      response: round(nav.responseEnd - nav.responseStart),
+      dom_interactive: round(nav.domInteractive),
+      dom_content_loaded: round(nav.domContentLoadedEventEnd),
+      load: round(nav.loadEventEnd),
+      transfer_size: nav.transferSize,
+      decoded_body_size: nav.decodedBodySize,
+    } : null,
+    resources: performance.getEntriesByType('resource').map((r) => ({
+      url: r.name,
+      type: r.initiatorType,
+      transfer_size: r.transferSize,
+      decoded_size: r.decodedBodySize,
+      start: round(r.startTime),
+      duration: round(r.duration),
+      render_blocking: r.renderBlockingStatus === 'blocking',
+    })),
+    long_tasks: (window.__smokeMetrics || {}).longTasks || [],
+    links: Array.from(document.querySelectorAll('a[href]'), (a) => a.href),
+  };
+}
+"""
+
 
 def run_basic_test(url: str, take_screenshot: bool = False) -> dict:
     """Run basic browser test on URL."""
@@ -45,14 +164,16 @@ def run_basic_test(url: str, take_screenshot: bool = False) -> dict:
     try:
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=True)
-            context = browser.new_context(
-                viewport={"width": 1280, "height": 720},
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            )
+            context = browser.new_context(viewport=VIEWPORT, user_agent=USER_AGENT)
             page = context.new_page()
             
+            # Console errors (registered before navigation so load-time errors are kept)
+            console_errors = []
+            page.on("console", lambda msg: console_errors.append(msg.text) if msg.type == "error" else None)
+            page.on("pageerror", lambda err: console_errors.append(str(err)))
+            
             # Navigate
-            response = page.goto(url, wait_until="networkidle", timeout=30000)
+            response = page.goto(url, wait_until="networkidle", timeout=NAVIGATION_TIMEOUT)
             
             # Basic info
             result["page"] = {
@@ -70,14 +191,14 @@ def run_basic_test(url: str, take_screenshot: bool = False) -> dict:
                 "has_images": page.locator("img").count() > 0
             }
             
-            # Console errors
-            console_errors = []
-            page.on("console", lambda msg: console_errors.append(msg.text) if msg.type == "error" else None)
+            result["console_errors"] = console_errors
             
-            # Performance metrics
+            # Performance metrics (Navigation Timing Level 2: times relative to navigation start)
+            navigation = page.evaluate("JSON.parse(JSON.stringify(performance.getEntriesByType('navigation')[0] || null))") or {}
             result["performance"] = {
-                "dom_content_loaded": page.evaluate("window.performance.timing.domContentLoadedEventEnd - window.performance.timing.navigationStart"),
-                "load_complete": page.evaluate("window.performance.timing.loadEventEnd - window.performance.timing.navigationStart")
+                "ttfb": navigation.get("responseStart"),
+                "dom_content_loaded": navigation.get("domContentLoadedEventEnd"),
+                "load_complete": navigation.get("loadEventEnd")
             }
             
             # Screenshot - uses system temp directory (cross-platform, auto-cleaned)
@@ -149,23 +270,497 @@ def run_accessibility_check(url: str) -> dict:
     return result
 
 
+# ============================================================================
+#  CRAWL MODE
+# ============================================================================
+
+def normalize_link(href: str, origin: Tuple[str, str]) -> Optional[str]:
+    """Crawlable form of a link (fragment dropped), or None if it leaves the site or is not a page."""
+    url, _ = urldefrag(href)
+    parsed = urlparse(url)
+    if (parsed.scheme, parsed.netloc) != origin:
+        return None
+    path = parsed.path or "/"
+    if path.startswith(SKIPPED_PATH_PREFIXES) or path.lower().endswith(SKIPPED_EXTENSIONS):
+        return None
+    return parsed._replace(path=path.rstrip("/") or "/").geturl()
+
+
+async def _visit(context, url: str, settle_ms: int) -> Tuple[dict, List[str]]:
+    """Load one page on a context; returns its record and the links it contains (never raises)."""
+    page = None
+    errors, failed = [], []
+    record = {"url": url, "status": "pending"}
+    links: List[str] = []
+    try:
+        page = await context.new_page()
+        page.on("console", lambda msg: errors.append({"text": msg.text, "source": (msg.location or {}).get("url")})
+                if msg.type == "error" else None)
+        page.on("pageerror", lambda err: errors.append({"text": str(err), "source": "uncaught"}))
+        page.on("requestfailed", lambda req: failed.append({"url": req.url, "failure": req.failure}))
+        response = await page.goto(url, wait_until="load", timeout=NAVIGATION_TIMEOUT)
+        await page.wait_for_timeout(settle_ms)
+        data = await page.evaluate(COLLECT_SCRIPT)
+        links = data.pop("links")
+        record.update(data)
+        record["final_url"] = page.url
+        record["status_code"] = response.status if response else None
+        record["status"] = "success" if response and response.ok else "failed"
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = str(e)[:300]
+    finally:
+        record["console_errors"] = errors
+        record["failed_requests"] = failed
+        if page is not None:
+            try:
+                await page.close()
+            except Exception:
+                pass  # browser already gone
+    return record, links
+
+
+async def _crawl(seed: str, max_pages: int, concurrency: int, settle_ms: int) -> List[dict]:
+    parsed = urlparse(seed)
+    origin = (parsed.scheme, parsed.netloc)
+    start = normalize_link(seed, origin) or seed
+    seen = {start}
+    queue: "asyncio.Queue[Tuple[str, int]]" = asyncio.Queue()
+    queue.put_nowait((start, 0))
+    pages: List[dict] = []
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+
+        async def worker():
+            context = await browser.new_context(viewport=VIEWPORT, user_agent=USER_AGENT)
+            await context.add_init_script(OBSERVER_SCRIPT)
+            try:
+                while True:
+                    url, depth = await queue.get()
+                    try:
+                        record, links = await _visit(context, url, settle_ms)
+                        record["depth"] = depth
+                        pages.append(record)
+                        for href in links:
+                            link = normalize_link(href, origin)
+                            if link and link not in seen and len(seen) < max_pages:
+                                seen.add(link)
+                                queue.put_nowait((link, depth + 1))
+                    finally:
+                        queue.task_done()
+            finally:
+                await context.close()
+
+        workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+        # A worker that dies (context creation after a browser crash) never calls task_done():
+        # wait for the queue OR for every worker to be gone, whichever comes first
+        join = asyncio.create_task(queue.join())
+        alive = set(workers)
+        while alive and not join.done():
+            done, _ = await asyncio.wait(alive | {join}, return_when=asyncio.FIRST_COMPLETED)
+            alive -= done
+        crash = next((task.exception() for task in workers
+                      if task.done() and not task.cancelled() and task.exception()), None)
+        while not queue.empty():
+            url, depth = queue.get_nowait()
+            pages.append({"url": url, "depth": depth, "status": "error",
+                          "error": f"Not visited, crawl workers stopped: {crash}"[:300],
+                          "console_errors": [], "failed_requests": []})
+        join.cancel()
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(join, *workers, return_exceptions=True)
+        try:
+            await browser.close()
+        except Exception:
+            pass
+    return pages
+
+
+def _distribution(values: List[float]) -> Optional[dict]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return {
+        "median": round(statistics.median(ordered), 1),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+        "max": round(ordered[-1], 1),
+    }
+
+
+def aggregate_crawl(pages: List[dict]) -> dict:
+    """Site-wide summary of crawled page records."""
+    loaded = [p for p in pages if p.get("navigation")]
+    navigation = {}
+    for metric in ("ttfb", "dom_content_loaded", "load"):
+        values = [(p["navigation"][metric], p["url"]) for p in loaded if p["navigation"].get(metric)]
+        summary = _distribution([v for v, _ in values])
+        if summary:
+            summary["slowest"] = [{"url": u, "ms": v} for v, u in sorted(values, reverse=True)[:3]]
+            navigation[metric] = summary
+
+    errors = {}
+    for page in pages:
+        for error in page.get("console_errors", []):
+            entry = errors.setdefault(error["text"][:300], {"message": error["text"][:300], "count": 0, "pages": []})
+            entry["count"] += 1
+            if page["url"] not in entry["pages"]:
+                entry["pages"].append(page["url"])
+
+    resources = {}
+    for page in loaded:
+        for resource in page.get("resources", []):
+            entry = resources.setdefault(resource["url"], {"url": resource["url"], "type": resource["type"],
+                                                           "transfer_size": 0, "max_duration": 0, "pages": 0,
+                                                           "render_blocking": False})
+            entry["transfer_size"] = max(entry["transfer_size"], resource["transfer_size"] or 0)
+            entry["max_duration"] = max(entry["max_duration"], resource["duration"] or 0)
+            entry["render_blocking"] |= bool(resource.get("render_blocking"))
+            entry["pages"] += 1
+
+    blocking = []
+    for page in loaded:
+        tasks = page.get("long_tasks", [])
+        if tasks:
+            blocking.append({
+                "url": page["url"],
+                "long_tasks": len(tasks),
+                "blocking_ms": sum(max(0, t["duration"] - LONG_TASK_THRESHOLD) for t in tasks),
+                "longest_ms": max(t["duration"] for t in tasks),
+            })
+
+    return {
+        "pages": len(pages),
+        "loaded": len([p for p in pages if p["status"] == "success"]),
+        "failed": [{"url": p["url"], "status": p["status"], "status_code": p.get("status_code"),
+                    "error": p.get("error")} for p in pages if p["status"] != "success"],
+        "navigation": navigation,
+        "console_errors": sum(e["count"] for e in errors.values()),
+        "errors": sorted(errors.values(), key=lambda e: (-len(e["pages"]), -e["count"]))[:TOP],
+        "failed_requests": sum(len(p.get("failed_requests", [])) for p in pages),
+        "resources": {
+            "unique": len(resources),
+            "requests": sum(len(p.get("resources", [])) for p in loaded),
+            "transfer_bytes": sum(r["transfer_size"] or 0 for p in loaded for r in p.get("resources", [])),
+            "heaviest": sorted(resources.values(), key=lambda r: -r["transfer_size"])[:TOP],
+            "render_blocking": sorted((r["url"] for r in resources.values() if r["render_blocking"])),
+        },
+        "long_tasks": sorted(blocking, key=lambda b: -b["blocking_ms"])[:TOP],
+    }
+
+
+def run_crawl(seed: str, max_pages: int = MAX_PAGES, concurrency: int = CONCURRENCY,
+              settle_ms: int = SETTLE_MS, report_path: Optional[str] = None) -> dict:
+    """Crawl the site from `seed`; writes the full report and returns the aggregated summary."""
+    if not PLAYWRIGHT_AVAILABLE:
+        return {
+            "error": "Playwright not installed",
+            "fix": "pip install playwright && playwright install chromium"
+        }
+    started = datetime.now()
+    try:
+        pages = asyncio.run(_crawl(seed, max_pages, concurrency, settle_ms))
+    except Exception as e:
+        return {"seed": seed, "status": "error", "error": str(e), "summary": f"[X] Error: {str(e)[:100]}"}
+
+    summary = aggregate_crawl(pages)
+    report = {
+        "seed": seed,
+        "timestamp": started.isoformat(),
+        "duration_s": round((datetime.now() - started).total_seconds(), 1),
+        "concurrency": concurrency,
+        "summary": summary,
+        "pages": sorted(pages, key=lambda p: (p.get("depth", 0), p["url"])),
+    }
+    if report_path is None:
+        report_dir = os.path.join(tempfile.gettempdir(), "maestro_crawls")
+        os.makedirs(report_dir, exist_ok=True)
+        report_path = os.path.join(report_dir, f"crawl_{started.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    ok = not summary["failed"] and not summary["console_errors"]
+    return {
+        "seed": seed,
+        "status": "success" if ok else "failed",
+        "duration_s": report["duration_s"],
+        "report": report_path,
+        "crawl": summary,
+        "summary": (f"[OK] {summary['pages']} page(s) crawled, no errors" if ok else
+                    f"[X] {len(summary['failed'])} failed page(s), {summary['console_errors']} console error(s) "
+                    f"in {summary['pages']} page(s)"),
+    }
+
+
+# ============================================================================
+#  TRACE MODE
+# ============================================================================
+
+TRACE_CATEGORIES = [
+    "devtools.timeline", "disabled-by-default-devtools.timeline", "disabled-by-default-devtools.timeline.frame",
+    "v8.execute", "disabled-by-default-v8.cpu_profiler", "blink.user_timing", "loading", "latencyInfo", "toplevel",
+]
+STEP_SETTLE_MS = 300      # after each step, so the interaction gets painted before the next one
+
+# Flows for the pages with interaction latency reports; both need --storage-state
+FLOWS = {
+    "logbook-map": [
+        {"goto": "/es/academy/logbook"},
+        {"wait_for": "button:has-text('Mapa')"},
+        {"click": "button:has-text('Mapa')"},
+        {"wait_for": ".leaflet-container"},
+        {"wait": 1500},
+        {"drag": ".leaflet-container", "dx": -250, "dy": 120},
+        {"wheel": ".leaflet-container", "dy": -400},
+        {"drag": ".leaflet-container", "dx": 200, "dy": -80},
+        {"click": ".leaflet-container"},
+        {"click": "button:has-text('Diario')"},
+        {"click": "button:has-text('Mapa')"},
+        {"wait_for": ".leaflet-container"},
+        {"wait": 1000},
+    ],
+    "academy-dashboard": [
+        {"goto": "/es/academy/dashboard"},
+        {"wait_for": "main"},
+        {"wait": 2000},
+        {"scroll": 800},
+        {"scroll": 800},
+        {"scroll": 800},
+        {"scroll": 800},
+        {"press": "Tab"},
+        {"press": "Tab"},
+        {"press": "Tab"},
+        {"scroll": -3200},
+        {"wait": 1000},
+    ],
+}
+
+# Interactions (Event Timing) and layout shifts with a short description of the element
+TRACE_OBSERVER_SCRIPT = """
+(() => {
+  const store = window.__flowMetrics = {events: [], shifts: []};
+  const describe = (node) => {
+    if (!node) return null;
+    if (node.nodeType !== 1) return node.nodeName;
+    let label = node.tagName.toLowerCase();
+    if (node.id) return label + '#' + node.id;
+    const classes = (typeof node.className === 'string' ? node.className : '').trim().split(/\\s+/).filter(Boolean);
+    if (classes.length) label += '.' + classes.slice(0, 2).join('.');
+    const text = (node.textContent || '').trim().replace(/\\s+/g, ' ').slice(0, 40);
+    return text ? label + ' "' + text + '"' : label;
+  };
+  try {
+    new PerformanceObserver((list) => {
+      for (const entry of list.getEntries()) {
+        if (!entry.interactionId) continue;
+        store.events.push({
+          type: entry.name,
+          interaction: entry.interactionId,
+          start: entry.startTime,
+          processing_start: entry.processingStart,
+          processing_end: entry.processingEnd,
+          duration: entry.duration,
+          target: describe(entry.target),
+        });
+      }
+    }).observe({type: 'event', durationThreshold: 16, buffered: true});
+  } catch (e) {}
+  try {
+    new PerformanceObserver((list) => {
+      for (const entry of list.getEntries()) {
+        store.shifts.push({
+          start: entry.startTime,
+          value: entry.value,
+          recent_input: entry.hadRecentInput,
+          sources: (entry.sources || []).map((source) => describe(source.node)).filter(Boolean),
+        });
+      }
+    }).observe({type: 'layout-shift', buffered: true});
+  } catch (e) {}
+})();
+"""
+
+
+def load_flow(spec: str) -> Tuple[str, List[dict]]:
+    """(name, steps) of a built-in flow or a JSON file {"name": ..., "steps": [...]}."""
+    if spec in FLOWS:
+        return spec, FLOWS[spec]
+    with open(spec, encoding="utf-8") as f:
+        flow = json.load(f)
+    if isinstance(flow, list):
+        return Path(spec).stem, flow
+    return flow.get("name") or Path(spec).stem, flow["steps"]
+
+
+def _run_step(page, step: dict, base_url: str):
+    if "goto" in step:
+        page.goto(urljoin(base_url, step["goto"]), wait_until="load", timeout=NAVIGATION_TIMEOUT)
+    elif "click" in step:
+        page.locator(step["click"]).first.click()
+    elif "hover" in step:
+        page.locator(step["hover"]).first.hover()
+    elif "fill" in step:
+        page.locator(step["fill"]).first.fill(step.get("value", ""))
+    elif "press" in step:
+        if step.get("selector"):
+            page.locator(step["selector"]).first.press(step["press"])
+        else:
+            page.keyboard.press(step["press"])
+    elif "wait_for" in step:
+        page.locator(step["wait_for"]).first.wait_for(timeout=NAVIGATION_TIMEOUT)
+    elif "wait" in step:
+        page.wait_for_timeout(step["wait"])
+        return
+    elif "scroll" in step:
+        page.mouse.wheel(0, step["scroll"])
+    elif "wheel" in step or "drag" in step:
+        box = page.locator(step.get("wheel") or step["drag"]).first.bounding_box()
+        if box is None:
+            raise RuntimeError(f"element not visible: {step.get('wheel') or step['drag']}")
+        x, y = box["x"] + box["width"] / 2, box["y"] + box["height"] / 2
+        page.mouse.move(x, y)
+        if "wheel" in step:
+            page.mouse.wheel(0, step["dy"])
+        else:
+            page.mouse.down()
+            page.mouse.move(x + step.get("dx", 0), y + step.get("dy", 0), steps=10)
+            page.mouse.up()
+    else:
+        raise ValueError(f"unknown step: {step}")
+    page.wait_for_timeout(step.get("settle_ms", STEP_SETTLE_MS))
+
+
+def run_trace_flow(base_url: str, flow_spec: str, out_dir: Optional[str] = None,
+                   storage_state: Optional[str] = None, baseline: Optional[str] = None) -> dict:
+    """Replay a flow under a performance trace; writes trace, flamegraph and summary, returns the summary."""
+    if not PLAYWRIGHT_AVAILABLE:
+        return {
+            "error": "Playwright not installed",
+            "fix": "pip install playwright && playwright install chromium"
+        }
+    try:
+        name, steps = load_flow(flow_spec)
+    except (OSError, ValueError, KeyError) as e:
+        return {"flow": flow_spec, "status": "error", "error": f"Invalid flow: {e}",
+                "available": sorted(FLOWS)}
+    previous = None
+    if baseline:
+        try:
+            with open(baseline, encoding="utf-8") as f:
+                previous = json.load(f)
+        except (OSError, ValueError) as e:
+            return {"flow": name, "status": "error", "error": f"Invalid baseline {baseline}: {e}",
+                    "summary": f"[X] Could not read baseline {baseline}"}
+
+    started = datetime.now()
+    out = Path(out_dir or os.path.join(tempfile.gettempdir(), "maestro_traces"))
+    out.mkdir(parents=True, exist_ok=True)
+    sync_mark = f"trace-flow:{name}:{started.strftime('%H%M%S%f')}"
+    step_error, page_metrics, trace_bytes = None, {}, b""
+
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            context = browser.new_context(viewport=VIEWPORT, user_agent=USER_AGENT,
+                                          storage_state=storage_state)
+            context.add_init_script(TRACE_OBSERVER_SCRIPT)
+            page = context.new_page()
+            browser.start_tracing(page=page, categories=TRACE_CATEGORIES)
+            try:
+                for index, step in enumerate(steps):
+                    try:
+                        _run_step(page, step, base_url)
+                    except Exception as e:
+                        step_error = f"step {index + 1} {json.dumps(step)}: {str(e).splitlines()[0]}"
+                        break
+                # Entries are relative to the current document; the mark places them on the trace clock
+                page_metrics = page.evaluate(
+                    "(name) => Object.assign({}, window.__flowMetrics || {},"
+                    " {sync: {name, mark_ms: performance.mark(name).startTime}})", sync_mark)
+            finally:
+                trace_bytes = browser.stop_tracing()
+                browser.close()
+    except Exception as e:
+        return {"flow": name, "status": "error", "error": str(e), "summary": f"[X] Error: {str(e)[:100]}"}
+
+    summary, folded = trace_analysis.analyze_trace(trace_analysis.load_trace(trace_bytes), page_metrics)
+    trace_file, folded_file, summary_file = (out / f"{name}.trace.json.gz", out / f"{name}.folded",
+                                             out / f"{name}.summary.json")
+    with gzip.open(trace_file, "wb") as f:
+        f.write(trace_bytes)
+    trace_analysis.write_folded(folded, folded_file)
+
+    comparison = None
+    if previous is not None:
+        comparison = trace_analysis.compare_summaries(previous.get("trace", previous), summary)
+    with open(summary_file, "w", encoding="utf-8") as f:
+        json.dump({"flow": name, "base_url": base_url, "timestamp": started.isoformat(), "steps": steps,
+                   "step_error": step_error, "trace": summary}, f, indent=2)
+
+    worst = summary["inp"]
+    blocking = summary["long_tasks"]["blocking_ms"]
+    status = "error" if step_error else "success"
+    return {
+        "flow": name,
+        "status": status,
+        "step_error": step_error,
+        "files": {"trace": str(trace_file), "flamegraph": str(folded_file), "summary": str(summary_file)},
+        "inp": worst,
+        "long_tasks": {"count": summary["long_tasks"]["count"], "blocking_ms": blocking,
+                       "longest": summary["long_tasks"]["longest"][:3]},
+        "cls": summary["cls"],
+        "layout_shifts": summary["layout_shifts"][:3],
+        "hot_spots": summary["hot_spots"]["self"][:TOP],
+        "vs_baseline": comparison,
+        "summary": (f"[X] Flow stopped at {step_error[:80]}" if step_error else
+                    f"[OK] {name}: INP {worst['duration_ms'] if worst else '-'} ms, "
+                    f"{blocking:.0f} ms blocking, CLS {summary['cls']}"),
+    }
+
+
+def _int_option(name: str, default: int) -> int:
+    for arg in sys.argv[1:]:
+        if arg.startswith(name + "="):
+            value = arg.split("=", 1)[1]
+            try:
+                return int(value)
+            except ValueError:
+                print(json.dumps({"error": f"{name} expects an integer, got '{value}'"}, indent=2))
+                sys.exit(1)
+    return default
+
+
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
+    # `<url>` or `<project_path> <url>` (verify_all / checklist convention)
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    url = next((a for a in args if a.startswith(("http://", "https://"))), None)
+    if url is None:
         print(json.dumps({
-            "error": "Usage: python playwright_runner.py <url> [--screenshot] [--a11y]",
+            "error": "Usage: python playwright_runner.py <url> [--screenshot] [--a11y] [--crawl] [--trace-flow=<flow>]",
             "examples": [
                 "python playwright_runner.py https://example.com",
                 "python playwright_runner.py https://example.com --screenshot",
-                "python playwright_runner.py https://example.com --a11y"
+                "python playwright_runner.py https://example.com --a11y",
+                "python playwright_runner.py http://localhost:3000/es --crawl --max-pages=100 --concurrency=6",
+                "python playwright_runner.py http://localhost:3000 --trace-flow=logbook-map --storage-state=auth.json"
             ]
         }, indent=2))
         sys.exit(1)
     
-    url = sys.argv[1]
     take_screenshot = "--screenshot" in sys.argv
     check_a11y = "--a11y" in sys.argv
     
-    if check_a11y:
+    options = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+    if "trace-flow" in options:
+        result = run_trace_flow(url, options["trace-flow"], out_dir=options.get("out"),
+                                storage_state=options.get("storage-state"), baseline=options.get("baseline"))
+    elif "--crawl" in sys.argv:
+        report_path = next((a.split("=", 1)[1] for a in sys.argv[1:] if a.startswith("--report=")), None)
+        result = run_crawl(url, max_pages=_int_option("--max-pages", MAX_PAGES),
+                           concurrency=_int_option("--concurrency", CONCURRENCY),
+                           settle_ms=_int_option("--settle-ms", SETTLE_MS), report_path=report_path)
+    elif check_a11y:
         result = run_accessibility_check(url)
     else:
         result = run_basic_test(url, take_screenshot)
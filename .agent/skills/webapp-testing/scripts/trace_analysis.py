@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+Skill: webapp-testing
+Script: trace_analysis.py
+Purpose: Attribute main-thread work in a Chrome performance trace
+Usage: python trace_analysis.py <trace.json[.gz]> [--folded <file>] [--baseline <summary.json>] [--json]
+       (--name=value works for --folded and --baseline too)
+Output: Long tasks with their breakdown, scripting hot spots, layout shifts and a
+        collapsed-stack flamegraph (`--folded`, for flamegraph.pl / speedscope)
+
+Works on the JSON written by Chrome tracing (CDP Tracing domain, Playwright
+browser.start_tracing, DevTools "Save profile"). playwright_runner.py
+--trace-flow records one per user flow and adds the in-page Event Timing /
+Layout Instability entries, which give INP and the elements involved.
+
+- Main thread: the busiest CrRendererMain thread of the trace.
+- Long tasks: top-level RunTask events over 50 ms, with self time grouped
+  into scripting / style & layout / paint / GC / parsing / other, and the
+  script URL that spent the most of it.
+- Hot spots: V8 CPU profile samples (disabled-by-default-v8.cpu_profiler)
+  as self and total time per function and self time per script.
+- Flamegraph: one `frame;frame;frame <microseconds>` line per stack.
+
+Next.js content hashes are stripped from script names (9335-*.js) so
+summaries and flamegraphs of two builds line up for comparison.
+"""
+import gzip
+import json
+import re
+import statistics
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+LONG_TASK_MS = 50
+TOP = 20
+
+TASK_EVENTS = {"RunTask", "ThreadControllerImpl::RunTask"}
+EVENT_GROUPS = {
+    "scripting": {"FunctionCall", "EvaluateScript", "v8.compile", "v8.compileModule", "v8.evaluateModule",
+                  "v8.produceCache", "TimerFire", "FireAnimationFrame", "FireIdleCallback", "EventDispatch",
+                  "RunMicrotasks", "V8.Execute", "v8.callFunction", "v8.run", "CompileScript", "CompileCode",
+                  "XHRReadyStateChange", "XHRLoad"},
+    "style_layout": {"UpdateLayoutTree", "RecalculateStyles", "Layout", "UpdateLayerTree", "Layerize",
+                     "PrePaint", "HitTest", "ScheduleStyleRecalculation", "InvalidateLayout"},
+    "paint": {"Paint", "PaintImage", "CompositeLayers", "Commit", "DecodeImage", "ImageDecodeTask",
+              "RasterTask", "UpdateLayer"},
+    "parsing": {"ParseHTML", "ParseAuthorStyleSheet"},
+}
+IDLE_FRAMES = {"(idle)", "(root)"}
+
+# Session windows of Cumulative Layout Shift (ms)
+CLS_GAP = 1000
+CLS_WINDOW = 5000
+
+BUILD_HASH = re.compile(r'(?<![0-9a-z])[0-9a-f]{16,}(?![0-9a-z])', re.IGNORECASE)
+
+# ============================================================================
+#  TRACE LOADING
+# ============================================================================
+
+def load_trace(source) -> List[dict]:
+    """Trace events from a path (plain or gzipped), bytes, or an already parsed trace."""
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        opener = gzip.open if path.suffix == '.gz' else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            source = json.load(f)
+    elif isinstance(source, (bytes, bytearray)):
+        source = json.loads(source)
+    return source.get("traceEvents", []) if isinstance(source, dict) else list(source)
+
+
+def _group(name: str) -> str:
+    for group, names in EVENT_GROUPS.items():
+        if name in names:
+            return group
+    if name.startswith(("V8.GC", "BlinkGC")) or name in ("MajorGC", "MinorGC", "GCEvent"):
+        return "gc"
+    return "other"
+
+
+def main_thread(events: List[dict]) -> Optional[Tuple[int, int]]:
+    """(pid, tid) of the busiest renderer main thread."""
+    renderers = {(e["pid"], e["tid"]) for e in events
+                 if e.get("ph") == "M" and e.get("name") == "thread_name"
+                 and e.get("args", {}).get("name") == "CrRendererMain"}
+    busy = Counter()
+    for e in events:
+        if e.get("ph") == "X" and e.get("name") in TASK_EVENTS and (e.get("pid"), e.get("tid")) in renderers:
+            busy[(e["pid"], e["tid"])] += e.get("dur", 0)
+    if busy:
+        return busy.most_common(1)[0][0]
+    return next(iter(renderers), None)
+
+
+def thread_slices(events: List[dict], thread: Tuple[int, int]) -> List[dict]:
+    """Complete slices of one thread ({"name", "ts", "dur", "args", "self", "depth", "children"}), B/E paired."""
+    slices, open_stack = [], {}
+    for e in events:
+        if (e.get("pid"), e.get("tid")) != thread:
+            continue
+        ph = e.get("ph")
+        if ph == "X":
+            slices.append({"name": e["name"], "ts": e["ts"], "dur": e.get("dur", 0), "args": e.get("args", {})})
+        elif ph == "B":
+            open_stack.setdefault(e["name"], []).append(e)
+        elif ph == "E" and open_stack.get(e.get("name")):
+            begin = open_stack[e["name"]].pop()
+            slices.append({"name": begin["name"], "ts": begin["ts"], "dur": e["ts"] - begin["ts"],
+                           "args": begin.get("args", {})})
+
+    # Nesting: parents start earlier (or at the same time and last longer)
+    slices.sort(key=lambda s: (s["ts"], -s["dur"]))
+    stack: List[dict] = []
+    for s in slices:
+        while stack and s["ts"] >= stack[-1]["ts"] + stack[-1]["dur"]:
+            stack.pop()
+        s["self"] = s["dur"]
+        s["depth"] = len(stack)
+        s["children"] = []
+        if stack:
+            stack[-1]["self"] -= min(s["dur"], stack[-1]["self"])
+            stack[-1]["children"].append(s)
+        stack.append(s)
+    return slices
+
+# ============================================================================
+#  LONG TASKS
+# ============================================================================
+
+def _descendants(task: dict, url: Optional[str] = None) -> Iterable[Tuple[dict, Optional[str]]]:
+    """Nested slices with the nearest script URL above them (forced layout counts for the caller)."""
+    pending = [(child, url) for child in task["children"]]
+    while pending:
+        s, inherited = pending.pop()
+        owner = _script_url(s) or inherited
+        yield s, owner
+        pending.extend((child, owner) for child in s["children"])
+
+
+def _script_url(s: dict) -> Optional[str]:
+    data = s["args"].get("data") or {}
+    return data.get("url") or data.get("scriptName") or None
+
+
+def short_script(url: Optional[str]) -> str:
+    """Last path segment of a script URL, content hash stripped."""
+    if not url:
+        return ""
+    name = url.split('?')[0].rstrip('/').rsplit('/', 1)[-1] or url
+    return BUILD_HASH.sub('*', name)
+
+
+def long_tasks(slices: List[dict], threshold_ms: float = LONG_TASK_MS) -> List[dict]:
+    """Top-level tasks over the threshold, with their self-time breakdown and dominant script."""
+    tasks = []
+    for task in slices:
+        if task["depth"] != 0 or task["name"] not in TASK_EVENTS or task["dur"] < threshold_ms * 1000:
+            continue
+        breakdown = Counter({"other": task["self"]})
+        by_script = Counter()
+        events = Counter()
+        dispatch = None
+        for s, url in _descendants(task):
+            breakdown[_group(s["name"])] += s["self"]
+            events[s["name"]] += s["self"]
+            if url:
+                by_script[url] += s["self"]
+            if s["name"] == "EventDispatch" and dispatch is None:
+                dispatch = (s["args"].get("data") or {}).get("type")
+        top_script = by_script.most_common(1)[0][0] if by_script else None
+        tasks.append({
+            "start_us": task["ts"],
+            "duration_ms": round(task["dur"] / 1000, 1),
+            "blocking_ms": round(task["dur"] / 1000 - LONG_TASK_MS, 1),
+            "breakdown_ms": {k: round(v / 1000, 1) for k, v in breakdown.most_common() if v >= 500},
+            "top_events": [name for name, _ in events.most_common(3)],
+            "script": top_script,
+            "event": dispatch,
+        })
+    return sorted(tasks, key=lambda t: -t["duration_ms"])
+
+# ============================================================================
+#  CPU PROFILE
+# ============================================================================
+
+def profile_samples(events: List[dict], thread: Optional[Tuple[int, int]]) -> List[Tuple[int, Tuple[str, ...], int]]:
+    """V8 CPU profile samples as (timestamp us, stack root->leaf, weight us), idle dropped."""
+    starts: Dict[Tuple[int, str], float] = {}
+    chunks: Dict[Tuple[int, str], List[dict]] = defaultdict(list)
+    owner: Dict[Tuple[int, str], int] = {}
+    for e in events:
+        if e.get("name") == "Profile":
+            key = (e.get("pid"), str(e.get("id")))
+            starts[key] = e.get("args", {}).get("data", {}).get("startTime", e.get("ts", 0))
+            owner[key] = e.get("tid")
+        elif e.get("name") == "ProfileChunk":
+            chunks[(e.get("pid"), str(e.get("id")))].append(e.get("args", {}).get("data", {}))
+
+    keys = [k for k in chunks if thread is None or k[0] == thread[0]]
+    on_main = [k for k in keys if thread is not None and owner.get(k) == thread[1]]
+    samples = []
+    for key in on_main or keys:
+        nodes: Dict[int, Tuple[str, Optional[int]]] = {}
+        ts = starts.get(key, 0)
+        timeline = []
+        for chunk in chunks[key]:
+            profile = chunk.get("cpuProfile", {})
+            for node in profile.get("nodes", []):
+                frame = node.get("callFrame", {})
+                name = frame.get("functionName") or "(anonymous)"
+                script = short_script(frame.get("url"))
+                label = f"{name} ({script}:{frame.get('lineNumber', -1) + 1})" if script else name
+                nodes[node["id"]] = (label.replace(';', ':'), node.get("parent"))
+            for node_id, delta in zip(profile.get("samples", []), chunk.get("timeDeltas", [])):
+                ts += delta
+                timeline.append((ts, node_id))
+        # children may list their parent only through the parent's "children" array
+        for chunk in chunks[key]:
+            for node in chunk.get("cpuProfile", {}).get("nodes", []):
+                for child in node.get("children", []):
+                    if child in nodes and nodes[child][1] is None:
+                        nodes[child] = (nodes[child][0], node["id"])
+
+        intervals = [b[0] - a[0] for a, b in zip(timeline, timeline[1:])]
+        typical = statistics.median(intervals) if intervals else 0
+        stacks: Dict[int, Tuple[str, ...]] = {}
+        for i, (sample_ts, node_id) in enumerate(timeline):
+            if node_id not in stacks:
+                frames, current = [], node_id
+                while current is not None and current in nodes:
+                    frames.append(nodes[current][0])
+                    current = nodes[current][1]
+                stacks[node_id] = tuple(f for f in reversed(frames) if f != "(root)")
+            stack = stacks[node_id]
+            if not stack or stack[-1] in IDLE_FRAMES:
+                continue
+            weight = intervals[i] if i < len(intervals) else typical
+            samples.append((sample_ts, stack, int(min(weight, 10 * typical) if typical else weight)))
+    return samples
+
+
+def collapsed_stacks(samples) -> Counter:
+    """Flamegraph input: 'root;...;leaf' -> microseconds."""
+    folded = Counter()
+    for _, stack, weight in samples:
+        folded[';'.join(stack)] += weight
+    return folded
+
+
+def hot_spots(samples, top: int = TOP, window: Optional[Tuple[float, float]] = None) -> dict:
+    """Self / total time per function and self time per script, optionally within a time window (us)."""
+    self_time, total_time, by_script = Counter(), Counter(), Counter()
+    for ts, stack, weight in samples:
+        if window and not window[0] <= ts <= window[1]:
+            continue
+        self_time[stack[-1]] += weight
+        for frame in set(stack):
+            total_time[frame] += weight
+        match = re.search(r'\(([^():]+):\d+\)$', stack[-1])
+        by_script[match.group(1) if match else stack[-1]] += weight
+    ms = lambda counter: [{"frame": k, "ms": round(v / 1000, 1)} for k, v in counter.most_common(top) if v]
+    return {
+        "sampled_ms": round(sum(self_time.values()) / 1000, 1),
+        "self": ms(self_time),
+        "total": ms(total_time),
+        "scripts": [{"script": k, "ms": round(v / 1000, 1)} for k, v in by_script.most_common(top) if v],
+    }
+
+# ============================================================================
+#  LAYOUT SHIFTS AND INTERACTIONS
+# ============================================================================
+
+def cumulative_layout_shift(shifts: List[dict]) -> Tuple[float, List[dict]]:
+    """CLS (largest session window) and the shifts of that window; shifts are {"start" ms, "value", ...}."""
+    best, best_window, window, window_start, last = 0.0, [], [], None, None
+    for shift in sorted((s for s in shifts if not s.get("recent_input")), key=lambda s: s["start"]):
+        if last is None or shift["start"] - last > CLS_GAP or shift["start"] - window_start > CLS_WINDOW:
+            window, window_start = [], shift["start"]
+        window.append(shift)
+        last = shift["start"]
+        total = sum(s["value"] for s in window)
+        if total > best:
+            best, best_window = total, list(window)
+    return round(best, 4), best_window
+
+
+def trace_layout_shifts(events: List[dict]) -> List[dict]:
+    """LayoutShift trace events as shift records (no element attribution: nodes are ids in a trace)."""
+    shifts = []
+    for e in events:
+        if e.get("name") == "LayoutShift":
+            data = e.get("args", {}).get("data", {})
+            if data.get("is_main_frame", True):
+                shifts.append({"start": e["ts"] / 1000, "value": data.get("score", 0),
+                               "recent_input": data.get("had_recent_input", False), "sources": []})
+    return shifts
+
+
+def interactions(events: List[dict]) -> List[dict]:
+    """Event Timing entries grouped per interaction: the longest entry of each, with its phases."""
+    by_id: Dict[int, dict] = {}
+    for e in events:
+        current = by_id.get(e["interaction"])
+        if current is None or e["duration"] > current["duration"]:
+            by_id[e["interaction"]] = e
+    result = []
+    for e in by_id.values():
+        result.append({
+            "type": e["type"],
+            "target": e.get("target"),
+            "start": round(e["start"], 1),
+            "duration_ms": round(e["duration"]),
+            "input_delay_ms": round(e["processing_start"] - e["start"], 1),
+            "processing_ms": round(e["processing_end"] - e["processing_start"], 1),
+            "presentation_delay_ms": round(max(0, e["start"] + e["duration"] - e["processing_end"]), 1),
+        })
+    return sorted(result, key=lambda i: -i["duration_ms"])
+
+
+def inp(ranked: List[dict]) -> Optional[dict]:
+    """Interaction to Next Paint: the worst interaction, ignoring one per 50 (web-vitals' p98)."""
+    if not ranked:
+        return None
+    return ranked[min(len(ranked) - 1, len(ranked) // 50)]
+
+# ============================================================================
+#  SUMMARY AND COMPARISON
+# ============================================================================
+
+def analyze_trace(events: List[dict], page_metrics: Optional[dict] = None, top: int = TOP) -> Tuple[dict, Counter]:
+    """
+    Summary of a trace (+ in-page Event Timing / layout-shift entries) and its collapsed stacks.
+
+    page_metrics: {"events": [...], "shifts": [...], "sync": {"mark_ms": ...}} from playwright_runner;
+    the sync mark maps page times (ms) onto trace time (us) to attribute interactions to samples.
+    """
+    thread = main_thread(events)
+    slices = thread_slices(events, thread) if thread else []
+    samples = profile_samples(events, thread)
+    tasks = long_tasks(slices)
+    busy = Counter()
+    for s in slices:
+        busy[_group(s["name"]) if s["depth"] else "other"] += s["self"]
+
+    page_metrics = page_metrics or {}
+    shifts = page_metrics.get("shifts") or trace_layout_shifts(events)
+    cls, cls_window = cumulative_layout_shift(shifts)
+    ranked = interactions(page_metrics.get("events", []))
+    worst = inp(ranked)
+
+    offset = None
+    mark_ms = (page_metrics.get("sync") or {}).get("mark_ms")
+    if mark_ms is not None:
+        mark = next((e for e in events if e.get("name") == (page_metrics.get("sync") or {}).get("name")), None)
+        if mark is not None:
+            offset = mark["ts"] - mark_ms * 1000
+    if worst and offset is not None:
+        window = (offset + worst["start"] * 1000, offset + (worst["start"] + worst["duration_ms"]) * 1000)
+        worst = dict(worst, hot_spots=hot_spots(samples, 5, window)["self"])
+
+    summary = {
+        "main_thread": list(thread) if thread else None,
+        "main_thread_ms": {k: round(v / 1000, 1) for k, v in busy.most_common() if v >= 1000},
+        "long_tasks": {
+            "count": len(tasks),
+            "blocking_ms": round(sum(t["blocking_ms"] for t in tasks), 1),
+            "longest": tasks[:top],
+        },
+        "inp": worst,
+        "interactions": ranked[:top],
+        "cls": cls,
+        "layout_shifts": [{"value": round(s["value"], 4), "start": round(s["start"], 1), "sources": s.get("sources", [])}
+                          for s in sorted(cls_window, key=lambda s: -s["value"])][:top],
+        "hot_spots": hot_spots(samples, top),
+    }
+    return summary, collapsed_stacks(samples)
+
+
+def write_folded(folded: Counter, path: Path) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        for stack, weight in sorted(folded.items()):
+            f.write(f"{stack} {weight}\n")
+
+
+def compare_summaries(before: dict, after: dict, top: int = 10) -> dict:
+    """Deltas between two flow summaries (same flow, two builds)."""
+    def value(summary, *path):
+        for key in path:
+            summary = (summary or {}).get(key) if isinstance(summary, dict) else None
+        return summary
+
+    metrics = {}
+    for name, path in (("inp_ms", ("inp", "duration_ms")), ("blocking_ms", ("long_tasks", "blocking_ms")),
+                       ("long_tasks", ("long_tasks", "count")), ("cls", ("cls",)),
+                       ("sampled_ms", ("hot_spots", "sampled_ms"))):
+        old, new = value(before, *path), value(after, *path)
+        if isinstance(old, (int, float)) and isinstance(new, (int, float)):
+            metrics[name] = {"before": old, "after": new, "delta": round(new - old, 4)}
+
+    def by_frame(summary, key, field):
+        return {e[field]: e["ms"] for e in value(summary, "hot_spots", key) or []}
+
+    changes = {}
+    for key, field in (("self", "frame"), ("scripts", "script")):
+        old, new = by_frame(before, key, field), by_frame(after, key, field)
+        deltas = [{"frame": f, "before": old.get(f, 0), "after": new.get(f, 0),
+                   "delta": round(new.get(f, 0) - old.get(f, 0), 1)} for f in set(old) | set(new)]
+        changes[key] = sorted((d for d in deltas if d["delta"]), key=lambda d: -d["delta"])[:top]
+    return {"metrics": metrics, "hot_spots": changes["self"], "scripts": changes["scripts"]}
+
+# ============================================================================
+#  OUTPUT
+# ============================================================================
+
+def print_summary(summary: dict, title: str = "TRACE"):
+    print("\n" + "=" * 70)
+    print(f"{title}")
+    print("=" * 70)
+    busy = ', '.join(f"{k} {v:.0f}ms" for k, v in summary["main_thread_ms"].items())
+    print(f"Main thread: {busy or '-'}")
+    tasks = summary["long_tasks"]
+    print(f"\n[LONG TASKS] {tasks['count']} task(s), {tasks['blocking_ms']:.0f} ms blocking")
+    for task in tasks["longest"][:8]:
+        parts = ', '.join(f"{k} {v:.0f}" for k, v in task["breakdown_ms"].items())
+        cause = task["script"] or ', '.join(task["top_events"])
+        event = f" on {task['event']}" if task["event"] else ""
+        print(f"  {task['duration_ms']:>6.0f} ms{event}  {short_script(cause) if task['script'] else cause}  ({parts})")
+    if summary["inp"]:
+        worst = summary["inp"]
+        print(f"\n[INP] {worst['duration_ms']} ms - {worst['type']} on {worst.get('target') or '?'} "
+              f"(input delay {worst['input_delay_ms']:.0f}, processing {worst['processing_ms']:.0f}, "
+              f"presentation {worst['presentation_delay_ms']:.0f} ms)")
+        for spot in worst.get("hot_spots", []):
+            print(f"        {spot['ms']:>6.1f} ms  {spot['frame']}")
+    print(f"\n[CLS] {summary['cls']}")
+    for shift in summary["layout_shifts"][:5]:
+        sources = ', '.join(shift["sources"][:3]) or "(no element attribution)"
+        print(f"  {shift['value']:.4f} at {shift['start']:.0f} ms: {sources}")
+    spots = summary["hot_spots"]
+    print(f"\n[HOT SPOTS] {spots['sampled_ms']:.0f} ms sampled (self time)")
+    for spot in spots["self"][:10]:
+        print(f"  {spot['ms']:>8.1f} ms  {spot['frame']}")
+    if spots["scripts"]:
+        print("  By script: " + ', '.join(f"{s['script']} {s['ms']:.0f}ms" for s in spots["scripts"][:5]))
+    print("=" * 70)
+
+
+def print_comparison(comparison: dict):
+    print("\n[VS BASELINE]")
+    for name, values in comparison["metrics"].items():
+        sign = '+' if values["delta"] > 0 else ''
+        print(f"  {name:<12} {values['before']} -> {values['after']} ({sign}{values['delta']})")
+    for change in comparison["hot_spots"][:8]:
+        sign = '+' if change["delta"] > 0 else ''
+        print(f"  {sign}{change['delta']:>7.1f} ms  {change['frame']}")
+
+
+def main():
+    argv = sys.argv[1:]
+    # --folded/--baseline take a value, either as --name=value or --name value
+    options, args = {}, []
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg.startswith('--') and '=' in arg:
+            name, value = arg[2:].split('=', 1)
+            options[name] = value
+        elif arg in ("--folded", "--baseline") and i + 1 < len(argv):
+            options[arg[2:]] = argv[i + 1]
+            i += 1
+        elif not arg.startswith('--'):
+            args.append(arg)
+        i += 1
+    if len(args) != 1:
+        print("Usage: python trace_analysis.py <trace.json[.gz]> [--folded <file>] [--baseline <summary.json>] [--json]")
+        sys.exit(1)
+    baseline = None
+    if options.get("baseline"):
+        try:
+            baseline = json.loads(Path(options["baseline"]).read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Could not read baseline {options['baseline']}: {e}")
+            sys.exit(1)
+    try:
+        events = load_trace(args[0])
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Could not read trace {args[0]}: {e}")
+        sys.exit(1)
+    summary, folded = analyze_trace(events)
+    if options.get("folded"):
+        write_folded(folded, Path(options["folded"]))
+    comparison = None
+    if baseline is not None:
+        comparison = compare_summaries(baseline.get("trace", baseline), summary)
+    if '--json' in sys.argv:
+        print(json.dumps({"trace": summary, "vs_baseline": comparison}, indent=2))
+        return
+    print_summary(summary, f"TRACE {args[0]}")
+    if comparison:
+        print_comparison(comparison)
+    if options.get("folded"):
+        print(f"Collapsed stacks: {options['folded']}")
+
+
+if __name__ == "__main__":
+    main()